@@ -50,3 +50,14 @@ def require_auth(f):
         return f(*args, **kwargs)
 
     return decorated
+
+
+def require_admin(f):
+    @require_auth
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if not g.user.is_admin:
+            return _error_response("FORBIDDEN", "Admin access required", 403)
+        return f(*args, **kwargs)
+
+    return decorated
@@ -13,6 +13,7 @@ import time
 from typing import Optional, List
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from app.auth.security_utils import log_audit
+from app.core.db_pool import get_connection
 
 
 # Valid platforms and credential types
@@ -48,7 +49,7 @@ class CredentialManager:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -121,9 +122,32 @@ class CredentialManager:
             "CREATE INDEX IF NOT EXISTS idx_shared_creds_credential ON shared_credentials(credential_id)"
         )
 
+        self._create_sessions_table(cursor)
+
         conn.commit()
         conn.close()
 
+    def _create_sessions_table(self, cursor):
+        """Create the platform_sessions table (encrypted login sessions)"""
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS platform_sessions (
+                user_id INTEGER NOT NULL,
+                platform TEXT NOT NULL,
+
+                -- Encrypted session data (AES-256-GCM)
+                encrypted_data BLOB NOT NULL,
+                encryption_iv BLOB NOT NULL,
+                encryption_tag BLOB NOT NULL,
+
+                updated_at INTEGER NOT NULL,
+
+                PRIMARY KEY (user_id, platform),
+                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+        """
+        )
+
     def _encrypt_credentials(self, data: dict) -> tuple[bytes, bytes, bytes]:
         """
         Encrypt credential data using AES-256-GCM.
@@ -480,6 +504,15 @@ class CredentialManager:
                 (user_id, platform, credential_type),
             )
 
+            # Sessions opened with these credentials go with them
+            try:
+                cursor.execute(
+                    "DELETE FROM platform_sessions WHERE user_id = ? AND platform = ?",
+                    (user_id, platform),
+                )
+            except sqlite3.OperationalError:
+                pass
+
             conn.commit()
 
             # Log audit event
@@ -731,3 +764,114 @@ class CredentialManager:
 
         finally:
             conn.close()
+
+    def save_session(self, user_id: int, platform: str, data: dict) -> bool:
+        """
+        Save an encrypted login session (e.g. access/refresh tokens) for a user.
+
+        Sessions are kept apart from user_credentials so they never show up
+        as credentials, and are replaced on every save.
+
+        Args:
+            user_id: User ID
+            platform: Platform ('twitter' or 'bluesky')
+            data: Session data as dictionary
+
+        Returns:
+            True if saved successfully
+
+        Raises:
+            ValueError: If platform is invalid
+        """
+        if platform not in VALID_PLATFORMS:
+            raise ValueError(
+                f"Invalid platform: {platform}. Must be one of {VALID_PLATFORMS}"
+            )
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            self._create_sessions_table(cursor)
+            encrypted_data, iv, tag = self._encrypt_credentials(data)
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO platform_sessions
+                (user_id, platform, encrypted_data, encryption_iv, encryption_tag, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                (user_id, platform, encrypted_data, iv, tag, int(time.time())),
+            )
+            conn.commit()
+            return True
+
+        finally:
+            conn.close()
+
+    def get_session(self, user_id: int, platform: str) -> Optional[dict]:
+        """
+        Get the decrypted login session for a user.
+
+        Args:
+            user_id: User ID
+            platform: Platform ('twitter' or 'bluesky')
+
+        Returns:
+            Decrypted session data or None if there is none (or it cannot
+            be decrypted)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(
+                """
+                SELECT encrypted_data, encryption_iv, encryption_tag
+                FROM platform_sessions
+                WHERE user_id = ? AND platform = ?
+            """,
+                (user_id, platform),
+            )
+            row = cursor.fetchone()
+        except sqlite3.OperationalError:
+            # Table not created yet
+            return None
+        finally:
+            conn.close()
+
+        if not row:
+            return None
+
+        try:
+            return self._decrypt_credentials(
+                row["encrypted_data"], row["encryption_iv"], row["encryption_tag"]
+            )
+        except Exception:
+            # Sessions are disposable; a stale key just means logging in again
+            return None
+
+    def delete_session(self, user_id: int, platform: str) -> bool:
+        """
+        Delete the stored login session for a user.
+
+        Args:
+            user_id: User ID
+            platform: Platform ('twitter' or 'bluesky')
+
+        Returns:
+            True if a session was deleted
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(
+                "DELETE FROM platform_sessions WHERE user_id = ? AND platform = ?",
+                (user_id, platform),
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+        except sqlite3.OperationalError:
+            return False
+        finally:
+            conn.close()
@@ -10,6 +10,7 @@ import re
 from typing import Optional, List, Dict
 from collections import defaultdict
 import threading
+from app.core.db_pool import get_connection
 
 
 # Password validation requirements
@@ -139,7 +140,7 @@ def log_audit(
         db_path: Database path
     """
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_connection(db_path)
         cursor = conn.cursor()
 
         # Create audit_log table if not exists
@@ -208,7 +209,7 @@ def get_audit_log(
         List of audit log entries as dicts
     """
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_connection(db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
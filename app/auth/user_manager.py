@@ -13,6 +13,7 @@ import time
 from typing import Optional, List
 from dataclasses import dataclass
 from app.auth.security_utils import validate_password, log_audit
+from app.core.db_pool import get_connection
 
 
 @dataclass
@@ -49,7 +50,7 @@ class UserManager:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
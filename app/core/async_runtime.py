@@ -0,0 +1,206 @@
+"""
+Process-wide asyncio runtime for the sync cycle.
+
+The scraper (twscrape) and other async integrations used to be driven with
+``asyncio.run()`` per call, which creates and tears down an event loop - and
+every connection opened on it - for each tweet. The runtime instead owns one
+long-lived event loop running in a background thread. Synchronous callers
+submit coroutines to it with ``run_sync()`` and block for the result, so all
+async work in the process shares the same loop and keeps its connections
+alive between calls.
+
+Usage:
+    from app.core.async_runtime import run_sync
+
+    tweets = run_sync(_fetch_tweets_async(count))
+"""
+
+import asyncio
+import atexit
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Optional
+
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class AsyncRuntime:
+    """
+    A single event loop running in a daemon thread.
+
+    The loop is started lazily on first use and can be shut down and
+    restarted (e.g. between tests).
+    """
+
+    def __init__(self, name: str = "chirpsyncer-async"):
+        """
+        Initialize AsyncRuntime.
+
+        Args:
+            name: Name of the loop thread
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"started": 0, "submitted": 0, "completed": 0, "failed": 0}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runtime's event loop, started on first access."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._start_locked()
+            return self._loop
+
+    def _start_locked(self):
+        ready = threading.Event()
+        loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+        self._stats["started"] += 1
+        logger.debug(f"Async runtime loop started in thread {self.name}")
+
+    def in_loop_thread(self) -> bool:
+        """True when called from the runtime's own loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable) -> Future:
+        """
+        Schedule a coroutine on the runtime loop.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            concurrent.futures.Future for the coroutine's result
+        """
+        loop = self.loop
+        with self._lock:
+            self._stats["submitted"] += 1
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        future.add_done_callback(self._record_outcome)
+        return future
+
+    def _record_outcome(self, future: Future):
+        outcome = "failed" if future.cancelled() or future.exception() else "completed"
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the runtime loop and wait for its result.
+
+        Safe to call from any thread, including one that is itself running
+        a different event loop.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait before cancelling (None waits forever)
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the runtime loop thread (would deadlock)
+            TimeoutError: If timeout elapses first
+        """
+        if self.in_loop_thread():
+            if asyncio.iscoroutine(coro):
+                coro.close()
+            raise RuntimeError("run() called from the runtime loop; await the coroutine instead")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self, timeout: float = 5.0):
+        """
+        Cancel pending tasks, stop the loop and join its thread.
+
+        Args:
+            timeout: Seconds to wait for the loop thread to exit
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if loop is None or loop.is_closed():
+            return
+
+        async def _drain():
+            from app.core.http_client import close_http_session
+
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await close_http_session()
+            await loop.shutdown_asyncgens()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_drain(), loop).result(timeout)
+        except Exception as e:
+            logger.debug(f"Async runtime drain incomplete: {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+    def get_stats(self) -> dict:
+        """
+        Get runtime metrics.
+
+        Returns:
+            Dictionary with loop starts and submitted/completed/failed counts
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["running"] = self._loop is not None and self._loop.is_running()
+        stats["pending"] = stats["submitted"] - stats["completed"] - stats["failed"]
+        return stats
+
+
+_runtime = AsyncRuntime()
+
+
+def get_runtime() -> AsyncRuntime:
+    """Get the process-wide async runtime."""
+    return _runtime
+
+
+def run_sync(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the shared runtime loop from synchronous code.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds to wait before cancelling (None waits forever)
+
+    Returns:
+        The coroutine's result
+    """
+    return _runtime.run(coro, timeout)
+
+
+def shutdown_runtime(timeout: float = 5.0):
+    """Stop the shared runtime loop (it restarts lazily on next use)."""
+    _runtime.shutdown(timeout)
+
+
+atexit.register(shutdown_runtime)
@@ -24,3 +24,108 @@ BSKY_PASSWORD = os.getenv("BSKY_PASSWORD")
 # Polling interval (in seconds) - 7.2 hours to stay within 100 requests/month limit
 # Calculation: 30 days * 24 hours = 720 hours/month ÷ 100 requests = 7.2 hours/request
 POLL_INTERVAL = 7.2 * 60 * 60  # 25,920 seconds
+
+# SQLite connection pool tuning (see app/core/db_pool.py)
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "16384"))  # 16MB page cache
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(128 * 1024 * 1024)))  # 128MB
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+DB_POOL_MAX_IDLE = int(os.getenv("DB_POOL_MAX_IDLE", "4"))  # idle connections per thread and file
+
+# In-memory dedup front cache (see app/core/dedup_cache.py)
+DEDUP_CACHE_ENABLED = os.getenv("DEDUP_CACHE_ENABLED", "true").lower() == "true"
+DEDUP_BLOOM_CAPACITY = int(os.getenv("DEDUP_BLOOM_CAPACITY", "100000"))
+DEDUP_BLOOM_ERROR_RATE = float(os.getenv("DEDUP_BLOOM_ERROR_RATE", "0.001"))
+DEDUP_LRU_SIZE = int(os.getenv("DEDUP_LRU_SIZE", "10000"))
+
+# Multi-user sync
+SYNC_MAX_CONCURRENT_USERS = int(os.getenv("SYNC_MAX_CONCURRENT_USERS", "4"))
+
+# Shared twscrape account pool (see app/services/scraper_pool.py)
+TWSCRAPE_ACCOUNTS_DB = os.getenv("TWSCRAPE_ACCOUNTS_DB", "accounts.db")
+SCRAPER_LOGIN_RETRY_SECONDS = int(os.getenv("SCRAPER_LOGIN_RETRY_SECONDS", "3600"))
+
+# Adaptive per-user polling (see app/services/sync_scheduler.py)
+SCHEDULER_MIN_INTERVAL = int(os.getenv("SCHEDULER_MIN_INTERVAL", "300"))  # 5 minutes
+SCHEDULER_MAX_INTERVAL = int(os.getenv("SCHEDULER_MAX_INTERVAL", str(int(POLL_INTERVAL))))
+SCHEDULER_HALF_LIFE_SECONDS = int(os.getenv("SCHEDULER_HALF_LIFE_SECONDS", str(24 * 3600)))
+SCHEDULER_POSTS_PER_SYNC = float(os.getenv("SCHEDULER_POSTS_PER_SYNC", "1"))
+SCHEDULER_TWITTER_REQUESTS_PER_HOUR = float(os.getenv("SCHEDULER_TWITTER_REQUESTS_PER_HOUR", "60"))
+SCHEDULER_BLUESKY_REQUESTS_PER_HOUR = float(os.getenv("SCHEDULER_BLUESKY_REQUESTS_PER_HOUR", "600"))
+SCHEDULER_MAX_SLEEP = int(os.getenv("SCHEDULER_MAX_SLEEP", "60"))  # recheck for new users
+
+# Durable sync outbox (see app/services/sync_outbox.py)
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_BACKOFF_SECONDS = int(os.getenv("OUTBOX_BACKOFF_SECONDS", "60"))
+OUTBOX_MAX_BACKOFF_SECONDS = int(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", str(6 * 3600)))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))  # jobs posted per user and drain
+
+# Staged sync pipeline (see app/services/sync_pipeline.py)
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "32"))  # items buffered between stages
+PIPELINE_ENRICH_CONCURRENCY = int(os.getenv("PIPELINE_ENRICH_CONCURRENCY", "4"))  # thread lookups
+PIPELINE_POST_CONCURRENCY = int(os.getenv("PIPELINE_POST_CONCURRENCY", "1"))  # >1 may reorder posts
+
+# Sharded sync workers (see app/services/sync_leases.py)
+WORKER_LEASE_SECONDS = int(os.getenv("WORKER_LEASE_SECONDS", "300"))  # longer than one user's sync
+WORKER_HEARTBEAT_SECONDS = int(os.getenv("WORKER_HEARTBEAT_SECONDS", "60"))
+
+# Shared token-bucket rate limiter (see app/services/rate_limiter.py).
+# Defaults until response headers report the real limits.
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", "chirpsyncer.db")
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "60"))  # seconds, then give up
+RATE_LIMIT_BLUESKY_WRITES_PER_HOUR = int(os.getenv("RATE_LIMIT_BLUESKY_WRITES_PER_HOUR", "1666"))
+RATE_LIMIT_TWITTER_POSTS_PER_15_MIN = int(os.getenv("RATE_LIMIT_TWITTER_POSTS_PER_15_MIN", "100"))
+
+# Circuit breakers per platform and endpoint (see app/services/circuit_breaker.py)
+CIRCUIT_ERROR_THRESHOLD = float(os.getenv("CIRCUIT_ERROR_THRESHOLD", "0.5"))  # failed/slow share
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))  # calls in window before tripping
+CIRCUIT_WINDOW_SECONDS = int(os.getenv("CIRCUIT_WINDOW_SECONDS", "60"))
+CIRCUIT_OPEN_SECONDS = int(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))  # then one probe call
+CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "10"))
+
+# Thread expansion (see fetch_thread in app/integrations/twitter_scraper.py)
+THREAD_MAX_TWEETS = int(os.getenv("THREAD_MAX_TWEETS", "100"))
+THREAD_LOOKUP_BATCH_SIZE = int(os.getenv("THREAD_LOOKUP_BATCH_SIZE", "20"))  # IDs per detail lookup
+THREAD_CACHE_SIZE = int(os.getenv("THREAD_CACHE_SIZE", "512"))  # conversations kept in memory
+THREAD_CACHE_TTL_SECONDS = int(os.getenv("THREAD_CACHE_TTL_SECONDS", str(3 * 24 * 3600)))
+
+# Twitter archive import (see app/features/archive_import.py)
+ARCHIVE_IMPORT_BATCH_SIZE = int(os.getenv("ARCHIVE_IMPORT_BATCH_SIZE", "500"))  # tweets per transaction
+ARCHIVE_IMPORT_CHUNK_BYTES = int(os.getenv("ARCHIVE_IMPORT_CHUNK_BYTES", str(256 * 1024)))
+
+# Push-based Bluesky ingestion from a Jetstream event stream (see app/services/jetstream.py)
+JETSTREAM_ENABLED = os.getenv("JETSTREAM_ENABLED", "false").lower() == "true"
+JETSTREAM_URL = os.getenv("JETSTREAM_URL", "wss://jetstream2.us-east.bsky.network/subscribe")
+JETSTREAM_CURSOR_SAVE_SECONDS = float(os.getenv("JETSTREAM_CURSOR_SAVE_SECONDS", "5"))
+JETSTREAM_RECONNECT_MAX_SECONDS = float(os.getenv("JETSTREAM_RECONNECT_MAX_SECONDS", "60"))
+
+# Content-addressed media cache (see app/core/media_cache.py)
+MEDIA_CACHE_ENABLED = os.getenv("MEDIA_CACHE_ENABLED", "true").lower() == "true"
+MEDIA_CACHE_DIR = os.getenv("MEDIA_CACHE_DIR", "media_cache")
+MEDIA_CACHE_MAX_BYTES = int(os.getenv("MEDIA_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+MEDIA_CACHE_BLOB_TTL_SECONDS = int(os.getenv("MEDIA_CACHE_BLOB_TTL_SECONDS", "3600"))  # Bluesky blob refs
+MEDIA_CACHE_MEDIA_ID_TTL_SECONDS = int(os.getenv("MEDIA_CACHE_MEDIA_ID_TTL_SECONDS", "86400"))  # Twitter
+
+# Streaming media downloads (see app/integrations/media_handler.py)
+MEDIA_DOWNLOAD_CHUNK_BYTES = int(os.getenv("MEDIA_DOWNLOAD_CHUNK_BYTES", str(64 * 1024)))
+MEDIA_SPOOL_BYTES = int(os.getenv("MEDIA_SPOOL_BYTES", str(1024 * 1024)))  # then spilled to a temp file
+
+# Shared outbound HTTP client (see app/core/http_client.py)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "8"))
+HTTP_DNS_CACHE_SECONDS = int(os.getenv("HTTP_DNS_CACHE_SECONDS", "300"))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))  # whole request
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "10"))
+
+# Image recompression into platform size limits (see app/services/media_transform.py)
+MEDIA_TRANSFORM_ENABLED = os.getenv("MEDIA_TRANSFORM_ENABLED", "true").lower() == "true"
+MEDIA_TRANSFORM_WORKERS = int(os.getenv("MEDIA_TRANSFORM_WORKERS", "2"))  # encoder processes
+MEDIA_TRANSFORM_MAX_DIMENSION = int(os.getenv("MEDIA_TRANSFORM_MAX_DIMENSION", "2048"))  # pixels
+MEDIA_TRANSFORM_MIN_QUALITY = int(os.getenv("MEDIA_TRANSFORM_MIN_QUALITY", "50"))
+MEDIA_TRANSFORM_MAX_QUALITY = int(os.getenv("MEDIA_TRANSFORM_MAX_QUALITY", "90"))
+
+# Media of synced posts (see sync_post_media() in app/integrations/media_handler.py)
+MEDIA_SYNC_ENABLED = os.getenv("MEDIA_SYNC_ENABLED", "true").lower() == "true"
+MEDIA_POST_CONCURRENCY = int(os.getenv("MEDIA_POST_CONCURRENCY", "4"))  # attachments of one post at a time
@@ -1,6 +1,13 @@
 import os
-import sqlite3
 from app.core.utils import compute_content_hash
+from app.core.db_pool import get_connection
+from app.core.dedup_cache import (
+    BLUESKY_URI,
+    CONTENT_HASH,
+    SEEN_TWEET,
+    TWITTER_ID,
+    get_dedup_cache,
+)
 
 # Define the database file path
 DB_PATH = os.path.join(os.getcwd(), "data.db")
@@ -14,7 +21,7 @@ def initialize_db(db_path=None):
         raise ValueError(f"{resolved_path} exists and is a directory! Please remove it.")
 
     # Automatically create the database file if it doesn't exist
-    conn = sqlite3.connect(resolved_path)
+    conn = get_connection(resolved_path)
     cursor = conn.cursor()
 
     # Create required tables
@@ -33,27 +40,65 @@ def initialize_db(db_path=None):
     """)
     conn.commit()
     conn.close()
+def _db_file(conn):
+    """Return the file path of a connection's main database."""
+    for _, name, path in conn.execute("PRAGMA database_list"):
+        if name == "main":
+            return path
+    return ""
+
+
 def is_tweet_seen(tweet_id, conn=None):
-    conn = conn or sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT 1 FROM seen_tweets WHERE tweet_id = ?", (tweet_id,))
-    result = cursor.fetchone()
+    owned = conn is None
+    # An explicit connection may carry uncommitted state; only the
+    # default database is answered from the dedup cache
+    cache = get_dedup_cache(DB_PATH) if owned else None
+    if cache is not None:
+        verdict = cache.lookup([(SEEN_TWEET, tweet_id)])
+        if verdict is not None:
+            return verdict
+
+    conn = conn or get_connection(DB_PATH)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM seen_tweets WHERE tweet_id = ?", (tweet_id,))
+        result = cursor.fetchone()
+    finally:
+        if owned:
+            conn.close()
+
+    if cache is not None:
+        cache.confirm(SEEN_TWEET, tweet_id, result is not None)
     return result is not None
 
 def mark_tweet_as_seen(tweet_id, conn=None):
-    conn = conn or sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("INSERT OR IGNORE INTO seen_tweets (tweet_id) VALUES (?)", (tweet_id,))
-    conn.commit()
+    owned = conn is None
+    conn = conn or get_connection(DB_PATH)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("INSERT OR IGNORE INTO seen_tweets (tweet_id) VALUES (?)", (tweet_id,))
+        conn.commit()
+        cache = get_dedup_cache(DB_PATH if owned else _db_file(conn))
+    finally:
+        if owned:
+            conn.close()
+
+    if cache is not None:
+        cache.add([(SEEN_TWEET, tweet_id)])
 
 def store_api_rate_limit(remaining_reads, reset_time, conn=None):
-    conn = conn or sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-    INSERT OR REPLACE INTO api_usage (id, remaining_reads, reset_time)
-    VALUES (1, ?, ?)
-    """, (remaining_reads, reset_time))
-    conn.commit()
+    owned = conn is None
+    conn = conn or get_connection(DB_PATH)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+        INSERT OR REPLACE INTO api_usage (id, remaining_reads, reset_time)
+        VALUES (1, ?, ?)
+        """, (remaining_reads, reset_time))
+        conn.commit()
+    finally:
+        if owned:
+            conn.close()
 
 
 # BIDIR-003: Database Schema Migration Functions
@@ -69,7 +114,7 @@ def migrate_database(db_path=None):
         db_path: Path to database file (defaults to DB_PATH)
     """
     resolved_path = db_path or DB_PATH
-    conn = sqlite3.connect(resolved_path)
+    conn = get_connection(resolved_path)
     cursor = conn.cursor()
 
     # Create new synced_posts table
@@ -92,6 +137,9 @@ def migrate_database(db_path=None):
         -- Original content
         original_text TEXT NOT NULL,
 
+        -- Owning user in multi-user mode
+        user_id INTEGER,
+
         -- Constraints
         CHECK (source IN ('twitter', 'bluesky')),
         CHECK (synced_to IN ('bluesky', 'twitter', 'both'))
@@ -104,6 +152,32 @@ def migrate_database(db_path=None):
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_content_hash ON synced_posts(content_hash)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_source ON synced_posts(source)")
 
+    # Databases created before posts were attributed to users
+    cursor.execute("PRAGMA table_info(synced_posts)")
+    if "user_id" not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE synced_posts ADD COLUMN user_id INTEGER")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_synced_posts_user ON synced_posts(user_id, synced_at)"
+    )
+
+    # High-water marks for incremental timeline fetching
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sync_cursors (
+        account TEXT NOT NULL,
+        platform TEXT NOT NULL,
+
+        -- Newest item fetched: tweet ID, or Bluesky post URI
+        last_id TEXT,
+        -- Bluesky indexedAt of last_id
+        last_timestamp TEXT,
+
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+        PRIMARY KEY (account, platform),
+        CHECK (platform IN ('twitter', 'bluesky'))
+    )
+    """)
+
     conn.commit()
     conn.close()
 
@@ -116,7 +190,7 @@ def add_stats_tables(db_path=None):
         db_path: Path to database file (defaults to DB_PATH)
     """
     resolved_path = db_path or DB_PATH
-    conn = sqlite3.connect(resolved_path)
+    conn = get_connection(resolved_path)
     cursor = conn.cursor()
 
     # Create sync_stats table for detailed sync tracking
@@ -175,16 +249,27 @@ def should_sync_post(content: str, source: str, post_id: str, db_path=None) -> b
         True if should sync, False if duplicate detected
     """
     resolved_path = db_path or DB_PATH
-    conn = sqlite3.connect(resolved_path)
-    cursor = conn.cursor()
 
     # Compute content hash
     content_hash = compute_content_hash(content)
+    id_namespace = TWITTER_ID if source == 'twitter' else BLUESKY_URI
+
+    # Answer from the in-memory front cache when it is certain
+    cache = get_dedup_cache(resolved_path)
+    if cache is not None:
+        verdict = cache.lookup([(CONTENT_HASH, content_hash), (id_namespace, post_id)])
+        if verdict is not None:
+            return not verdict
+
+    conn = get_connection(resolved_path)
+    cursor = conn.cursor()
 
     # Check for duplicate hash (same content already synced)
     cursor.execute("SELECT 1 FROM synced_posts WHERE content_hash = ?", (content_hash,))
     if cursor.fetchone():
         conn.close()
+        if cache is not None:
+            cache.confirm(CONTENT_HASH, content_hash, True)
         return False
 
     # Check for duplicate ID based on source
@@ -195,14 +280,18 @@ def should_sync_post(content: str, source: str, post_id: str, db_path=None) -> b
 
     if cursor.fetchone():
         conn.close()
+        if cache is not None:
+            cache.confirm(id_namespace, post_id, True)
         return False
 
     conn.close()
+    if cache is not None:
+        cache.confirm(id_namespace, post_id, False)
     return True
 
 
 def save_synced_post(twitter_id=None, bluesky_uri=None, source=None,
-                     synced_to=None, content=None, db_path=None):
+                     synced_to=None, content=None, db_path=None, user_id=None):
     """
     Save synced post to database with metadata.
 
@@ -213,22 +302,33 @@ def save_synced_post(twitter_id=None, bluesky_uri=None, source=None,
         synced_to: 'bluesky', 'twitter', or 'both'
         content: Original post text content
         db_path: Path to database file (defaults to DB_PATH)
+        user_id: Owning user in multi-user mode (optional)
     """
     resolved_path = db_path or DB_PATH
-    conn = sqlite3.connect(resolved_path)
+    conn = get_connection(resolved_path)
     cursor = conn.cursor()
 
     # Compute content hash
     content_hash = compute_content_hash(content)
 
     # Insert into synced_posts
-    cursor.execute("""
-    INSERT INTO synced_posts (twitter_id, bluesky_uri, source, content_hash, synced_to, original_text)
-    VALUES (?, ?, ?, ?, ?, ?)
-    """, (twitter_id, bluesky_uri, source, content_hash, synced_to, content))
+    try:
+        cursor.execute("""
+        INSERT INTO synced_posts
+        (twitter_id, bluesky_uri, source, content_hash, synced_to, original_text, user_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (twitter_id, bluesky_uri, source, content_hash, synced_to, content, user_id))
+        conn.commit()
+    finally:
+        conn.close()
 
-    conn.commit()
-    conn.close()
+    cache = get_dedup_cache(resolved_path)
+    if cache is not None:
+        cache.add([
+            (CONTENT_HASH, content_hash),
+            (TWITTER_ID, twitter_id),
+            (BLUESKY_URI, bluesky_uri),
+        ])
 
 
 def get_post_by_hash(content_hash: str, db_path=None):
@@ -243,11 +343,236 @@ def get_post_by_hash(content_hash: str, db_path=None):
         Tuple of post data or None if not found
     """
     resolved_path = db_path or DB_PATH
-    conn = sqlite3.connect(resolved_path)
+    conn = get_connection(resolved_path)
     cursor = conn.cursor()
 
     cursor.execute("SELECT * FROM synced_posts WHERE content_hash = ?", (content_hash,))
     result = cursor.fetchone()
 
     conn.close()
-    return result
\ No newline at end of file
+    return result
+
+# Posts per IN-list query; two lists per query keeps us under SQLite's
+# historical 999 bound-parameter limit.
+_BATCH_CHUNK_SIZE = 400
+
+
+def should_sync_post_many(posts, source: str, db_path=None) -> list:
+    """
+    Batch variant of should_sync_post() for a whole fetched timeline.
+
+    Resolves content-hash and platform-ID duplicates with one set-based
+    query per chunk instead of two point queries per post.
+
+    Args:
+        posts: Iterable of (content, post_id) tuples
+        source: 'twitter' or 'bluesky'
+        db_path: Path to database file (defaults to DB_PATH)
+
+    Returns:
+        List of booleans in input order (True = should sync). Within the
+        batch only the first occurrence of a content hash or post ID is
+        syncable, matching sequential should_sync_post()/save_synced_post().
+    """
+    posts = list(posts)
+    if not posts:
+        return []
+
+    resolved_path = db_path or DB_PATH
+    hashes = [compute_content_hash(content) for content, _ in posts]
+    post_ids = [str(post_id) for _, post_id in posts]
+    id_column = "twitter_id" if source == "twitter" else "bluesky_uri"
+    id_namespace = TWITTER_ID if source == "twitter" else BLUESKY_URI
+
+    # The front cache settles most posts; only the rest go to the database
+    cache = get_dedup_cache(resolved_path)
+    if cache is not None:
+        verdicts = [
+            cache.lookup([(CONTENT_HASH, content_hash), (id_namespace, post_id)])
+            for content_hash, post_id in zip(hashes, post_ids)
+        ]
+    else:
+        verdicts = [None] * len(posts)
+    unresolved = [i for i, verdict in enumerate(verdicts) if verdict is None]
+
+    known_hashes = set()
+    known_ids = set()
+
+    if unresolved:
+        conn = get_connection(resolved_path)
+        try:
+            cursor = conn.cursor()
+            for start in range(0, len(unresolved), _BATCH_CHUNK_SIZE):
+                chunk = unresolved[start:start + _BATCH_CHUNK_SIZE]
+                chunk_hashes = [hashes[i] for i in chunk]
+                chunk_ids = [post_ids[i] for i in chunk]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(f"""
+                SELECT content_hash, {id_column} FROM synced_posts
+                WHERE content_hash IN ({placeholders}) OR {id_column} IN ({placeholders})
+                """, chunk_hashes + chunk_ids)
+                for content_hash, post_id in cursor.fetchall():
+                    known_hashes.add(content_hash)
+                    if post_id is not None:
+                        known_ids.add(str(post_id))
+        finally:
+            conn.close()
+
+        if cache is not None:
+            for i in unresolved:
+                if hashes[i] in known_hashes:
+                    cache.confirm(CONTENT_HASH, hashes[i], True)
+                elif post_ids[i] in known_ids:
+                    cache.confirm(id_namespace, post_ids[i], True)
+                else:
+                    cache.confirm(id_namespace, post_ids[i], False)
+
+    results = []
+    for content_hash, post_id, verdict in zip(hashes, post_ids, verdicts):
+        if verdict or content_hash in known_hashes or post_id in known_ids:
+            results.append(False)
+            continue
+        known_hashes.add(content_hash)
+        known_ids.add(post_id)
+        results.append(True)
+    return results
+
+
+def save_synced_posts_many(posts, db_path=None, conn=None) -> int:
+    """
+    Batch variant of save_synced_post() that writes all posts in one transaction.
+
+    Args:
+        posts: Iterable of dicts with save_synced_post() keyword names
+               (twitter_id, bluesky_uri, source, synced_to, content, user_id)
+        db_path: Path to database file (defaults to DB_PATH)
+        conn: Connection with an open transaction to write in. The caller
+              commits; the dedup cache picks the rows up once committed.
+
+    Returns:
+        Number of rows inserted. Posts whose content hash is already
+        recorded are skipped instead of aborting the batch.
+    """
+    rows = [
+        (
+            post.get("twitter_id"),
+            post.get("bluesky_uri"),
+            post.get("source"),
+            compute_content_hash(post.get("content")),
+            post.get("synced_to"),
+            post.get("content"),
+            post.get("user_id"),
+        )
+        for post in posts
+    ]
+    if not rows:
+        return 0
+
+    insert_sql = """
+    INSERT OR IGNORE INTO synced_posts
+    (twitter_id, bluesky_uri, source, content_hash, synced_to, original_text, user_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
+    if conn is not None:
+        before = conn.total_changes
+        conn.executemany(insert_sql, rows)
+        return conn.total_changes - before
+
+    resolved_path = db_path or DB_PATH
+    conn = get_connection(resolved_path)
+    try:
+        before = conn.total_changes
+        with conn:
+            conn.executemany(insert_sql, rows)
+        inserted = conn.total_changes - before
+    finally:
+        conn.close()
+
+    cache = get_dedup_cache(resolved_path)
+    if cache is not None:
+        keys = []
+        for twitter_id, bluesky_uri, _, content_hash, _, _, _ in rows:
+            keys.extend([
+                (CONTENT_HASH, content_hash),
+                (TWITTER_ID, twitter_id),
+                (BLUESKY_URI, bluesky_uri),
+            ])
+        cache.add(keys)
+    return inserted
+
+
+def warm_dedup_cache(db_path=None):
+    """
+    Load the dedup front cache for a database at startup.
+
+    Args:
+        db_path: Path to database file (defaults to DB_PATH)
+
+    Returns:
+        Cache metrics (including warm-up time), or None if caching is disabled
+    """
+    cache = get_dedup_cache(db_path or DB_PATH)
+    if cache is None:
+        return None
+    cache.warm()
+    return cache.get_stats()
+
+
+def get_sync_cursor(account: str, platform: str, db_path=None):
+    """
+    Get the high-water mark of an account's timeline.
+
+    Args:
+        account: Twitter username or Bluesky handle
+        platform: 'twitter' or 'bluesky'
+        db_path: Path to database file (defaults to DB_PATH)
+
+    Returns:
+        Dict with last_id and last_timestamp, or None if the account has
+        not been fetched yet
+    """
+    resolved_path = db_path or DB_PATH
+    conn = get_connection(resolved_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT last_id, last_timestamp FROM sync_cursors WHERE account = ? AND platform = ?",
+            (account, platform),
+        )
+        row = cursor.fetchone()
+    finally:
+        conn.close()
+
+    if row is None:
+        return None
+    return {"last_id": row[0], "last_timestamp": row[1]}
+
+
+def save_sync_cursor(account: str, platform: str, last_id=None,
+                     last_timestamp=None, db_path=None):
+    """
+    Store the high-water mark of an account's timeline.
+
+    Args:
+        account: Twitter username or Bluesky handle
+        platform: 'twitter' or 'bluesky'
+        last_id: Newest tweet ID, or newest Bluesky post URI
+        last_timestamp: Bluesky indexedAt of the newest post
+        db_path: Path to database file (defaults to DB_PATH)
+    """
+    resolved_path = db_path or DB_PATH
+    conn = get_connection(resolved_path)
+    try:
+        with conn:
+            conn.execute("""
+            INSERT INTO sync_cursors (account, platform, last_id, last_timestamp)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(account, platform) DO UPDATE SET
+                last_id = excluded.last_id,
+                last_timestamp = excluded.last_timestamp,
+                updated_at = CURRENT_TIMESTAMP
+            """, (account, platform, str(last_id) if last_id is not None else None,
+                  last_timestamp))
+    finally:
+        conn.close()
@@ -0,0 +1,288 @@
+"""
+SQLite connection pool shared by every database-backed component.
+
+Connections are pooled per thread and per database file. Each connection is
+opened once with WAL journaling, ``synchronous=NORMAL``, a busy timeout,
+tuned page-cache/mmap sizes and a statement cache. Calling ``close()`` on a
+pooled connection rolls back any open transaction and returns it to the
+calling thread's idle list instead of closing the underlying handle, so the
+existing ``conn = ...; ...; conn.close()`` call sites work unchanged.
+
+Usage:
+    from app.core.db_pool import get_connection
+
+    conn = get_connection(db_path, row_factory=sqlite3.Row)
+    try:
+        conn.execute(...)
+        conn.commit()
+    finally:
+        conn.close()  # returned to the pool
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from app.core.config import (
+    DB_BUSY_TIMEOUT_MS,
+    DB_CACHE_SIZE_KB,
+    DB_MMAP_SIZE,
+    DB_POOL_MAX_IDLE,
+    DB_STATEMENT_CACHE_SIZE,
+)
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_generation = 0
+_stats = {
+    "checkouts": 0,
+    "hits": 0,
+    "misses": 0,
+    "opened": 0,
+    "closed": 0,
+    "stale_discarded": 0,
+    "writes": 0,
+    "rows_written": 0,
+    "total_wait_ms": 0.0,
+    "max_wait_ms": 0.0,
+}
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection whose close() hands the connection back to the pool."""
+
+    _pool_key: str = ""
+    _file_id: Optional[tuple] = None
+    _generation: int = 0
+    _in_pool: bool = False
+    _foreign_keys: bool = False
+    _changes_at_checkout: int = 0
+
+    def close(self):
+        """Return this connection to the pool (idempotent)."""
+        _release(self)
+
+    def _discard(self):
+        """Really close the underlying SQLite handle."""
+        try:
+            super().close()
+        except sqlite3.Error:
+            pass
+        _bump("closed")
+
+
+def _is_memory(db_path: str) -> bool:
+    return db_path in ("", ":memory:") or str(db_path).startswith("file:")
+
+
+def _file_identity(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def _idle_for(key: str) -> list:
+    pools: Dict[str, list] = getattr(_local, "idle", None)
+    if pools is None:
+        pools = _local.idle = {}
+    return pools.setdefault(key, [])
+
+
+def _bump(counter: str, amount=1):
+    with _stats_lock:
+        _stats[counter] += amount
+
+
+def _open(key: str) -> PooledConnection:
+    """Open and configure a new pooled connection."""
+    conn = sqlite3.connect(
+        key,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        cached_statements=DB_STATEMENT_CACHE_SIZE,
+        factory=PooledConnection,
+    )
+    try:
+        conn.execute(f"PRAGMA busy_timeout = {int(DB_BUSY_TIMEOUT_MS)}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = {-int(DB_CACHE_SIZE_KB)}")
+        conn.execute(f"PRAGMA mmap_size = {int(DB_MMAP_SIZE)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+    except sqlite3.DatabaseError as e:
+        # Read-only media or a locked database can refuse WAL; the connection
+        # is still usable with the default journal.
+        logger.debug(f"Could not apply pragmas to {key}: {e}")
+
+    conn._pool_key = key
+    conn._file_id = _file_identity(key)
+    conn._generation = _generation
+    _bump("opened")
+    return conn
+
+
+def _is_reusable(conn: PooledConnection) -> bool:
+    """A pooled connection is stale if the pool was reset or its file was replaced."""
+    return (
+        conn._generation == _generation
+        and conn._file_id is not None
+        and conn._file_id == _file_identity(conn._pool_key)
+    )
+
+
+def _set_foreign_keys(conn: PooledConnection, enabled: bool):
+    if conn._foreign_keys != enabled:
+        conn.execute(f"PRAGMA foreign_keys = {'ON' if enabled else 'OFF'}")
+        conn._foreign_keys = enabled
+
+
+def get_connection(
+    db_path: str, row_factory=None, foreign_keys: bool = False
+) -> sqlite3.Connection:
+    """
+    Check out a connection to db_path from the calling thread's pool.
+
+    Args:
+        db_path: Path to SQLite database
+        row_factory: Row factory for this checkout (e.g. sqlite3.Row)
+        foreign_keys: Enforce foreign key constraints for this checkout
+
+    Returns:
+        sqlite3.Connection; call close() to return it to the pool
+    """
+    if _is_memory(db_path):
+        # Every in-memory connection is its own database, so never share one
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = row_factory
+        if foreign_keys:
+            conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    start = time.perf_counter()
+    key = os.path.abspath(db_path)
+    idle = _idle_for(key)
+
+    conn = None
+    while idle:
+        candidate = idle.pop()
+        if _is_reusable(candidate):
+            conn = candidate
+            break
+        _bump("stale_discarded")
+        candidate._discard()
+
+    hit = conn is not None
+    if conn is None:
+        conn = _open(key)
+
+    conn._in_pool = False
+    conn._changes_at_checkout = conn.total_changes
+    conn.row_factory = row_factory
+    _set_foreign_keys(conn, foreign_keys)
+
+    wait_ms = (time.perf_counter() - start) * 1000
+    with _stats_lock:
+        _stats["checkouts"] += 1
+        _stats["hits" if hit else "misses"] += 1
+        _stats["total_wait_ms"] += wait_ms
+        _stats["max_wait_ms"] = max(_stats["max_wait_ms"], wait_ms)
+
+    return conn
+
+
+def _release(conn: PooledConnection):
+    """Roll back leftovers and park the connection on its thread's idle list."""
+    if conn._in_pool:
+        return
+    conn._in_pool = True
+
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        else:
+            # Rows changed by this checkout, once committed
+            changed = conn.total_changes - conn._changes_at_checkout
+            if changed:
+                with _stats_lock:
+                    _stats["writes"] += 1
+                    _stats["rows_written"] += changed
+        conn.row_factory = None
+    except sqlite3.Error as e:
+        logger.debug(f"Discarding broken pooled connection: {e}")
+        conn._discard()
+        return
+
+    idle = _idle_for(conn._pool_key)
+    if conn._generation != _generation or len(idle) >= DB_POOL_MAX_IDLE:
+        conn._discard()
+        return
+    idle.append(conn)
+
+
+def close_all():
+    """
+    Close the calling thread's idle connections and invalidate all others.
+
+    Connections parked in other threads are closed the next time those
+    threads touch the pool.
+    """
+    global _generation
+    with _stats_lock:
+        _generation += 1
+
+    pools = getattr(_local, "idle", None) or {}
+    for idle in pools.values():
+        while idle:
+            idle.pop()._discard()
+
+
+def checkpoint(db_path: str, mode: str = "TRUNCATE"):
+    """
+    Fold the WAL file back into the main database file.
+
+    Call before copying the database file (e.g. backups) so the copy
+    contains every committed transaction.
+
+    Args:
+        db_path: Path to SQLite database
+        mode: wal_checkpoint mode ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+    """
+    conn = get_connection(db_path)
+    try:
+        conn.execute(f"PRAGMA wal_checkpoint({mode})")
+    finally:
+        conn.close()
+
+
+def get_pool_stats() -> dict:
+    """
+    Get connection pool metrics.
+
+    Returns:
+        Dictionary with checkout counts, hit rate, wait times,
+        opened/closed connection totals and committed writes (checkouts
+        that changed rows, and the rows they changed)
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+
+    checkouts = stats["checkouts"]
+    stats["hit_rate"] = round(stats["hits"] / checkouts, 4) if checkouts else 0.0
+    stats["avg_wait_ms"] = (
+        round(stats["total_wait_ms"] / checkouts, 4) if checkouts else 0.0
+    )
+    stats["open_connections"] = stats["opened"] - stats["closed"]
+    return stats
+
+
+def reset_pool_stats():
+    """Reset all pool counters to zero."""
+    with _stats_lock:
+        for counter in _stats:
+            _stats[counter] = 0.0 if counter.endswith("_ms") else 0
@@ -0,0 +1,408 @@
+"""
+In-memory dedup front cache for synced_posts and seen_tweets lookups.
+
+Each database file gets a Bloom filter of every known content hash,
+Twitter ID, Bluesky URI and seen tweet ID, plus a bounded LRU of keys
+recently confirmed present. Lookups the Bloom filter rules out are
+definite misses and skip the database; LRU hits are definite duplicates.
+Everything else falls through to SQLite as before.
+
+The cache is warmed from the database on first use and updated by the
+db_handler write helpers. Writes made by other connections or processes
+are detected by stat-ing the database and its WAL file: new rows are
+pulled in incrementally by rowid and the LRU is flushed, since rows may
+also have been deleted.
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core.config import (
+    DEDUP_BLOOM_CAPACITY,
+    DEDUP_BLOOM_ERROR_RATE,
+    DEDUP_CACHE_ENABLED,
+    DEDUP_LRU_SIZE,
+)
+from app.core.db_pool import get_connection
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Key namespaces
+CONTENT_HASH = "hash"
+TWITTER_ID = "twitter_id"
+BLUESKY_URI = "bluesky_uri"
+SEEN_TWEET = "seen_tweet"
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys.
+
+    Sized for `capacity` keys at the requested false-positive rate using
+    the standard m = -n*ln(p)/ln(2)^2 and k = m/n*ln(2) formulas.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Initialize BloomFilter.
+
+        Args:
+            capacity: Expected number of keys
+            error_rate: Target false-positive rate (0 < error_rate < 1)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.size_bits / capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.size_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.size_bits
+
+    def add(self, key: str):
+        """Add a key to the filter."""
+        new = False
+        for pos in self._positions(key):
+            byte, bit = divmod(pos, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        for pos in self._positions(key):
+            byte, bit = divmod(pos, 8)
+            if not self._bits[byte] & (1 << bit):
+                return False
+        return True
+
+    def estimated_error_rate(self) -> float:
+        """False-positive rate expected at the current fill level."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.size_bits)) ** self.num_hashes
+
+
+class DedupCache:
+    """
+    Bloom filter + LRU front cache for one database file.
+
+    Lookups return True (definitely present), False (definitely absent)
+    or None (unknown, ask the database).
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        capacity: int = DEDUP_BLOOM_CAPACITY,
+        error_rate: float = DEDUP_BLOOM_ERROR_RATE,
+        lru_size: int = DEDUP_LRU_SIZE,
+    ):
+        """
+        Initialize DedupCache.
+
+        Args:
+            db_path: Path to SQLite database
+            capacity: Initial Bloom filter capacity (doubles when exceeded)
+            error_rate: Target Bloom filter false-positive rate
+            lru_size: Maximum number of recently confirmed keys to keep
+        """
+        self.db_path = db_path
+        self.error_rate = error_rate
+        self.lru_size = lru_size
+        self._lock = threading.RLock()
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._last_rowids = {"synced_posts": 0, "seen_tweets": 0}
+        self._file_id = None
+        self._signature = None
+        self._warmed = False
+        self._stats = {
+            "lookups": 0,
+            "definite_misses": 0,
+            "lru_hits": 0,
+            "db_checks": 0,
+            "false_positives": 0,
+            "refreshes": 0,
+            "lru_flushes": 0,
+            "warmup_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Change detection
+    # ------------------------------------------------------------------
+
+    def _stat_signature(self) -> Tuple:
+        signature = []
+        for path in (self.db_path, self.db_path + "-wal"):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_ino, st.st_size, st.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _reset_locked(self):
+        self._bloom = BloomFilter(self._bloom.capacity, self.error_rate)
+        self._recent.clear()
+        self._last_rowids = {"synced_posts": 0, "seen_tweets": 0}
+
+    def _load_new_rows_locked(self):
+        """Pull rows added since the last load into the Bloom filter."""
+        conn = get_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    """
+                    SELECT rowid, content_hash, twitter_id, bluesky_uri
+                    FROM synced_posts WHERE rowid > ? ORDER BY rowid
+                    """,
+                    (self._last_rowids["synced_posts"],),
+                )
+                for rowid, content_hash, twitter_id, bluesky_uri in cursor:
+                    self._bloom.add(f"{CONTENT_HASH}:{content_hash}")
+                    if twitter_id is not None:
+                        self._bloom.add(f"{TWITTER_ID}:{twitter_id}")
+                    if bluesky_uri is not None:
+                        self._bloom.add(f"{BLUESKY_URI}:{bluesky_uri}")
+                    self._last_rowids["synced_posts"] = rowid
+            except sqlite3.OperationalError as e:
+                # Table not created yet
+                logger.debug(f"Dedup cache skipped synced_posts: {e}")
+
+            try:
+                cursor.execute(
+                    "SELECT rowid, tweet_id FROM seen_tweets WHERE rowid > ? ORDER BY rowid",
+                    (self._last_rowids["seen_tweets"],),
+                )
+                for rowid, tweet_id in cursor:
+                    self._bloom.add(f"{SEEN_TWEET}:{tweet_id}")
+                    self._last_rowids["seen_tweets"] = rowid
+            except sqlite3.OperationalError as e:
+                logger.debug(f"Dedup cache skipped seen_tweets: {e}")
+        finally:
+            conn.close()
+
+        if self._bloom.count > self._bloom.capacity:
+            self._grow_locked()
+
+    def _rows_removed_locked(self) -> bool:
+        """True if a table's highest rowid fell below what was already loaded."""
+        conn = get_connection(self.db_path)
+        try:
+            for table, last in self._last_rowids.items():
+                try:
+                    row = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()
+                except sqlite3.OperationalError:
+                    row = (0,)
+                if row[0] < last:
+                    return True
+            return False
+        finally:
+            conn.close()
+
+    def _grow_locked(self):
+        """Rebuild the Bloom filter at double capacity to hold the error rate."""
+        capacity = self._bloom.capacity * 2
+        logger.info(f"Dedup cache for {self.db_path} growing to {capacity} keys")
+        self._bloom = BloomFilter(capacity, self.error_rate)
+        self._last_rowids = {"synced_posts": 0, "seen_tweets": 0}
+        self._load_new_rows_locked()
+
+    def _sync_locked(self, own_write: bool = False):
+        """
+        Warm on first use and catch up with writes from other connections.
+
+        Args:
+            own_write: The change was a commit by this process, so the LRU
+                       does not need flushing
+        """
+        signature = self._stat_signature()
+        if self._warmed and signature == self._signature:
+            return
+
+        file_id = signature[0][0] if signature[0] else None
+        start = time.perf_counter()
+
+        if not self._warmed or file_id != self._file_id or self._rows_removed_locked():
+            # First use, or the database file was replaced or truncated
+            self._reset_locked()
+            self._load_new_rows_locked()
+            self._stats["warmup_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            self._warmed = True
+        else:
+            self._load_new_rows_locked()
+            if not own_write:
+                # Another connection wrote: rows may also have been deleted
+                if self._recent:
+                    self._recent.clear()
+                    self._stats["lru_flushes"] += 1
+                self._stats["refreshes"] += 1
+
+        self._file_id = file_id
+        self._signature = self._stat_signature()
+
+    def warm(self):
+        """Load every known key from the database (idempotent)."""
+        with self._lock:
+            self._sync_locked()
+
+    # ------------------------------------------------------------------
+    # Lookups and updates
+    # ------------------------------------------------------------------
+
+    def lookup(self, keys: Iterable[Tuple[str, str]]) -> Optional[bool]:
+        """
+        Check keys against the cache.
+
+        Args:
+            keys: (namespace, key) pairs; a post is a duplicate if any is known
+
+        Returns:
+            True if any key is definitely present, False if all are
+            definitely absent, None if the database must be asked
+        """
+        with self._lock:
+            self._sync_locked()
+            self._stats["lookups"] += 1
+
+            maybe = False
+            for namespace, key in keys:
+                entry = f"{namespace}:{key}"
+                if entry in self._recent:
+                    self._recent.move_to_end(entry)
+                    self._stats["lru_hits"] += 1
+                    return True
+                if entry in self._bloom:
+                    maybe = True
+
+            if not maybe:
+                self._stats["definite_misses"] += 1
+                return False
+
+            self._stats["db_checks"] += 1
+            return None
+
+    def confirm(self, namespace: str, key, present: bool):
+        """
+        Record the database's answer for a key the Bloom filter could not rule out.
+
+        Args:
+            namespace: Key namespace
+            key: Key value
+            present: Whether the database had the key
+        """
+        with self._lock:
+            if present:
+                self._remember_locked(f"{namespace}:{key}")
+            else:
+                self._stats["false_positives"] += 1
+
+    def add(self, keys: Iterable[Tuple[str, str]]):
+        """
+        Record keys just committed to the database by this process.
+
+        Args:
+            keys: (namespace, key) pairs
+        """
+        with self._lock:
+            self._sync_locked(own_write=True)
+            for namespace, key in keys:
+                if key is None:
+                    continue
+                entry = f"{namespace}:{key}"
+                self._bloom.add(entry)
+                self._remember_locked(entry)
+
+    def _remember_locked(self, entry: str):
+        self._recent[entry] = None
+        self._recent.move_to_end(entry)
+        while len(self._recent) > self.lru_size:
+            self._recent.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dictionary with lookup outcomes, filter sizing and warm-up time
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["lookups"]
+            stats.update(
+                {
+                    "keys": self._bloom.count,
+                    "capacity": self._bloom.capacity,
+                    "size_bytes": len(self._bloom._bits),
+                    "num_hashes": self._bloom.num_hashes,
+                    "target_error_rate": self.error_rate,
+                    "estimated_error_rate": round(self._bloom.estimated_error_rate(), 6),
+                    "lru_entries": len(self._recent),
+                    "lru_size": self.lru_size,
+                    "db_skip_rate": round(
+                        (stats["definite_misses"] + stats["lru_hits"]) / lookups, 4
+                    ) if lookups else 0.0,
+                }
+            )
+            return stats
+
+
+_caches: Dict[str, DedupCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_dedup_cache(db_path: str) -> Optional[DedupCache]:
+    """
+    Get the process-wide dedup cache for a database file.
+
+    Args:
+        db_path: Path to SQLite database
+
+    Returns:
+        DedupCache, or None when caching is disabled or db_path is in-memory
+    """
+    if not DEDUP_CACHE_ENABLED or db_path in ("", ":memory:") or str(db_path).startswith("file:"):
+        return None
+
+    key = os.path.abspath(db_path)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = DedupCache(key)
+        return cache
+
+
+def get_dedup_stats() -> Dict[str, dict]:
+    """
+    Get metrics for every dedup cache in this process.
+
+    Returns:
+        Dictionary mapping database path to cache metrics
+    """
+    with _caches_lock:
+        caches = dict(_caches)
+    return {path: cache.get_stats() for path, cache in caches.items()}
+
+
+def reset_dedup_caches():
+    """Drop every dedup cache (they are rebuilt lazily)."""
+    with _caches_lock:
+        _caches.clear()
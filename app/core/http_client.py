@@ -0,0 +1,135 @@
+"""
+Application-scoped HTTP client for raw outbound HTTP (media downloads, ...).
+
+Opening an aiohttp.ClientSession per request costs a DNS lookup and a
+TCP+TLS handshake every time, which is most of the wall time of fetching a
+small image. Instead, every event loop gets one shared session whose
+connector keeps connections alive between requests:
+
+- At most HTTP_MAX_CONNECTIONS connections, HTTP_MAX_CONNECTIONS_PER_HOST
+  of them to one host; further requests wait for a free connection
+- Resolved hosts are cached for HTTP_DNS_CACHE_SECONDS
+- Idle connections are kept for HTTP_KEEPALIVE_SECONDS
+- HTTP_TIMEOUT_SECONDS per request (HTTP_CONNECT_TIMEOUT_SECONDS to connect)
+
+Sessions are bound to the loop they were created on; in practice all async
+work runs on the async runtime's loop (see app/core/async_runtime.py), so
+there is one session, closed when the runtime shuts down. Platform SDKs
+(atproto, tweepy, twscrape) keep their own clients.
+
+Usage:
+    from app.core.http_client import get_http_session
+
+    async with get_http_session().get(url) as response:
+        ...
+"""
+
+import asyncio
+import threading
+from typing import Dict, Optional
+
+import aiohttp
+
+from app.core.config import (
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    HTTP_DNS_CACHE_SECONDS,
+    HTTP_KEEPALIVE_SECONDS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP_TIMEOUT_SECONDS,
+)
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+_lock = threading.Lock()
+
+# Trace hook -> counter
+_TRACED = {
+    "on_request_start": "requests",
+    "on_request_exception": "request_errors",
+    "on_connection_create_end": "connections_created",
+    "on_connection_reuseconn": "connections_reused",
+    "on_connection_queued_start": "connection_waits",
+    "on_dns_resolvehost_end": "dns_lookups",
+    "on_dns_cache_hit": "dns_cache_hits",
+}
+_stats = {"sessions_created": 0, **{counter: 0 for counter in _TRACED.values()}}
+
+
+def _count(counter: str):
+    async def on_event(session, trace_config_ctx, params):
+        with _lock:
+            _stats[counter] += 1
+
+    return on_event
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    trace = aiohttp.TraceConfig()
+    for hook, counter in _TRACED.items():
+        getattr(trace, hook).append(_count(counter))
+    return trace
+
+
+def _create_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_MAX_CONNECTIONS,
+        limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+        keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+    )
+    timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=[_trace_config()])
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Shared session of the running event loop, created on first use.
+
+    Must be called from a coroutine. Do not close the session; it is
+    closed with close_http_session() (the async runtime does so on shutdown).
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        session = _sessions.get(loop)
+        if session is None or session.closed:
+            # Forget sessions of loops that are gone
+            for stale in [other for other in _sessions if other.is_closed()]:
+                del _sessions[stale]
+            session = _sessions[loop] = _create_session()
+            _stats["sessions_created"] += 1
+            logger.debug("Created shared HTTP session")
+        return session
+
+
+async def close_http_session():
+    """Close the running loop's shared session (a new one is created on next use)."""
+    with _lock:
+        session: Optional[aiohttp.ClientSession] = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def get_http_stats() -> dict:
+    """
+    Get connection pool metrics of all shared sessions.
+
+    Returns:
+        Dictionary with request and connection counters, the share of
+        requests that reused a kept-alive connection, and the open sessions
+    """
+    with _lock:
+        stats = dict(_stats)
+        stats["open_sessions"] = sum(1 for session in _sessions.values() if not session.closed)
+    acquired = stats["connections_created"] + stats["connections_reused"]
+    stats["reuse_rate"] = round(stats["connections_reused"] / acquired, 3) if acquired else 0.0
+    return stats
+
+
+def reset_http_stats():
+    """Zero the counters (e.g. between benchmark runs)."""
+    with _lock:
+        for counter in _stats:
+            _stats[counter] = 0
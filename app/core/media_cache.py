@@ -0,0 +1,302 @@
+"""
+Content-addressed, disk-backed cache of downloaded media and upload refs.
+
+Media bytes are stored once per SHA-256 digest under MEDIA_CACHE_DIR, with
+an index from source URL to digest, so a retried sync, a thread repeating
+an image or several users mirroring the same post download it only once.
+Files are evicted least recently used first once they take more than
+MEDIA_CACHE_MAX_BYTES.
+
+Uploads are memoized per (digest, platform, account): the Bluesky blob ref
+or Twitter media ID an upload returned is reused until it expires, so the
+same bytes are uploaded once per account. Blob refs belong to one repo and
+media IDs to one account, hence the account in the key.
+
+The index is a SQLite database next to the files.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+from app.core.config import MEDIA_CACHE_DIR, MEDIA_CACHE_MAX_BYTES
+from app.core.db_pool import get_connection
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# An upload ref this close to its expiry is not handed out anymore
+EXPIRY_MARGIN_SECONDS = 300
+
+
+def media_digest(data) -> str:
+    """SHA-256 hex digest of media bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class MediaCache:
+    """
+    Media files by digest, plus URL and upload ref indexes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = MEDIA_CACHE_DIR,
+        max_bytes: int = MEDIA_CACHE_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize MediaCache.
+
+        Args:
+            cache_dir: Directory of the media files and index database
+            max_bytes: Most bytes of media kept on disk
+            clock: Returns the current Unix time (for tests)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.db_path = os.path.join(cache_dir, "index.db")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._stats = {
+            "hits": 0, "misses": 0, "upload_hits": 0, "upload_misses": 0, "evictions": 0,
+        }
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get index database connection, creating the cache on first use"""
+        if not self._initialized:
+            self.init_db()
+        return get_connection(self.db_path)
+
+    def init_db(self):
+        """Create the cache directory and index tables"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        conn = get_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS media_files (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+            ''')
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_media_files_lru ON media_files(last_used_at)"
+            )
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS media_urls (
+                    url TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS media_uploads (
+                    digest TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    account TEXT NOT NULL,
+                    ref TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (digest, platform, account)
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, digest[:2], digest)
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def lookup_url(self, url: str) -> Optional[str]:
+        """
+        Path of the cached file downloaded from url, or None.
+
+        Args:
+            url: Source URL the media was downloaded from
+
+        Returns:
+            Path of the media file, or None if the URL was not cached (or evicted)
+        """
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT f.digest FROM media_urls u JOIN media_files f ON f.digest = u.digest "
+                "WHERE u.url = ?",
+                (url,),
+            ).fetchone()
+            path = None
+            if row:
+                if os.path.exists(self._path(row[0])):
+                    path = self._path(row[0])
+                    conn.execute(
+                        "UPDATE media_files SET last_used_at = ? WHERE digest = ?",
+                        (self._clock(), row[0]),
+                    )
+                else:
+                    # Removed behind our back; forget it
+                    conn.execute("DELETE FROM media_files WHERE digest = ?", (row[0],))
+                conn.commit()
+        finally:
+            conn.close()
+        self._count("hits" if path is not None else "misses")
+        return path
+
+    def get_url(self, url: str) -> Optional[bytes]:
+        """Cached bytes downloaded from url, or None."""
+        path = self.lookup_url(url)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, data, url: Optional[str] = None) -> str:
+        """
+        Store media bytes (once per digest) and map url to them.
+
+        Args:
+            data: Media bytes (or a bytes-like view of them)
+            url: Source URL the bytes were downloaded from
+
+        Returns:
+            SHA-256 digest of the bytes
+        """
+        digest = media_digest(data)
+        if len(data) > self.max_bytes:
+            return digest
+
+        conn = self._get_connection()
+        try:
+            path = self._path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write under a unique name first, so readers never see a partial file
+                partial = f"{path}.{uuid.uuid4().hex}.part"
+                with open(partial, "wb") as f:
+                    f.write(data)
+                os.replace(partial, path)
+            now = self._clock()
+            conn.execute(
+                "INSERT INTO media_files (digest, size, created_at, last_used_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(digest) DO UPDATE SET last_used_at = excluded.last_used_at",
+                (digest, len(data), now, now),
+            )
+            if url:
+                conn.execute(
+                    "INSERT OR REPLACE INTO media_urls (url, digest) VALUES (?, ?)", (url, digest)
+                )
+            self._evict(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        return digest
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used files until the cache fits max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM media_files").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute(
+            "SELECT digest, size FROM media_files ORDER BY last_used_at"
+        ).fetchall()
+        for digest, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM media_files WHERE digest = ?", (digest,))
+            conn.execute("DELETE FROM media_urls WHERE digest = ?", (digest,))
+            try:
+                os.remove(self._path(digest))
+            except FileNotFoundError:
+                pass
+            total -= size
+            self._count("evictions")
+
+    def get_upload(self, digest: str, platform: str, account: str):
+        """
+        Unexpired ref of an earlier upload of these bytes by this account.
+
+        Args:
+            digest: SHA-256 digest of the media bytes
+            platform: 'bluesky' or 'twitter'
+            account: Account the upload was made with
+
+        Returns:
+            The stored ref (blob ref dict or media ID string), or None
+        """
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT ref FROM media_uploads WHERE digest = ? AND platform = ? AND account = ? "
+                "AND expires_at > ?",
+                (digest, platform, account, self._clock() + EXPIRY_MARGIN_SECONDS),
+            ).fetchone()
+        finally:
+            conn.close()
+        self._count("upload_hits" if row else "upload_misses")
+        return json.loads(row[0]) if row else None
+
+    def save_upload(self, digest: str, platform: str, account: str, ref, ttl_seconds: float):
+        """
+        Remember the ref an upload returned.
+
+        Args:
+            digest: SHA-256 digest of the uploaded bytes
+            platform: 'bluesky' or 'twitter'
+            account: Account the upload was made with
+            ref: JSON-serializable blob ref or media ID
+            ttl_seconds: How long the platform keeps the ref usable
+        """
+        conn = self._get_connection()
+        try:
+            now = self._clock()
+            conn.execute(
+                "INSERT OR REPLACE INTO media_uploads (digest, platform, account, ref, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (digest, platform, account, json.dumps(ref), now + ttl_seconds),
+            )
+            conn.execute("DELETE FROM media_uploads WHERE expires_at <= ?", (now,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters plus the files and bytes on disk"""
+        conn = self._get_connection()
+        try:
+            files, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM media_files"
+            ).fetchone()
+            uploads = conn.execute("SELECT COUNT(*) FROM media_uploads").fetchone()[0]
+        finally:
+            conn.close()
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update(files=files, bytes=size, uploads=uploads)
+        return stats
+
+
+_cache: Optional[MediaCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_media_cache() -> MediaCache:
+    """Get the process-wide media cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MediaCache()
+        return _cache
@@ -0,0 +1,118 @@
+"""
+In-memory cache of partially fetched thread graphs.
+
+Threads are expanded again every time one of their tweets is synced, and
+a growing thread is synced once per new reply. Each conversation's known
+tweets (by ID) are kept in a bounded LRU, so the next expansion only
+searches for replies newer than the newest known one and needs no detail
+lookups for tweets it has already seen.
+
+Entries expire after THREAD_CACHE_TTL_SECONDS; an edited or deleted tweet
+is therefore picked up again at the latest then.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from app.core.config import THREAD_CACHE_SIZE, THREAD_CACHE_TTL_SECONDS
+
+
+@dataclass
+class ThreadGraph:
+    """Known tweets of one conversation by one author"""
+
+    conversation_id: int
+    tweets: Dict[int, object] = field(default_factory=dict)  # tweet ID -> twscrape tweet
+    cached_at: float = 0.0
+
+    @property
+    def newest_id(self) -> Optional[int]:
+        return max(self.tweets) if self.tweets else None
+
+
+class ThreadCache:
+    """
+    Bounded LRU of ThreadGraphs keyed by (author, conversation ID).
+    """
+
+    def __init__(self, max_size: int = THREAD_CACHE_SIZE, ttl_seconds: float = THREAD_CACHE_TTL_SECONDS):
+        """
+        Initialize ThreadCache.
+
+        Args:
+            max_size: Most conversations kept
+            ttl_seconds: How long a conversation stays cached
+        """
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._graphs: "OrderedDict[tuple, ThreadGraph]" = OrderedDict()
+        self._by_tweet: Dict[tuple, int] = {}  # (author, tweet ID) -> conversation ID
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _drop(self, key: tuple):
+        graph = self._graphs.pop(key)
+        for tweet_id in graph.tweets:
+            self._by_tweet.pop((key[0], tweet_id), None)
+
+    def get(self, author: str, conversation_id: int) -> Optional[ThreadGraph]:
+        """Cached graph of a conversation, or None."""
+        key = (author.lower(), conversation_id)
+        with self._lock:
+            graph = self._graphs.get(key)
+            if graph is not None and time.time() - graph.cached_at > self.ttl_seconds:
+                self._drop(key)
+                graph = None
+            if graph is None:
+                self._stats["misses"] += 1
+                return None
+            self._graphs.move_to_end(key)
+            self._stats["hits"] += 1
+            return ThreadGraph(graph.conversation_id, dict(graph.tweets), graph.cached_at)
+
+    def conversation_of(self, author: str, tweet_id: int) -> Optional[int]:
+        """Conversation ID of a cached tweet, or None."""
+        with self._lock:
+            return self._by_tweet.get((author.lower(), tweet_id))
+
+    def put(self, author: str, graph: ThreadGraph):
+        """Store (or replace) a conversation's graph."""
+        key = (author.lower(), graph.conversation_id)
+        with self._lock:
+            if key in self._graphs:
+                self._drop(key)
+            graph.cached_at = time.time()
+            self._graphs[key] = graph
+            for tweet_id in graph.tweets:
+                self._by_tweet[(key[0], tweet_id)] = graph.conversation_id
+            while len(self._graphs) > self.max_size:
+                self._drop(next(iter(self._graphs)))
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._graphs.clear()
+            self._by_tweet.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["conversations"] = len(self._graphs)
+            stats["tweets"] = len(self._by_tweet)
+        return stats
+
+
+_cache: Optional[ThreadCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_thread_cache() -> ThreadCache:
+    """Get the process-wide thread cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ThreadCache()
+        return _cache
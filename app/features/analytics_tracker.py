@@ -5,10 +5,10 @@ Tracks and analyzes Twitter/Bluesky engagement metrics with time-series storage.
 Provides comprehensive analytics including top tweets, engagement rates, and period-based snapshots.
 """
 
-import sqlite3
 import time
 from typing import Optional, List
 from datetime import datetime
+from app.core.db_pool import get_connection
 
 
 class AnalyticsTracker:
@@ -30,7 +30,7 @@ class AnalyticsTracker:
 
     def init_db(self):
         """Initialize database tables and indexes"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         # Create tweet_metrics table
@@ -145,7 +145,7 @@ class AnalyticsTracker:
 
             timestamp = int(time.time())
 
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             # Check if tweet already has metrics for this user
@@ -218,7 +218,7 @@ class AnalyticsTracker:
             Dictionary with metrics or None if not found
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute(
@@ -267,7 +267,7 @@ class AnalyticsTracker:
             Dictionary with aggregated analytics
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             # Calculate time range based on period
@@ -382,7 +382,7 @@ class AnalyticsTracker:
             top_tweets = self.get_top_tweets(user_id, metric="engagement_rate", limit=1)
             top_tweet_id = top_tweets[0]["tweet_id"] if top_tweets else None
 
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             # Insert or update snapshot
@@ -429,7 +429,7 @@ class AnalyticsTracker:
             List of tweet dictionaries sorted by metric
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             # Validate metric against whitelist (prevents SQL injection)
@@ -501,7 +501,7 @@ class AnalyticsTracker:
             List of snapshot dictionaries with id, user_id, period, data, created_at
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             # Build query
@@ -0,0 +1,488 @@
+"""
+Twitter Archive Importer
+
+Bulk-imports the tweets of an official Twitter archive (the zip from
+"Download an archive of your data") so new users start with their history
+in synced_posts, the search index and tweet_metrics instead of scraping it
+through the rate-limited API.
+
+The archive's data/tweets.js (data/tweet.js in older archives, split into
+tweets-partN.js for large accounts) is a JavaScript assignment wrapping one
+huge JSON array. It is read straight from the zip and decoded one array
+element at a time, so memory stays flat however large the archive is.
+
+Tweets are written in batches of ARCHIVE_IMPORT_BATCH_SIZE, one transaction
+each, together with the import's progress row. An interrupted import resumes
+after the last committed batch; importing the same archive again only adds
+what is missing.
+"""
+
+import codecs
+import html
+import json
+import os
+import re
+import sqlite3
+import time
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from app.core.config import ARCHIVE_IMPORT_BATCH_SIZE, ARCHIVE_IMPORT_CHUNK_BYTES
+from app.core.db_handler import migrate_database
+from app.core.db_pool import get_connection
+from app.core.dedup_cache import CONTENT_HASH, TWITTER_ID, get_dedup_cache
+from app.core.logger import setup_logger
+from app.core.utils import compute_content_hash
+from app.features.analytics_tracker import AnalyticsTracker
+
+logger = setup_logger(__name__)
+
+# data/tweets.js, data/tweet.js, data/tweets-part1.js, ...
+TWEETS_MEMBER = re.compile(r"(^|/)data/tweets?(-part\d+)?\.js$")
+
+ARCHIVE_DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"  # Wed Oct 10 20:19:24 +0000 2018
+
+
+@dataclass
+class ArchiveTweet:
+    """A tweet of the archive, normalized for import"""
+
+    tweet_id: str
+    text: str
+    created_at: int  # Unix timestamp
+    hashtags: str  # space separated, without '#'
+    likes: int = 0
+    retweets: int = 0
+    in_reply_to: Optional[str] = None
+
+
+@dataclass
+class ImportProgress:
+    """Counters of a running or finished import"""
+
+    processed: int = 0  # archive records read (the resume offset)
+    imported: int = 0
+    skipped: int = 0  # retweets, empty and already known tweets
+    bytes_read: int = 0
+    bytes_total: int = 0
+    resumed_from: int = 0
+    completed: bool = False
+
+    @property
+    def percent(self) -> float:
+        if not self.bytes_total:
+            return 100.0 if self.completed else 0.0
+        return round(100.0 * self.bytes_read / self.bytes_total, 1)
+
+
+def _int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def normalize_tweet(record: dict) -> Optional[ArchiveTweet]:
+    """
+    Normalize one tweets.js record.
+
+    Args:
+        record: Array element, {"tweet": {...}} (or the bare tweet in old archives)
+
+    Returns:
+        ArchiveTweet, or None for retweets and records without ID or text
+    """
+    tweet = record.get("tweet", record) if isinstance(record, dict) else None
+    if not isinstance(tweet, dict):
+        return None
+
+    tweet_id = tweet.get("id_str") or tweet.get("id")
+    text = tweet.get("full_text") or tweet.get("text") or ""
+    if not tweet_id or not text or text.startswith("RT @"):
+        return None
+
+    entities = tweet.get("entities") or {}
+    # The archive stores t.co links and HTML-escaped text
+    for url in entities.get("urls") or ():
+        if url.get("url") and url.get("expanded_url"):
+            text = text.replace(url["url"], url["expanded_url"])
+    text = html.unescape(text)
+
+    try:
+        created_at = int(
+            datetime.strptime(tweet.get("created_at", ""), ARCHIVE_DATE_FORMAT).timestamp()
+        )
+    except ValueError:
+        created_at = 0
+
+    return ArchiveTweet(
+        tweet_id=str(tweet_id),
+        text=text,
+        created_at=created_at,
+        hashtags=" ".join(tag.get("text", "") for tag in entities.get("hashtags") or ()),
+        likes=_int(tweet.get("favorite_count")),
+        retweets=_int(tweet.get("retweet_count")),
+        in_reply_to=tweet.get("in_reply_to_status_id_str"),
+    )
+
+
+def iter_js_array(stream, chunk_size: int = ARCHIVE_IMPORT_CHUNK_BYTES) -> Iterator[Tuple[object, int]]:
+    """
+    Decode the elements of the JSON array in a `window.YTD.x.part0 = [...]` file.
+
+    Args:
+        stream: Binary file object (e.g. a zip member)
+        chunk_size: Bytes read at a time
+
+    Yields:
+        (element, bytes of the stream read so far)
+
+    Raises:
+        ValueError: If the stream holds no array or ends inside it
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos, read, eof = "", 0, 0, False
+
+    def fill():
+        nonlocal buffer, pos, read, eof
+        chunk = stream.read(chunk_size)
+        read += len(chunk)
+        eof = not chunk
+        buffer = buffer[pos:] + utf8.decode(chunk, final=eof)
+        pos = 0
+
+    # Skip the JavaScript assignment in front of the array
+    while True:
+        start = buffer.find("[", pos)
+        if start >= 0:
+            pos = start + 1
+            break
+        if eof:
+            raise ValueError("No JSON array in archive file")
+        pos = len(buffer)
+        fill()
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Archive file ends inside its JSON array")
+            fill()
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            element, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # The element continues in the next chunk
+            if eof:
+                raise
+            fill()
+            continue
+        yield element, read
+
+
+def search_index_mode(cursor) -> Optional[str]:
+    """How imported posts reach tweet_search_index: 'trigger', 'direct' or None (no index)."""
+    names = {
+        row[0] for row in cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name IN "
+            "('sync_search_index_insert', 'tweet_search_index')"
+        )
+    }
+    if "sync_search_index_insert" in names:
+        return "trigger"
+    if "tweet_search_index" in names:
+        return "direct"
+    return None
+
+
+def has_search_columns(cursor) -> bool:
+    """True if synced_posts carries the fields the search triggers index."""
+    cursor.execute("PRAGMA table_info(synced_posts)")
+    return {"hashtags", "twitter_username", "posted_at"} <= {row[1] for row in cursor.fetchall()}
+
+
+class ArchiveImporter:
+    """
+    Streams a Twitter archive into synced_posts, tweet_search_index and tweet_metrics.
+    """
+
+    def __init__(self, db_path: str = "chirpsyncer.db", batch_size: int = ARCHIVE_IMPORT_BATCH_SIZE):
+        """
+        Initialize ArchiveImporter.
+
+        Args:
+            db_path: Path to SQLite database
+            batch_size: Tweets committed per transaction
+        """
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+
+    def init_db(self):
+        """Create the tables written by the import, and its progress table."""
+        migrate_database(self.db_path)
+        AnalyticsTracker(self.db_path).init_db()
+
+        conn = get_connection(self.db_path)
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS archive_imports (
+                    user_id INTEGER NOT NULL,
+                    archive_key TEXT NOT NULL,
+                    processed INTEGER NOT NULL DEFAULT 0,
+                    imported INTEGER NOT NULL DEFAULT 0,
+                    skipped INTEGER NOT NULL DEFAULT 0,
+                    started_at INTEGER NOT NULL,
+                    updated_at INTEGER NOT NULL,
+                    completed_at INTEGER,
+                    PRIMARY KEY (user_id, archive_key)
+                )
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def archive_key(path: str) -> str:
+        """Identity of an archive file for resuming (name and size)."""
+        return f"{os.path.basename(path)}:{os.path.getsize(path)}"
+
+    def get_progress(self, path: str, user_id: Optional[int] = None) -> Optional[ImportProgress]:
+        """Stored progress of an archive's import, or None if never started."""
+        conn = get_connection(self.db_path)
+        try:
+            row = conn.execute(
+                "SELECT processed, imported, skipped, completed_at FROM archive_imports "
+                "WHERE user_id = ? AND archive_key = ?",
+                (user_id or 0, self.archive_key(path)),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return ImportProgress(
+            processed=row[0], imported=row[1], skipped=row[2], completed=row[3] is not None
+        )
+
+    def import_archive(
+        self,
+        path: str,
+        user_id: Optional[int] = None,
+        username: str = "",
+        progress: Callable[[ImportProgress], None] = None,
+        restart: bool = False,
+    ) -> ImportProgress:
+        """
+        Import every tweet of an archive zip.
+
+        Args:
+            path: Path to the archive zip
+            user_id: Owning user (search index and metrics rows need one)
+            username: Twitter username, recorded as the tweets' author
+            progress: Called with the counters after each committed batch
+            restart: Ignore the stored progress and read the archive from the start
+
+        Returns:
+            Final ImportProgress
+
+        Raises:
+            ValueError: If the zip has no tweets file or a tweets file is malformed
+        """
+        key = self.archive_key(path)
+        stored = None if restart else self.get_progress(path, user_id)
+        if stored is not None and stored.completed:
+            logger.info(f"Archive {key} already imported for user {user_id}")
+            return stored
+
+        state = stored or ImportProgress()
+        state.resumed_from = state.processed
+        if state.resumed_from:
+            logger.info(f"Resuming import of {key} after {state.resumed_from} tweets")
+
+        started = time.time()
+        with zipfile.ZipFile(path) as archive:
+            members = sorted(
+                (info for info in archive.infolist() if TWEETS_MEMBER.search(info.filename)),
+                key=lambda info: info.filename,
+            )
+            if not members:
+                raise ValueError(f"No data/tweets.js in archive {path}")
+            state.bytes_total = sum(info.file_size for info in members)
+            self._save_progress(None, user_id, key, state)
+
+            position = 0  # records seen across all members
+            bytes_before = 0
+            batch: List[Optional[ArchiveTweet]] = []
+            for info in members:
+                with archive.open(info) as stream:
+                    for record, read in iter_js_array(stream):
+                        state.bytes_read = bytes_before + read
+                        position += 1
+                        if position <= state.resumed_from:
+                            continue
+                        batch.append(normalize_tweet(record))
+                        if len(batch) >= self.batch_size:
+                            self._write_batch(batch, user_id, username, key, state)
+                            batch = []
+                            if progress:
+                                progress(state)
+                bytes_before += info.file_size
+
+            state.bytes_read = state.bytes_total
+            state.completed = True
+            self._write_batch(batch, user_id, username, key, state)
+            if progress:
+                progress(state)
+
+        logger.info(
+            f"Imported archive {key} for user {user_id}: {state.imported} tweets imported, "
+            f"{state.skipped} skipped in {time.time() - started:.1f}s"
+        )
+        return state
+
+    def _write_batch(self, batch, user_id, username, key, state: ImportProgress):
+        """Insert one batch and advance the stored progress, in one transaction."""
+        tweets = [tweet for tweet in batch if tweet is not None]
+        state.processed += len(batch)
+        state.skipped += len(batch) - len(tweets)
+
+        conn = get_connection(self.db_path)
+        new = []
+        try:
+            cursor = conn.cursor()
+            if tweets:
+                new = self._new_tweets(cursor, tweets)
+                state.skipped += len(tweets) - len(new)
+            if new:
+                self._insert(cursor, new, user_id, username)
+                state.imported += len(new)
+            self._save_progress(cursor, user_id, key, state)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        cache = get_dedup_cache(self.db_path)
+        if cache is not None and new:
+            cache.add(
+                [(TWITTER_ID, tweet.tweet_id) for tweet, _ in new]
+                + [(CONTENT_HASH, content_hash) for _, content_hash in new]
+            )
+
+    def _new_tweets(self, cursor, tweets: List[ArchiveTweet]) -> List[Tuple[ArchiveTweet, str]]:
+        """Tweets of the batch whose ID and content are not in synced_posts yet."""
+        hashed = [(tweet, compute_content_hash(tweet.text)) for tweet in tweets]
+        placeholders = ",".join("?" * len(hashed))
+        known_ids = {
+            row[0] for row in cursor.execute(
+                f"SELECT twitter_id FROM synced_posts WHERE twitter_id IN ({placeholders})",
+                [tweet.tweet_id for tweet, _ in hashed],
+            )
+        }
+        known_hashes = {
+            row[0] for row in cursor.execute(
+                f"SELECT content_hash FROM synced_posts WHERE content_hash IN ({placeholders})",
+                [content_hash for _, content_hash in hashed],
+            )
+        }
+
+        new = []
+        for tweet, content_hash in hashed:
+            if tweet.tweet_id in known_ids or content_hash in known_hashes:
+                continue
+            # Repeated text inside the archive keeps its oldest copy only
+            known_ids.add(tweet.tweet_id)
+            known_hashes.add(content_hash)
+            new.append((tweet, content_hash))
+        return new
+
+    def _insert(self, cursor, new, user_id, username):
+        if has_search_columns(cursor):
+            cursor.executemany(
+                """
+                INSERT INTO synced_posts
+                (twitter_id, source, content_hash, original_text, user_id,
+                 hashtags, twitter_username, posted_at)
+                VALUES (?, 'twitter', ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (tweet.tweet_id, content_hash, tweet.text, user_id,
+                     tweet.hashtags, username, tweet.created_at)
+                    for tweet, content_hash in new
+                ],
+            )
+        else:
+            cursor.executemany(
+                """
+                INSERT INTO synced_posts
+                (twitter_id, source, content_hash, original_text, user_id)
+                VALUES (?, 'twitter', ?, ?, ?)
+                """,
+                [(tweet.tweet_id, content_hash, tweet.text, user_id) for tweet, content_hash in new],
+            )
+
+        if user_id is None:
+            # Search and metrics rows belong to a user
+            return
+
+        if search_index_mode(cursor) == "direct":
+            cursor.executemany(
+                """
+                INSERT INTO tweet_search_index (tweet_id, user_id, content, hashtags, author, posted_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (tweet.tweet_id, user_id, tweet.text, tweet.hashtags, username, tweet.created_at)
+                    for tweet, _ in new
+                ],
+            )
+
+        # Engagement as of the archive's export; impressions are not exported
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO tweet_metrics
+            (tweet_id, user_id, timestamp, likes, retweets, engagements)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (tweet.tweet_id, user_id, tweet.created_at, tweet.likes, tweet.retweets,
+                 tweet.likes + tweet.retweets)
+                for tweet, _ in new
+            ],
+        )
+
+    def _save_progress(self, cursor, user_id, key, state: ImportProgress):
+        now = int(time.time())
+        params = (
+            user_id or 0, key, state.processed, state.imported, state.skipped,
+            now, now, now if state.completed else None,
+        )
+        sql = """
+            INSERT INTO archive_imports
+            (user_id, archive_key, processed, imported, skipped, started_at, updated_at, completed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, archive_key) DO UPDATE SET
+                processed = excluded.processed,
+                imported = excluded.imported,
+                skipped = excluded.skipped,
+                updated_at = excluded.updated_at,
+                completed_at = excluded.completed_at
+        """
+        if cursor is not None:
+            cursor.execute(sql, params)
+            return
+        conn = get_connection(self.db_path)
+        try:
+            conn.execute(sql, params)
+            conn.commit()
+        finally:
+            conn.close()
@@ -0,0 +1,364 @@
+"""
+Bluesky Repository (CAR) Importer
+
+Loads the posts of an exported atproto repository (the .car file from
+"Export my data", or com.atproto.sync.getRepo) into synced_posts with
+source='bluesky' and into the search index, without a single API call.
+
+A CAR file is a header followed by (CID, block) sections. The file is read
+one section at a time: records of type app.bsky.feed.post are decoded as
+they come, and the repository's MST nodes map record CIDs to their keys
+(app.bsky.feed.post/<rkey>), which give the posts' at:// URIs. Only that
+CID-to-key map and records still waiting for their key are kept in memory,
+never the blocks themselves.
+
+Posts are written in batches of ARCHIVE_IMPORT_BATCH_SIZE, one transaction
+each, together with their search index rows. Posts already known by URI or
+content hash are skipped, so importing a newer export of the same
+repository only adds the new posts.
+"""
+
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from atproto_core.cbor import decode_dag
+
+from app.core.config import ARCHIVE_IMPORT_BATCH_SIZE
+from app.core.db_handler import migrate_database
+from app.core.db_pool import get_connection
+from app.core.dedup_cache import BLUESKY_URI, CONTENT_HASH, get_dedup_cache
+from app.core.logger import setup_logger
+from app.core.utils import compute_content_hash
+from app.features.archive_import import ImportProgress, has_search_columns, search_index_mode
+
+logger = setup_logger(__name__)
+
+POST_COLLECTION = "app.bsky.feed.post"
+
+
+@dataclass
+class RepoPost:
+    """A post record of the repository, normalized for import"""
+
+    uri: str
+    text: str
+    created_at: int  # Unix timestamp
+    hashtags: str  # space separated, without '#'
+
+
+def _varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Decode an unsigned LEB128 varint at pos; returns (value, next pos)."""
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint in CAR file")
+        byte = data[pos]
+        value |= (byte & 0x7F) << shift
+        pos += 1
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def _read_varint(stream: BinaryIO) -> Optional[int]:
+    """Read an unsigned varint from the stream, None at end of file."""
+    value = shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            if shift:
+                raise ValueError("Truncated varint in CAR file")
+            return None
+        value |= (byte[0] & 0x7F) << shift
+        if not byte[0] & 0x80:
+            return value
+        shift += 7
+
+
+def _cid_length(section: bytes) -> int:
+    """Length of the binary CID at the start of a CAR section."""
+    if section[:2] == b"\x12\x20":
+        # CIDv0: a bare sha2-256 multihash
+        return 34
+    _, pos = _varint(section, 0)  # version
+    _, pos = _varint(section, pos)  # codec
+    _, pos = _varint(section, pos)  # multihash code
+    size, pos = _varint(section, pos)
+    return pos + size
+
+
+def iter_car_blocks(stream: BinaryIO) -> Iterator[Tuple[bytes, bytes]]:
+    """
+    Stream the blocks of a CARv1 file.
+
+    Args:
+        stream: Binary file object positioned at the start of the CAR
+
+    Yields:
+        (binary CID, block bytes), in file order
+
+    Raises:
+        ValueError: If the stream is not a CARv1 file or ends mid-block
+    """
+    header_size = _read_varint(stream)
+    if not header_size:
+        raise ValueError("Empty CAR file")
+    header = decode_dag(stream.read(header_size))
+    if not isinstance(header, dict) or header.get("version") != 1:
+        raise ValueError("Only CARv1 repository exports are supported")
+
+    while True:
+        size = _read_varint(stream)
+        if size is None:
+            return
+        section = stream.read(size)
+        if len(section) != size:
+            raise ValueError("CAR file ends inside a block")
+        cid_size = _cid_length(section)
+        yield section[:cid_size], section[cid_size:]
+
+
+def _timestamp(value) -> int:
+    try:
+        return int(datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return 0
+
+
+def _hashtags(record: dict) -> str:
+    tags = []
+    for facet in record.get("facets") or ():
+        for feature in facet.get("features") or ():
+            if feature.get("$type") == "app.bsky.richtext.facet#tag" and feature.get("tag"):
+                tags.append(feature["tag"])
+    return " ".join(tags)
+
+
+def iter_repo_posts(stream: BinaryIO, did: str = None) -> Iterator[RepoPost]:
+    """
+    Stream the post records of a repository CAR file.
+
+    Args:
+        stream: Binary file object of the CAR
+        did: Repository DID; read from the commit block if not given
+
+    Yields:
+        RepoPost for each app.bsky.feed.post record whose key is in the MST
+    """
+    keys: Dict[bytes, str] = {}  # record CID -> rkey
+    waiting: Dict[bytes, dict] = {}  # post records whose key is not known yet
+    ready: List[Tuple[str, dict]] = []
+
+    for cid, block in iter_car_blocks(stream):
+        try:
+            node = decode_dag(block)
+        except Exception:
+            # Not DAG-CBOR (e.g. a raw blob); no post lives there
+            continue
+        if not isinstance(node, dict):
+            continue
+
+        if node.get("$type") == POST_COLLECTION:
+            if cid in keys:
+                ready.append((keys.pop(cid), node))
+            else:
+                waiting[cid] = node
+        elif isinstance(node.get("e"), list):
+            # MST node: keys are prefix-compressed against the previous entry
+            key = b""
+            for entry in node["e"]:
+                key = key[:entry.get("p", 0)] + entry.get("k", b"")
+                collection, _, rkey = key.decode("utf-8", "replace").partition("/")
+                if collection != POST_COLLECTION:
+                    continue
+                value = entry.get("v")
+                if value in waiting:
+                    ready.append((rkey, waiting.pop(value)))
+                else:
+                    keys[value] = rkey
+        elif did is None and "did" in node and "data" in node:
+            # Signed commit at the root of the repository
+            did = node["did"]
+
+        for rkey, record in ready:
+            if not did:
+                raise ValueError("Repository DID not found before its records")
+            yield RepoPost(
+                uri=f"at://{did}/{POST_COLLECTION}/{rkey}",
+                text=record.get("text") or "",
+                created_at=_timestamp(record.get("createdAt")),
+                hashtags=_hashtags(record),
+            )
+        ready.clear()
+
+    if waiting:
+        logger.warning(f"{len(waiting)} post records in the CAR file are not in its MST")
+
+
+class CarImporter:
+    """
+    Streams a Bluesky repository CAR file into synced_posts and tweet_search_index.
+    """
+
+    def __init__(self, db_path: str = "chirpsyncer.db", batch_size: int = ARCHIVE_IMPORT_BATCH_SIZE):
+        """
+        Initialize CarImporter.
+
+        Args:
+            db_path: Path to SQLite database
+            batch_size: Posts committed per transaction
+        """
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+
+    def init_db(self):
+        """Create the tables written by the import."""
+        migrate_database(self.db_path)
+
+    def import_car(
+        self,
+        path: str,
+        user_id: Optional[int] = None,
+        username: str = "",
+        did: str = None,
+        progress: Callable[[ImportProgress], None] = None,
+    ) -> ImportProgress:
+        """
+        Import every post of a repository CAR file.
+
+        Args:
+            path: Path to the .car file
+            user_id: Owning user (search index rows need one)
+            username: Bluesky handle, recorded as the posts' author
+            did: Repository DID, if the export has no commit block
+            progress: Called with the counters after each committed batch
+
+        Returns:
+            Final ImportProgress
+
+        Raises:
+            ValueError: If the file is not a CARv1 repository export
+        """
+        state = ImportProgress(bytes_total=os.path.getsize(path))
+        started = time.time()
+
+        with open(path, "rb") as stream:
+            batch: List[RepoPost] = []
+            for post in iter_repo_posts(stream, did=did):
+                batch.append(post)
+                if len(batch) >= self.batch_size:
+                    state.bytes_read = stream.tell()
+                    self._write_batch(batch, user_id, username, state)
+                    batch = []
+                    if progress:
+                        progress(state)
+
+            state.bytes_read = state.bytes_total
+            state.completed = True
+            self._write_batch(batch, user_id, username, state)
+            if progress:
+                progress(state)
+
+        logger.info(
+            f"Imported repository {os.path.basename(path)} for user {user_id}: "
+            f"{state.imported} posts imported, {state.skipped} skipped "
+            f"in {time.time() - started:.1f}s"
+        )
+        return state
+
+    def _write_batch(self, batch: List[RepoPost], user_id, username, state: ImportProgress):
+        """Insert one batch of posts and their search rows, in one transaction."""
+        state.processed += len(batch)
+        posts = [post for post in batch if post.text]
+        state.skipped += len(batch) - len(posts)
+        if not posts:
+            return
+
+        conn = get_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            new = self._new_posts(cursor, posts)
+            state.skipped += len(posts) - len(new)
+            if new:
+                self._insert(cursor, new, user_id, username)
+                state.imported += len(new)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        cache = get_dedup_cache(self.db_path)
+        if cache is not None and new:
+            cache.add(
+                [(BLUESKY_URI, post.uri) for post, _ in new]
+                + [(CONTENT_HASH, content_hash) for _, content_hash in new]
+            )
+
+    def _new_posts(self, cursor, posts: List[RepoPost]) -> List[Tuple[RepoPost, str]]:
+        """Posts of the batch whose URI and content are not in synced_posts yet."""
+        hashed = [(post, compute_content_hash(post.text)) for post in posts]
+        placeholders = ",".join("?" * len(hashed))
+        known_uris = {
+            row[0] for row in cursor.execute(
+                f"SELECT bluesky_uri FROM synced_posts WHERE bluesky_uri IN ({placeholders})",
+                [post.uri for post, _ in hashed],
+            )
+        }
+        known_hashes = {
+            row[0] for row in cursor.execute(
+                f"SELECT content_hash FROM synced_posts WHERE content_hash IN ({placeholders})",
+                [content_hash for _, content_hash in hashed],
+            )
+        }
+
+        new = []
+        for post, content_hash in hashed:
+            if post.uri in known_uris or content_hash in known_hashes:
+                continue
+            known_uris.add(post.uri)
+            known_hashes.add(content_hash)
+            new.append((post, content_hash))
+        return new
+
+    def _insert(self, cursor, new, user_id, username):
+        if has_search_columns(cursor):
+            cursor.executemany(
+                """
+                INSERT INTO synced_posts
+                (bluesky_uri, source, content_hash, original_text, user_id,
+                 hashtags, twitter_username, posted_at)
+                VALUES (?, 'bluesky', ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (post.uri, content_hash, post.text, user_id,
+                     post.hashtags, username, post.created_at)
+                    for post, content_hash in new
+                ],
+            )
+        else:
+            cursor.executemany(
+                """
+                INSERT INTO synced_posts
+                (bluesky_uri, source, content_hash, original_text, user_id)
+                VALUES (?, 'bluesky', ?, ?, ?)
+                """,
+                [(post.uri, content_hash, post.text, user_id) for post, content_hash in new],
+            )
+
+        if user_id is not None and search_index_mode(cursor) == "direct":
+            cursor.executemany(
+                """
+                INSERT INTO tweet_search_index (tweet_id, user_id, content, hashtags, author, posted_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (post.uri, user_id, post.text, post.hashtags, username, post.created_at)
+                    for post, _ in new
+                ],
+            )
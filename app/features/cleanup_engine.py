@@ -15,54 +15,20 @@ import sqlite3
 import json
 import time
 import re
-import asyncio
 import uuid
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
 from collections import defaultdict
 
+from app.core.async_runtime import run_sync
 from app.core.logger import setup_logger
+from app.core.db_pool import get_connection
+from app.integrations.twitter_api_handler import classify_twitter_request
+from app.services.rate_limiter import RateLimitExceeded, get_rate_limiter
 
 logger = setup_logger(__name__)
 
 
-class RateLimiter:
-    """
-    Sliding window rate limiter for Twitter API compliance.
-
-    Twitter API v2 limits:
-    - Read: 900 requests / 15 min
-    - Delete: 50 requests / 15 min
-    """
-
-    def __init__(self, max_requests: int, window_seconds: int = 900):
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self.requests: List[float] = []
-
-    def can_proceed(self) -> bool:
-        """Check if we can make another request."""
-        self._cleanup_old_requests()
-        return len(self.requests) < self.max_requests
-
-    def record_request(self):
-        """Record a request timestamp."""
-        self.requests.append(time.time())
-
-    def wait_time(self) -> float:
-        """Get seconds to wait before next request is allowed."""
-        self._cleanup_old_requests()
-        if len(self.requests) < self.max_requests:
-            return 0
-        oldest = min(self.requests)
-        return max(0, (oldest + self.window_seconds) - time.time())
-
-    def _cleanup_old_requests(self):
-        """Remove requests outside the current window."""
-        cutoff = time.time() - self.window_seconds
-        self.requests = [t for t in self.requests if t > cutoff]
-
-
 @dataclass
 class CleanupRule:
     """Cleanup rule data class"""
@@ -99,12 +65,10 @@ class CleanupEngine:
         """
         self.db_path = db_path
         self.credential_manager = credential_manager
-        self._read_limiter = RateLimiter(max_requests=900, window_seconds=900)
-        self._delete_limiter = RateLimiter(max_requests=50, window_seconds=900)
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -567,16 +531,11 @@ class CleanupEngine:
             logger.warning(f"[{correlation_id}] No scraping credentials for user")
             return []
 
-        # Rate limit check
-        if not self._read_limiter.can_proceed():
-            wait = self._read_limiter.wait_time()
-            logger.info(f"[{correlation_id}] Rate limited, waiting {wait:.1f}s")
-            time.sleep(wait)
-
         try:
+            # Read budget shared with every other worker using this account
+            get_rate_limiter().acquire("twitter", "read", credential=creds.get('username'))
             # Use sync wrapper for async twscrape
             tweets = self._fetch_tweets_sync(creds, correlation_id)
-            self._read_limiter.record_request()
             logger.info(f"[{correlation_id}] Fetched {len(tweets)} tweets")
             return tweets
         except Exception as e:
@@ -585,35 +544,18 @@ class CleanupEngine:
 
     def _fetch_tweets_sync(self, creds: dict, correlation_id: str) -> List[dict]:
         """Sync wrapper for async tweet fetching."""
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        return loop.run_until_complete(self._fetch_tweets_async(creds, correlation_id))
+        return run_sync(self._fetch_tweets_async(creds, correlation_id))
 
     async def _fetch_tweets_async(self, creds: dict, correlation_id: str) -> List[dict]:
         """Fetch tweets using twscrape."""
         try:
-            import twscrape
-
-            api = twscrape.API()
-
-            # Add account from credentials
-            username = creds.get('username', '')
-            password = creds.get('password', '')
-            email = creds.get('email', '')
-            email_password = creds.get('email_password', '')
+            from app.services.scraper_pool import get_scraper_pool
 
-            if username and password:
-                await api.pool.add_account(
-                    username, password, email, email_password
-                )
-                await api.pool.login_all()
+            # Shared API; the account is added and logged in only once
+            api = await get_scraper_pool().get_api(creds)
 
             # Get user's twitter handle from credentials
-            twitter_handle = creds.get('twitter_handle', username)
+            twitter_handle = creds.get('twitter_handle', creds.get('username', ''))
 
             tweets = []
             async for tweet in api.user_tweets(twitter_handle, limit=200):
@@ -669,15 +611,17 @@ class CleanupEngine:
         base_delay = 1.0
 
         for attempt in range(max_retries):
-            if not self._delete_limiter.can_proceed():
-                wait = self._delete_limiter.wait_time()
-                logger.info(f"[{correlation_id}] Rate limited, waiting {wait:.1f}s")
-                time.sleep(wait)
+            try:
+                get_rate_limiter().acquire(
+                    "twitter", "delete", credential=creds.get('access_token')
+                )
+            except RateLimitExceeded as e:
+                logger.warning(f"[{correlation_id}] {e}")
+                return False
 
             try:
                 success = self._delete_tweet_api(creds, tweet_id, correlation_id)
                 if success:
-                    self._delete_limiter.record_request()
                     logger.info(f"[{correlation_id}] Successfully deleted tweet")
                     return True
             except Exception as e:
@@ -703,6 +647,11 @@ class CleanupEngine:
                 access_token=creds.get('access_token'),
                 access_token_secret=creds.get('access_token_secret'),
             )
+            client.session.hooks["response"].append(
+                get_rate_limiter().observer(
+                    "twitter", creds.get('access_token'), classify_twitter_request
+                )
+            )
 
             response = client.delete_tweet(tweet_id)
 
@@ -6,9 +6,9 @@ audit log archiving, database backups, and statistics aggregation.
 """
 import os
 import shutil
-import sqlite3
 import time
 from typing import Dict
+from app.core.db_pool import checkpoint, get_connection
 
 
 DB_PATH = 'chirpsyncer.db'
@@ -19,7 +19,7 @@ def cleanup_expired_sessions(db_path: str = DB_PATH) -> Dict:
     start = time.time()
 
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_connection(db_path)
         cursor = conn.cursor()
 
         now = int(time.time())
@@ -47,7 +47,7 @@ def archive_audit_logs(days_old: int = 90, db_path: str = DB_PATH) -> Dict:
     """Archive audit logs older than X days"""
     start = time.time()
 
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     cursor = conn.cursor()
 
     try:
@@ -106,6 +106,10 @@ def backup_database(backup_dir: str = 'backups', db_path: str = DB_PATH) -> Dict
         backup_name = f'chirpsyncer_backup_{timestamp}.db'
         backup_path = os.path.join(backup_dir, backup_name)
 
+        # Flush the WAL into the main file so the copy has every commit
+        if os.path.isfile(db_path):
+            checkpoint(db_path)
+
         # Copy database
         shutil.copy2(db_path, backup_path)
 
@@ -128,7 +132,7 @@ def cleanup_inactive_credentials(months: int = 6, db_path: str = DB_PATH) -> Dic
     """Mark credentials as inactive if last_used > X months ago"""
     start = time.time()
 
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     cursor = conn.cursor()
 
     try:
@@ -158,7 +162,7 @@ def aggregate_daily_stats(db_path: str = DB_PATH) -> Dict:
     """Aggregate sync_stats into daily summary"""
     start = time.time()
 
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     cursor = conn.cursor()
 
     try:
@@ -210,7 +214,7 @@ def cleanup_error_logs(days_old: int = 30, db_path: str = DB_PATH) -> Dict:
     """Delete audit log errors older than X days"""
     start = time.time()
 
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     cursor = conn.cursor()
 
     try:
@@ -12,6 +12,7 @@ import io
 from typing import List, Dict, Any
 from datetime import datetime
 import time
+from app.core.db_pool import get_connection
 
 
 class ReportGenerator:
@@ -41,7 +42,7 @@ class ReportGenerator:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection with Row factory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
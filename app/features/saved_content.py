@@ -14,6 +14,7 @@ Features:
 import sqlite3
 import time
 from typing import List, Optional, Dict, Any
+from app.core.db_pool import get_connection
 
 
 class SavedContentManager:
@@ -43,9 +44,7 @@ class SavedContentManager:
         Returns:
             SQLite connection with foreign keys enabled
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return get_connection(self.db_path, foreign_keys=True)
 
     def init_db(self) -> None:
         """
@@ -55,11 +54,9 @@ class SavedContentManager:
         - collections table: User's collections for organizing saved content
         - saved_tweets table: Saved tweets with optional collection assignment
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         # Enable foreign key constraints
-        cursor.execute("PRAGMA foreign_keys = ON")
+        conn = get_connection(self.db_path, foreign_keys=True)
+        cursor = conn.cursor()
 
         # Create collections table
         cursor.execute("""
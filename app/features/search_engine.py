@@ -13,10 +13,10 @@ Features:
 - Author filtering
 - Index rebuild functionality
 """
-import sqlite3
 import time
 from typing import List, Dict, Optional, Any
 from app.core.logger import setup_logger
+from app.core.db_pool import get_connection
 
 logger = setup_logger(__name__)
 
@@ -54,7 +54,7 @@ class SearchEngine:
             True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             # Create FTS5 virtual table with porter tokenizer
@@ -143,7 +143,7 @@ class SearchEngine:
             True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             if posted_at is None:
@@ -192,7 +192,7 @@ class SearchEngine:
             List of matching tweets with metadata
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             results = []
@@ -275,7 +275,7 @@ class SearchEngine:
             if filters is None:
                 filters = {}
 
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             # Check if we need to join with synced_posts for engagement/media filters
@@ -433,7 +433,7 @@ class SearchEngine:
             Number of tweets indexed
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             # Clear existing index for user (or all)
@@ -502,7 +502,7 @@ class SearchEngine:
                 - last_indexed: Timestamp of most recent tweet
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -539,7 +539,7 @@ class SearchEngine:
             True if removed, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("DELETE FROM tweet_search_index WHERE tweet_id = ?", (tweet_id,))
@@ -577,7 +577,7 @@ class SearchEngine:
             List of suggested search terms
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -639,7 +639,7 @@ class SearchEngine:
             List of matching tweets
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -681,7 +681,7 @@ class SearchEngine:
             List of dicts with hashtag and count
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -10,6 +10,8 @@ import time
 import traceback
 from datetime import datetime
 from typing import List, Dict, Optional
+from app.core.db_pool import get_connection
+from app.services.circuit_breaker import CircuitOpenError, get_breaker
 
 
 class TweetScheduler:
@@ -39,7 +41,7 @@ class TweetScheduler:
 
     def init_db(self):
         """Initialize database table for scheduled tweets"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         # Create scheduled_tweets table (ADR-002 schema)
@@ -108,7 +110,7 @@ class TweetScheduler:
         # Convert media list to JSON
         media_json = json.dumps(media) if media else None
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -136,7 +138,7 @@ class TweetScheduler:
         Returns:
             True if cancelled, False otherwise
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -181,7 +183,7 @@ class TweetScheduler:
         Returns:
             List of scheduled tweet dictionaries
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -224,25 +226,29 @@ class TweetScheduler:
         Process the queue of scheduled tweets.
 
         Called by cron every minute to check for and post due tweets.
+        While the Twitter post circuit is open, due tweets stay pending
+        for a later run instead of failing one by one.
 
         Returns:
             Dictionary with processing statistics:
             {
                 'processed': int,
                 'successful': int,
-                'failed': int
+                'failed': int,
+                'deferred': int
             }
         """
         stats = {
             'processed': 0,
             'successful': 0,
-            'failed': 0
+            'failed': 0,
+            'deferred': 0
         }
 
         # Get all pending tweets that are due
         current_time = int(time.time())
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -260,7 +266,12 @@ class TweetScheduler:
             conn.close()
 
         # Process each due tweet
-        for row in due_tweets:
+        breaker = get_breaker('twitter', 'post')
+        for index, row in enumerate(due_tweets):
+            if breaker.is_open():
+                stats['deferred'] = len(due_tweets) - index
+                break
+
             tweet_id = row['id']
             stats['processed'] += 1
 
@@ -282,10 +293,11 @@ class TweetScheduler:
             scheduled_tweet_id: ID of scheduled tweet
 
         Returns:
-            True if posted successfully, False otherwise
+            True if posted successfully, False otherwise (the tweet stays
+            pending if Twitter posting is down)
         """
         # Get tweet details
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -343,6 +355,9 @@ class TweetScheduler:
             self.update_status(scheduled_tweet_id, 'posted', tweet_id=tweet_id)
             return True
 
+        except CircuitOpenError:
+            # Never sent; the next queue run retries it
+            return False
         except Exception as e:
             # Update status to failed with error
             error_msg = f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
@@ -374,6 +389,8 @@ class TweetScheduler:
             tweet_id = post_tweet_with_credentials(credentials, content, media_paths)
             return tweet_id
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to post tweet to Twitter: {str(e)}") from e
 
@@ -391,7 +408,7 @@ class TweetScheduler:
         Returns:
             True if updated successfully, False otherwise
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -1,14 +1,81 @@
-import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Iterator, Optional
 from atproto import Client, models
-from tenacity import retry, stop_after_attempt, wait_exponential, before_sleep_log, after_log
+from atproto_client.request import Request
+from tenacity import (
+    retry,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    before_sleep_log,
+    after_log,
+)
 from config import BSKY_USERNAME, BSKY_PASSWORD
+from app.integrations.bluesky_session import get_session_store
+from app.integrations.media_handler import bluesky_attachments
+from app.services.circuit_breaker import CircuitOpenError, get_breaker
+from app.services.rate_limiter import RateLimitExceeded, get_rate_limiter
 from app.core.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Largest page getAuthorFeed returns
+BLUESKY_MAX_PAGE_SIZE = 100
+
+# Procedures spending the account's record-write budget
+_REPO_WRITES = frozenset(
+    {
+        "com.atproto.repo.createRecord",
+        "com.atproto.repo.putRecord",
+        "com.atproto.repo.deleteRecord",
+        "com.atproto.repo.applyWrites",
+    }
+)
+
+
+def _classify_xrpc(method: str, url: str) -> str:
+    """
+    Rate-limit class of an XRPC call.
+
+    Queries read and record writes write. Session procedures (createSession,
+    refreshSession, ...) have much stricter limits of their own, and other
+    procedures (uploadBlob, ...) are not part of the write budget, so their
+    headers go to buckets of their own instead of overwriting the write one.
+    """
+    if method.upper() != "POST":
+        return "read"
+    nsid = url.split("?")[0].rstrip("/").rsplit("/", 1)[-1]
+    if nsid in _REPO_WRITES:
+        return "write"
+    if nsid.startswith("com.atproto.server."):
+        return "session"
+    return "procedure"
+
+
+def _limited_client_factory(username: str):
+    """Client factory whose responses teach the rate limiter the account's limits."""
+
+    def factory() -> Client:
+        hook = get_rate_limiter().observer("bluesky", username, _classify_xrpc)
+        client = Client(request=Request(event_hooks={"response": [hook]}))
+        client.rate_limit_account = username
+        return client
+
+    return factory
+
+
+def _account(client) -> str:
+    """Account whose rate-limit buckets a client spends."""
+    account = getattr(client, "rate_limit_account", None)
+    if isinstance(account, str):
+        return account
+    return getattr(getattr(client, "me", None), "handle", None) or BSKY_USERNAME
+
+
 # Initialize Bluesky client
-bsky_client = Client()
+bsky_client = _limited_client_factory(BSKY_USERNAME)()
 
 # Function to login (explicitly called when needed)
 @retry(
@@ -21,6 +88,68 @@ def login_to_bluesky():
     bsky_client.login(BSKY_USERNAME, BSKY_PASSWORD)
 
 
+@retry(
+    retry=retry_if_not_exception_type(CircuitOpenError),
+    stop=stop_after_attempt(2),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    after=after_log(logger, logging.ERROR)
+)
+def create_bluesky_client(
+    username: str, password: str, user_id: int = None, cred_manager=None
+) -> Client:
+    """
+    Get a Bluesky client logged in with the given credentials.
+
+    Used in multi-user mode so each user gets their own client instead of
+    sharing the module-level one. Clients come from the session store, so a
+    password login only happens when no cached or stored session exists.
+
+    Args:
+        username: Bluesky handle
+        password: Bluesky (app) password
+        user_id: User owning the credentials, to persist the session
+        cred_manager: CredentialManager to persist the session through
+
+    Returns:
+        Logged-in atproto Client
+    """
+    return get_session_store().get_client(
+        username,
+        password,
+        user_id=user_id,
+        cred_manager=cred_manager,
+        client_factory=_limited_client_factory(username),
+    )
+
+
+# Handle -> DID, resolved once per process (handles rarely move)
+_did_cache = {}
+
+
+def resolve_did(handle: str, client=None) -> str:
+    """
+    Resolve a Bluesky handle to its DID.
+
+    Args:
+        handle: Bluesky handle (a DID is returned as is)
+        client: Client to resolve with (defaults to the module-level client)
+
+    Returns:
+        The account's DID
+    """
+    if handle.startswith("did:"):
+        return handle
+    did = _did_cache.get(handle.lower())
+    if did is None:
+        client = client or bsky_client
+        get_rate_limiter().acquire("bluesky", "read", credential=_account(client))
+        with get_breaker("bluesky", "read").guard():
+            did = client.com.atproto.identity.resolve_handle({"handle": handle}).did
+        _did_cache[handle.lower()] = did
+    return did
+
+
 def validate_and_truncate_text(text: str, max_length: int = 300) -> str:
     """
     Validate text length for Bluesky.
@@ -41,100 +170,267 @@ def validate_and_truncate_text(text: str, max_length: int = 300) -> str:
     return text[:max_length - 3] + "..."
 
 
-# Post to Bluesky
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    before_sleep=before_sleep_log(logger, logging.WARNING),
-    after=after_log(logger, logging.ERROR)
-)
-def post_to_bluesky(content):
+# Post to Bluesky; not retried here, since a retry after a post that went
+# out but timed out would post it twice. The caller (the outbox) retries.
+def post_to_bluesky(content, client=None, embed=None):
     # Validate length before posting
     validated_content = validate_and_truncate_text(content)
+    client = client or bsky_client
 
     try:
-        bsky_client.post(validated_content)
+        get_rate_limiter().acquire("bluesky", "write", credential=_account(client))
+        with get_breaker("bluesky", "write").guard():
+            # embed: attached media, see media_handler.bluesky_embed()
+            if embed is not None:
+                response = client.post(validated_content, embed=embed)
+            else:
+                response = client.post(validated_content)
         logger.info(f"Posted to Bluesky: {validated_content[:50]}...")
+        # URI of the new post, recorded in synced_posts.bluesky_uri
+        return getattr(response, "uri", None)
     except Exception as e:
         logger.error(f"Error posting to Bluesky: {e}")
-        raise  # Re-raise to allow retry mechanism to work
+        raise
 
 
 class Post:
-    """Simple Post class for Bluesky posts with text and URI."""
-    def __init__(self, uri: str, text: str):
+    """Simple Post class for Bluesky posts with text, URI and attached media."""
+
+    # Backfills hold many thousands of these
+    __slots__ = ("uri", "text", "indexed_at", "media")
+
+    def __init__(self, uri: str, text: str, indexed_at: str = None, media: list = None):
         self.uri = uri
         self.text = text
+        self.indexed_at = indexed_at
+        # media_handler.bluesky_attachments() entries
+        self.media = media or []
 
     def __repr__(self):
         return f"Post(uri={self.uri[:30]}..., text={self.text[:50]}...)"
 
 
+def _field(obj, name: str, attr: str = None):
+    """Read a field from a feed item given as a dict or an atproto model."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, attr or name, None)
+
+
+def _parse_time(value) -> Optional[datetime]:
+    """Timezone-aware datetime of an ISO timestamp (or datetime), None if unparseable."""
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            # Python < 3.11 does not read the "Z" suffix
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
 @retry(
+    retry=retry_if_not_exception_type((RateLimitExceeded, CircuitOpenError)),
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=10),
     before_sleep=before_sleep_log(logger, logging.WARNING),
     after=after_log(logger, logging.ERROR)
 )
-def fetch_posts_from_bluesky(username: str, count: int = 10) -> list:
+def _fetch_feed_page(client, username: str, limit: int, cursor: str = None):
+    """One getAuthorFeed page; retried on its own so a long backfill never restarts."""
+    params = {"actor": username, "limit": limit}
+    if cursor:
+        params["cursor"] = cursor
+    get_rate_limiter().acquire("bluesky", "read", credential=_account(client))
+    with get_breaker("bluesky", "read").guard():
+        # Namespace methods take the query parameters as one argument
+        return client.app.bsky.feed.get_author_feed(params)
+
+
+def iter_bluesky_posts(
+    username: str,
+    client=None,
+    since: dict = None,
+    until=None,
+    max_posts: int = None,
+    page_size: int = BLUESKY_MAX_PAGE_SIZE,
+    max_pages: int = None,
+    prefetch: bool = True,
+) -> Iterator[Post]:
+    """
+    Stream a Bluesky user's original posts, newest first, following feed cursors.
+
+    Pages are requested lazily as the caller consumes posts. With prefetch,
+    the next page is requested in the background while the caller works
+    through the current one; it is only requested when the current page
+    did not reach a stop condition, so an incremental fetch that ends on
+    the first page still costs one request.
+
+    Args:
+        username: Bluesky username (e.g., 'user.bsky.social')
+        client: Logged-in client to use (defaults to the module-level client)
+        since: High-water mark from get_sync_cursor(); stop at the marked post
+        until: Stop at posts indexed before this datetime or ISO timestamp
+        max_posts: Stop after this many posts
+        page_size: Size of the first page; later pages are as large as allowed
+        max_pages: Stop after this many pages
+        prefetch: Request the next page while the current one is consumed
+
+    Yields:
+        Post objects; reposts and pinned reposts are skipped
+    """
+    client = client or bsky_client
+    last_uri = (since or {}).get("last_id")
+    last_indexed_at = (since or {}).get("last_timestamp")
+    # Timestamps are compared as datetimes: ISO strings differ in precision and offset
+    last_indexed = _parse_time(last_indexed_at) if last_indexed_at else None
+    oldest = _parse_time(until) if until is not None else None
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    pending = None
+    try:
+        page = _fetch_feed_page(client, username, min(page_size, BLUESKY_MAX_PAGE_SIZE))
+        pages = 1
+        yielded = 0
+
+        while page is not None:
+            posts = []
+            stopped = False
+            for item in getattr(page, "feed", None) or ():
+                if max_posts is not None and yielded + len(posts) >= max_posts:
+                    stopped = True
+                    break
+
+                # Skip reposts (reason != None indicates repost). Pinned
+                # posts carry a reason too, so they never end the scan.
+                if _field(item, "reason") is not None:
+                    continue
+
+                post_data = _field(item, "post")
+                uri = _field(post_data, "uri") or ""
+                indexed_at = _field(post_data, "indexedAt", "indexed_at")
+
+                indexed = _parse_time(indexed_at) if indexed_at else None
+                if (last_uri and uri == last_uri) or (
+                    last_indexed is not None and indexed is not None and indexed <= last_indexed
+                ):
+                    stopped = True
+                    break
+                if oldest is not None and indexed is not None and indexed < oldest:
+                    stopped = True
+                    break
+
+                text = _field(_field(post_data, "record"), "text") or ""
+                if uri and text:
+                    media = bluesky_attachments(_field(post_data, "embed"))
+                    posts.append(Post(uri=uri, text=text, indexed_at=indexed_at, media=media))
+
+            page_cursor = getattr(page, "cursor", None)
+            if not page_cursor or not getattr(page, "feed", None) or (
+                max_posts is not None and yielded + len(posts) >= max_posts
+            ) or (max_pages is not None and pages >= max_pages):
+                stopped = True
+
+            page = None
+            if not stopped:
+                pages += 1
+                if executor is not None:
+                    pending = executor.submit(
+                        _fetch_feed_page, client, username, BLUESKY_MAX_PAGE_SIZE, page_cursor
+                    )
+
+            for post in posts:
+                yield post
+            yielded += len(posts)
+
+            if pending is not None:
+                page, pending = pending.result(), None
+            elif not stopped:
+                page = _fetch_feed_page(client, username, BLUESKY_MAX_PAGE_SIZE, page_cursor)
+    finally:
+        if executor is not None:
+            # A caller that stops early abandons the prefetched page
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_posts_from_bluesky(username: str, count: int = 10, client=None, since: dict = None) -> list:
     """
     Fetch recent posts from Bluesky user's feed.
 
+    Without a high-water mark this reads a single page of ``count`` items.
+    With one, it follows the feed cursor until it reaches the marked post,
+    so every new post is returned however many there are (a burst is
+    never cut off above the mark) and a quiet account costs one small page.
+    Backfills that need more should stream iter_bluesky_posts() instead.
+
     Args:
         username: Bluesky username (e.g., 'user.bsky.social')
         count: Maximum number of posts to fetch (default 10)
+        client: Logged-in client to use (defaults to the module-level client)
+        since: High-water mark from get_sync_cursor() (last_id = post URI,
+               last_timestamp = its indexedAt)
 
     Returns:
-        List of Post objects with .text and .uri attributes
-        Filters out reposts and quote posts, only returns original posts
+        List of Post objects with .text, .uri and .indexed_at attributes,
+        newest first. Filters out reposts and quote posts, only returns
+        original posts
 
     Raises:
-        Exception on network errors (handled by retry decorator)
+        Exception on network errors (after each page's retries)
     """
     try:
         logger.info(f"Fetching posts from Bluesky user: {username} (limit: {count})")
 
-        # Call Bluesky API to get author feed
-        response = bsky_client.app.bsky.feed.get_author_feed(
-            actor=username,
-            limit=count
+        incremental = bool((since or {}).get("last_id") or (since or {}).get("last_timestamp"))
+        posts = list(
+            iter_bluesky_posts(
+                username,
+                client=client,
+                since=since,
+                max_posts=None if incremental else count,
+                page_size=count,
+                max_pages=None if incremental else 1,
+            )
         )
 
-        # Extract posts from response
-        if not hasattr(response, 'feed') or not response.feed:
-            logger.info(f"No posts found for user: {username}")
+        if not posts:
+            logger.info(f"No new posts found for user: {username}")
             return []
 
-        # Filter and process posts
-        posts = []
-        for item in response.feed:
-            # Stop if we've reached the requested count
-            if len(posts) >= count:
-                break
-
-            # Skip reposts (reason != None indicates repost)
-            if item.get('reason') is not None:
-                continue
-
-            # Extract post data
-            post_data = item.get('post', {})
-            record = post_data.get('record', {})
-            uri = post_data.get('uri', '')
-            text = record.get('text', '')
-
-            # Create Post object
-            if uri and text:
-                posts.append(Post(uri=uri, text=text))
-
         logger.info(f"Fetched {len(posts)} original posts from {username}")
         return posts
 
     except Exception as e:
         logger.error(f"Error fetching posts from Bluesky: {e}")
-        raise  # Re-raise to allow retry mechanism to work
+        raise
+
+
+class ThreadPostError(Exception):
+    """A thread stopped partway, after some of its posts went out.
+
+    Attributes:
+        posted: URIs of the posted prefix, in thread order
+        root: Strong ref ({"uri", "cid"}) of the thread's root post
+        parent: Strong ref of the last posted post, to continue the thread under
+        error: Error that stopped the thread
+    """
+
+    def __init__(self, posted: list, root: dict, parent: dict, error: Exception):
+        super().__init__(f"thread stopped after {len(posted)} posts: {error}")
+        self.posted = posted
+        self.root = root
+        self.parent = parent
+        self.error = error
+
+
+def _ref_dict(ref) -> dict:
+    return {"uri": ref.uri, "cid": ref.cid}
 
 
-def post_thread_to_bluesky(tweets: list) -> list:
+def post_thread_to_bluesky(tweets: list, client=None, reply_to: dict = None) -> list:
     """Post a thread to Bluesky maintaining reply chain.
 
     This function posts a list of tweets as a thread on Bluesky, maintaining
@@ -142,16 +438,25 @@ def post_thread_to_bluesky(tweets: list) -> list:
     a reply to the previous one.
 
     Args:
-        tweets: List of TweetAdapter objects representing the thread
+        tweets: List of TweetAdapter objects representing the thread; an
+            ``embed`` attribute (media_handler.bluesky_embed()) is attached
+        client: Logged-in client to use (defaults to the module-level client)
+        reply_to: {"root": ref, "parent": ref} strong refs ({"uri", "cid"})
+            of a thread to continue; the first tweet replies to parent
 
     Returns:
-        list: List of URIs for the posted tweets
+        list: List of URIs for the posted tweets, one per tweet
+
+    Raises:
+        ThreadPostError: A post failed after earlier ones went out; later
+            replies could not chain to the missing post, so the thread stops
+            there. Errors before anything was posted are raised as is.
 
     Note:
-        - Includes rate limiting (1 second sleep between posts)
+        - Each post takes a token from the account's shared write bucket
+          and goes through the Bluesky write circuit
         - Validates and truncates text for each tweet
-        - Handles partial failures gracefully
-        - Uses retry logic for each individual post
+        - Nothing is retried here; retries belong to the caller (the outbox)
 
     Example:
         >>> thread = [tweet1, tweet2, tweet3]
@@ -162,51 +467,54 @@ def post_thread_to_bluesky(tweets: list) -> list:
         logger.warning("Empty thread provided to post_thread_to_bluesky")
         return []
 
+    client = client or bsky_client
     posted_uris = []
     parent_ref = None
+    root_ref = None
+    if reply_to:
+        parent_ref = models.ComAtprotoRepoStrongRef.Main(**reply_to["parent"])
+        root_ref = models.ComAtprotoRepoStrongRef.Main(**reply_to["root"])
+
+    account = _account(client)
 
     for i, tweet in enumerate(tweets):
         try:
             # Validate and truncate text
             validated_content = validate_and_truncate_text(tweet.text)
 
-            # Prepare post parameters
-            if i == 0:
-                # First tweet: no reply parent
-                response = bsky_client.send_post(text=validated_content)
-            else:
-                # Subsequent tweets: reply to previous tweet
-                if parent_ref:
-                    # Create reply reference
-                    reply_ref = models.AppBskyFeedPost.ReplyRef(
-                        parent=parent_ref,
-                        root=posted_uris[0] if posted_uris else parent_ref
-                    )
-                    response = bsky_client.send_post(
-                        text=validated_content,
-                        reply_to=reply_ref
-                    )
-                else:
-                    # Fallback if parent_ref is missing
-                    response = bsky_client.send_post(text=validated_content)
-
-            # Store the URI and CID for the next reply
-            if hasattr(response, 'uri') and hasattr(response, 'cid'):
-                posted_uris.append(response.uri)
-                # Create reference for next tweet in thread
-                parent_ref = models.create_strong_ref(response)
-                logger.info(f"Posted tweet {i+1}/{len(tweets)} to Bluesky: {validated_content[:50]}...")
-            else:
-                logger.warning(f"Response missing uri/cid for tweet {i+1}")
-
-            # Rate limiting: sleep between posts (except after last one)
-            if i < len(tweets) - 1:
-                time.sleep(1)
+            get_rate_limiter().acquire("bluesky", "write", credential=account)
 
+            # Prepare post parameters; the thread's first post has no reply parent
+            params = {"text": validated_content}
+            embed = getattr(tweet, "embed", None)
+            if embed is not None:
+                params["embed"] = embed
+            if parent_ref is not None:
+                # Subsequent tweets: reply to previous tweet
+                params["reply_to"] = models.AppBskyFeedPost.ReplyRef(
+                    parent=parent_ref,
+                    root=root_ref or parent_ref
+                )
+            with get_breaker("bluesky", "write").guard():
+                response = client.send_post(**params)
+
+            if getattr(response, "uri", None) is None or getattr(response, "cid", None) is None:
+                raise RuntimeError(f"response missing uri/cid for tweet {i+1}")
         except Exception as e:
-            logger.error(f"Error posting tweet {i+1} in thread: {e}")
-            # Continue with next tweet even if one fails
-            continue
-
-    logger.info(f"Posted thread: {len(posted_uris)}/{len(tweets)} tweets successful")
+            if not posted_uris:
+                # Nothing posted yet: let the caller retry the whole thread
+                raise
+            logger.warning(f"Thread stopped at tweet {i+1}/{len(tweets)}: {e}")
+            raise ThreadPostError(
+                posted_uris, _ref_dict(root_ref), _ref_dict(parent_ref), e
+            ) from e
+
+        # Store the URI and CID for the next reply
+        posted_uris.append(response.uri)
+        # Create reference for next tweet in thread
+        parent_ref = models.create_strong_ref(response)
+        root_ref = root_ref or parent_ref
+        logger.info(f"Posted tweet {i+1}/{len(tweets)} to Bluesky: {validated_content[:50]}...")
+
+    logger.info(f"Posted thread: {len(posted_uris)} tweets")
     return posted_uris
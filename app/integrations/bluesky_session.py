@@ -0,0 +1,244 @@
+"""Bluesky session store.
+
+Logging in to Bluesky (com.atproto.server.createSession) is rate limited
+much more tightly than posting, so logging in once per user per sync cycle
+does not scale. This module keeps one logged-in atproto Client per account
+for the whole process and persists each user's session (access and refresh
+JWTs) encrypted through CredentialManager:
+
+- In-memory hit: the cached client is returned as is. atproto refreshes the
+  access token by itself shortly before it expires.
+- Persisted session: a new client resumes from the stored session string,
+  which costs a refresh at most, never a createSession.
+- Otherwise: a normal password login.
+
+Every session change (create or refresh) is written back, so the stored
+tokens are always the newest. The same clients are used by sync, media
+upload and credential validation.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from atproto import Client
+from app.core.logger import setup_logger
+from app.services.circuit_breaker import get_breaker
+
+logger = setup_logger(__name__)
+
+PLATFORM = "bluesky"
+
+
+def _fingerprint(username: str, password: str) -> str:
+    """Identify the credentials a session was opened with."""
+    return hashlib.sha256(f"{username.lower()}:{password}".encode("utf-8")).hexdigest()
+
+
+def _refresh_expired(session_string: str) -> bool:
+    """True if the session's refresh token can no longer be used."""
+    from atproto_client.client.session import Session
+
+    try:
+        payload = Session.decode(session_string).refresh_jwt_payload
+    except Exception:
+        return True
+    return bool(payload.exp) and payload.exp <= time.time()
+
+
+class _Entry:
+    """One account: its client and the users whose stored session it updates."""
+
+    __slots__ = ("client", "fingerprint", "lock", "owners")
+
+    def __init__(self):
+        self.client = None
+        self.fingerprint = None
+        self.lock = threading.Lock()
+        self.owners = {}  # user_id -> CredentialManager
+
+
+class BlueskySessionStore:
+    """
+    Process-wide cache of logged-in Bluesky clients, one per account.
+
+    Sessions are persisted per user when a CredentialManager and user ID
+    are given.
+    """
+
+    def __init__(self, client_factory: Callable[[], Client] = Client):
+        """
+        Initialize BlueskySessionStore.
+
+        Args:
+            client_factory: Creates unauthenticated clients (for tests)
+        """
+        self._client_factory = client_factory
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "cache_hits": 0,
+            "resumed": 0,
+            "logins": 0,
+            "refreshes": 0,
+            "persist_errors": 0,
+        }
+
+    def _bump(self, counter: str):
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _entry(self, username: str) -> _Entry:
+        with self._lock:
+            return self._entries.setdefault(username.lower(), _Entry())
+
+    def _new_client(self, owners: dict, fingerprint: str, client_factory=None) -> Client:
+        client = (client_factory or self._client_factory)()
+
+        # atproto only accepts plain functions as callbacks
+        def on_session_change(event, session):
+            if getattr(event, "value", event) == "refresh":
+                self._bump("refreshes")
+            for user_id, cred_manager in list(owners.items()):
+                self._persist(client, user_id, cred_manager, fingerprint)
+
+        client.on_session_change(on_session_change)
+        return client
+
+    def _persist(self, client, user_id, cred_manager, fingerprint):
+        try:
+            cred_manager.save_session(
+                user_id,
+                PLATFORM,
+                {
+                    "session_string": client.export_session_string(),
+                    "fingerprint": fingerprint,
+                },
+            )
+        except Exception as e:
+            self._bump("persist_errors")
+            logger.warning(f"Could not persist Bluesky session for user {user_id}: {e}")
+
+    def _resume(
+        self, owners, username, user_id, cred_manager, fingerprint, client_factory=None
+    ) -> Optional[Client]:
+        if cred_manager is None or user_id is None:
+            return None
+
+        stored = cred_manager.get_session(user_id, PLATFORM)
+        if not stored or stored.get("fingerprint") != fingerprint:
+            return None
+
+        session_string = stored.get("session_string")
+        if not session_string or _refresh_expired(session_string):
+            return None
+
+        client = self._new_client(owners, fingerprint, client_factory)
+        try:
+            client.login(session_string=session_string)
+        except Exception as e:
+            logger.info(f"Stored Bluesky session for {username} unusable, logging in: {e}")
+            return None
+
+        self._bump("resumed")
+        return client
+
+    def get_client(
+        self,
+        username: str,
+        password: str,
+        user_id: Optional[int] = None,
+        cred_manager=None,
+        client_factory: Optional[Callable[[], Client]] = None,
+    ) -> Client:
+        """
+        Get a logged-in client for an account, logging in only if needed.
+
+        Args:
+            username: Bluesky handle
+            password: Bluesky (app) password
+            user_id: Owning user, to persist the session (optional)
+            cred_manager: CredentialManager used to persist the session (optional)
+            client_factory: Overrides the store's client factory for new logins
+
+        Returns:
+            Logged-in atproto Client
+
+        Raises:
+            Exception: If the password login fails
+            CircuitOpenError: If Bluesky logins are failing for everyone
+        """
+        fingerprint = _fingerprint(username, password)
+        entry = self._entry(username)
+
+        persist_for = user_id is not None and cred_manager is not None
+
+        with entry.lock:
+            if entry.client is not None and entry.fingerprint == fingerprint:
+                if not _refresh_expired(entry.client.export_session_string()):
+                    self._bump("cache_hits")
+                    if persist_for and user_id not in entry.owners:
+                        # First use by this user: store the session for them too
+                        entry.owners[user_id] = cred_manager
+                        self._persist(entry.client, user_id, cred_manager, fingerprint)
+                    return entry.client
+
+            # No usable session for these credentials. The cached client is
+            # only replaced once the new one is logged in, so a failed login
+            # (e.g. validating a wrong password) leaves it in place.
+            owners = {user_id: cred_manager} if persist_for else {}
+            client = self._resume(
+                owners, username, user_id, cred_manager, fingerprint, client_factory
+            )
+            if client is None:
+                client = self._new_client(owners, fingerprint, client_factory)
+                with get_breaker("bluesky", "session").guard():
+                    client.login(username, password)
+                self._bump("logins")
+                logger.info(f"Logged in to Bluesky as {username}")
+
+            entry.client = client
+            entry.fingerprint = fingerprint
+            entry.owners = owners
+            return client
+
+    def invalidate(self, username: str, user_id: Optional[int] = None, cred_manager=None):
+        """
+        Forget an account's session (e.g. after an authentication error).
+
+        Args:
+            username: Bluesky handle
+            user_id: Owning user, to delete the persisted session (optional)
+            cred_manager: CredentialManager holding the session (optional)
+        """
+        with self._lock:
+            self._entries.pop(username.lower(), None)
+        if user_id is not None and cred_manager is not None:
+            cred_manager.delete_session(user_id, PLATFORM)
+
+    def clear(self):
+        """Forget every in-memory session."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Get session store metrics.
+
+        Returns:
+            Dictionary with cache hits, resumed sessions, password logins,
+            token refreshes and the number of cached accounts
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["accounts"] = sum(1 for e in self._entries.values() if e.client is not None)
+        return stats
+
+
+_store = BlueskySessionStore()
+
+
+def get_session_store() -> BlueskySessionStore:
+    """Get the process-wide Bluesky session store."""
+    return _store
@@ -6,10 +6,10 @@ authentication against the respective platform APIs. Used by the web dashboard
 to verify stored credentials are working.
 """
 
-import asyncio
 from typing import Dict, Tuple
 from atproto import Client
-from twscrape import API
+from app.core.async_runtime import run_sync
+from app.integrations.bluesky_session import get_session_store
 from app.core.logger import setup_logger
 
 # Import tweepy at module level so it can be mocked in tests
@@ -34,9 +34,6 @@ async def _validate_twitter_scraping_async(
         Tuple of (success: bool, message: str)
     """
     try:
-        # Initialize twscrape API
-        API()
-
         # For now, just verify credentials structure is correct
         required_fields = ["username", "password", "email", "email_password"]
         missing_fields = [
@@ -66,15 +63,7 @@ def validate_twitter_scraping(credentials: Dict[str, str]) -> Tuple[bool, str]:
     Returns:
         Tuple of (success: bool, message: str)
     """
-    try:
-        return asyncio.run(_validate_twitter_scraping_async(credentials))
-    except RuntimeError as e:
-        if "asyncio.run() cannot be called from a running event loop" in str(e):
-            loop = asyncio.get_event_loop()
-            return loop.run_until_complete(
-                _validate_twitter_scraping_async(credentials)
-            )
-        raise
+    return run_sync(_validate_twitter_scraping_async(credentials))
 
 
 def validate_twitter_api(credentials: Dict[str, str]) -> Tuple[bool, str]:
@@ -146,12 +135,19 @@ def validate_twitter_api(credentials: Dict[str, str]) -> Tuple[bool, str]:
         return False, "Validation error occurred"
 
 
-def validate_bluesky(credentials: Dict[str, str]) -> Tuple[bool, str]:
+def validate_bluesky(
+    credentials: Dict[str, str], user_id: int = None, credential_manager=None
+) -> Tuple[bool, str]:
     """
     Validate Bluesky credentials by attempting login.
 
+    Goes through the shared session store: credentials that already have a
+    live session validate without another login.
+
     Args:
         credentials: Dictionary with keys: username, password (app password)
+        user_id: User owning the credentials, to persist the session (optional)
+        credential_manager: CredentialManager to persist the session (optional)
 
     Returns:
         Tuple of (success: bool, message: str)
@@ -164,9 +160,14 @@ def validate_bluesky(credentials: Dict[str, str]) -> Tuple[bool, str]:
             return False, "Missing password (app password)"
 
         # Attempt login to verify credentials
-        client = Client()
         try:
-            client.login(credentials["username"], credentials["password"])
+            get_session_store().get_client(
+                credentials["username"],
+                credentials["password"],
+                user_id=user_id,
+                cred_manager=credential_manager,
+                client_factory=Client,
+            )
             return True, "Bluesky credentials validated successfully"
         except Exception as login_error:
             logger.error(f"Bluesky login error: {login_error}")
@@ -184,7 +185,11 @@ def validate_bluesky(credentials: Dict[str, str]) -> Tuple[bool, str]:
 
 
 def validate_credentials(
-    platform: str, credential_type: str, credentials: Dict[str, str]
+    platform: str,
+    credential_type: str,
+    credentials: Dict[str, str],
+    user_id: int = None,
+    credential_manager=None,
 ) -> Tuple[bool, str]:
     """
     Validate credentials for any platform and credential type.
@@ -193,6 +198,8 @@ def validate_credentials(
         platform: Platform name ('twitter' or 'bluesky')
         credential_type: Credential type ('scraping' or 'api')
         credentials: Credential data dictionary
+        user_id: User owning the credentials (optional, lets Bluesky reuse sessions)
+        credential_manager: CredentialManager holding the user's sessions (optional)
 
     Returns:
         Tuple of (success: bool, message: str)
@@ -209,7 +216,7 @@ def validate_credentials(
             raise ValueError(f"Invalid credential_type for Twitter: {credential_type}")
     elif platform == "bluesky":
         if credential_type == "api":
-            return validate_bluesky(credentials)
+            return validate_bluesky(credentials, user_id, credential_manager)
         else:
             raise ValueError(f"Invalid credential_type for Bluesky: {credential_type}")
     else:
@@ -4,20 +4,47 @@ This module handles downloading, uploading, and processing of images and videos
 for synchronization between Twitter and Bluesky platforms.
 
 Key features:
-- Async media download from URLs
+- Async media download from URLs over the shared keep-alive HTTP session, streamed into a memory/temp-file buffer
+  and aborted as soon as it exceeds the target platform's limit
 - Upload media to Bluesky with blob storage
 - Upload media to Twitter via API
 - MIME type detection
-- Size validation for platform limits
+- Size validation for platform limits, re-encoding images that are too
+  large in a process pool (see app/services/media_transform.py)
 - Alt text preservation
+- Mirroring a post's attachments concurrently (sync_post_media())
+- Circuit breakers per media host and upload endpoint, so an outage fails
+  fast instead of timing out for every post
+- Content-addressed media cache: a URL is downloaded once, and the same
+  bytes are uploaded once per account while the upload's ref is valid
 """
 
-import aiohttp
 import asyncio
 import io
 import mimetypes
-from typing import Optional
+import mmap
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, BinaryIO, List, Optional
+from urllib.parse import urlparse
+from atproto import models
+from app.core.config import (
+    MEDIA_CACHE_BLOB_TTL_SECONDS,
+    MEDIA_CACHE_ENABLED,
+    MEDIA_CACHE_MEDIA_ID_TTL_SECONDS,
+    MEDIA_DOWNLOAD_CHUNK_BYTES,
+    MEDIA_POST_CONCURRENCY,
+    MEDIA_SPOOL_BYTES,
+    MEDIA_SYNC_ENABLED,
+    MEDIA_TRANSFORM_ENABLED,
+    TWITTER_USERNAME,
+)
+from app.core.http_client import get_http_session
 from app.core.logger import setup_logger
+from app.core.media_cache import get_media_cache, media_digest
+from app.services.circuit_breaker import CircuitOpenError, get_breaker
+from app.services.media_transform import get_media_transformer
 
 logger = setup_logger(__name__)
 
@@ -46,124 +73,408 @@ def _init_clients():
             logger.debug("Could not import twitter_api (may not be configured)")
 
 
+def _bluesky_account(client) -> Optional[str]:
+    """Repo a client uploads blobs to, or None if unknown."""
+    me = getattr(client, "me", None)
+    for account in (getattr(me, "did", None), getattr(client, "rate_limit_account", None)):
+        if isinstance(account, str):
+            return account
+    return None
+
+
+class MediaDownloadError(Exception):
+    """A media URL answered with an HTTP error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class MediaTooLargeError(MediaDownloadError):
+    """Media exceeds the size limit it was downloaded for."""
+
+    def __init__(self, size: int, limit: int, url: str):
+        # 413: the media's fault, not the host's, so no circuit trips on it
+        super().__init__(413, f"Media at {url} exceeds {limit} bytes ({size}+ bytes)")
+        self.size = size
+        self.limit = limit
+
+
 # Platform size limits (in bytes)
 BLUESKY_IMAGE_LIMIT = 1 * 1024 * 1024  # 1MB
 TWITTER_IMAGE_LIMIT = 5 * 1024 * 1024  # 5MB
 BLUESKY_VIDEO_LIMIT = 50 * 1024 * 1024  # 50MB (more permissive)
 TWITTER_VIDEO_LIMIT = 512 * 1024 * 1024  # 512MB (more permissive)
 
+_SIZE_LIMITS = {
+    ('bluesky', 'image'): BLUESKY_IMAGE_LIMIT,
+    ('bluesky', 'video'): BLUESKY_VIDEO_LIMIT,
+    ('twitter', 'image'): TWITTER_IMAGE_LIMIT,
+    ('twitter', 'video'): TWITTER_VIDEO_LIMIT,
+}
 
-async def download_media(url: str, media_type: str) -> bytes:
-    """Download media from URL asynchronously.
+
+def media_size_limit(platform: Optional[str], media_type: str) -> int:
+    """Largest media of a type a platform accepts (any platform if None)."""
+    media_type = 'video' if media_type == 'video' else 'image'
+    if platform is None:
+        return max(limit for (_, kind), limit in _SIZE_LIMITS.items() if kind == media_type)
+    return _SIZE_LIMITS[(platform.lower(), media_type)]
+
+
+class MediaBuffer:
+    """Media bytes, in memory up to spool_bytes and in a temporary file beyond.
+
+    Downloads are written here chunk by chunk, so a worker's memory stays
+    flat however large the media is. view() exposes the bytes without
+    copying them (memory-mapping the file if spilled), file() as a stream.
+    The buffer is read-only once read; close it (or use it as a context
+    manager) to release the views and delete the file.
+    """
+
+    def __init__(self, spool_bytes: int = MEDIA_SPOOL_BYTES):
+        self.spool_bytes = spool_bytes
+        self._memory = bytearray()
+        self._file = None
+        self._map = None
+        self._views = []
+        self._size = 0
+        self._sealed = False
+
+    @classmethod
+    def open(cls, path: str) -> 'MediaBuffer':
+        """Buffer over an existing file (e.g. a media cache entry)."""
+        buffer = cls(spool_bytes=0)
+        buffer._file = open(path, 'rb')
+        buffer._size = os.fstat(buffer._file.fileno()).st_size
+        buffer._sealed = True
+        return buffer
+
+    @property
+    def on_disk(self) -> bool:
+        return self._file is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, chunk: bytes):
+        """Append a chunk, spilling to a temporary file past spool_bytes."""
+        if self._sealed:
+            raise ValueError("MediaBuffer is read-only once read")
+        if self._file is None and self._size + len(chunk) > self.spool_bytes:
+            self._file = tempfile.TemporaryFile(prefix='chirpsyncer-media-')
+            self._file.write(self._memory)
+            self._memory = bytearray()
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            self._memory += chunk
+        self._size += len(chunk)
+
+    def view(self) -> memoryview:
+        """The bytes, without copying them."""
+        self._sealed = True
+        if self._file is None:
+            view = memoryview(self._memory)
+        elif not self._size:
+            view = memoryview(b'')
+        else:
+            if self._map is None:
+                self._file.flush()
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(self._map)
+        self._views.append(view)
+        return view
+
+    def file(self) -> BinaryIO:
+        """The bytes as a file object positioned at the start."""
+        self._sealed = True
+        if self._file is None:
+            return io.BytesIO(self._memory)
+        self._file.flush()
+        self._file.seek(0)
+        return self._file
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A caller still holds a slice; the map goes with it
+                pass
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._memory = bytearray()
+
+
+def _as_bytes(media) -> bytes:
+    """bytes of media data given as bytes, a memoryview or a MediaBuffer."""
+    if isinstance(media, MediaBuffer):
+        media = media.view()
+    return media if isinstance(media, bytes) else bytes(media)
+
+
+def _open_cached(url: str) -> Optional[MediaBuffer]:
+    """Cached media downloaded from url, or None (blocking: index query and file open)."""
+    path = get_media_cache().lookup_url(url)
+    if path is None:
+        return None
+    try:
+        return MediaBuffer.open(path)
+    except FileNotFoundError:
+        # Evicted since the lookup
+        return None
+
+
+async def fetch_media(url: str, media_type: str, max_bytes: Optional[int] = None) -> MediaBuffer:
+    """Stream media from a URL into a MediaBuffer.
+
+    The download is rejected from its Content-Length, or aborted as soon as
+    more than max_bytes arrived, before the rest is transferred.
 
     Args:
         url: URL of the media to download
         media_type: Type of media ('image' or 'video')
+        max_bytes: Size limit, e.g. media_size_limit(platform, media_type)
+            (default: the largest limit of any platform)
 
     Returns:
-        bytes: Downloaded media data
+        MediaBuffer: The media; the caller closes it
 
     Raises:
-        Exception: If download fails (network error, 404, timeout, etc.)
-
-    Example:
-        >>> media_data = await download_media('https://example.com/photo.jpg', 'image')
-        >>> len(media_data)
-        12345
+        MediaTooLargeError: If the media exceeds max_bytes
+        MediaDownloadError: If the URL answers with an HTTP error status
+        Exception: If download fails (network error, timeout, etc.)
+        CircuitOpenError: If downloads from the URL's host keep failing
     """
+    if max_bytes is None:
+        max_bytes = media_size_limit(None, media_type)
+
+    # Cache work (SQLite, file I/O, hashing and copying the media) runs in
+    # threads, so it never stalls the runtime loop the downloads share
+    if MEDIA_CACHE_ENABLED:
+        cached = await asyncio.to_thread(_open_cached, url)
+        if cached is not None:
+            if len(cached) > max_bytes:
+                cached.close()
+                raise MediaTooLargeError(len(cached), max_bytes, url)
+            logger.debug(f"Using cached {media_type} ({len(cached)} bytes) for {url}")
+            return cached
+
+    media = MediaBuffer()
     try:
         logger.info(f"Downloading {media_type} from {url}")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=30) as response:
+        with get_breaker("media", urlparse(url).netloc or "download").guard():
+            async with get_http_session().get(url) as response:
                 if response.status != 200:
-                    raise Exception(f"Failed to download media: HTTP {response.status}")
-
-                media_data = await response.read()
-                logger.info(f"Downloaded {len(media_data)} bytes from {url}")
-                return media_data
+                    raise MediaDownloadError(
+                        response.status, f"Failed to download media: HTTP {response.status}"
+                    )
+                length = response.content_length
+                if isinstance(length, int) and length > max_bytes:
+                    raise MediaTooLargeError(length, max_bytes, url)
+
+                async for chunk in response.content.iter_chunked(MEDIA_DOWNLOAD_CHUNK_BYTES):
+                    if len(media) + len(chunk) > max_bytes:
+                        raise MediaTooLargeError(len(media) + len(chunk), max_bytes, url)
+                    media.write(chunk)
+        logger.info(f"Downloaded {len(media)} bytes from {url}")
+        if MEDIA_CACHE_ENABLED:
+            await asyncio.to_thread(get_media_cache().put, media.view(), url=url)
+        return media
 
     except asyncio.TimeoutError:
+        media.close()
         logger.error(f"Timeout downloading media from {url}")
         raise Exception(f"Download timed out for {url}")
+    except MediaTooLargeError as e:
+        media.close()
+        logger.warning(f"Skipping {media_type}: {e}")
+        raise
     except Exception as e:
+        media.close()
         logger.error(f"Error downloading media from {url}: {e}")
         raise
 
 
-async def upload_media_to_bluesky(media_data: bytes, mime_type: str, _alt_text: str = '') -> dict:
+async def download_media(url: str, media_type: str, max_bytes: Optional[int] = None) -> bytes:
+    """Download media from URL asynchronously.
+
+    Holds the whole media in memory; fetch_media() hands out a MediaBuffer
+    instead.
+
+    Args:
+        url: URL of the media to download
+        media_type: Type of media ('image' or 'video')
+        max_bytes: Size limit (default: the largest limit of any platform)
+
+    Returns:
+        bytes: Downloaded media data
+
+    Raises:
+        MediaTooLargeError: If the media exceeds max_bytes
+        Exception: If download fails (network error, 404, timeout, etc.)
+        CircuitOpenError: If downloads from the URL's host keep failing
+
+    Example:
+        >>> media_data = await download_media('https://example.com/photo.jpg', 'image')
+        >>> len(media_data)
+        12345
+    """
+    with await fetch_media(url, media_type, max_bytes=max_bytes) as media:
+        return bytes(media.view())
+
+
+async def upload_media_to_bluesky(
+    media_data, mime_type: str, _alt_text: str = '', client=None
+) -> dict:
     """Upload media to Bluesky and return blob reference.
 
     Args:
-        media_data: Binary media data
+        media_data: Binary media data (bytes, memoryview or MediaBuffer)
         mime_type: MIME type (e.g., 'image/jpeg', 'video/mp4')
         _alt_text: Alternative text description for accessibility (optional, reserved for future use)
+        client: Logged-in Bluesky client to upload with (default: module-level client)
 
     Returns:
         dict: Blob reference with metadata from Bluesky
 
     Raises:
         Exception: If upload fails
+        CircuitOpenError: If Bluesky uploads are failing for everyone
 
     Example:
         >>> blob = await upload_media_to_bluesky(image_bytes, 'image/jpeg', 'Sunset')
         >>> blob['blob']['ref']
         {'$link': 'bafyreiabc...'}
     """
-    _init_clients()
+    if client is None:
+        _init_clients()
+        client = bsky_client
 
-    if bsky_client is None:
+    if client is None:
         raise Exception("Bluesky client not initialized")
 
+    if isinstance(media_data, MediaBuffer):
+        media_data = media_data.view()
+    account = _bluesky_account(client) if MEDIA_CACHE_ENABLED else None
+    digest = None
+    if account:
+        # Hashing the media and the cache query block, so they run in a thread
+        digest = await asyncio.to_thread(media_digest, media_data)
+        blob = await asyncio.to_thread(get_media_cache().get_upload, digest, "bluesky", account)
+        if blob is not None:
+            logger.debug(f"Reusing Bluesky blob {digest[:12]} of {account}")
+            return models.ComAtprotoRepoUploadBlob.Response(blob=blob)
+
     try:
         logger.info(f"Uploading {len(media_data)} bytes to Bluesky (mime: {mime_type})")
 
-        # Upload blob to Bluesky
-        blob_response = bsky_client.com.atproto.repo.upload_blob(media_data)
+        # Upload blob to Bluesky (the client sends bytes, one copy within the size limit).
+        # The client blocks, so it runs in a thread and uploads of a post overlap.
+        with get_breaker("bluesky", "upload").guard():
+            blob_response = await asyncio.to_thread(
+                client.com.atproto.repo.upload_blob, _as_bytes(media_data)
+            )
 
         logger.info(f"Successfully uploaded media to Bluesky")
+        if account:
+            blob = getattr(blob_response, "blob", None)
+            blob = blob.model_dump(by_alias=True, mode="json") if hasattr(blob, "model_dump") else None
+            if isinstance(blob, dict):
+                await asyncio.to_thread(
+                    get_media_cache().save_upload,
+                    digest, "bluesky", account, blob, MEDIA_CACHE_BLOB_TTL_SECONDS,
+                )
         return blob_response
 
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"Failed to upload media to Bluesky: {e}")
         raise Exception(f"Failed to upload media to Bluesky: {e}")
 
 
-def upload_media_to_twitter(media_data: bytes, mime_type: str) -> str:
+def upload_media_to_twitter(
+    media_data, mime_type: str, api=None, account: Optional[str] = None
+) -> str:
     """Upload media to Twitter and return media ID.
 
     Args:
-        media_data: Binary media data
+        media_data: Binary media data (bytes, memoryview or MediaBuffer;
+            a MediaBuffer is uploaded from its file without copying)
         mime_type: MIME type (e.g., 'image/jpeg', 'video/mp4')
+        api: tweepy API (v1.1) to upload with (default: module-level API)
+        account: Username of api's account; media IDs are only reused
+            when it is known (the module-level API is TWITTER_USERNAME's)
 
     Returns:
         str: Media ID string from Twitter
 
     Raises:
         Exception: If upload fails or Twitter API not configured
+        CircuitOpenError: If Twitter uploads are failing for everyone
 
     Example:
         >>> media_id = upload_media_to_twitter(image_bytes, 'image/jpeg')
         >>> media_id
         '1234567890123456789'
     """
-    _init_clients()
+    if api is None:
+        _init_clients()
+        api = twitter_api
+        account = account or TWITTER_USERNAME
 
-    if twitter_api is None:
+    if api is None:
         raise Exception("Twitter API not configured")
 
+    account = account if MEDIA_CACHE_ENABLED else None
+    if account:
+        digest = media_digest(media_data.view() if isinstance(media_data, MediaBuffer) else media_data)
+        media_id = get_media_cache().get_upload(digest, "twitter", account)
+        if media_id is not None:
+            logger.debug(f"Reusing Twitter media {media_id} of {account}")
+            return media_id
+
     try:
         logger.info(f"Uploading {len(media_data)} bytes to Twitter")
 
-        # Create a file-like object from bytes
-        media_file = io.BytesIO(media_data)
+        # tweepy reads a file object; a MediaBuffer is streamed from its own
+        if isinstance(media_data, MediaBuffer):
+            media_file = media_data.file()
+        else:
+            media_file = io.BytesIO(media_data)
 
-        # Upload media using tweepy
-        media = twitter_api.media_upload(filename="media", file=media_file)
+        # Upload media using tweepy; it picks chunked upload for GIFs and
+        # videos from the file name's extension
+        filename = "media" + (mimetypes.guess_extension(mime_type) or "")
+        options = {"chunked": True, "media_category": "tweet_video"} if mime_type.startswith("video/") else {}
+        with get_breaker("twitter", "upload").guard():
+            media = api.media_upload(filename=filename, file=media_file, **options)
 
         logger.info(f"Successfully uploaded media to Twitter: {media.media_id_string}")
+        if account:
+            # Uploads report how long their media ID stays usable
+            ttl = getattr(media, "expires_after_secs", None)
+            if not isinstance(ttl, int):
+                ttl = MEDIA_CACHE_MEDIA_ID_TTL_SECONDS
+            get_media_cache().save_upload(digest, "twitter", account, media.media_id_string, ttl)
         return media.media_id_string
 
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"Failed to upload media to Twitter: {e}")
         raise Exception(f"Failed to upload media to Twitter: {e}")
@@ -218,6 +529,47 @@ def get_mime_type(url: str) -> str:
     return 'application/octet-stream'
 
 
+async def fit_image_to_platform(media_data, mime_type: str, platform: str):
+    """Re-encode an image over a platform's size limit so that it fits.
+
+    The encoding runs in the media transformer's process pool. Failures are
+    logged and the original is returned, so validate_media_size() decides.
+
+    Args:
+        media_data: Binary media data (bytes, memoryview or MediaBuffer)
+        mime_type: MIME type of media_data
+        platform: Target platform ('bluesky' or 'twitter')
+
+    Returns:
+        tuple: (data, mime_type) - the re-encoded image, or media_data and
+        mime_type unchanged if it fits, is not a still image or transforms
+        are disabled
+
+    Example:
+        >>> data, mime = await fit_image_to_platform(photo, 'image/png', 'bluesky')
+        >>> len(data) <= BLUESKY_IMAGE_LIMIT
+        True
+    """
+    limit = media_size_limit(platform, 'image')
+    if not MEDIA_TRANSFORM_ENABLED or not mime_type.startswith('image/') or len(media_data) <= limit:
+        return media_data, mime_type
+
+    data = media_data.view() if isinstance(media_data, MediaBuffer) else media_data
+    try:
+        result = await get_media_transformer().fit(data, limit)
+    except Exception as e:
+        logger.warning(f"Could not fit {len(media_data)} byte image into the {platform} limit: {e}")
+        return media_data, mime_type
+    if result is None:
+        return media_data, mime_type
+
+    logger.info(
+        f"Re-encoded image for {platform}: {len(media_data)} -> {len(result.data)} bytes "
+        f"({result.width}x{result.height}, quality {result.quality})"
+    )
+    return result.data, result.mime_type
+
+
 def validate_media_size(data: bytes, platform: str) -> bool:
     """Validate media size against platform limits.
 
@@ -288,3 +640,217 @@ def should_process_media(media_urls: list, max_count: int = 4) -> bool:
         logger.warning(f"Too many media items ({len(media_urls)}), limiting to {max_count}")
 
     return True
+
+
+# Attachments a post can carry on either platform (or one video)
+MAX_ATTACHMENTS = 4
+# Bluesky image CDN, for records that only carry blob refs (e.g. from Jetstream)
+BLUESKY_CDN_URL = 'https://cdn.bsky.app/img/feed_fullsize/plain'
+
+
+@dataclass
+class UploadedMedia:
+    """An attachment uploaded to the target platform."""
+
+    media_type: str  # 'image' or 'video'
+    mime_type: str
+    ref: Any  # Bluesky BlobRef or Twitter media ID
+    alt: str = ''
+    size: int = 0
+
+
+def _field(obj, name: str, attr: str = None):
+    """Read a field from an embed given as a dict or an atproto model."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, attr or name, None)
+
+
+def _text(value) -> str:
+    return value if isinstance(value, str) else ''
+
+
+def twitter_attachments(tweet) -> List[dict]:
+    """Attachments of a twscrape tweet, as outbox item media entries.
+
+    Photos are taken as they are, videos in their highest-bitrate MP4
+    variant and GIFs as the MP4 Twitter converted them to. twscrape does
+    not report alt text, so the entries carry it only if a newer version
+    exposes it.
+
+    Args:
+        tweet: twscrape Tweet (anything without a media attribute has none)
+
+    Returns:
+        list: {'url', 'type', 'mime_type', 'alt'} dicts, in tweet order
+    """
+    media = getattr(tweet, 'media', None)
+    attachments = []
+
+    photos = getattr(media, 'photos', None)
+    for photo in photos if isinstance(photos, list) else ():
+        url = getattr(photo, 'url', None)
+        if isinstance(url, str):
+            attachments.append({
+                'url': url, 'type': 'image', 'mime_type': get_mime_type(url),
+                'alt': _text(getattr(photo, 'altText', None)),
+            })
+
+    videos = getattr(media, 'videos', None)
+    for video in videos if isinstance(videos, list) else ():
+        variants = [
+            variant for variant in getattr(video, 'variants', None) or ()
+            if getattr(variant, 'contentType', None) == 'video/mp4'
+            and isinstance(getattr(variant, 'url', None), str)
+        ]
+        if variants:
+            best = max(variants, key=lambda variant: getattr(variant, 'bitrate', 0) or 0)
+            attachments.append({'url': best.url, 'type': 'video', 'mime_type': 'video/mp4', 'alt': ''})
+
+    animated = getattr(media, 'animated', None)
+    for gif in animated if isinstance(animated, list) else ():
+        url = getattr(gif, 'videoUrl', None)
+        if isinstance(url, str):
+            attachments.append({'url': url, 'type': 'video', 'mime_type': 'video/mp4', 'alt': ''})
+
+    return attachments
+
+
+def bluesky_attachments(embed, did: Optional[str] = None) -> List[dict]:
+    """Image attachments of a Bluesky post embed, as outbox item media entries.
+
+    Reads feed views (fullsize image URLs) as well as post records, whose
+    blob refs are turned into CDN URLs with the author's DID. Videos are
+    only served as HLS playlists and are not mirrored.
+
+    Args:
+        embed: Post embed (images or record-with-media), dict or atproto model
+        did: DID of the post's author, needed for records
+
+    Returns:
+        list: {'url', 'type', 'mime_type', 'alt'} dicts, in post order
+    """
+    # A quote post with media keeps the media one level down
+    media = _field(embed, 'media') or embed
+    images = _field(media, 'images')
+    attachments = []
+    for image in images if isinstance(images, (list, tuple)) else ():
+        url = _field(image, 'fullsize')
+        if not isinstance(url, str):
+            ref = _field(_field(image, 'image'), 'ref')
+            cid = _field(ref, '$link', 'link')
+            url = f"{BLUESKY_CDN_URL}/{did}/{cid}@jpeg" if isinstance(cid, str) and did else None
+        if url:
+            # The CDN serves JPEG whatever was uploaded
+            attachments.append({
+                'url': url, 'type': 'image', 'mime_type': 'image/jpeg',
+                'alt': _text(_field(image, 'alt')),
+            })
+    return attachments
+
+
+def _select_attachments(attachments: list) -> list:
+    """Attachments one post can carry: up to MAX_ATTACHMENTS images, or one video."""
+    if not should_process_media(attachments, MAX_ATTACHMENTS):
+        return []
+    images = [item for item in attachments if item.get('type') != 'video']
+    if images:
+        return images[:MAX_ATTACHMENTS]
+    return attachments[:1]
+
+
+async def _sync_attachment(attachment: dict, platform: str, semaphore: asyncio.Semaphore,
+                           client=None, api=None, account: Optional[str] = None) -> UploadedMedia:
+    """Download, fit and upload one attachment."""
+    url = attachment['url']
+    media_type = attachment.get('type', 'image')
+    mime_type = attachment.get('mime_type') or get_mime_type(url)
+    alt = _text(attachment.get('alt'))
+    # Images may be larger than the target accepts as long as they can be re-encoded
+    limit = media_size_limit(
+        None if media_type == 'image' and MEDIA_TRANSFORM_ENABLED else platform, media_type
+    )
+
+    async with semaphore:
+        with await fetch_media(url, media_type, max_bytes=limit) as media:
+            data, mime_type = await fit_image_to_platform(media, mime_type, platform)
+            if len(data) > media_size_limit(platform, media_type):
+                raise MediaTooLargeError(len(data), media_size_limit(platform, media_type), url)
+
+            if platform == 'bluesky':
+                response = await upload_media_to_bluesky(data, mime_type, alt, client=client)
+                ref = response.blob
+            else:
+                ref = await asyncio.to_thread(
+                    upload_media_to_twitter, data, mime_type, api=api, account=account
+                )
+                if alt and api is not None:
+                    with get_breaker('twitter', 'upload').guard():
+                        await asyncio.to_thread(api.create_media_metadata, ref, alt[:1000])
+            return UploadedMedia(media_type, mime_type, ref, alt, len(data))
+
+
+async def sync_post_media(attachments, platform: str, client=None, api=None,
+                          account: Optional[str] = None) -> List[UploadedMedia]:
+    """Mirror a post's attachments to the target platform.
+
+    Every attachment is downloaded, re-encoded if it is too large and
+    uploaded concurrently with the others (at most MEDIA_POST_CONCURRENCY
+    at a time), so a post takes about as long as its slowest attachment.
+    An attachment that cannot be mirrored (gone, too large, rejected) is
+    left out; the post goes out with the rest.
+
+    Args:
+        attachments: The post's media entries (twitter_attachments() /
+            bluesky_attachments() format)
+        platform: Target platform ('bluesky' or 'twitter')
+        client: Logged-in Bluesky client to upload with
+        api: tweepy API (v1.1) to upload with
+        account: Username of api's account (see upload_media_to_twitter())
+
+    Returns:
+        list: UploadedMedia of the mirrored attachments, in post order
+
+    Raises:
+        CircuitOpenError: If a media host or the upload endpoint is down;
+            the post should be retried later rather than lose its media
+    """
+    if not MEDIA_SYNC_ENABLED or not isinstance(attachments, list):
+        return []
+    selected = _select_attachments(attachments)
+    if not selected:
+        return []
+
+    semaphore = asyncio.Semaphore(max(1, MEDIA_POST_CONCURRENCY))
+    results = await asyncio.gather(
+        *(
+            _sync_attachment(attachment, platform, semaphore, client=client, api=api, account=account)
+            for attachment in selected
+        ),
+        return_exceptions=True,
+    )
+
+    uploaded = []
+    for attachment, result in zip(selected, results):
+        if isinstance(result, CircuitOpenError):
+            raise result
+        if isinstance(result, BaseException):
+            logger.warning(f"Leaving out {attachment.get('type', 'media')} {attachment['url']}: {result}")
+        else:
+            uploaded.append(result)
+    return uploaded
+
+
+def bluesky_embed(media: List[UploadedMedia]):
+    """Bluesky post embed of uploaded media (images, or else one video), or None."""
+    images = [item for item in media if item.media_type == 'image']
+    if images:
+        return models.AppBskyEmbedImages.Main(
+            images=[models.AppBskyEmbedImages.Image(alt=item.alt, image=item.ref) for item in images]
+        )
+    videos = [item for item in media if item.media_type == 'video']
+    if videos:
+        return models.AppBskyEmbedVideo.Main(video=videos[0].ref, alt=videos[0].alt or None)
+    return None
@@ -12,10 +12,22 @@ Requirements:
 import tweepy
 from typing import List, Optional, Dict
 from app.core.logger import setup_logger
+from app.services.circuit_breaker import get_breaker
+from app.services.rate_limiter import get_rate_limiter
 
 logger = setup_logger(__name__)
 
 
+def classify_twitter_request(method: str, url: str) -> str:
+    """Rate-limit class of a Twitter API v2 call."""
+    method = method.upper()
+    if method == "DELETE":
+        return "delete"
+    if method == "POST" and url.split("?")[0].rstrip("/").endswith("/2/tweets"):
+        return "post"
+    return "read"
+
+
 class TwitterAPIHandler:
     """
     Twitter API v2 handler for posting tweets.
@@ -49,9 +61,20 @@ class TwitterAPIHandler:
                 access_token=access_token,
                 access_token_secret=access_secret
             )
+            self._access_token = access_token
+            self._credentials = (api_key, api_secret, access_token, access_secret)
+            self._api_v1 = None
+            # Learn the real limits from every response of this client
+            self.client.session.hooks["response"].append(
+                get_rate_limiter().observer("twitter", access_token, classify_twitter_request)
+            )
 
             # Verify credentials work
-            self.client.get_me()
+            with get_breaker("twitter", "read").guard():
+                me = self.client.get_me()
+            # Account ID the uploaded media IDs belong to (see upload_media_to_twitter())
+            user_id = getattr(getattr(me, "data", None), "id", None)
+            self.account = str(user_id) if isinstance(user_id, (int, str)) else None
             logger.info("Twitter API authentication successful")
 
         except Exception as e:
@@ -71,17 +94,21 @@ class TwitterAPIHandler:
 
         Raises:
             ValueError: If content exceeds 280 characters
+            RateLimitExceeded: If the account's post budget stays exhausted
+            CircuitOpenError: If Twitter posting is failing for everyone
             tweepy.TweepyException: If posting fails
         """
         if len(content) > 280:
             raise ValueError(f"Tweet content exceeds 280 characters: {len(content)}")
 
         try:
+            get_rate_limiter().acquire("twitter", "post", credential=self._access_token)
             # Post tweet
-            response = self.client.create_tweet(
-                text=content,
-                media_ids=media_ids
-            )
+            with get_breaker("twitter", "post").guard():
+                response = self.client.create_tweet(
+                    text=content,
+                    media_ids=media_ids
+                )
 
             tweet_id = str(response.data['id'])
             logger.info(f"Tweet posted successfully: {tweet_id}")
@@ -91,6 +118,13 @@ class TwitterAPIHandler:
             logger.error(f"Failed to post tweet: {e}")
             raise
 
+    @property
+    def api_v1(self) -> tweepy.API:
+        """API v1.1 client of the same account (media uploads need it)"""
+        if self._api_v1 is None:
+            self._api_v1 = tweepy.API(tweepy.OAuth1UserHandler(*self._credentials))
+        return self._api_v1
+
     def upload_media(self, media_path: str, api_v1: tweepy.API) -> str:
         """
         Upload media file to Twitter (requires API v1.1).
@@ -12,11 +12,15 @@ Key features:
 """
 
 import asyncio
-from typing import List
-from twscrape import API
+from typing import List, Optional
 from db_handler import is_tweet_seen, mark_tweet_as_seen
 from config import TWITTER_USERNAME
+from app.core.async_runtime import run_sync
+from app.core.config import THREAD_LOOKUP_BATCH_SIZE, THREAD_MAX_TWEETS
 from app.core.logger import setup_logger
+from app.core.thread_cache import ThreadGraph, get_thread_cache
+from app.services.circuit_breaker import CircuitOpenError, get_breaker
+from app.services.scraper_pool import get_scraper_pool
 
 logger = setup_logger(__name__)
 
@@ -43,59 +47,104 @@ class TweetAdapter:
         return f"TweetAdapter(id={self.id}, text='{self.text[:50]}...')"
 
 
-async def _fetch_tweets_async(count: int = 5) -> List[TweetAdapter]:
+async def _get_api(credentials: dict = None):
+    """Get the process-wide twscrape API, loading the user's account if given."""
+    return await get_scraper_pool().get_api(credentials)
+
+
+async def _fetch_tweets_async(
+    count: int = 5,
+    username: str = None,
+    credentials: dict = None,
+    since_id: str = None,
+) -> List[TweetAdapter]:
     """Async implementation to fetch tweets using twscrape.
 
     This function uses twscrape to scrape recent tweets from the configured
-    Twitter username. It filters out already-seen tweets and marks new ones
-    as seen in the database.
+    Twitter username. Without a high-water mark it filters out already-seen
+    tweets and marks new ones as seen in the database.
 
     Args:
         count: Maximum number of tweets to fetch (default: 5)
+        username: Twitter account to fetch (default: TWITTER_USERNAME)
+        credentials: Scraping credentials to add to the shared account pool
+        since_id: High-water mark; when given, every tweet newer than it is
+            fetched instead of a fixed count, however many there are
 
     Returns:
         List of TweetAdapter objects containing unseen tweets
 
     Note:
-        - Requires twscrape account pool to be set up (one-time manual setup)
+        - Requires an account in the twscrape pool (added once from credentials)
         - No rate limiting needed (scraping-based approach)
         - Filters replies and retweets automatically via search query
     """
-    # Initialize twscrape API
-    api = API()
+    # Shared twscrape API (accounts are loaded and logged in only once)
+    api = await _get_api(credentials)
 
     # Build search query to fetch tweets from specific user
     # -filter:replies excludes reply tweets
     # -filter:retweets excludes retweets
-    query = f"from:{TWITTER_USERNAME} -filter:replies -filter:retweets"
+    query = f"from:{username or TWITTER_USERNAME} -filter:replies -filter:retweets"
+
+    # With a high-water mark, page back until the mark instead of taking a
+    # fixed window, so bursts are not cut off and quiet accounts stop early
+    limit = count
+    if since_id:
+        # The search ends at the mark by itself; a cap would skip the
+        # older part of a burst for good once the mark moves past it
+        query += f" since_id:{since_id}"
+        limit = -1
 
     # Fetch tweets using twscrape
     tweets = []
     try:
-        # Use gather to collect tweets from async generator
-        # Limit results to the requested count
-        async for tweet in api.search(query, limit=count):
-            tweets.append(tweet)
-            if len(tweets) >= count:
-                break
+        with get_breaker("twitter", "scrape").guard():
+            # Search results come newest first; twscrape pages until the limit (-1: none)
+            async for tweet in api.search(query, limit=limit):
+                if since_id and int(tweet.id) <= int(since_id):
+                    break
+                tweets.append(tweet)
+                if 0 < limit <= len(tweets):
+                    break
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping tweet fetch: {e}")
+        return []
     except Exception as e:
         logger.error(f"Error fetching tweets from twscrape: {e}")
         return []
 
-    # Filter out already-seen tweets
+    if since_id:
+        # The high-water mark already bounds the window and only moves past
+        # handled tweets; marking them seen here would hide any that fail to
+        # post from every later fetch
+        return [TweetAdapter(tweet) for tweet in tweets]
+
+    if not tweets:
+        return []
+    # The seen table is SQLite, so the whole batch runs in one worker
+    # thread instead of blocking the shared loop once per tweet
+    return await asyncio.to_thread(_take_unseen, tweets)
+
+
+def _take_unseen(tweets: list) -> List[TweetAdapter]:
+    """Adapters of the tweets not seen before, marking them as seen."""
     unseen_tweets = []
     for tweet in tweets:
         if not is_tweet_seen(tweet.id):
             # Wrap in adapter for compatibility
-            adapted_tweet = TweetAdapter(tweet)
-            unseen_tweets.append(adapted_tweet)
+            unseen_tweets.append(TweetAdapter(tweet))
             # Mark as seen in database
             mark_tweet_as_seen(tweet.id)
-
     return unseen_tweets
 
 
-def fetch_tweets(count: int = 5) -> List[TweetAdapter]:
+def fetch_tweets(
+    count: int = 5,
+    username: str = None,
+    credentials: dict = None,
+    since_id: str = None,
+) -> List[TweetAdapter]:
     """Fetch recent tweets using twscrape (synchronous wrapper).
 
     This is the main entry point for fetching tweets. It provides a synchronous
@@ -104,6 +153,9 @@ def fetch_tweets(count: int = 5) -> List[TweetAdapter]:
 
     Args:
         count: Maximum number of tweets to fetch (default: 5)
+        username: Twitter account to fetch (default: TWITTER_USERNAME)
+        credentials: Scraping credentials to add to the shared account pool
+        since_id: High-water mark; fetch every tweet newer than it
 
     Returns:
         List of TweetAdapter objects containing unseen tweets.
@@ -115,20 +167,10 @@ def fetch_tweets(count: int = 5) -> List[TweetAdapter]:
         ...     print(f"Tweet {tweet.id}: {tweet.text}")
 
     Note:
-        This function uses asyncio.run() to execute the async implementation
-        in a synchronous context, making it compatible with non-async code.
+        The coroutine runs on the shared async runtime loop, so repeated
+        calls reuse the same event loop instead of creating one per call.
     """
-    # Run the async function using asyncio.run for sync compatibility
-    try:
-        return asyncio.run(_fetch_tweets_async(count))
-    except RuntimeError as e:
-        # Handle case where event loop is already running
-        # This can happen in some environments (e.g., Jupyter notebooks)
-        if "asyncio.run() cannot be called from a running event loop" in str(e):
-            # Get the current event loop and run the coroutine
-            loop = asyncio.get_event_loop()
-            return loop.run_until_complete(_fetch_tweets_async(count))
-        raise
+    return run_sync(_fetch_tweets_async(count, username, credentials, since_id))
 
 
 async def is_thread(tweet) -> bool:
@@ -152,93 +194,155 @@ async def is_thread(tweet) -> bool:
     return tweet.inReplyToTweetId is not None
 
 
-async def fetch_thread(tweet_id: str, username: str) -> list:
+def _conversation_id(tweet) -> Optional[int]:
+    """Conversation (root tweet) ID reported by twscrape, if any."""
+    value = getattr(tweet, "conversationId", None)
+    if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+        return int(value)
+    return None
+
+
+def _parent_id(tweet) -> Optional[int]:
+    parent = tweet.inReplyToTweetId
+    return int(parent) if parent is not None else None
+
+
+def _same_author(tweet, username: str) -> bool:
+    return str(tweet.user.username).lower() == username.lower()
+
+
+async def _lookup_tweets(api, tweet_ids) -> dict:
+    """Fetch tweets by ID, up to THREAD_LOOKUP_BATCH_SIZE tweet_details calls at once.
+
+    tweet_details takes a single ID and returns the tweet, or None if it is
+    deleted or protected; those IDs are missing from the result.
+    """
+    ids = sorted({int(tweet_id) for tweet_id in tweet_ids})
+    found = {}
+    for start in range(0, len(ids), THREAD_LOOKUP_BATCH_SIZE):
+        batch = ids[start:start + THREAD_LOOKUP_BATCH_SIZE]
+        tweets = await asyncio.gather(*(api.tweet_details(tweet_id) for tweet_id in batch))
+        for tweet_id, tweet in zip(batch, tweets):
+            if tweet is not None:
+                found[tweet_id] = tweet
+    return found
+
+
+async def _fill_parents(api, graph: dict, username: str):
+    """Look up the author's parent tweets missing from the graph, one batch per level."""
+    unavailable = set()
+    for _ in range(THREAD_MAX_TWEETS):
+        missing = {
+            _parent_id(tweet) for tweet in graph.values()
+            if _parent_id(tweet) is not None
+        } - graph.keys() - unavailable
+        if not missing:
+            return
+        for tweet_id, parent in (await _lookup_tweets(api, missing)).items():
+            if _same_author(parent, username):
+                graph[tweet_id] = parent
+        # Deleted, protected or someone else's: the thread starts below them
+        unavailable |= missing - graph.keys()
+
+
+def _root_id(graph: dict, tweet_id: int) -> int:
+    """Oldest ancestor of a tweet present in the graph."""
+    parent = _parent_id(graph[tweet_id])
+    while parent is not None and parent in graph:
+        tweet_id = parent
+        parent = _parent_id(graph[tweet_id])
+    return tweet_id
+
+
+def _thread_from(graph: dict, root_id: int, username: str) -> list:
+    """The author's tweets whose reply chain leads to the root, oldest first."""
+    in_thread = {root_id}
+    # Tweet IDs grow over time, so parents are visited before their replies
+    for tweet_id in sorted(graph):
+        tweet = graph[tweet_id]
+        if _parent_id(tweet) in in_thread and _same_author(tweet, username):
+            in_thread.add(tweet_id)
+    return [graph[tweet_id] for tweet_id in sorted(in_thread)]
+
+
+async def fetch_thread(tweet_id: str, username: str, tweet=None) -> list:
     """Fetch all tweets in a thread, ordered chronologically.
 
-    This function retrieves a complete thread starting from the given tweet ID.
-    It follows the reply chain to get all connected tweets in chronological order.
+    This function retrieves a complete thread starting from the given tweet ID:
+
+    1. The author's replies in the tweet's conversation come from a single
+       conversation_id search instead of walking the chain tweet by tweet.
+    2. Parents missing from the results (e.g. the root, or tweets the
+       search index skipped) are looked up in batches, one round per level.
+    3. The known tweets of the conversation are cached (see
+       app/core/thread_cache.py), so expanding a growing thread again only
+       searches for replies newer than the newest known one.
 
     Args:
         tweet_id: The ID of a tweet in the thread (can be any tweet in the chain)
         username: The username of the thread author
+        tweet: The tweet itself if already fetched (saves its lookup)
 
     Returns:
         list: List of tweet objects in chronological order (oldest to newest)
 
     Note:
-        - Limited to 10 tweets maximum to avoid rate limiting issues
-        - Handles deleted tweets gracefully by skipping them
-        - Uses tweet_details API to fetch individual tweets by ID
+        - Limited to THREAD_MAX_TWEETS tweets
+        - Handles deleted tweets gracefully by starting the thread below them
+        - Only the author's own replies belong to the thread
 
     Example:
         >>> thread = await fetch_thread("123456789", "elonmusk")
         >>> for tweet in thread:
         ...     print(tweet.text)
     """
-    api = API()
-    thread_tweets = []
+    api = await _get_api()
+    cache = get_thread_cache()
 
     try:
-        # Fetch the initial tweet to start building the thread
-        tweet_ids = [int(tweet_id)]
-        fetched_tweet = None
-
-        async for tweet in api.tweet_details(tweet_ids):
-            fetched_tweet = tweet
-            break
-
-        if not fetched_tweet:
-            logger.warning(f"Could not fetch initial tweet {tweet_id}")
-            return []
-
-        # Start building thread from this tweet
-        thread_tweets.append(fetched_tweet)
-
-        # Follow reply chain backwards to find the root tweet
-        current_tweet = fetched_tweet
-        max_iterations = 10  # Limit to prevent infinite loops
-
-        while current_tweet.inReplyToTweetId and max_iterations > 0:
-            reply_id = current_tweet.inReplyToTweetId
-            parent_found = False
-
-            async for parent_tweet in api.tweet_details([int(reply_id)]):
-                # Check if parent is by same author (self-reply = thread)
-                if parent_tweet.user.username.lower() == username.lower():
-                    thread_tweets.insert(0, parent_tweet)  # Add to beginning
-                    current_tweet = parent_tweet
-                    parent_found = True
-                break
-
-            if not parent_found:
-                # Parent tweet not found or not by same author
-                break
-
-            max_iterations -= 1
-
-        # Now follow forward to get any replies after the initial tweet
-        # Search for replies to the root tweet
-        # Fetch potential replies using search
-        query = f"from:{username} to:{username}"
-        reply_count = 0
-        max_replies = 10 - len(thread_tweets)  # Keep total under 10
-
-        async for reply in api.search(query, limit=max_replies):
-            # Check if this is a reply in our thread chain
-            if reply.inReplyToTweetId and reply.inReplyToTweetId in [t.id for t in thread_tweets]:
-                # Add to thread if not already present
-                if reply.id not in [t.id for t in thread_tweets]:
-                    thread_tweets.append(reply)
-                    reply_count += 1
-
-            if reply_count >= max_replies:
-                break
-
-        # Sort by ID to ensure chronological order (tweet IDs are sequential)
-        thread_tweets.sort(key=lambda t: t.id)
-
-        # Limit to 10 tweets maximum
-        thread_tweets = thread_tweets[:10]
+        start_id = int(tweet_id)
+        with get_breaker("twitter", "scrape").guard():
+            graph = {}
+            conversation_id = cache.conversation_of(username, start_id)
+            if conversation_id is None:
+                if tweet is None or int(tweet.id) != start_id:
+                    tweet = (await _lookup_tweets(api, [start_id])).get(start_id)
+                if tweet is None:
+                    logger.warning(f"Could not fetch initial tweet {tweet_id}")
+                    return []
+                graph[start_id] = tweet
+                conversation_id = _conversation_id(tweet)
+
+            known = cache.get(username, conversation_id) if conversation_id else None
+            if known is not None:
+                graph = {**known.tweets, **graph}
+            if start_id not in graph:
+                # Cached conversation evicted between the two lookups
+                tweet = (await _lookup_tweets(api, [start_id])).get(start_id)
+                if tweet is None:
+                    return []
+                graph[start_id] = tweet
+
+            if conversation_id is None:
+                # No conversation ID on the tweet: the root's ID is the
+                # conversation's ID, so walk up to it first
+                await _fill_parents(api, graph, username)
+                conversation_id = _root_id(graph, start_id)
+
+            # Every reply of the author in the conversation (newer than the
+            # cached ones), in one search
+            query = f"conversation_id:{conversation_id} from:{username}"
+            if known is not None and known.newest_id:
+                query += f" since_id:{known.newest_id}"
+            async for reply in api.search(query, limit=THREAD_MAX_TWEETS):
+                graph.setdefault(int(reply.id), reply)
+
+            # Replies whose parents the search did not return
+            await _fill_parents(api, graph, username)
+            root_id = _root_id(graph, start_id)
+
+        cache.put(username, ThreadGraph(conversation_id, graph))
+        thread_tweets = _thread_from(graph, root_id, username)[:THREAD_MAX_TWEETS]
 
         logger.info(f"Fetched thread with {len(thread_tweets)} tweets")
         return thread_tweets
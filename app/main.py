@@ -1,13 +1,19 @@
-import time
 import asyncio
+import time
 import os
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from types import SimpleNamespace
+from typing import Optional
 from twitter_scraper import fetch_tweets, is_thread, fetch_thread
 from bluesky_handler import (
     post_to_bluesky,
     post_thread_to_bluesky,
     login_to_bluesky,
+    create_bluesky_client,
     fetch_posts_from_bluesky,
+    resolve_did,
 )
 from twitter_handler import post_to_twitter
 from config import POLL_INTERVAL, TWITTER_USERNAME, BSKY_USERNAME, TWITTER_API_KEY
@@ -17,14 +23,43 @@ from config import (
     TWITTER_EMAIL_PASSWORD,
     BSKY_PASSWORD,
 )
-from db_handler import migrate_database, should_sync_post, save_synced_post
+from db_handler import (
+    migrate_database,
+    should_sync_post,
+    save_synced_post,
+    should_sync_post_many,
+    warm_dedup_cache,
+    get_sync_cursor,
+    save_sync_cursor,
+    add_stats_tables,
+)
 from validation import validate_credentials
+from app.core.async_runtime import run_sync
+from app.core.config import (
+    JETSTREAM_ENABLED,
+    PIPELINE_ENRICH_CONCURRENCY,
+    PIPELINE_POST_CONCURRENCY,
+    SCHEDULER_MAX_SLEEP,
+    SYNC_MAX_CONCURRENT_USERS,
+)
 from app.core.logger import setup_logger
+from app.core.utils import compute_content_hash
 
 # Sprint 6: Multi-user support imports
 from app.auth.user_manager import UserManager
 from app.auth.credential_manager import CredentialManager
 from app.services.user_settings import UserSettings
+from app.services.circuit_breaker import get_breaker
+from app.services.jetstream import JetstreamConsumer
+from app.services.sync_executor import get_sync_executor
+from app.services.sync_scheduler import SyncScheduler
+from app.services.sync_leases import SyncLeases
+from app.services.sync_outbox import DrainResult, PartialPostError, SyncOutbox
+from app.services.sync_pipeline import Stage, SyncPipeline
+from app.integrations.bluesky_handler import ThreadPostError
+from app.integrations.media_handler import bluesky_embed, sync_post_media, twitter_attachments
+from app.integrations.twitter_api_handler import TwitterAPIHandler
+from app.services.stats_handler import StatsTracker
 from app.auth.security_utils import log_audit
 
 logger = setup_logger(__name__)
@@ -35,6 +70,73 @@ DB_PATH = "chirpsyncer.db"
 # Feature flag for multi-user mode (backward compatible)
 MULTI_USER_ENABLED = os.getenv("MULTI_USER_ENABLED", "false").lower() == "true"
 
+# Worker mode: several sync processes share the users through leases
+SYNC_WORKER_MODE = os.getenv("SYNC_WORKER_MODE", "false").lower() == "true"
+
+# Push-based Bluesky ingestion (JETSTREAM_ENABLED); None while only polling
+_jetstream: Optional[JetstreamConsumer] = None
+_stream_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _newest_tweet_id(tweets):
+    """Newest tweet ID of a fetched timeline, or None if it is empty."""
+    ids = [int(tweet.id) for tweet in tweets]
+    return str(max(ids)) if ids else None
+
+
+def _since_id(account: str, db_path=None):
+    """High-water tweet ID stored for an account, if any."""
+    cursor = get_sync_cursor(account, "twitter", db_path=db_path)
+    return cursor["last_id"] if cursor else None
+
+
+def _save_timeline_cursor(account: str, platform: str, items, db_path=None, failed=()):
+    """
+    Move an account's high-water mark to the newest handled item.
+
+    Every fetched item has been through dedup, so the next fetch only
+    needs what is newer. Items that failed to post must be fetched again,
+    so the mark stops below the oldest of them. Empty fetches leave the
+    mark untouched.
+
+    Args:
+        account: Account whose timeline was fetched
+        platform: 'twitter' or 'bluesky'
+        items: Fetched items (tweets, or Bluesky posts newest first)
+        db_path: Database path
+        failed: Fetched items that could not be posted
+    """
+    if failed:
+        if platform == "twitter":
+            oldest_failed = min(int(tweet.id) for tweet in failed)
+            items = [tweet for tweet in items if int(tweet.id) < oldest_failed]
+        else:
+            failed_uris = {post.uri for post in failed}
+            last = max(i for i, post in enumerate(items) if post.uri in failed_uris)
+            items = items[last + 1:]
+    if not items:
+        return
+    if platform == "twitter":
+        save_sync_cursor(account, "twitter", last_id=_newest_tweet_id(items), db_path=db_path)
+    else:
+        # Bluesky feeds come newest first
+        save_sync_cursor(
+            account,
+            "bluesky",
+            last_id=items[0].uri,
+            last_timestamp=items[0].indexed_at,
+            db_path=db_path,
+        )
+
+
+def _open_circuits(*circuits) -> list:
+    """Names of the given (platform, endpoint) circuits that are open."""
+    return [
+        f"{platform}:{endpoint}"
+        for platform, endpoint in circuits
+        if get_breaker(platform, endpoint).is_open()
+    ]
+
 
 def sync_twitter_to_bluesky():
     """
@@ -45,24 +147,29 @@ def sync_twitter_to_bluesky():
     Supports thread detection and posting.
     """
     logger.info("Starting Twitter → Bluesky sync...")
-    tweets = fetch_tweets()
+    open_circuits = _open_circuits(("twitter", "scrape"), ("bluesky", "write"))
+    if open_circuits:
+        logger.warning(f"Circuit open ({', '.join(open_circuits)}), skipping Twitter → Bluesky")
+        return
+    tweets = fetch_tweets(since_id=_since_id(TWITTER_USERNAME))
 
     synced_count = 0
     skipped_count = 0
+    failed = []
 
     for tweet in tweets:
         # Check if should sync using new DB function
         if should_sync_post(tweet.text, "twitter", tweet.id):
             # Handle threads
             try:
-                is_thread_result = asyncio.run(is_thread(tweet._tweet))
+                is_thread_result = run_sync(is_thread(tweet._tweet))
 
                 if is_thread_result:
                     logger.info(
                         f"Thread detected for tweet {tweet.id}, fetching full thread..."
                     )
                     # Fetch the complete thread
-                    thread = asyncio.run(fetch_thread(str(tweet.id), TWITTER_USERNAME))
+                    thread = run_sync(fetch_thread(str(tweet.id), TWITTER_USERNAME))
 
                     if thread and len(thread) > 0:
                         logger.info(
@@ -72,9 +179,12 @@ def sync_twitter_to_bluesky():
                         from twitter_scraper import TweetAdapter
 
                         adapted_thread = [TweetAdapter(t) for t in thread]
-                        bluesky_uris = post_thread_to_bluesky(adapted_thread)
+                        try:
+                            bluesky_uris, error = post_thread_to_bluesky(adapted_thread), None
+                        except ThreadPostError as e:
+                            bluesky_uris, error = e.posted, e
 
-                        # Save each tweet in thread
+                        # Save each posted tweet in thread (the posted part if it stopped)
                         for t, uri in zip(thread, bluesky_uris):
                             # Get text from thread tweet
                             tweet_text = t.text if hasattr(t, "text") else str(t)
@@ -87,6 +197,8 @@ def sync_twitter_to_bluesky():
                                 synced_to="bluesky",
                                 content=tweet_text,
                             )
+                        if error is not None:
+                            raise error
                         synced_count += len(thread)
                         logger.info(f"Synced thread ({len(thread)} tweets) to Bluesky")
                     else:
@@ -133,12 +245,16 @@ def sync_twitter_to_bluesky():
                     logger.info(f"Synced tweet {tweet.id} to Bluesky (fallback)")
                 except Exception as post_error:
                     logger.error(f"Failed to post tweet {tweet.id}: {post_error}")
+                    failed.append(tweet)
         else:
             skipped_count += 1
             logger.debug(
                 f"Skipped tweet {tweet.id} (already synced or duplicate content)"
             )
 
+    # Failed tweets are fetched again next cycle
+    _save_timeline_cursor(TWITTER_USERNAME, "twitter", tweets, failed=failed)
+
     logger.info(
         f"Twitter → Bluesky sync complete: {synced_count} synced, {skipped_count} skipped"
     )
@@ -162,10 +278,17 @@ def sync_bluesky_to_twitter():
         return
 
     logger.info("Starting Bluesky → Twitter sync...")
-    posts = fetch_posts_from_bluesky(BSKY_USERNAME, count=10)
+    open_circuits = _open_circuits(("bluesky", "read"), ("twitter", "post"))
+    if open_circuits:
+        logger.warning(f"Circuit open ({', '.join(open_circuits)}), skipping Bluesky → Twitter")
+        return
+    posts = fetch_posts_from_bluesky(
+        BSKY_USERNAME, count=10, since=get_sync_cursor(BSKY_USERNAME, "bluesky")
+    )
 
     synced_count = 0
     skipped_count = 0
+    failed = []
 
     for post in posts:
         # Check if should sync
@@ -190,12 +313,16 @@ def sync_bluesky_to_twitter():
 
             except Exception as e:
                 logger.error(f"Failed to sync Bluesky post {post.uri} to Twitter: {e}")
+                failed.append(post)
         else:
             skipped_count += 1
             logger.debug(
                 f"Skipped Bluesky post {post.uri} (already synced or duplicate content)"
             )
 
+    # Failed posts are fetched again next cycle
+    _save_timeline_cursor(BSKY_USERNAME, "bluesky", posts, failed=failed)
+
     logger.info(
         f"Bluesky → Twitter sync complete: {synced_count} synced, {skipped_count} skipped"
     )
@@ -236,6 +363,8 @@ def init_multi_user_system():
     - Users and sessions (UserManager)
     - Encrypted credentials (CredentialManager)
     - User settings (UserSettings)
+    - Posts waiting to be mirrored (SyncOutbox)
+    - Sync statistics (sync_stats)
     """
     logger.info("Initializing multi-user system...")
 
@@ -256,6 +385,14 @@ def init_multi_user_system():
         settings_manager.init_db()
         logger.info("✓ User settings tables initialized")
 
+        # Initialize the sync outbox
+        get_outbox().init_db()
+        logger.info("✓ Sync outbox initialized")
+
+        # Per-post sync statistics (sync_stats)
+        add_stats_tables(DB_PATH)
+        logger.info("✓ Sync stats tables initialized")
+
         logger.info("Multi-user system initialized successfully")
 
     except Exception as e:
@@ -390,148 +527,410 @@ def ensure_admin_user():
         raise
 
 
-def sync_user_twitter_to_bluesky(user, twitter_creds: dict, bluesky_creds: dict):
+def get_outbox() -> SyncOutbox:
+    """Sync outbox of the multi-user database."""
+    return SyncOutbox(db_path=DB_PATH)
+
+
+def _outbox_records(job, posted_ids: list, media_counts: list = None) -> list:
+    """
+    synced_posts records of a posted outbox job (one per posted item).
+
+    Each record also carries the number of attachments mirrored with its
+    item (media_count), for the sync statistics.
+    """
+    if len(posted_ids) != len(job.items):
+        raise RuntimeError(f"{len(posted_ids)} posts for {len(job.items)} job items")
+    records = []
+    media_counts = media_counts or [0] * len(job.items)
+    for item, posted_id, media_count in zip(job.items, posted_ids, media_counts):
+        if job.source == "twitter":
+            twitter_id, bluesky_uri = item["id"], posted_id
+        else:
+            twitter_id, bluesky_uri = posted_id, item["id"]
+        records.append(
+            {
+                "twitter_id": str(twitter_id) if twitter_id is not None else None,
+                "bluesky_uri": bluesky_uri,
+                "source": job.source,
+                "synced_to": job.target,
+                "content": item["text"],
+                "user_id": job.user_id,
+                "media_count": media_count,
+            }
+        )
+    return records
+
+
+def _with_media(item: dict, media) -> dict:
+    """Outbox item with its attachments (media_handler entries), if it has any."""
+    if isinstance(media, list) and media:
+        item["media"] = media
+    return item
+
+
+def _thread_item(tweet) -> dict:
+    """Outbox item of a twscrape thread tweet (full text is in rawContent)."""
+    text = getattr(tweet, "rawContent", None)
+    if not isinstance(text, str):
+        text = tweet.text
+    return _with_media({"id": str(tweet.id), "text": text}, twitter_attachments(tweet))
+
+
+async def _job_media(job, platform: str, **upload) -> list:
+    """
+    Mirror the attachments of every item of an outbox job.
+
+    All attachments of the job are handled at once, so a media post takes
+    about as long as its slowest attachment.
+
+    Args:
+        job: Outbox job
+        platform: Platform to upload to
+        **upload: Upload clients for sync_post_media()
+
+    Returns:
+        One list of UploadedMedia per job item
+    """
+    if not any(item.get("media") for item in job.items):
+        return [[] for _ in job.items]
+    return await asyncio.gather(
+        *(sync_post_media(item.get("media"), platform, **upload) for item in job.items)
+    )
+
+
+async def _post_job_to_bluesky(job, bluesky_client) -> list:
+    """Post an outbox job (tweet or thread) to Bluesky, with its media."""
+    media = await _job_media(job, "bluesky", client=bluesky_client)
+    embeds = [bluesky_embed(uploaded) for uploaded in media]
+    media_counts = [len(uploaded) for uploaded in media]
+    # Rest of a thread that stopped midway, chained under its last posted post
+    reply_to = job.items[0].get("reply_to")
+    # The Bluesky client blocks, so posting runs in a worker thread
+    if job.is_thread or reply_to:
+        logger.info(f"Posting thread ({len(job.items)} tweets) to Bluesky")
+        tweets = [SimpleNamespace(id=item["id"], text=item["text"]) for item in job.items]
+        for tweet, embed in zip(tweets, embeds):
+            if embed is not None:
+                tweet.embed = embed
+        try:
+            bluesky_uris = await asyncio.to_thread(
+                post_thread_to_bluesky, tweets, client=bluesky_client, reply_to=reply_to
+            )
+        except ThreadPostError as e:
+            posted = len(e.posted)
+            remaining = [dict(item) for item in job.items[posted:]]
+            remaining[0]["reply_to"] = {"root": e.root, "parent": e.parent}
+            records = _outbox_records(
+                replace(job, items=job.items[:posted]), e.posted, media_counts[:posted]
+            )
+            raise PartialPostError(records, remaining, e.error) from e
+    elif embeds[0] is not None:
+        bluesky_uris = [
+            await asyncio.to_thread(
+                post_to_bluesky, job.items[0]["text"], client=bluesky_client, embed=embeds[0]
+            )
+        ]
+    else:
+        bluesky_uris = [
+            await asyncio.to_thread(post_to_bluesky, job.items[0]["text"], client=bluesky_client)
+        ]
+    return _outbox_records(job, bluesky_uris, media_counts)
+
+
+async def _post_job_to_twitter(job, twitter_client) -> list:
+    """Post an outbox job (Bluesky post) to Twitter, with its media."""
+    media = []
+    if job.items[0].get("media"):
+        media = (await _job_media(
+            job, "twitter", api=twitter_client.api_v1, account=twitter_client.account
+        ))[0]
+    # tweepy blocks, so posting runs in a worker thread
+    if media:
+        tweet_id = await asyncio.to_thread(
+            twitter_client.post_tweet,
+            job.items[0]["text"],
+            media_ids=[uploaded.ref for uploaded in media],
+        )
+    else:
+        tweet_id = await asyncio.to_thread(twitter_client.post_tweet, job.items[0]["text"])
+    return _outbox_records(job, [tweet_id], [len(media)])
+
+
+def _job_keys(items) -> set:
+    """Dedup keys (post IDs and content hashes) of outbox job items."""
+    return {key for item in items for key in (item["id"], compute_content_hash(item["text"]))}
+
+
+def _run_user_pipeline(
+    user, source: str, target: str, fetch, dedup, to_job, post, enrich_concurrency: int = 1
+):
+    """
+    Sync one direction for a user as a staged pipeline.
+
+    fetch -> dedup -> enrich -> enqueue -> post -> record. Fetched items that
+    survive dedup become outbox jobs; the enqueue stage claims the user's
+    due jobs (retries from earlier cycles included), so posting overlaps
+    with enriching later items. Every posting attempt is recorded in
+    sync_stats with its media count and duration (media included).
+
+    Jobs are enqueued in fetch order even though several items are enriched
+    at once, so the thread of a reply is queued before its root shows up on
+    its own. Items of a job that this run already queued, or that are
+    already synced, are trimmed from it; a job with nothing left is skipped.
+
+    A fetched item is handled once dedup skipped it or its job is in the
+    outbox; from then on the outbox retries it, so the timeline mark may
+    move past it. Items dropped before that (e.g. a failed enrich) are
+    returned so the mark stops below them.
+
+    Args:
+        user: User object with user.id
+        source: Platform the items are fetched from
+        target: Platform to post to
+        fetch: Returns the fetched items
+        dedup: Returns one needs-sync flag per fetched item
+        to_job: item -> outbox job items (the item, or its whole thread); may be async
+        post: Coroutine function posting an outbox job; returns its synced_posts
+            records. It runs on the runtime loop, so uploads it awaits never
+            wait on a blocked stage thread
+        enrich_concurrency: Workers of the enrich stage
+
+    Returns:
+        (DrainResult, number of skipped items, fetched items not handled)
+    """
+    outbox = get_outbox()
+    stats = StatsTracker(db_path=DB_PATH)
+    result = DrainResult()
+    queued_keys = set()
+    skipped = 0
+    # Fetched items not yet skipped or queued, by identity
+    unhandled = {}
+    # Enriched jobs waiting for the ones fetched before them, by fetch position
+    ready = {}
+    next_position = 0
+
+    def dedup_stage(items):
+        nonlocal skipped
+        fresh = [item for item, needs_sync in zip(items, dedup(items)) if needs_sync]
+        skipped += len(items) - len(fresh)
+        unhandled.update((id(item), item) for item in fresh)
+        return list(enumerate(fresh))
+
+    async def enrich_stage(entry):
+        position, item = entry
+        try:
+            if asyncio.iscoroutinefunction(to_job):
+                items = await to_job(item)
+            else:
+                items = await asyncio.to_thread(to_job, item)
+        except Exception as e:
+            # Passed on without a job, so the jobs after it are not held up
+            logger.error(f"[User {user.id}] Could not prepare {source} item: {e}")
+            items = None
+        return position, item, items
+
+    def queue_job(fetched, items):
+        nonlocal skipped
+        if items is None:
+            # Not prepared: stays unhandled, so the mark stops below it
+            return
+        # Posts already queued in this run (e.g. a root queued with its reply's thread)
+        items = [item for item in items if queued_keys.isdisjoint(_job_keys([item]))]
+        if len(items) > 1:
+            # Thread tweets other than the fetched one have not been deduped yet
+            needs_sync = should_sync_post_many(
+                [(item["text"], item["id"]) for item in items], source, db_path=DB_PATH
+            )
+            items = [item for item, needed in zip(items, needs_sync) if needed]
+        if items:
+            outbox.enqueue_many(user.id, source, target, [items])
+            queued_keys.update(_job_keys(items))
+        else:
+            skipped += 1
+        unhandled.pop(id(fetched), None)
+
+    def enqueue_stage(entry):
+        nonlocal next_position
+        position, fetched, items = entry
+        ready[position] = (fetched, items)
+        while next_position in ready:
+            queue_job(*ready.pop(next_position))
+            next_position += 1
+        return outbox.claim(user.id, target)
+
+    async def post_stage(job):
+        start = time.perf_counter()
+        try:
+            records, error = await post(job), None
+        except Exception as e:
+            records, error = None, e
+        return job, records, error, (time.perf_counter() - start) * 1000
+
+    def record_stage(posted):
+        job, records, error, elapsed_ms = posted
+        outbox.settle(job, result, records=records, error=error)
+        stats.record_sync(
+            source,
+            target,
+            error is None,
+            media_count=sum(record.get("media_count", 0) for record in records or ()),
+            is_thread=job.is_thread,
+            duration_ms=round(elapsed_ms),
+            user_id=user.id,
+        )
+
+    name = f"{source}_to_{target}"
+    pipeline = SyncPipeline(
+        name,
+        [
+            Stage("fetch", lambda _: fetch(), fail_fast=True),
+            Stage("dedup", dedup_stage, fan_out=True, fail_fast=True),
+            Stage("enrich", enrich_stage, concurrency=enrich_concurrency),
+            Stage("enqueue", enqueue_stage, fan_out=True, fail_fast=True),
+            Stage("post", post_stage, concurrency=PIPELINE_POST_CONCURRENCY),
+            Stage("record", record_stage, fail_fast=True),
+        ],
+    )
+    run_sync(pipeline.run([user]))
+
+    # Due jobs nothing new was enqueued for (e.g. retries on a quiet timeline)
+    leftovers = outbox.claim(user.id, target)
+    if leftovers:
+        run_sync(SyncPipeline(name, pipeline.stages[-2:]).run(leftovers))
+    return result, skipped, list(unhandled.values())
+
+
+def sync_user_twitter_to_bluesky(
+    user, twitter_creds: dict, bluesky_creds: dict, bluesky_client=None
+):
     """
     Sync Twitter → Bluesky for a specific user.
 
+    All platform access goes through the user's own clients, so several
+    users can be synced concurrently. New tweets (and their threads) are
+    queued in the sync outbox and posted through the staged pipeline,
+    along with retries left over from earlier cycles.
+
     Args:
         user: User object with user.id and user.username
         twitter_creds: Twitter credentials dict (username, password, email, email_password)
         bluesky_creds: Bluesky credentials dict (username, password)
+        bluesky_client: Logged-in Bluesky client for this user (created if omitted)
     """
     logger.info(f"[User {user.username}] Starting Twitter → Bluesky sync...")
 
-    # Temporarily override global config with user's credentials
-    # (This is a workaround until we refactor the entire codebase to be credential-aware)
-    import app.core.config as config_module
-
-    original_twitter_username = config_module.TWITTER_USERNAME
-    original_bsky_username = config_module.BSKY_USERNAME
-    original_bsky_password = config_module.BSKY_PASSWORD
+    # Fail fast while either platform is down; queued jobs wait in the outbox
+    open_circuits = _open_circuits(("twitter", "scrape"), ("bluesky", "write"))
+    if open_circuits:
+        logger.warning(
+            f"[User {user.username}] Circuit open ({', '.join(open_circuits)}), "
+            f"skipping Twitter → Bluesky"
+        )
+        return
 
     try:
-        # Set user's credentials
-        config_module.TWITTER_USERNAME = twitter_creds.get("username")
-        config_module.BSKY_USERNAME = bluesky_creds.get("username")
-        config_module.BSKY_PASSWORD = bluesky_creds.get("password")
-
         # Login to Bluesky with user's credentials
-        login_to_bluesky()
-
-        # Fetch tweets with user's credentials
-        tweets = fetch_tweets()
+        if bluesky_client is None:
+            bluesky_client = create_bluesky_client(
+                bluesky_creds.get("username"), bluesky_creds.get("password")
+            )
 
-        synced_count = 0
-        skipped_count = 0
+        twitter_username = twitter_creds.get("username")
+        tweets = []
 
-        for tweet in tweets:
-            # Check if should sync (now with user_id context)
-            if should_sync_post(tweet.text, "twitter", tweet.id, db_path=DB_PATH):
-                try:
-                    is_thread_result = asyncio.run(is_thread(tweet._tweet))
-
-                    if is_thread_result:
-                        logger.info(
-                            f"[User {user.username}] Thread detected for tweet {tweet.id}"
-                        )
-                        thread = asyncio.run(
-                            fetch_thread(str(tweet.id), twitter_creds.get("username"))
-                        )
+        def fetch():
+            # Every tweet newer than the account's high-water mark
+            tweets.extend(
+                fetch_tweets(
+                    username=twitter_username,
+                    credentials=twitter_creds,
+                    since_id=_since_id(twitter_username, db_path=DB_PATH),
+                )
+            )
+            return list(tweets)
 
-                        if thread and len(thread) > 0:
-                            logger.info(
-                                f"[User {user.username}] Posting thread ({len(thread)} tweets)"
-                            )
-                            from twitter_scraper import TweetAdapter
-
-                            adapted_thread = [TweetAdapter(t) for t in thread]
-                            bluesky_uris = post_thread_to_bluesky(adapted_thread)
-
-                            for t, uri in zip(thread, bluesky_uris):
-                                tweet_text = t.text if hasattr(t, "text") else str(t)
-                                tweet_id = t.id if hasattr(t, "id") else str(t)
-
-                                save_synced_post(
-                                    twitter_id=str(tweet_id),
-                                    bluesky_uri=uri,
-                                    source="twitter",
-                                    synced_to="bluesky",
-                                    content=tweet_text,
-                                    db_path=DB_PATH,
-                                )
-
-                            synced_count += len(thread)
-                        else:
-                            # Fallback to single tweet
-                            bluesky_uri = post_to_bluesky(tweet.text)
-                            save_synced_post(
-                                twitter_id=tweet.id,
-                                bluesky_uri=bluesky_uri,
-                                source="twitter",
-                                synced_to="bluesky",
-                                content=tweet.text,
-                                db_path=DB_PATH,
-                            )
-                            synced_count += 1
-                    else:
-                        # Single tweet
-                        bluesky_uri = post_to_bluesky(tweet.text)
-                        save_synced_post(
-                            twitter_id=tweet.id,
-                            bluesky_uri=bluesky_uri,
-                            source="twitter",
-                            synced_to="bluesky",
-                            content=tweet.text,
-                            db_path=DB_PATH,
-                        )
-                        synced_count += 1
+        def dedup(fetched):
+            # Duplicates of the whole timeline are resolved in one query
+            return should_sync_post_many(
+                [(tweet.text, tweet.id) for tweet in fetched], "twitter", db_path=DB_PATH
+            )
 
-                except Exception as e:
-                    logger.error(
-                        f"[User {user.username}] Error processing tweet {tweet.id}: {e}"
+        async def expand_thread(tweet):
+            items = [
+                _with_media(
+                    {"id": str(tweet.id), "text": tweet.text},
+                    twitter_attachments(getattr(tweet, "_tweet", None)),
+                )
+            ]
+            try:
+                if await is_thread(tweet._tweet):
+                    logger.info(f"[User {user.username}] Thread detected for tweet {tweet.id}")
+                    thread = await fetch_thread(
+                        str(tweet.id), twitter_username, tweet=tweet._tweet
                     )
-                    # Try fallback
-                    try:
-                        bluesky_uri = post_to_bluesky(tweet.text)
-                        save_synced_post(
-                            twitter_id=tweet.id,
-                            bluesky_uri=bluesky_uri,
-                            source="twitter",
-                            synced_to="bluesky",
-                            content=tweet.text,
-                            db_path=DB_PATH,
-                        )
-                        synced_count += 1
-                    except Exception as post_error:
-                        logger.error(
-                            f"[User {user.username}] Failed to post tweet {tweet.id}: {post_error}"
-                        )
-            else:
-                skipped_count += 1
+                    if thread:
+                        items = [_thread_item(t) for t in thread]
+            except Exception as e:
+                # Fall back to posting the tweet on its own
+                logger.error(
+                    f"[User {user.username}] Error expanding thread for tweet {tweet.id}: {e}"
+                )
+            return items
+
+        result, skipped_count, unhandled = _run_user_pipeline(
+            user,
+            "twitter",
+            "bluesky",
+            fetch,
+            dedup,
+            expand_thread,
+            lambda job: _post_job_to_bluesky(job, bluesky_client),
+            enrich_concurrency=PIPELINE_ENRICH_CONCURRENCY,
+        )
+        # Only past what dedup skipped or the outbox holds; a failed
+        # pipeline leaves the mark alone
+        _save_timeline_cursor(
+            twitter_username, "twitter", tweets, db_path=DB_PATH, failed=unhandled
+        )
 
         logger.info(
-            f"[User {user.username}] Twitter → Bluesky: {synced_count} synced, {skipped_count} skipped"
+            f"[User {user.username}] Twitter → Bluesky: {result.posted} synced, "
+            f"{skipped_count} skipped, {result.failed} to retry, {result.deferred} deferred, "
+            f"{result.dead} dead-lettered"
         )
 
     except Exception as e:
         logger.error(f"[User {user.username}] Error in Twitter → Bluesky sync: {e}")
         raise
 
-    finally:
-        # Restore original credentials
-        config_module.TWITTER_USERNAME = original_twitter_username
-        config_module.BSKY_USERNAME = original_bsky_username
-        config_module.BSKY_PASSWORD = original_bsky_password
-
 
-def sync_user_bluesky_to_twitter(user, twitter_api_creds: dict, bluesky_creds: dict):
+def sync_user_bluesky_to_twitter(
+    user,
+    twitter_api_creds: dict,
+    bluesky_creds: dict,
+    bluesky_client=None,
+    twitter_client=None,
+    posts=None,
+):
     """
     Sync Bluesky → Twitter for a specific user.
 
+    New posts are queued in the sync outbox and posted through the staged
+    pipeline, along with retries left over from earlier cycles.
+
     Args:
         user: User object with user.id and user.username
         twitter_api_creds: Twitter API credentials dict (api_key, api_secret, access_token, access_secret)
         bluesky_creds: Bluesky credentials dict (username, password)
+        bluesky_client: Logged-in Bluesky client for this user (created if omitted)
+        twitter_client: TwitterAPIHandler for this user (created if omitted)
+        posts: Posts pushed by the Jetstream stream; the feed is not fetched
+            when given (an empty list only posts the queued jobs)
+
+    Returns:
+        True if the sync ran and every fetched post reached the outbox or
+        was a duplicate, False if it was skipped or left posts behind
     """
     logger.info(f"[User {user.username}] Starting Bluesky → Twitter sync...")
 
@@ -540,74 +939,221 @@ def sync_user_bluesky_to_twitter(user, twitter_api_creds: dict, bluesky_creds: d
         logger.debug(
             f"[User {user.username}] Twitter API credentials not configured. Skipping."
         )
-        return
-
-    # Temporarily override global config with user's credentials
-    import app.core.config as config_module
-
-    original_bsky_username = config_module.BSKY_USERNAME
-    original_twitter_api_key = config_module.TWITTER_API_KEY
+        return False
+
+    # Fail fast while either platform is down; queued jobs wait in the outbox
+    open_circuits = _open_circuits(("bluesky", "read"), ("twitter", "post"))
+    if open_circuits:
+        logger.warning(
+            f"[User {user.username}] Circuit open ({', '.join(open_circuits)}), "
+            f"skipping Bluesky → Twitter"
+        )
+        return False
 
     try:
-        # Set user's credentials
-        config_module.BSKY_USERNAME = bluesky_creds.get("username")
-        config_module.TWITTER_API_KEY = twitter_api_creds.get("api_key")
-
-        # Fetch Bluesky posts
-        posts = fetch_posts_from_bluesky(bluesky_creds.get("username"), count=10)
-
-        synced_count = 0
-        skipped_count = 0
-
-        for post in posts:
-            if should_sync_post(post.text, "bluesky", post.uri, db_path=DB_PATH):
-                try:
-                    tweet_id = post_to_twitter(post.text)
+        if bluesky_client is None and posts is None:
+            bluesky_client = create_bluesky_client(
+                bluesky_creds.get("username"), bluesky_creds.get("password")
+            )
+        if twitter_client is None:
+            twitter_client = TwitterAPIHandler(
+                api_key=twitter_api_creds.get("api_key"),
+                api_secret=twitter_api_creds.get("api_secret"),
+                access_token=twitter_api_creds.get("access_token"),
+                access_secret=twitter_api_creds.get("access_secret"),
+            )
 
-                    save_synced_post(
-                        twitter_id=tweet_id,
-                        bluesky_uri=post.uri,
-                        source="bluesky",
-                        synced_to="twitter",
-                        content=post.text,
-                        db_path=DB_PATH,
-                    )
+        bluesky_username = bluesky_creds.get("username")
+        fetched = []
+
+        def fetch():
+            if posts is not None:
+                fetched.extend(posts)
+                return list(fetched)
+            # Every Bluesky post newer than the account's high-water mark
+            fetched.extend(
+                fetch_posts_from_bluesky(
+                    bluesky_username,
+                    count=10,
+                    client=bluesky_client,
+                    since=get_sync_cursor(bluesky_username, "bluesky", db_path=DB_PATH),
+                )
+            )
+            return list(fetched)
 
-                    synced_count += 1
-                    logger.info(
-                        f"[User {user.username}] Synced Bluesky post {post.uri} to Twitter"
-                    )
+        def dedup(fetched):
+            # Duplicates of the whole feed are resolved in one query
+            return should_sync_post_many(
+                [(post.text, post.uri) for post in fetched], "bluesky", db_path=DB_PATH
+            )
 
-                except Exception as e:
-                    logger.error(
-                        f"[User {user.username}] Failed to sync post {post.uri}: {e}"
-                    )
-            else:
-                skipped_count += 1
+        def to_job(post):
+            return [_with_media({"id": post.uri, "text": post.text}, getattr(post, "media", None))]
+
+        result, skipped_count, unhandled = _run_user_pipeline(
+            user,
+            "bluesky",
+            "twitter",
+            fetch,
+            dedup,
+            to_job,
+            lambda job: _post_job_to_twitter(job, twitter_client),
+        )
+        # Pushed posts leave the mark alone; a later poll still sees
+        # anything the stream missed
+        if posts is None:
+            _save_timeline_cursor(
+                bluesky_username, "bluesky", fetched, db_path=DB_PATH, failed=unhandled
+            )
 
         logger.info(
-            f"[User {user.username}] Bluesky → Twitter: {synced_count} synced, {skipped_count} skipped"
+            f"[User {user.username}] Bluesky → Twitter: {result.posted} synced, "
+            f"{skipped_count} skipped, {result.failed} to retry, {result.deferred} deferred, "
+            f"{result.dead} dead-lettered"
         )
+        return not unhandled
 
     except Exception as e:
         logger.error(f"[User {user.username}] Error in Bluesky → Twitter sync: {e}")
         raise
 
-    finally:
-        # Restore original credentials
-        config_module.BSKY_USERNAME = original_bsky_username
-        config_module.TWITTER_API_KEY = original_twitter_api_key
+
+def sync_user(user, cred_manager, settings_manager) -> bool:
+    """
+    Sync one user in both directions.
+
+    Loads the user's settings and credentials and runs each enabled
+    direction with the user's own clients. A failure in one direction is
+    logged and audited without stopping the other.
+
+    Args:
+        user: User object with user.id and user.username
+        cred_manager: CredentialManager to load the user's credentials from
+        settings_manager: UserSettings to load the user's settings from
+
+    Returns:
+        True if the user was synced, False if skipped (no Bluesky credentials)
+    """
+    logger.info(f"Syncing user: {user.username} (ID: {user.id})")
+
+    # Get user settings
+    user_settings = settings_manager.get_all(user.id)
+
+    # Check if user has sync enabled
+    twitter_to_bluesky_enabled = user_settings.get("twitter_to_bluesky_enabled", True)
+    bluesky_to_twitter_enabled = user_settings.get("bluesky_to_twitter_enabled", True)
+
+    # Get user credentials
+    twitter_scraping_creds = cred_manager.get_credentials(user.id, "twitter", "scraping")
+    twitter_api_creds = cred_manager.get_credentials(user.id, "twitter", "api")
+    bluesky_creds = cred_manager.get_credentials(user.id, "bluesky", "api")
+
+    # Check if user has minimum required credentials
+    if not bluesky_creds:
+        logger.warning(f"[User {user.username}] No Bluesky credentials. Skipping.")
+        return False
+
+    # One Bluesky client per user, shared by both directions. The session
+    # store reuses the account's session across cycles.
+    bluesky_client = None
+
+    def get_bluesky_client():
+        nonlocal bluesky_client
+        if bluesky_client is None:
+            bluesky_client = create_bluesky_client(
+                bluesky_creds.get("username"),
+                bluesky_creds.get("password"),
+                user_id=user.id,
+                cred_manager=cred_manager,
+            )
+        return bluesky_client
+
+    # Sync Twitter → Bluesky (if enabled and credentials available)
+    if twitter_to_bluesky_enabled and twitter_scraping_creds:
+        try:
+            sync_user_twitter_to_bluesky(
+                user,
+                twitter_scraping_creds,
+                bluesky_creds,
+                bluesky_client=get_bluesky_client(),
+            )
+        except Exception as e:
+            logger.error(f"[User {user.username}] Twitter → Bluesky sync failed: {e}")
+            log_audit(
+                user.id,
+                "sync_error",
+                success=False,
+                details={"direction": "twitter_to_bluesky", "error": str(e)},
+                db_path=DB_PATH,
+            )
+    else:
+        if not twitter_to_bluesky_enabled:
+            logger.info(
+                f"[User {user.username}] Twitter → Bluesky sync disabled by user"
+            )
+        else:
+            logger.info(
+                f"[User {user.username}] No Twitter scraping credentials. Skipping Twitter → Bluesky"
+            )
+
+    # Sync Bluesky → Twitter (if enabled and API credentials available)
+    if bluesky_to_twitter_enabled and twitter_api_creds:
+        try:
+            if _jetstream is not None and _jetstream.tracks(user.id):
+                # New posts are pushed by the stream; only retry queued jobs
+                sync_user_bluesky_to_twitter(user, twitter_api_creds, bluesky_creds, posts=[])
+            else:
+                # A user the stream just started delivering is polled once
+                # more, for the posts made before it did
+                catch_up = _jetstream.start_catch_up(user.id) if _jetstream is not None else None
+                polled = sync_user_bluesky_to_twitter(
+                    user,
+                    twitter_api_creds,
+                    bluesky_creds,
+                    bluesky_client=get_bluesky_client(),
+                )
+                if polled and catch_up is not None:
+                    _jetstream.finish_catch_up(user.id, catch_up)
+        except Exception as e:
+            logger.error(f"[User {user.username}] Bluesky → Twitter sync failed: {e}")
+            log_audit(
+                user.id,
+                "sync_error",
+                success=False,
+                details={"direction": "bluesky_to_twitter", "error": str(e)},
+                db_path=DB_PATH,
+            )
+    else:
+        if not bluesky_to_twitter_enabled:
+            logger.info(
+                f"[User {user.username}] Bluesky → Twitter sync disabled by user"
+            )
+        else:
+            logger.info(
+                f"[User {user.username}] No Twitter API credentials. Skipping Bluesky → Twitter"
+            )
+
+    logger.info(f"[User {user.username}] Sync complete")
+    return True
 
 
-def sync_all_users():
+def sync_all_users(users=None, leases=None):
     """
     Sync all active users in multi-user mode.
 
-    Iterates through all active users and performs sync for each:
+    Runs sync_user() for every active user (or the given users) on the
+    shared SyncExecutor, up to SYNC_MAX_CONCURRENT_USERS at a time:
     1. Load user credentials from CredentialManager
     2. Run Twitter → Bluesky sync (if credentials available)
     3. Run Bluesky → Twitter sync (if Twitter API credentials available)
     4. Handle errors gracefully (one user's failure doesn't stop others)
+
+    Args:
+        users: Users to sync (defaults to every active user)
+        leases: SyncLeases of this worker; users whose lease was lost are skipped
+
+    Returns:
+        List of UserSyncResult (one per synced user, with timing)
     """
     logger.info("=" * 60)
     logger.info("MULTI-USER SYNC: Starting sync for all active users...")
@@ -619,121 +1165,143 @@ def sync_all_users():
     settings_manager = UserSettings(db_path=DB_PATH)
 
     # Get all active users
-    active_users = user_manager.list_users(active_only=True)
+    active_users = users if users is not None else user_manager.list_users(active_only=True)
 
     if not active_users:
         logger.warning("No active users found. Please create a user first.")
-        return
+        return []
 
     logger.info(f"Found {len(active_users)} active user(s) to sync")
 
+    def job(user):
+        if leases is not None and not leases.holds(user.id):
+            logger.warning(f"[User {user.username}] Lease lost to another worker. Skipping.")
+            return False
+        return sync_user(user, cred_manager, settings_manager)
+
+    start = time.perf_counter()
+    results = get_sync_executor().run(active_users, job)
+
     # Track overall stats
     total_users_synced = 0
     total_users_failed = 0
 
-    for user in active_users:
-        try:
-            logger.info("-" * 60)
-            logger.info(f"Syncing user: {user.username} (ID: {user.id})")
-            logger.info("-" * 60)
+    for result in results:
+        if result.success:
+            if result.result:
+                total_users_synced += 1
+            continue
+
+        total_users_failed += 1
+        log_audit(
+            result.user_id,
+            "sync_error",
+            success=False,
+            details={"error": result.error, "error_type": result.error_type},
+            db_path=DB_PATH,
+        )
 
-            # Get user settings
-            user_settings = settings_manager.get_all(user.id)
+    logger.info("=" * 60)
+    logger.info(
+        f"MULTI-USER SYNC COMPLETE: {total_users_synced} users synced, {total_users_failed} failed "
+        f"in {int((time.perf_counter() - start) * 1000)} ms"
+    )
+    logger.info("=" * 60)
+    return results
 
-            # Check if user has sync enabled
-            twitter_to_bluesky_enabled = user_settings.get(
-                "twitter_to_bluesky_enabled", True
-            )
-            bluesky_to_twitter_enabled = user_settings.get(
-                "bluesky_to_twitter_enabled", True
-            )
 
-            # Get user credentials
-            twitter_scraping_creds = cred_manager.get_credentials(
-                user.id, "twitter", "scraping"
-            )
-            twitter_api_creds = cred_manager.get_credentials(user.id, "twitter", "api")
-            bluesky_creds = cred_manager.get_credentials(user.id, "bluesky", "api")
+def run_due_syncs(scheduler: SyncScheduler, leases: SyncLeases = None):
+    """
+    Sync the active users whose adaptive polling interval has elapsed.
 
-            # Check if user has minimum required credentials
-            if not bluesky_creds:
-                logger.warning(
-                    f"[User {user.username}] No Bluesky credentials. Skipping."
-                )
-                continue
+    Args:
+        scheduler: SyncScheduler holding each user's next due time
+        leases: SyncLeases of this worker in worker mode; only the users
+            it holds a lease on are scheduled
 
-            # Sync Twitter → Bluesky (if enabled and credentials available)
-            if twitter_to_bluesky_enabled and twitter_scraping_creds:
-                try:
-                    sync_user_twitter_to_bluesky(
-                        user, twitter_scraping_creds, bluesky_creds
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"[User {user.username}] Twitter → Bluesky sync failed: {e}"
-                    )
-                    log_audit(
-                        user.id,
-                        "sync_error",
-                        success=False,
-                        details={"direction": "twitter_to_bluesky", "error": str(e)},
-                        db_path=DB_PATH,
-                    )
-            else:
-                if not twitter_to_bluesky_enabled:
-                    logger.info(
-                        f"[User {user.username}] Twitter → Bluesky sync disabled by user"
-                    )
-                else:
-                    logger.info(
-                        f"[User {user.username}] No Twitter scraping credentials. Skipping Twitter → Bluesky"
-                    )
+    Returns:
+        List of UserSyncResult for the users synced now
+    """
+    user_manager = UserManager(db_path=DB_PATH)
+    active_users = user_manager.list_users(active_only=True)
+    if leases is not None:
+        held = leases.rebalance(user.id for user in active_users)
+        active_users = [user for user in active_users if user.id in held]
+    if _jetstream is not None:
+        _track_stream_users(active_users)
+    scheduler.set_users(user.id for user in active_users)
+
+    due_ids = set(scheduler.pop_due())
+    due_users = [user for user in active_users if user.id in due_ids]
+    if not due_users:
+        return []
 
-            # Sync Bluesky → Twitter (if enabled and API credentials available)
-            if bluesky_to_twitter_enabled and twitter_api_creds:
-                try:
-                    sync_user_bluesky_to_twitter(user, twitter_api_creds, bluesky_creds)
-                except Exception as e:
-                    logger.error(
-                        f"[User {user.username}] Bluesky → Twitter sync failed: {e}"
-                    )
-                    log_audit(
-                        user.id,
-                        "sync_error",
-                        success=False,
-                        details={"direction": "bluesky_to_twitter", "error": str(e)},
-                        db_path=DB_PATH,
-                    )
-            else:
-                if not bluesky_to_twitter_enabled:
-                    logger.info(
-                        f"[User {user.username}] Bluesky → Twitter sync disabled by user"
-                    )
-                else:
-                    logger.info(
-                        f"[User {user.username}] No Twitter API credentials. Skipping Bluesky → Twitter"
-                    )
+    try:
+        return sync_all_users(due_users, leases=leases)
+    finally:
+        # Failed syncs are rescheduled too, so they back off like the rest
+        for user in due_users:
+            scheduler.reschedule(user.id)
 
-            total_users_synced += 1
-            logger.info(f"[User {user.username}] Sync complete")
 
+def _track_stream_users(users):
+    """
+    Point the Jetstream consumer at the users mirroring Bluesky → Twitter.
+
+    Args:
+        users: Active users of this process
+    """
+    cred_manager = CredentialManager(get_master_key(), db_path=DB_PATH)
+    settings_manager = UserSettings(db_path=DB_PATH)
+    dids = {}
+    for user in users:
+        if not settings_manager.get_all(user.id).get("bluesky_to_twitter_enabled", True):
+            continue
+        bluesky_creds = cred_manager.get_credentials(user.id, "bluesky", "api")
+        if not bluesky_creds or not cred_manager.get_credentials(user.id, "twitter", "api"):
+            continue
+        try:
+            dids[resolve_did(bluesky_creds.get("username"))] = user.id
         except Exception as e:
-            total_users_failed += 1
-            logger.error(f"Error syncing user {user.username}: {e}")
-            log_audit(
-                user.id,
-                "sync_error",
-                success=False,
-                details={"error": str(e), "error_type": type(e).__name__},
-                db_path=DB_PATH,
-            )
-            # Continue with next user
+            # Left to polling until the handle resolves
+            logger.warning(f"[User {user.username}] Could not resolve Bluesky DID: {e}")
+    _jetstream.set_dids(dids)
 
-    logger.info("=" * 60)
-    logger.info(
-        f"MULTI-USER SYNC COMPLETE: {total_users_synced} users synced, {total_users_failed} failed"
-    )
-    logger.info("=" * 60)
+
+def _enqueue_stream_posts(user_id: int, posts):
+    """
+    Queue posts pushed by the Jetstream stream in the sync outbox.
+
+    Returns once the posts are stored; posting to Twitter runs in the
+    stream pool so the stream is not held up by the Twitter API.
+
+    Args:
+        user_id: User the posts belong to
+        posts: New Bluesky posts of that user
+    """
+    flags = should_sync_post_many([(post.text, post.uri) for post in posts], "bluesky", db_path=DB_PATH)
+    jobs = [
+        [_with_media({"id": post.uri, "text": post.text}, getattr(post, "media", None))]
+        for post, new in zip(posts, flags)
+        if new
+    ]
+    if jobs and get_outbox().enqueue_many(user_id, "bluesky", "twitter", jobs):
+        _stream_pool.submit(_post_stream_jobs, user_id)
+
+
+def _post_stream_jobs(user_id: int):
+    """Post a user's queued Bluesky → Twitter jobs right away."""
+    try:
+        user = UserManager(db_path=DB_PATH).get_user_by_id(user_id)
+        cred_manager = CredentialManager(get_master_key(), db_path=DB_PATH)
+        twitter_api_creds = cred_manager.get_credentials(user_id, "twitter", "api")
+        if user is None or not twitter_api_creds:
+            return
+        bluesky_creds = cred_manager.get_credentials(user_id, "bluesky", "api") or {}
+        sync_user_bluesky_to_twitter(user, twitter_api_creds, bluesky_creds, posts=[])
+    except Exception as e:
+        # The jobs stay queued for the user's next sync
+        logger.error(f"[User {user_id}] Posting streamed Bluesky posts failed: {e}")
 
 
 def main():
@@ -753,9 +1321,17 @@ def main():
     2. Ensure admin user exists (create from .env if first run)
     3. Migrate database schema
     4. Run sync loop for ALL active users
+       - Each user is synced when their adaptive interval (SyncScheduler)
+         has elapsed, instead of all users every POLL_INTERVAL
        - Each user uses their own credentials from CredentialManager
        - Errors in one user don't affect others
+       - With SYNC_WORKER_MODE=true, this process only syncs the users it
+         holds a lease on (SyncLeases), so several workers can run at once
+       - With JETSTREAM_ENABLED=true, new Bluesky posts are pushed by the
+         Jetstream stream (JetstreamConsumer) instead of polled
     """
+    global _jetstream, _stream_pool
+
     logger.info("=" * 80)
     logger.info("ChirpSyncer - Twitter ↔ Bluesky Sync")
     logger.info("=" * 80)
@@ -770,6 +1346,7 @@ def main():
         try:
             # Migrate database schema
             migrate_database(db_path=DB_PATH)
+            warm_dedup_cache(db_path=DB_PATH)
 
             # Initialize multi-user system
             init_multi_user_system()
@@ -780,16 +1357,38 @@ def main():
             logger.info("Multi-user system ready")
             logger.info("=" * 80)
 
+            scheduler = SyncScheduler(db_path=DB_PATH)
+            scheduler.init_db()
+
+            leases = None
+            if SYNC_WORKER_MODE:
+                leases = SyncLeases(db_path=DB_PATH)
+                leases.init_db()
+                leases.heartbeat()
+                leases.start_heartbeat()
+                logger.info(f"WORKER MODE: worker {leases.worker_id}")
+
+            if JETSTREAM_ENABLED:
+                # New Bluesky posts are pushed instead of polled
+                _stream_pool = ThreadPoolExecutor(
+                    max_workers=SYNC_MAX_CONCURRENT_USERS, thread_name_prefix="jetstream-post"
+                )
+                _jetstream = JetstreamConsumer(_enqueue_stream_posts, db_path=DB_PATH)
+                _jetstream.start()
+                logger.info("JETSTREAM: ingesting Bluesky posts from the stream")
+
             # Main sync loop - multi-user mode
             while True:
                 try:
-                    # Sync all active users
-                    sync_all_users()
+                    # Sync the users that are due
+                    run_due_syncs(scheduler, leases=leases)
 
-                    logger.info(
-                        f"Sync cycle complete. Sleeping {POLL_INTERVAL/3600:.1f} hours..."
-                    )
-                    time.sleep(POLL_INTERVAL)
+                    # Wake up for the next due user, or periodically to
+                    # pick up new and deactivated users
+                    wait = scheduler.seconds_until_next()
+                    wait = SCHEDULER_MAX_SLEEP if wait is None else min(wait, SCHEDULER_MAX_SLEEP)
+                    logger.debug(f"Next scheduler check in {wait:.0f}s")
+                    time.sleep(max(wait, 1))
 
                 except KeyboardInterrupt:
                     logger.info("Shutting down gracefully...")
@@ -799,6 +1398,15 @@ def main():
                     logger.info("Waiting 1 minute before retry...")
                     time.sleep(60)
 
+            if _jetstream is not None:
+                _jetstream.stop()
+                _stream_pool.shutdown(wait=True)
+
+            if leases is not None:
+                # Hand this worker's users to the others right away
+                leases.stop_heartbeat()
+                leases.release_all()
+
         except Exception as e:
             logger.error(f"Failed to initialize multi-user system: {e}")
             logger.error("Please check your configuration and try again.")
@@ -815,6 +1423,7 @@ def main():
 
         # Migrate database schema (after validation passes)
         migrate_database(db_path=DB_PATH)
+        warm_dedup_cache(db_path=DB_PATH)
 
         # Login to Bluesky
         login_to_bluesky()
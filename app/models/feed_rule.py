@@ -1,6 +1,6 @@
-import sqlite3
 from dataclasses import dataclass
 from typing import List, Dict, Any
+from app.core.db_pool import get_connection
 
 
 @dataclass
@@ -17,7 +17,7 @@ class FeedRule:
 
 
 def init_feed_rules_db(db_path: str) -> None:
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     try:
         cursor = conn.cursor()
         cursor.execute(
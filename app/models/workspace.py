@@ -1,9 +1,10 @@
 import sqlite3
 import time
+from app.core.db_pool import get_connection
 
 
 def init_workspace_db(db_path: str) -> None:
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     try:
         cursor = conn.cursor()
         cursor.execute(
@@ -95,7 +96,7 @@ def init_workspace_db(db_path: str) -> None:
 
 
 def ensure_personal_workspace(db_path: str, user_id: int, username: str | None) -> int:
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     conn.row_factory = sqlite3.Row
     try:
         cursor = conn.cursor()
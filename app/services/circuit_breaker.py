@@ -0,0 +1,287 @@
+"""
+CircuitBreaker - Failing fast while a platform endpoint is degraded
+
+Every call to a platform endpoint (e.g. Bluesky writes, Twitter posts,
+media uploads) runs through the breaker of (platform, endpoint):
+
+- closed: calls pass. Outcomes are kept for CIRCUIT_WINDOW_SECONDS; when at
+  least CIRCUIT_MIN_CALLS were made and CIRCUIT_ERROR_THRESHOLD of them
+  failed or took longer than CIRCUIT_SLOW_CALL_SECONDS, the circuit opens.
+- open: calls raise CircuitOpenError at once, without touching the network
+  or the retry ladder, for CIRCUIT_OPEN_SECONDS.
+- half_open: a single probe call is let through. Success closes the
+  circuit, failure opens it again.
+
+Client errors (HTTP 4xx other than 408/429) say nothing about the
+platform's health, so they count as successful calls. Breakers are per
+process; each worker learns an outage from its own calls.
+
+Usage:
+    from app.services.circuit_breaker import get_breaker
+
+    with get_breaker("bluesky", "write").guard():
+        client.post(text)
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from app.core.config import (
+    CIRCUIT_ERROR_THRESHOLD,
+    CIRCUIT_MIN_CALLS,
+    CIRCUIT_OPEN_SECONDS,
+    CIRCUIT_SLOW_CALL_SECONDS,
+    CIRCUIT_WINDOW_SECONDS,
+)
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """The circuit of a platform endpoint is open; the call was not made."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit {name} is open, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def is_client_error(error: BaseException) -> bool:
+    """True for HTTP 4xx errors caused by the request rather than the platform."""
+    response = getattr(error, "response", None)
+    for status in (
+        getattr(response, "status_code", None),
+        getattr(response, "status", None),
+        getattr(error, "status", None),
+    ):
+        if isinstance(status, int):
+            return 400 <= status < 500 and status not in (408, 429)
+    return False
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker over a rolling window of call outcomes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        error_threshold: float = CIRCUIT_ERROR_THRESHOLD,
+        min_calls: int = CIRCUIT_MIN_CALLS,
+        window_seconds: float = CIRCUIT_WINDOW_SECONDS,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS,
+        slow_call_seconds: float = CIRCUIT_SLOW_CALL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize CircuitBreaker.
+
+        Args:
+            name: Breaker name, e.g. "bluesky:write"
+            error_threshold: Share of failed or slow calls that opens the circuit
+            min_calls: Calls needed in the window before the circuit can open
+            window_seconds: How long call outcomes are remembered
+            open_seconds: How long the circuit stays open before a probe
+            slow_call_seconds: Calls slower than this count as failures
+            clock: Monotonic time source (for tests)
+        """
+        self.name = name
+        self.error_threshold = error_threshold
+        self.min_calls = max(1, min_calls)
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._outcomes: deque = deque()  # (finished_at, bad)
+        self._stats = {"calls": 0, "failures": 0, "slow": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the wait is over."""
+        with self._lock:
+            return self._current_state(self._clock())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected (open, or half-open with a probe running)."""
+        with self._lock:
+            state = self._current_state(self._clock())
+            return state == OPEN or (state == HALF_OPEN and self._probing)
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a probe call through."""
+        with self._lock:
+            if self._current_state(self._clock()) != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.open_seconds - self._clock())
+
+    def before_call(self):
+        """
+        Admit a call or reject it.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a probe is already running
+        """
+        with self._lock:
+            now = self._clock()
+            state = self._current_state(now)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self._stats["rejected"] += 1
+            retry_after = max(0.0, self._opened_at + self.open_seconds - now)
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record(self, success: bool, elapsed: float = 0.0):
+        """
+        Record the outcome of an admitted call.
+
+        Args:
+            success: False if the call failed
+            elapsed: Call duration in seconds
+        """
+        slow = elapsed > self.slow_call_seconds
+        bad = not success or slow
+        with self._lock:
+            now = self._clock()
+            self._stats["calls"] += 1
+            self._stats["failures"] += int(not success)
+            self._stats["slow"] += int(slow)
+
+            state = self._current_state(now)
+            if state == HALF_OPEN:
+                self._probing = False
+                if bad:
+                    self._open(now, "probe call failed")
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    logger.info(f"Circuit {self.name} closed")
+                return
+            if state == OPEN:
+                # A call admitted before the circuit opened
+                return
+
+            self._outcomes.append((now, bad))
+            while self._outcomes and self._outcomes[0][0] <= now - self.window_seconds:
+                self._outcomes.popleft()
+            calls = len(self._outcomes)
+            bad_calls = sum(1 for _, outcome in self._outcomes if outcome)
+            if calls >= self.min_calls and bad_calls / calls >= self.error_threshold:
+                self._open(now, f"{bad_calls}/{calls} calls failed or slow")
+
+    def release(self):
+        """
+        Give back an admitted call that did not complete (e.g. cancelled).
+
+        No outcome is recorded; a half-open circuit admits the next probe.
+        """
+        with self._lock:
+            if self._current_state(self._clock()) == HALF_OPEN:
+                self._probing = False
+
+    def _open(self, now: float, reason: str):
+        self._state = OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self._stats["opened"] += 1
+        logger.warning(f"Circuit {self.name} opened for {self.open_seconds}s: {reason}")
+
+    @contextmanager
+    def guard(self):
+        """
+        Run the enclosed call through the breaker (works around awaits too).
+
+        Raises:
+            CircuitOpenError: If the circuit rejects the call
+        """
+        self.before_call()
+        start = self._clock()
+        try:
+            yield
+        except Exception as e:
+            self.record(is_client_error(e), self._clock() - start)
+            raise
+        except BaseException:
+            # Cancelled or interrupted: no outcome, but never hold the probe slot
+            self.release()
+            raise
+        self.record(True, self._clock() - start)
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Call func through the breaker and return its result."""
+        with self.guard():
+            return func(*args, **kwargs)
+
+    def snapshot(self) -> dict:
+        """State and counters of the breaker."""
+        with self._lock:
+            now = self._clock()
+            state = self._current_state(now)
+            window = [bad for finished_at, bad in self._outcomes
+                      if finished_at > now - self.window_seconds]
+            stats = dict(self._stats)
+            stats.update(
+                state=state,
+                window_calls=len(window),
+                window_error_rate=round(sum(window) / len(window), 2) if window else 0.0,
+                retry_after=round(
+                    max(0.0, self._opened_at + self.open_seconds - now), 1
+                ) if state == OPEN else 0.0,
+            )
+        return stats
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(platform: str, endpoint: str) -> CircuitBreaker:
+    """Get the process-wide breaker of a platform endpoint."""
+    name = f"{platform}:{endpoint}"
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def get_breaker_stats() -> Dict[str, dict]:
+    """
+    Get the state of every breaker that has been used.
+
+    Returns:
+        {"platform:endpoint": state and counters}
+    """
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breakers[name].snapshot() for name in sorted(breakers)}
+
+
+def reset_breakers(name: Optional[str] = None):
+    """Forget one breaker, or all of them (for tests and manual recovery)."""
+    with _breakers_lock:
+        if name is None:
+            _breakers.clear()
+        else:
+            _breakers.pop(name, None)
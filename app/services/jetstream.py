@@ -0,0 +1,339 @@
+"""
+JetstreamConsumer - Push-based ingestion of new Bluesky posts
+
+Instead of polling every user's author feed, a single websocket
+subscription to a Jetstream instance receives every new
+app.bsky.feed.post in the network as JSON events:
+
+    {"did": "did:plc:...", "time_us": 1725911162329308, "kind": "commit",
+     "commit": {"operation": "create", "collection": "app.bsky.feed.post",
+                "rkey": "3l3qo2vutsw2b", "record": {"text": "...", ...}}}
+
+Events are filtered against the DIDs of the users being synced, a dict
+lookup read from the head of the raw message, so the stream of other
+accounts is never JSON-decoded. A post of a tracked user is handed to the
+sync path as a Post (see bluesky_handler), and only once the handler has
+returned does the stream position (time_us) count as handled.
+
+The position is saved in sync_cursors every JETSTREAM_CURSOR_SAVE_SECONDS
+and on disconnect; reconnects (with exponential backoff) resume from it,
+so posts made while disconnected are replayed rather than lost. Replayed
+posts that were already handled are dropped by the usual dedup.
+
+Posts from before a user is tracked (a first start at the live edge, or a
+user added later) are not in the stream. Polling for a user only stops
+once one poll from the user's feed mark ran after the stream started
+delivering their posts:
+
+    epoch = consumer.start_catch_up(user_id)  # None if not streamed
+    poll_feed(user_id)
+    consumer.finish_catch_up(user_id, epoch)  # now consumer.tracks(user_id)
+
+Usage:
+    consumer = JetstreamConsumer(on_posts=handle_posts, db_path=DB_PATH)
+    consumer.set_dids({"did:plc:alice": 1})
+    consumer.start()  # runs on the shared async runtime
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode, urlparse
+
+import aiohttp
+
+from app.core.async_runtime import get_runtime
+from app.core.config import (
+    JETSTREAM_CURSOR_SAVE_SECONDS,
+    JETSTREAM_RECONNECT_MAX_SECONDS,
+    JETSTREAM_URL,
+)
+from app.core.db_handler import get_sync_cursor, save_sync_cursor
+from app.core.logger import setup_logger
+from app.integrations.bluesky_handler import Post
+from app.integrations.media_handler import bluesky_attachments
+
+logger = setup_logger(__name__)
+
+POST_COLLECTION = "app.bsky.feed.post"
+
+# Jetstream serializes "did" and "time_us" first
+_EVENT_HEAD = re.compile(r'\{\s*"did"\s*:\s*"([^"]+)"\s*,\s*"time_us"\s*:\s*(\d+)')
+
+
+def _indexed_at(time_us: int) -> str:
+    """indexedAt-style timestamp of a Jetstream event time."""
+    moment = datetime.fromtimestamp(time_us / 1_000_000, tz=timezone.utc)
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class JetstreamConsumer:
+    """
+    Websocket consumer feeding tracked users' new Bluesky posts to a handler.
+    """
+
+    def __init__(
+        self,
+        on_posts: Callable[[int, List[Post]], None],
+        url: str = JETSTREAM_URL,
+        db_path: str = "chirpsyncer.db",
+        cursor_save_seconds: float = JETSTREAM_CURSOR_SAVE_SECONDS,
+        reconnect_max_seconds: float = JETSTREAM_RECONNECT_MAX_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize JetstreamConsumer.
+
+        Args:
+            on_posts: Called as on_posts(user_id, posts) in a worker thread;
+                must have stored the posts durably (e.g. in the outbox) when it returns
+            url: Jetstream subscribe endpoint
+            db_path: Database holding the saved stream position
+            cursor_save_seconds: Most seconds between two saves of the position
+            reconnect_max_seconds: Longest wait between reconnect attempts
+            clock: Monotonic time source (for tests)
+        """
+        self.on_posts = on_posts
+        self.url = url
+        self.db_path = db_path
+        self.cursor_save_seconds = cursor_save_seconds
+        self.reconnect_max_seconds = reconnect_max_seconds
+        self._clock = clock
+        self._cursor_account = f"jetstream:{urlparse(url).netloc or url}"
+        self._dids: Dict[str, int] = {}
+        # Bumped by every connect at the live edge, which skips older posts
+        self._epoch = 0
+        self._caught_up: Dict[int, int] = {}  # user ID -> epoch of its catch-up poll
+        self._cursor: Optional[int] = None  # time_us of the last handled event
+        self._saved_cursor: Optional[int] = None
+        self._saved_at = 0.0
+        self._live = False
+        self._stop: Optional[asyncio.Event] = None
+        self._ws = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._future = None
+        self._lock = threading.Lock()
+        self._stats = {"events": 0, "matched": 0, "posts": 0, "connects": 0, "errors": 0}
+
+    def set_dids(self, dids: Dict[str, int]):
+        """
+        Replace the tracked accounts.
+
+        Args:
+            dids: {DID: user ID} of the users whose posts are ingested
+        """
+        # Swapped whole, so the consumer never sees a half-updated map
+        self._dids = dict(dids)
+        # Users dropped and added again need a new catch-up poll
+        tracked = set(self._dids.values())
+        self._caught_up = {
+            user_id: epoch for user_id, epoch in self._caught_up.items() if user_id in tracked
+        }
+
+    def tracks(self, user_id: int) -> bool:
+        """True while the stream delivers every post of this user newer than its feed mark."""
+        return (
+            self._live
+            and user_id in self._dids.values()
+            and self._caught_up.get(user_id) == self._epoch
+        )
+
+    def start_catch_up(self, user_id: int) -> Optional[int]:
+        """
+        Begin the poll that covers a user's posts from before the stream.
+
+        Args:
+            user_id: User about to be polled
+
+        Returns:
+            Token for finish_catch_up(), or None if the stream does not
+            deliver this user's posts yet (keep polling)
+        """
+        if not self._live or user_id not in self._dids.values():
+            return None
+        return self._epoch
+
+    def finish_catch_up(self, user_id: int, epoch: Optional[int]):
+        """
+        Record that a poll begun with start_catch_up() succeeded.
+
+        From then on tracks(user_id) is true, unless the stream restarted
+        at the live edge or the user was dropped in between.
+        """
+        if epoch is not None and epoch == self._epoch and user_id in self._dids.values():
+            self._caught_up[user_id] = epoch
+
+    @property
+    def live(self) -> bool:
+        return self._live
+
+    @property
+    def cursor(self) -> Optional[int]:
+        return self._cursor
+
+    def load_cursor(self) -> Optional[int]:
+        """Saved stream position, or None to start at the live edge."""
+        mark = get_sync_cursor(self._cursor_account, "bluesky", db_path=self.db_path)
+        try:
+            return int(mark["last_id"]) if mark and mark.get("last_id") else None
+        except ValueError:
+            return None
+
+    def save_cursor(self):
+        """Persist the position of the last handled event."""
+        if self._cursor is None or self._cursor == self._saved_cursor:
+            return
+        save_sync_cursor(
+            self._cursor_account,
+            "bluesky",
+            last_id=self._cursor,
+            last_timestamp=_indexed_at(self._cursor),
+            db_path=self.db_path,
+        )
+        self._saved_cursor = self._cursor
+        self._saved_at = self._clock()
+
+    def subscribe_url(self) -> str:
+        """Subscribe URL for posts only, resuming from the saved position."""
+        params = [("wantedCollections", POST_COLLECTION)]
+        if self._cursor is not None:
+            params.append(("cursor", str(self._cursor)))
+        return f"{self.url}?{urlencode(params)}"
+
+    def _advance(self, time_us: Optional[int]):
+        if time_us is None:
+            return
+        self._cursor = time_us
+        if self._clock() - self._saved_at >= self.cursor_save_seconds:
+            self.save_cursor()
+
+    def match(self, raw: str):
+        """
+        Filter one raw event.
+
+        Args:
+            raw: Event JSON text
+
+        Returns:
+            (time_us, user ID or None, Post or None)
+        """
+        head = _EVENT_HEAD.match(raw)
+        if head is not None and head.group(1) not in self._dids:
+            return int(head.group(2)), None, None
+
+        event = json.loads(raw)
+        time_us = event.get("time_us")
+        user_id = self._dids.get(event.get("did"))
+        if user_id is None:
+            return time_us, None, None
+
+        commit = event.get("commit") or {}
+        record = commit.get("record") or {}
+        if (
+            event.get("kind") != "commit"
+            or commit.get("operation") != "create"
+            or commit.get("collection") != POST_COLLECTION
+            or not record.get("text")
+        ):
+            return time_us, user_id, None
+
+        post = Post(
+            uri=f"at://{event['did']}/{POST_COLLECTION}/{commit.get('rkey')}",
+            text=record["text"],
+            indexed_at=_indexed_at(time_us) if time_us else None,
+            media=bluesky_attachments(record.get("embed"), did=event["did"]),
+        )
+        return time_us, user_id, post
+
+    async def handle(self, raw: str):
+        """Filter one event and hand a tracked user's new post to the sync path."""
+        self._stats["events"] += 1
+        time_us, user_id, post = self.match(raw)
+        if user_id is not None:
+            self._stats["matched"] += 1
+        if post is not None:
+            # Blocking database work; the position only moves once it is stored
+            await asyncio.to_thread(self.on_posts, user_id, [post])
+            self._stats["posts"] += 1
+        self._advance(time_us)
+
+    async def _consume(self):
+        if self._cursor is None:
+            # Nothing to resume from: earlier posts need catch-up polls
+            self._epoch += 1
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(self.subscribe_url(), heartbeat=30) as ws:
+                self._ws = ws
+                self._live = True
+                self._stats["connects"] += 1
+                logger.info(f"Jetstream connected ({len(self._dids)} accounts, cursor {self._cursor})")
+                async for message in ws:
+                    if message.type == aiohttp.WSMsgType.TEXT:
+                        await self.handle(message.data)
+                    elif message.type == aiohttp.WSMsgType.ERROR:
+                        raise ws.exception() or ConnectionError("websocket error")
+
+    async def run(self):
+        """Consume the stream until stop(), reconnecting with exponential backoff."""
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        if self._cursor is None:
+            self._cursor = self._saved_cursor = self.load_cursor()
+
+        delay = 1.0
+        while not self._stop.is_set():
+            try:
+                await self._consume()
+                delay = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Jetstream connection lost: {e}")
+            finally:
+                self._ws = None
+                self._live = False
+                self.save_cursor()
+
+            if self._stop.is_set():
+                break
+            try:
+                await asyncio.wait_for(self._stop.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, self.reconnect_max_seconds)
+
+    def start(self):
+        """Run the consumer on the shared async runtime."""
+        with self._lock:
+            if self._future is None or self._future.done():
+                self._future = get_runtime().submit(self.run())
+            return self._future
+
+    def stop(self, timeout: float = 5.0):
+        """Stop consuming and save the stream position."""
+        with self._lock:
+            future = self._future
+        if future is None:
+            return
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._request_stop)
+        try:
+            future.result(timeout)
+        except Exception as e:
+            logger.debug(f"Jetstream consumer stopped: {e}")
+
+    def _request_stop(self):
+        self._stop.set()
+        if self._ws is not None:
+            # Ends the message loop of the open connection
+            asyncio.ensure_future(self._ws.close())
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        stats.update(live=self._live, accounts=len(self._dids), cursor=self._cursor)
+        return stats
@@ -0,0 +1,261 @@
+"""
+MediaTransformer - Fit images into platform size limits
+
+Images larger than the target platform accepts (e.g. Twitter photos over
+Bluesky's 1 MB limit) used to be dropped. They are now re-encoded until
+they fit:
+
+- EXIF orientation is applied to the pixels, then all metadata is dropped
+  (the color profile is kept)
+- Opaque images become JPEG, images with transparency WebP
+- The highest quality between MEDIA_TRANSFORM_MIN_QUALITY and
+  MEDIA_TRANSFORM_MAX_QUALITY that fits is found by binary search; if even
+  the lowest does not fit, the image is scaled down and searched again
+- Images are first scaled down to MEDIA_TRANSFORM_MAX_DIMENSION pixels on
+  their longer side
+
+Encoding is CPU-bound, so it runs on a process pool of
+MEDIA_TRANSFORM_WORKERS processes and never blocks the event loop or the
+GIL of the sync workers. Images that already fit, and animated ones, are
+left alone.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import (
+    MEDIA_TRANSFORM_MAX_DIMENSION,
+    MEDIA_TRANSFORM_MAX_QUALITY,
+    MEDIA_TRANSFORM_MIN_QUALITY,
+    MEDIA_TRANSFORM_WORKERS,
+)
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Quality search granularity
+QUALITY_STEP = 5
+# Most scale-down rounds before giving up
+MAX_SCALE_ROUNDS = 6
+
+
+@dataclass
+class TransformedImage:
+    """An image re-encoded to fit a size limit"""
+
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+    quality: int
+    original_size: int
+
+    @property
+    def ratio(self) -> float:
+        """Size after / size before"""
+        return len(self.data) / self.original_size if self.original_size else 1.0
+
+
+class ImageTooLargeError(Exception):
+    """An image could not be fit into the size limit."""
+
+
+def _encode(image, fmt: str, quality: int, icc_profile: Optional[bytes]) -> bytes:
+    out = io.BytesIO()
+    options = {"quality": quality}
+    if fmt == "JPEG":
+        options.update(optimize=True, progressive=True)
+    else:
+        options.update(method=4)
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+    image.save(out, format=fmt, **options)
+    return out.getvalue()
+
+
+def fit_image(
+    data: bytes,
+    max_bytes: int,
+    max_dimension: int = MEDIA_TRANSFORM_MAX_DIMENSION,
+    min_quality: int = MEDIA_TRANSFORM_MIN_QUALITY,
+    max_quality: int = MEDIA_TRANSFORM_MAX_QUALITY,
+) -> Optional[TransformedImage]:
+    """
+    Re-encode an image until it fits max_bytes (runs in a pool process).
+
+    Args:
+        data: Encoded image
+        max_bytes: Size limit of the result
+        max_dimension: Longest side of the result in pixels
+        min_quality: Lowest encoder quality tried before scaling down
+        max_quality: Highest encoder quality tried
+
+    Returns:
+        TransformedImage, or None for animated images (left to the caller)
+
+    Raises:
+        ImageTooLargeError: If the image does not fit even scaled down
+        PIL.UnidentifiedImageError: If data is not an image Pillow can read
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as source:
+        if getattr(source, "is_animated", False):
+            return None
+        icc_profile = source.info.get("icc_profile")
+        has_alpha = source.mode in ("RGBA", "LA") or (
+            source.mode == "P" and "transparency" in source.info
+        )
+        image = ImageOps.exif_transpose(source)
+
+    fmt, mime_type = ("WEBP", "image/webp") if has_alpha else ("JPEG", "image/jpeg")
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    scale = min(1.0, max_dimension / max(image.size))
+    qualities = list(range(min_quality, max_quality + 1, QUALITY_STEP))
+    if qualities[-1] != max_quality:
+        qualities.append(max_quality)
+
+    for _ in range(MAX_SCALE_ROUNDS):
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        resized = image if size == image.size else image.resize(size, Image.LANCZOS)
+
+        encoded = _encode(resized, fmt, max_quality, icc_profile)
+        if len(encoded) <= max_bytes:
+            return TransformedImage(encoded, mime_type, size[0], size[1], max_quality, len(data))
+
+        # Highest quality that fits, by binary search over the steps
+        best, smallest = None, None
+        lo, hi = 0, len(qualities) - 2
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            encoded = _encode(resized, fmt, qualities[mid], icc_profile)
+            if len(encoded) <= max_bytes:
+                best = (encoded, qualities[mid])
+                lo = mid + 1
+            else:
+                smallest = encoded
+                hi = mid - 1
+        if best is not None:
+            return TransformedImage(best[0], mime_type, size[0], size[1], best[1], len(data))
+
+        # Scale by the overshoot of the lowest quality (pixels ~ bytes)
+        scale *= min(0.9, max(0.3, (max_bytes / len(smallest)) ** 0.5))
+
+    raise ImageTooLargeError(f"Image does not fit into {max_bytes} bytes")
+
+
+class MediaTransformer:
+    """
+    Runs fit_image() on a process pool and keeps throughput metrics.
+    """
+
+    def __init__(self, max_workers: int = MEDIA_TRANSFORM_WORKERS):
+        """
+        Initialize MediaTransformer.
+
+        Args:
+            max_workers: Encoder processes
+        """
+        self.max_workers = max(1, int(max_workers))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "images": 0, "transformed": 0, "unchanged": 0, "failed": 0,
+            "bytes_in": 0, "bytes_out": 0, "total_ms": 0.0, "max_ms": 0.0,
+        }
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Spawned, not forked: the sync process is full of threads and locks
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def _record(self, outcome: str, elapsed_ms: float, bytes_in: int = 0, bytes_out: int = 0):
+        with self._lock:
+            self._stats["images"] += 1
+            self._stats[outcome] += 1
+            self._stats["bytes_in"] += bytes_in
+            self._stats["bytes_out"] += bytes_out
+            self._stats["total_ms"] += elapsed_ms
+            self._stats["max_ms"] = max(self._stats["max_ms"], elapsed_ms)
+
+    async def fit(self, data, max_bytes: int) -> Optional[TransformedImage]:
+        """
+        Fit an image into max_bytes without blocking the event loop.
+
+        Args:
+            data: Encoded image (bytes-like)
+            max_bytes: Size limit of the result
+
+        Returns:
+            TransformedImage, or None if the image is left as it is
+            (it already fits or is animated)
+
+        Raises:
+            ImageTooLargeError: If the image does not fit even scaled down
+            Exception: If the image cannot be decoded
+        """
+        if len(data) <= max_bytes:
+            self._record("unchanged", 0.0)
+            return None
+
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._get_pool(), fit_image, bytes(data), max_bytes)
+        except Exception:
+            self._record("failed", (time.perf_counter() - start) * 1000)
+            raise
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if result is None:
+            self._record("unchanged", elapsed_ms)
+        else:
+            self._record("transformed", elapsed_ms, len(data), len(result.data))
+        return result
+
+    def get_stats(self) -> dict:
+        """
+        Get transform metrics.
+
+        Returns:
+            Dictionary with image counts, bytes before/after transforming,
+            the compression ratio (after / before) and per-image times
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        worked = stats["transformed"] + stats["failed"]
+        stats["ratio"] = round(stats["bytes_out"] / stats["bytes_in"], 3) if stats["bytes_in"] else 0.0
+        stats["avg_ms"] = round(stats["total_ms"] / worked, 2) if worked else 0.0
+        stats["total_ms"] = round(stats["total_ms"], 2)
+        stats["max_ms"] = round(stats["max_ms"], 2)
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """Stop the encoder processes (they are restarted on next use)."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+_transformer: Optional[MediaTransformer] = None
+_transformer_lock = threading.Lock()
+
+
+def get_media_transformer() -> MediaTransformer:
+    """Get the process-wide media transformer."""
+    global _transformer
+    with _transformer_lock:
+        if _transformer is None:
+            _transformer = MediaTransformer()
+        return _transformer
@@ -0,0 +1,782 @@
+"""
+Platform record-and-replay harness
+
+Sync throughput cannot be measured against the real platforms, so this
+module records their responses into fixture files and replays them from a
+local stand-in HTTP server:
+
+- FixtureRecorder appends the read responses of recorded clients to a JSONL
+  fixture file: XRPC queries of atproto clients (httpx response hook),
+  Twitter API v2 reads of tweepy clients (requests response hook) and
+  twscrape searches and lookups (RecordingTwscrapeAPI).
+- ReplayServer serves a FixtureSet over HTTP, with configurable latency and
+  injected errors. Writes (logins, posts, uploads) are answered with
+  synthesized responses, so nothing is posted anywhere and no credentials
+  or tokens end up in fixture files.
+- replay_clients() points the app's clients at a ReplayServer: atproto
+  clients get its base URL, tweepy sessions are redirected to it, and the
+  scraper pool's twscrape API is replaced by ReplayTwscrapeAPI.
+- population() turns the timelines of one recorded (or synthetic) account
+  into those of many accounts, with unique IDs and texts, so a benchmark
+  can sync a whole user population without dedup collapsing it.
+
+Fixture lines look like:
+
+    {"platform": "bluesky", "method": "GET",
+     "endpoint": "app.bsky.feed.getAuthorFeed",
+     "key": "actor=alice.bsky.social&filter=posts_with_replies&includePins=false",
+     "status": 200, "body": {"feed": [...]}}
+
+scripts/sync_benchmark.py records fixtures and runs the benchmark.
+"""
+
+import asyncio
+import base64
+import copy
+import functools
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiohttp
+from aiohttp import web
+from requests.adapters import HTTPAdapter
+
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Page sizes do not change what a recorded page contains
+_IGNORED_PARAMS = {"limit", "max_results"}
+
+_SINCE_ID = re.compile(r"\s*since_id:(\d+)")
+_FROM_USER = re.compile(r"from:(\w+)")
+_CONVERSATION = re.compile(r"conversation_id:(\d+)")
+
+# Query defaults the atproto client sends with every getAuthorFeed
+AUTHOR_FEED_DEFAULTS = {"filter": "posts_with_replies", "includePins": "false"}
+
+# Any well-formed CID will do for synthesized records and blobs
+REPLAY_CID = "bafyreie5737gdxlw5i64vzichcalba3z2v5n6icifvx5xytvske7mr3hpm"
+
+TWITTER_HOST = "https://api.twitter.com/"
+
+
+def fixture_key(params) -> str:
+    """Canonical key of a request's parameters."""
+    items = params.items() if hasattr(params, "items") else params
+    return urlencode(sorted((k, str(v)) for k, v in items if k not in _IGNORED_PARAMS))
+
+
+def search_key(query: str) -> str:
+    """Key of a twscrape search; since_id is applied at replay time."""
+    return fixture_key({"q": _SINCE_ID.sub("", query).strip()})
+
+
+def did_for(handle: str) -> str:
+    """Stable did:plc of a replayed handle."""
+    digest = hashlib.sha256(handle.lower().encode("utf-8")).digest()
+    return "did:plc:" + base64.b32encode(digest[:15]).decode("ascii").lower()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class FixtureSet:
+    """
+    Recorded responses, looked up by (platform, method, endpoint, key).
+    """
+
+    def __init__(self, fixtures: Iterable[dict] = ()):
+        self._responses: Dict[tuple, dict] = {}
+        for fixture in fixtures:
+            self.add(fixture)
+
+    @staticmethod
+    def _index(platform: str, method: str, endpoint: str, key: str) -> tuple:
+        return platform, method.upper(), endpoint, key
+
+    def add(self, fixture: dict):
+        """Add a fixture; a later response for the same request replaces it."""
+        index = self._index(
+            fixture["platform"], fixture.get("method", "GET"), fixture["endpoint"], fixture.get("key", "")
+        )
+        self._responses[index] = fixture
+
+    def lookup(self, platform: str, method: str, endpoint: str, key: str = "") -> Optional[dict]:
+        """Recorded fixture of a request, or None."""
+        return self._responses.get(self._index(platform, method, endpoint, key))
+
+    def accounts(self) -> Tuple[List[str], List[str]]:
+        """Twitter usernames and Bluesky handles whose timelines were recorded."""
+        usernames, handles = [], []
+        for fixture in self:
+            if fixture["platform"] == "twscrape" and fixture["endpoint"] == "search":
+                match = _FROM_USER.search(dict(parse_qsl(fixture["key"])).get("q", ""))
+                if match and match.group(1) not in usernames and not _CONVERSATION.search(fixture["key"]):
+                    usernames.append(match.group(1))
+            elif fixture["endpoint"] == "app.bsky.feed.getAuthorFeed":
+                actor = dict(parse_qsl(fixture["key"])).get("actor")
+                if actor and actor not in handles:
+                    handles.append(actor)
+        return usernames, handles
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._responses.values())
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    @classmethod
+    def load(cls, path: str) -> "FixtureSet":
+        """Read a JSONL fixture file."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+    def save(self, path: str):
+        """Write the fixtures as a JSONL file."""
+        with open(path, "w", encoding="utf-8") as f:
+            for fixture in self:
+                f.write(json.dumps(fixture, default=_json_default) + "\n")
+
+
+class FixtureRecorder:
+    """
+    Appends the read responses of real clients to a JSONL fixture file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize FixtureRecorder.
+
+        Args:
+            path: Fixture file, appended to
+        """
+        self.path = path
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def record(self, platform: str, method: str, endpoint: str, key: str, body, status: int = 200):
+        """Append one response."""
+        line = json.dumps(
+            {
+                "platform": platform,
+                "method": method.upper(),
+                "endpoint": endpoint,
+                "key": key,
+                "status": status,
+                "body": body,
+            },
+            default=_json_default,
+        )
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.recorded += 1
+
+    def httpx_hook(self):
+        """Response hook recording the XRPC queries of an atproto client."""
+
+        def hook(response):
+            request = response.request
+            nsid = request.url.path.rsplit("/xrpc/", 1)[-1]
+            # Sessions carry tokens; the replay server synthesizes them
+            if request.method != "GET" or nsid.startswith("com.atproto.server."):
+                return
+            response.read()
+            try:
+                body = response.json()
+            except ValueError:
+                return
+            self.record(
+                "bluesky", "GET", nsid, fixture_key(request.url.params.multi_items()), body,
+                status=response.status_code,
+            )
+
+        return hook
+
+    def requests_hook(self):
+        """Response hook recording the Twitter API v2 reads of a tweepy session."""
+
+        def hook(response, *args, **kwargs):
+            if response.request.method != "GET":
+                return response
+            url = urlsplit(response.url)
+            try:
+                body = response.json()
+            except ValueError:
+                return response
+            self.record(
+                "twitter", "GET", url.path, fixture_key(parse_qsl(url.query)), body,
+                status=response.status_code,
+            )
+            return response
+
+        return hook
+
+
+def _tweet_dict(tweet) -> dict:
+    return tweet.dict() if hasattr(tweet, "dict") else dict(vars(tweet))
+
+
+class RecordingTwscrapeAPI:
+    """
+    twscrape API wrapper recording search results and tweet lookups.
+    """
+
+    def __init__(self, api, recorder: FixtureRecorder):
+        self._api = api
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self._api, name)
+
+    async def search(self, query: str, limit: int = -1, kv=None):
+        tweets = []
+        try:
+            async for tweet in self._api.search(query, limit=limit):
+                tweets.append(tweet)
+                yield tweet
+        finally:
+            self._recorder.record(
+                "twscrape", "GET", "search", search_key(query), [_tweet_dict(t) for t in tweets]
+            )
+
+    async def tweet_details(self, twid: int, kv=None):
+        # One ID in, the tweet or None (deleted, protected) out
+        tweet = await self._api.tweet_details(twid)
+        if tweet is not None:
+            self._recorder.record(
+                "twscrape", "GET", "tweet", fixture_key({"id": twid}), _tweet_dict(tweet)
+            )
+        return tweet
+
+
+def _namespace(value):
+    """Attribute access for a replayed JSON value, like the twscrape models."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_namespace(v) for v in value]
+    return value
+
+
+class _ReplayAccountPool:
+    """twscrape account pool in which every account is logged in."""
+
+    async def get_account(self, username: str):
+        return SimpleNamespace(username=username, active=True)
+
+    async def add_account(self, *args, **kwargs):
+        return None
+
+    async def login_all(self, usernames=None):
+        return {"total": len(usernames or []), "success": len(usernames or []), "failed": 0}
+
+    async def get_all(self):
+        return []
+
+
+class ReplayTwscrapeAPI:
+    """
+    Stand-in for twscrape.API that reads search results from a ReplayServer.
+    """
+
+    def __init__(self, base_url: str):
+        """
+        Initialize ReplayTwscrapeAPI.
+
+        Args:
+            base_url: Base URL of the ReplayServer
+        """
+        self.base_url = base_url.rstrip("/")
+        self.pool = _ReplayAccountPool()
+        self._sessions: Dict[int, aiohttp.ClientSession] = {}
+
+    async def _get(self, path: str, params: dict):
+        # A session only works on the loop it was created on
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(id(loop))
+        if session is None or session.closed:
+            session = self._sessions[id(loop)] = aiohttp.ClientSession()
+        async with session.get(self.base_url + path, params=params) as response:
+            if response.status != 200:
+                raise ConnectionError(f"twscrape replay {path} returned HTTP {response.status}")
+            return await response.json()
+
+    async def search(self, query: str, limit: int = -1, kv=None):
+        for tweet in await self._get("/twscrape/search", {"q": query, "limit": limit}):
+            yield _namespace(tweet)
+
+    async def tweet_details(self, twid: int, kv=None):
+        tweet = await self._get("/twscrape/tweet_details", {"id": str(twid)})
+        return _namespace(tweet) if tweet is not None else None
+
+    async def aclose(self):
+        """Close the HTTP sessions of the calling loop."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(id(loop), None)
+        if session is not None:
+            await session.close()
+
+
+def _jwt(handle: str, scope: str) -> str:
+    """Unsigned JWT that atproto clients accept as a session token."""
+
+    def part(data: dict) -> str:
+        raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    now = int(time.time())
+    payload = {"scope": scope, "sub": did_for(handle), "iat": now, "exp": now + 86400,
+               "aud": "did:web:replay.local"}
+    return f"{part({'typ': 'JWT', 'alg': 'none'})}.{part(payload)}.replay"
+
+
+class ReplayServer:
+    """
+    Local HTTP stand-in for Bluesky XRPC, Twitter API v2 and twscrape.
+    """
+
+    def __init__(
+        self,
+        fixtures: FixtureSet,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ):
+        """
+        Initialize ReplayServer.
+
+        Args:
+            fixtures: Responses to replay
+            latency_ms: Delay added to every response
+            jitter_ms: Random +/- variation of the delay
+            error_rate: Share of requests answered with error_status instead
+            error_status: HTTP status of injected errors
+            seed: Seed of the latency and error randomness
+        """
+        self.fixtures = fixtures
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.url: Optional[str] = None
+        self._random = random.Random(seed)
+        self._ids = itertools.count(int(time.time() * 1000) << 22)
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"requests": 0, "replayed": 0, "synthesized": 0, "misses": 0, "errors_injected": 0}
+
+    def app(self) -> web.Application:
+        """aiohttp application serving the fixtures."""
+        app = web.Application(middlewares=[self._delay_and_fail], client_max_size=64 * 1024 * 1024)
+        app.router.add_route("*", "/xrpc/{nsid}", self._xrpc)
+        app.router.add_route("*", "/2/{path:.*}", self._twitter)
+        app.router.add_get("/twscrape/search", self._twscrape_search)
+        app.router.add_get("/twscrape/tweet_details", self._twscrape_details)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on the running loop; returns the base URL."""
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self) -> str:
+        """Serve from a thread of its own, away from the loop being measured."""
+        started = threading.Event()
+        failure = []
+
+        def serve():
+            loop = self._loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self.start())
+            except Exception as e:
+                failure.append(e)
+                started.set()
+                return
+            started.set()
+            loop.run_forever()
+            loop.run_until_complete(self.stop())
+            loop.close()
+
+        self._thread = threading.Thread(target=serve, name="replay-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        if failure:
+            raise failure[0]
+        return self.url
+
+    def stop_thread(self):
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def get_stats(self) -> dict:
+        return dict(self._stats)
+
+    @web.middleware
+    async def _delay_and_fail(self, request, handler):
+        self._stats["requests"] += 1
+        delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self._stats["errors_injected"] += 1
+            return web.json_response(
+                {"error": "InjectedError", "message": "Error injected by the replay server"},
+                status=self.error_status,
+            )
+        return await handler(request)
+
+    def _replay(self, platform: str, method: str, endpoint: str, key: str):
+        fixture = self.fixtures.lookup(platform, method, endpoint, key)
+        if fixture is None:
+            self._stats["misses"] += 1
+            logger.info(f"Replay miss: {platform} {method} {endpoint}?{key}")
+            return web.json_response(
+                {"error": "NotRecorded", "message": f"No fixture for {method} {endpoint}?{key}"},
+                status=404,
+            )
+        self._stats["replayed"] += 1
+        return web.json_response(fixture["body"], status=fixture.get("status", 200))
+
+    def _synthesized(self, body: dict):
+        self._stats["synthesized"] += 1
+        return web.json_response(body)
+
+    def _next_id(self) -> int:
+        return next(self._ids)
+
+    async def _xrpc(self, request):
+        nsid = request.match_info["nsid"]
+        if request.method == "POST":
+            if nsid == "com.atproto.repo.uploadBlob":
+                data = await request.read()
+                return self._synthesized({"blob": {
+                    "$type": "blob",
+                    "ref": {"$link": REPLAY_CID},
+                    "mimeType": request.content_type,
+                    "size": len(data),
+                }})
+            body = await request.json() if request.can_read_body else {}
+            if nsid == "com.atproto.server.createSession":
+                handle = body.get("identifier", "replay.bsky.social")
+                return self._synthesized({
+                    "accessJwt": _jwt(handle, "com.atproto.access"),
+                    "refreshJwt": _jwt(handle, "com.atproto.refresh"),
+                    "handle": handle,
+                    "did": did_for(handle),
+                })
+            if nsid == "com.atproto.repo.createRecord":
+                rkey = base64.b32encode(self._next_id().to_bytes(8, "big")).decode("ascii").lower().rstrip("=")
+                return self._synthesized({
+                    "uri": f"at://{body.get('repo')}/{body.get('collection')}/{rkey}",
+                    "cid": REPLAY_CID,
+                })
+            if nsid == "com.atproto.repo.deleteRecord":
+                return self._synthesized({})
+            return self._replay("bluesky", "POST", nsid, "")
+
+        key = fixture_key(request.query)
+        if self.fixtures.lookup("bluesky", "GET", nsid, key) is None:
+            if nsid == "app.bsky.actor.getProfile":
+                actor = request.query.get("actor", "")
+                did = actor if actor.startswith("did:") else did_for(actor)
+                return self._synthesized({"did": did, "handle": actor})
+            if nsid == "com.atproto.identity.resolveHandle":
+                return self._synthesized({"did": did_for(request.query.get("handle", ""))})
+        return self._replay("bluesky", "GET", nsid, key)
+
+    async def _twitter(self, request):
+        path = "/2/" + request.match_info["path"]
+        if request.method == "POST" and path == "/2/tweets":
+            body = await request.json()
+            tweet_id = str(self._next_id())
+            return self._synthesized(
+                {"data": {"id": tweet_id, "text": body.get("text", ""), "edit_history_tweet_ids": [tweet_id]}}
+            )
+        if request.method == "DELETE" and path.startswith("/2/tweets/"):
+            return self._synthesized({"data": {"deleted": True}})
+
+        key = fixture_key(request.query)
+        if path == "/2/users/me" and self.fixtures.lookup("twitter", "GET", path, key) is None:
+            return self._synthesized({"data": {"id": "1", "name": "Replay", "username": "replay"}})
+        return self._replay("twitter", request.method, path, key)
+
+    async def _twscrape_search(self, request):
+        query = request.query.get("q", "")
+        fixture = self.fixtures.lookup("twscrape", "GET", "search", search_key(query))
+        if fixture is None:
+            # A search without results is an empty page, not an error
+            self._stats["misses"] += 1
+            return web.json_response([])
+        self._stats["replayed"] += 1
+        tweets = fixture["body"]
+        since = _SINCE_ID.search(query)
+        if since:
+            tweets = [tweet for tweet in tweets if int(tweet["id"]) > int(since.group(1))]
+        limit = int(request.query.get("limit", -1))
+        return web.json_response(tweets[:limit] if limit > 0 else tweets)
+
+    async def _twscrape_details(self, request):
+        tweet_id = request.query.get("id", "")
+        fixture = self.fixtures.lookup("twscrape", "GET", "tweet", fixture_key({"id": tweet_id}))
+        if fixture is None:
+            # Deleted or protected, as far as the caller can tell
+            self._stats["misses"] += 1
+            return web.json_response(None)
+        self._stats["replayed"] += 1
+        return web.json_response(fixture["body"])
+
+
+class _RedirectAdapter(HTTPAdapter):
+    """Sends the requests of a requests session to another base URL."""
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self._base = urlsplit(base_url)
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        request.url = urlunsplit((self._base.scheme, self._base.netloc, url.path, url.query, url.fragment))
+        return super().send(request, **kwargs)
+
+
+def redirect_session(session, base_url: str, host: str = TWITTER_HOST):
+    """Route a requests session's calls to host to base_url instead."""
+    session.mount(host, _RedirectAdapter(base_url))
+    return session
+
+
+def _replay_tweepy_client(client_class, base_url: str):
+    class ReplayTweepyClient(client_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            redirect_session(self.session, base_url)
+
+    return ReplayTweepyClient
+
+
+@contextmanager
+def replay_clients(base_url: str):
+    """
+    Point the app's platform clients at a ReplayServer.
+
+    Args:
+        base_url: Base URL of the ReplayServer
+
+    Yields:
+        The ReplayTwscrapeAPI the scraper pool uses
+    """
+    import tweepy
+
+    from app.integrations import bluesky_handler
+    from app.services import scraper_pool
+
+    api = ReplayTwscrapeAPI(base_url)
+    saved = (bluesky_handler.Client, tweepy.Client, scraper_pool._pool)
+    bluesky_handler.Client = functools.partial(saved[0], f"{base_url}/xrpc")
+    tweepy.Client = _replay_tweepy_client(saved[1], base_url)
+    scraper_pool._pool = scraper_pool.ScraperPool(api_factory=lambda db_file: api)
+    try:
+        yield api
+    finally:
+        bluesky_handler.Client, tweepy.Client, scraper_pool._pool = saved
+
+
+def synthetic_fixtures(
+    twitter_username: str,
+    bluesky_handle: str,
+    posts: int = 10,
+    thread_every: int = 0,
+    thread_length: int = 3,
+) -> FixtureSet:
+    """
+    Fixtures of one made-up account on both platforms.
+
+    Args:
+        twitter_username: Account of the tweets
+        bluesky_handle: Account of the Bluesky posts
+        posts: Timeline entries per platform
+        thread_every: Every n-th tweet starts a self-reply thread (0: none)
+        thread_length: Tweets per thread
+
+    Returns:
+        FixtureSet with a twscrape search and a getAuthorFeed page
+    """
+    now = datetime.now(timezone.utc)
+    fixtures = FixtureSet()
+    tweets, tweet_id = [], 1_800_000_000_000_000_000
+    for n in range(posts):
+        created = (now - timedelta(minutes=posts - n)).isoformat()
+        length = thread_length if thread_every and n % thread_every == thread_every - 1 else 1
+        chain = []
+        for part in range(length):
+            tweet_id += 1
+            chain.append({
+                "id": tweet_id,
+                "id_str": str(tweet_id),
+                "rawContent": f"Synthetic tweet {n}.{part} from {twitter_username} #benchmark",
+                "date": created,
+                "conversationId": chain[0]["id"] if chain else tweet_id,
+                "inReplyToTweetId": chain[-1]["id"] if chain else None,
+                "user": {"id": 1, "username": twitter_username},
+            })
+        tweets.extend(chain)
+        if length > 1:
+            conversation = chain[0]["id"]
+            fixtures.add({
+                "platform": "twscrape", "endpoint": "search",
+                "key": search_key(f"conversation_id:{conversation} from:{twitter_username}"),
+                "body": list(reversed(chain[1:])),
+            })
+            for tweet in chain:
+                fixtures.add({"platform": "twscrape", "endpoint": "tweet",
+                              "key": fixture_key({"id": tweet["id"]}), "body": tweet})
+
+    # Searches return newest first; the author's self-replies included
+    timeline = list(reversed(tweets))
+    fixtures.add({
+        "platform": "twscrape", "endpoint": "search",
+        "key": search_key(f"from:{twitter_username} -filter:replies -filter:retweets"),
+        "body": timeline,
+    })
+
+    did = did_for(bluesky_handle)
+    feed = []
+    for n in reversed(range(posts)):
+        created = (now - timedelta(minutes=posts - n)).isoformat().replace("+00:00", "Z")
+        feed.append({"post": {
+            "uri": f"at://{did}/app.bsky.feed.post/3lsynth{n:07d}",
+            "cid": REPLAY_CID,
+            "author": {"did": did, "handle": bluesky_handle},
+            "record": {
+                "$type": "app.bsky.feed.post",
+                "text": f"Synthetic post {n} from {bluesky_handle} #benchmark",
+                "createdAt": created,
+            },
+            "indexedAt": created,
+        }})
+    fixtures.add({
+        "platform": "bluesky", "endpoint": "app.bsky.feed.getAuthorFeed",
+        "key": fixture_key({"actor": bluesky_handle, **AUTHOR_FEED_DEFAULTS}), "body": {"feed": feed},
+    })
+    return fixtures
+
+
+def _shift(value, offset: int):
+    return None if value is None else type(value)(int(value) + offset)
+
+
+def _rename_tweet(tweet: dict, username: str, offset: int, suffix: str) -> dict:
+    tweet = copy.deepcopy(tweet)
+    for field in ("id", "conversationId", "inReplyToTweetId"):
+        if field in tweet:
+            tweet[field] = _shift(tweet[field], offset)
+    if "id_str" in tweet:
+        tweet["id_str"] = str(tweet["id"])
+    if isinstance(tweet.get("user"), dict):
+        tweet["user"]["username"] = username
+    if isinstance(tweet.get("rawContent"), str):
+        tweet["rawContent"] += suffix
+    return tweet
+
+
+def _rename_feed_item(item: dict, source: Tuple[str, str], handle: str, suffix: str) -> dict:
+    item = copy.deepcopy(item)
+    old_did, old_handle = source
+    post = item.get("post", {})
+    uri = post.get("uri", "")
+    if old_did:
+        uri = uri.replace(old_did, did_for(handle))
+    post["uri"] = uri.replace(old_handle, handle)
+    post["author"] = {**post.get("author", {}), "did": did_for(handle), "handle": handle}
+    record = post.get("record", {})
+    if isinstance(record.get("text"), str):
+        record["text"] += suffix
+    return item
+
+
+def population(template: FixtureSet, accounts: List[Tuple[str, str]]) -> FixtureSet:
+    """
+    Fixtures of many accounts from the timelines of a template account.
+
+    Tweet IDs are shifted and texts made unique per account, so every
+    account's posts are new to dedup.
+
+    Args:
+        template: Fixtures of one Twitter account and one Bluesky account
+        accounts: (Twitter username, Bluesky handle) per account to create
+
+    Returns:
+        FixtureSet of every account
+    """
+    usernames, handles = template.accounts()
+    if not usernames or not handles:
+        raise ValueError("Template fixtures need a recorded tweet search and author feed")
+    source_user, source_handle = usernames[0], handles[0]
+    source_did = None
+
+    result = FixtureSet()
+    for fixture in template:
+        if fixture["platform"] == "bluesky" and fixture["endpoint"] == "app.bsky.feed.getAuthorFeed":
+            for item in fixture["body"].get("feed", []):
+                source_did = source_did or item.get("post", {}).get("author", {}).get("did")
+
+    for index, (username, handle) in enumerate(accounts):
+        offset, suffix = (index + 1) * 10**15, f" ~{index}"
+        for fixture in template:
+            fixture = dict(fixture)
+            platform, endpoint = fixture["platform"], fixture["endpoint"]
+            if platform == "twscrape" and endpoint == "search":
+                query = dict(parse_qsl(fixture["key"])).get("q", "")
+                author = _FROM_USER.search(query)
+                if author is None or author.group(1) != source_user:
+                    continue
+                query = _FROM_USER.sub(f"from:{username}", query)
+                query = _CONVERSATION.sub(lambda m: f"conversation_id:{int(m.group(1)) + offset}", query)
+                fixture["key"] = search_key(query)
+                fixture["body"] = [_rename_tweet(t, username, offset, suffix) for t in fixture["body"]]
+            elif platform == "twscrape" and endpoint == "tweet":
+                tweet = _rename_tweet(fixture["body"], username, offset, suffix)
+                fixture["key"], fixture["body"] = fixture_key({"id": tweet["id"]}), tweet
+            elif endpoint == "app.bsky.feed.getAuthorFeed":
+                params = dict(parse_qsl(fixture["key"]))
+                if params.get("actor") != source_handle:
+                    continue
+                fixture["key"] = fixture_key({**params, "actor": handle})
+                body = dict(fixture["body"])
+                body["feed"] = [
+                    _rename_feed_item(item, (source_did or "", source_handle), handle, suffix)
+                    for item in body.get("feed", [])
+                ]
+                fixture["body"] = body
+            result.add(fixture)
+    return result
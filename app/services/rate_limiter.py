@@ -0,0 +1,377 @@
+"""
+RateLimiter - Shared token buckets per platform, endpoint and credential
+
+Every outbound call to a platform first takes a token from the bucket of
+(platform, endpoint class, credential). Buckets live in the
+rate_limit_buckets table, so every process and worker sharing the
+database spends the same budget:
+
+- A bucket holds up to `capacity` tokens and refills continuously at
+  capacity / window. Defaults come from DEFAULT_LIMITS.
+- Responses teach the bucket the real limits: x-rate-limit-* (Twitter) and
+  RateLimit-* (Bluesky) headers overwrite capacity and remaining tokens,
+  and an exhausted limit or a 429 blocks the bucket until the reset time.
+- acquire() / acquire_async() wait for a token. Waits longer than
+  RATE_LIMIT_MAX_WAIT raise RateLimitExceeded instead, so a sync can give
+  up and retry later rather than block a worker.
+
+Credentials are stored only as a short SHA-256 digest in the bucket key.
+
+Usage:
+    from app.services.rate_limiter import get_rate_limiter
+
+    get_rate_limiter().acquire("bluesky", "write", credential=handle)
+"""
+
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import (
+    RATE_LIMIT_BLUESKY_WRITES_PER_HOUR,
+    RATE_LIMIT_DB_PATH,
+    RATE_LIMIT_MAX_WAIT,
+    RATE_LIMIT_TWITTER_POSTS_PER_15_MIN,
+)
+from app.core.db_pool import get_connection
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# (platform, endpoint class) -> (requests, window seconds)
+DEFAULT_LIMITS: Dict[Tuple[str, str], Tuple[float, float]] = {
+    ("bluesky", "write"): (RATE_LIMIT_BLUESKY_WRITES_PER_HOUR, 3600),
+    ("bluesky", "read"): (3000, 300),
+    ("bluesky", "session"): (30, 300),
+    ("twitter", "post"): (RATE_LIMIT_TWITTER_POSTS_PER_15_MIN, 900),
+    ("twitter", "delete"): (50, 900),
+    ("twitter", "read"): (900, 900),
+}
+FALLBACK_LIMIT = (60, 60)
+
+_POLICY_WINDOW = re.compile(r"w=(\d+)")
+
+
+class RateLimitExceeded(Exception):
+    """No token is available within the allowed wait."""
+
+    def __init__(self, key: str, retry_after: float):
+        super().__init__(f"Rate limit for {key} exhausted, retry in {retry_after:.0f}s")
+        self.key = key
+        self.retry_after = retry_after
+
+
+def bucket_key(platform: str, endpoint: str, credential: Optional[str] = None) -> str:
+    """Key of a bucket; the credential is reduced to a digest."""
+    if credential:
+        digest = hashlib.sha256(str(credential).encode("utf-8")).hexdigest()[:12]
+    else:
+        digest = "default"
+    return f"{platform}:{endpoint}:{digest}"
+
+
+def _header(headers, *names) -> Optional[str]:
+    lowered = {str(k).lower(): v for k, v in dict(headers or {}).items()}
+    for name in names:
+        if name in lowered:
+            return lowered[name]
+    return None
+
+
+def _number(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    SQLite-backed token buckets shared by every process using the database.
+    """
+
+    def __init__(
+        self,
+        db_path: str = RATE_LIMIT_DB_PATH,
+        max_wait: float = RATE_LIMIT_MAX_WAIT,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize RateLimiter.
+
+        Args:
+            db_path: Path to SQLite database
+            max_wait: Longest wait for a token before RateLimitExceeded (seconds)
+            clock: Returns the current Unix time (for tests)
+            sleep: Blocking sleep used by acquire() (for tests)
+        """
+        self.db_path = db_path
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._initialized = False
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "waited": 0, "rejected": 0, "learned": 0}
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get database connection"""
+        return get_connection(self.db_path)
+
+    def init_db(self):
+        """Initialize the rate_limit_buckets table"""
+        conn = self._get_connection()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    bucket_key TEXT PRIMARY KEY,
+                    capacity REAL NOT NULL,
+                    refill_per_second REAL NOT NULL,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    blocked_until REAL NOT NULL DEFAULT 0
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def _ensure_db(self):
+        if not self._initialized:
+            self.init_db()
+
+    def _bump(self, counter: str):
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _load(self, conn: sqlite3.Connection, key: str, platform: str, endpoint: str,
+              now: float) -> list:
+        """Current [capacity, refill, tokens, blocked_until] of a bucket, refilled to now."""
+        row = conn.execute(
+            "SELECT capacity, refill_per_second, tokens, updated_at, blocked_until "
+            "FROM rate_limit_buckets WHERE bucket_key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            limit, window = DEFAULT_LIMITS.get((platform, endpoint), FALLBACK_LIMIT)
+            return [float(limit), limit / window, float(limit), 0.0]
+
+        capacity, refill, tokens, updated_at, blocked_until = row
+        tokens = min(capacity, tokens + max(0.0, now - updated_at) * refill)
+        return [capacity, refill, tokens, blocked_until]
+
+    @staticmethod
+    def _store(conn: sqlite3.Connection, key: str, bucket: list, now: float):
+        conn.execute(
+            '''
+            INSERT OR REPLACE INTO rate_limit_buckets
+            (bucket_key, capacity, refill_per_second, tokens, updated_at, blocked_until)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ''',
+            (key, bucket[0], bucket[1], bucket[2], now, bucket[3]),
+        )
+
+    def try_acquire(self, platform: str, endpoint: str, credential: Optional[str] = None,
+                    tokens: float = 1) -> float:
+        """
+        Take tokens if available.
+
+        Returns:
+            0 if the tokens were taken, else seconds until they could be
+        """
+        self._ensure_db()
+        key = bucket_key(platform, endpoint, credential)
+        now = self._clock()
+        conn = self._get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                bucket = self._load(conn, key, platform, endpoint, now)
+                capacity, refill, available, blocked_until = bucket
+                if blocked_until > now:
+                    wait = blocked_until - now
+                elif available >= tokens:
+                    bucket[2] = available - tokens
+                    wait = 0.0
+                else:
+                    wait = (min(tokens, capacity) - available) / refill if refill > 0 else float("inf")
+                self._store(conn, key, bucket, now)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        finally:
+            conn.close()
+        return wait
+
+    def acquire(self, platform: str, endpoint: str, credential: Optional[str] = None,
+                tokens: float = 1, max_wait: Optional[float] = None):
+        """
+        Wait for and take tokens from a bucket (blocking).
+
+        Args:
+            platform: "twitter" or "bluesky"
+            endpoint: Endpoint class (e.g. "post", "write", "read")
+            credential: Account or token the limit applies to
+            tokens: Tokens to take
+            max_wait: Overrides the limiter's max_wait
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed max_wait
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(platform, endpoint, credential, tokens)
+            if wait <= 0:
+                self._bump("acquired")
+                return
+            if waited + wait > max_wait:
+                self._bump("rejected")
+                raise RateLimitExceeded(bucket_key(platform, endpoint, credential), wait)
+            self._bump("waited")
+            self._sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, platform: str, endpoint: str,
+                            credential: Optional[str] = None, tokens: float = 1,
+                            max_wait: Optional[float] = None):
+        """Like acquire(), but waits with asyncio.sleep()."""
+        max_wait = self.max_wait if max_wait is None else max_wait
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, platform, endpoint, credential, tokens)
+            if wait <= 0:
+                self._bump("acquired")
+                return
+            if waited + wait > max_wait:
+                self._bump("rejected")
+                raise RateLimitExceeded(bucket_key(platform, endpoint, credential), wait)
+            self._bump("waited")
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def observe(self, platform: str, endpoint: str, credential: Optional[str],
+                headers, status_code: Optional[int] = None):
+        """
+        Learn a bucket's real state from a response.
+
+        Understands x-rate-limit-limit/-remaining/-reset (Twitter),
+        RateLimit-Limit/-Remaining/-Reset/-Policy (Bluesky) and Retry-After.
+
+        Args:
+            platform: "twitter" or "bluesky"
+            endpoint: Endpoint class the response belongs to
+            credential: Account or token the limit applies to
+            headers: Response headers (any mapping)
+            status_code: HTTP status of the response
+        """
+        limit = _number(_header(headers, "x-rate-limit-limit", "ratelimit-limit"))
+        remaining = _number(_header(headers, "x-rate-limit-remaining", "ratelimit-remaining"))
+        reset = _number(_header(headers, "x-rate-limit-reset", "ratelimit-reset"))
+        retry_after = _number(_header(headers, "retry-after"))
+        policy = _header(headers, "ratelimit-policy")
+        if limit is None and remaining is None and retry_after is None and status_code != 429:
+            return
+
+        self._ensure_db()
+        key = bucket_key(platform, endpoint, credential)
+        now = self._clock()
+        conn = self._get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                bucket = self._load(conn, key, platform, endpoint, now)
+                if limit and limit > 0:
+                    match = _POLICY_WINDOW.search(policy or "")
+                    window = float(match.group(1)) if match else bucket[0] / bucket[1]
+                    bucket[0], bucket[1] = limit, limit / window
+                if remaining is not None:
+                    bucket[2] = min(max(remaining, 0.0), bucket[0])
+                if status_code == 429 or remaining == 0:
+                    bucket[2] = 0.0
+                    if retry_after is not None:
+                        bucket[3] = now + retry_after
+                    elif reset is not None and reset > now:
+                        bucket[3] = reset
+                    else:
+                        bucket[3] = now + 1 / bucket[1]
+                self._store(conn, key, bucket, now)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        finally:
+            conn.close()
+        self._bump("learned")
+
+    def observer(self, platform: str, credential: Optional[str],
+                 classify: Callable[[str, str], str]) -> Callable:
+        """
+        Response hook that feeds observe() (requests and httpx hooks).
+
+        Args:
+            platform: "twitter" or "bluesky"
+            credential: Account or token of the client
+            classify: (method, url) -> endpoint class
+        """
+
+        def hook(response, *args, **kwargs):
+            try:
+                request = response.request
+                endpoint = classify(request.method, str(request.url))
+                self.observe(platform, endpoint, credential, response.headers,
+                             response.status_code)
+            except Exception as e:
+                logger.debug(f"Could not learn rate limits from response: {e}")
+            return response
+
+        return hook
+
+    def get_stats(self) -> dict:
+        """
+        Get limiter metrics.
+
+        Returns:
+            Dictionary with acquire/wait/reject counts and per-bucket state
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        now = self._clock()
+        buckets = {}
+        conn = self._get_connection()
+        try:
+            for key, capacity, refill, tokens, updated_at, blocked_until in conn.execute(
+                "SELECT bucket_key, capacity, refill_per_second, tokens, updated_at, "
+                "blocked_until FROM rate_limit_buckets ORDER BY bucket_key"
+            ):
+                buckets[key] = {
+                    "capacity": capacity,
+                    "tokens": round(min(capacity, tokens + max(0.0, now - updated_at) * refill), 2),
+                    "blocked_for": round(max(0.0, blocked_until - now), 1),
+                }
+        except sqlite3.OperationalError:
+            # Table not initialized yet
+            pass
+        finally:
+            conn.close()
+        stats["buckets"] = buckets
+        return stats
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
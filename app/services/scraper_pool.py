@@ -0,0 +1,257 @@
+"""
+ScraperPool - Process-wide twscrape API and account pool
+
+Building a new ``twscrape.API()`` per call and logging accounts in on every
+run is slow, triggers login challenges and burns most of the scraping
+budget. This service owns the single API object for the process:
+
+- Accounts are added to the twscrape pool once. An account is only logged
+  in when twscrape does not already hold an active session for it, and a
+  failed login is not retried until a cooldown has passed.
+- Every caller (tweet fetching, threads, cleanup) gets the same API
+  object. twscrape picks the least recently used unlocked account per
+  request, so accounts added for different users rotate across all of them.
+- Each account's health and per-queue lock state is tracked and exposed as
+  metrics.
+
+All coroutines must run on the shared async runtime loop (see
+app/core/async_runtime.py).
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from twscrape import API
+
+from app.core.config import SCRAPER_LOGIN_RETRY_SECONDS, TWSCRAPE_ACCOUNTS_DB
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+REQUIRED_FIELDS = ("username", "password", "email", "email_password")
+HEALTH_REFRESH_SECONDS = 60
+
+
+@dataclass
+class AccountHealth:
+    """Health and lock state of one scraping account"""
+
+    username: str
+    active: bool
+    logged_in: bool
+    total_requests: int = 0
+    error: Optional[str] = None
+    last_used: Optional[str] = None
+    locked_queues: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def available(self) -> bool:
+        """True if the account can serve requests for at least one queue."""
+        return self.active and self.error is None
+
+
+class ScraperPool:
+    """
+    One twscrape API shared by every caller, with accounts loaded once.
+    """
+
+    def __init__(
+        self,
+        db_file: str = TWSCRAPE_ACCOUNTS_DB,
+        api_factory: Callable[..., API] = API,
+        login_retry_seconds: float = SCRAPER_LOGIN_RETRY_SECONDS,
+    ):
+        """
+        Initialize ScraperPool.
+
+        Args:
+            db_file: twscrape accounts database
+            api_factory: Creates the API object (for tests)
+            login_retry_seconds: Cooldown before retrying a failed login
+        """
+        self.db_file = db_file
+        self.login_retry_seconds = login_retry_seconds
+        self._api_factory = api_factory
+        self._api: Optional[API] = None
+        self._ready = set()  # usernames with an active session in the pool
+        self._failed_logins: Dict[str, float] = {}  # username -> monotonic time
+        self._health: Dict[str, AccountHealth] = {}
+        self._health_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._async_lock: Optional[asyncio.Lock] = None
+        self._async_lock_loop = None
+        self._stats = {
+            "api_requests": 0,
+            "accounts_added": 0,
+            "logins": 0,
+            "login_failures": 0,
+            "logins_skipped": 0,
+        }
+
+    @property
+    def api(self) -> API:
+        """The shared twscrape API, created on first access."""
+        with self._lock:
+            if self._api is None:
+                self._api = self._api_factory(self.db_file)
+            return self._api
+
+    def _bump(self, counter: str, by: int = 1):
+        with self._lock:
+            self._stats[counter] += by
+
+    def _get_async_lock(self) -> asyncio.Lock:
+        # The runtime loop can be restarted; a lock only works on one loop
+        loop = asyncio.get_running_loop()
+        if self._async_lock is None or self._async_lock_loop is not loop:
+            self._async_lock = asyncio.Lock()
+            self._async_lock_loop = loop
+        return self._async_lock
+
+    async def ensure_account(self, credentials: Optional[dict]) -> bool:
+        """
+        Make sure an account is in the pool with an active session.
+
+        Accounts already known to be active cost nothing. New accounts are
+        added and logged in once; failed logins wait out the cooldown.
+
+        Args:
+            credentials: Dict with username, password, email, email_password
+
+        Returns:
+            True if the account is active in the pool
+        """
+        if not credentials or any(not credentials.get(f) for f in REQUIRED_FIELDS):
+            return False
+
+        username = credentials["username"]
+        if username in self._ready:
+            return True
+
+        async with self._get_async_lock():
+            if username in self._ready:
+                return True
+
+            pool = self.api.pool
+            account = await pool.get_account(username)
+            if account is None:
+                await pool.add_account(
+                    username,
+                    credentials["password"],
+                    credentials["email"],
+                    credentials["email_password"],
+                    cookies=credentials.get("cookies"),
+                    mfa_code=credentials.get("mfa_code"),
+                )
+                self._bump("accounts_added")
+                account = await pool.get_account(username)
+
+            if account is not None and account.active:
+                self._ready.add(username)
+                return True
+
+            failed_at = self._failed_logins.get(username)
+            if failed_at is not None and time.monotonic() - failed_at < self.login_retry_seconds:
+                self._bump("logins_skipped")
+                return False
+
+            self._bump("logins")
+            result = await pool.login_all([username])
+            if result and result.get("success"):
+                self._failed_logins.pop(username, None)
+                self._ready.add(username)
+                logger.info(f"Scraping account {username} logged in")
+                return True
+
+            self._failed_logins[username] = time.monotonic()
+            self._bump("login_failures")
+            logger.warning(
+                f"Login failed for scraping account {username}, "
+                f"retrying in {self.login_retry_seconds:.0f}s at the earliest"
+            )
+            return False
+
+    async def get_api(self, credentials: Optional[dict] = None) -> API:
+        """
+        Get the shared API, loading the caller's account into the pool first.
+
+        Args:
+            credentials: Scraping credentials of the requesting user (optional)
+
+        Returns:
+            The process-wide twscrape API
+        """
+        self._bump("api_requests")
+        if credentials:
+            await self.ensure_account(credentials)
+        if self._health_at is None or time.monotonic() - self._health_at > HEALTH_REFRESH_SECONDS:
+            try:
+                await self.refresh_health()
+            except Exception as e:
+                logger.debug(f"Could not refresh scraping account health: {e}")
+        return self.api
+
+    async def refresh_health(self) -> List[AccountHealth]:
+        """
+        Reload the health and lock state of every account in the pool.
+
+        Returns:
+            List of AccountHealth, one per account
+        """
+        now = datetime.now(timezone.utc)
+        health = {}
+        for account in await self.api.pool.get_all():
+            locked = {
+                queue: until.isoformat()
+                for queue, until in (account.locks or {}).items()
+                if until and until > now
+            }
+            health[account.username] = AccountHealth(
+                username=account.username,
+                active=bool(account.active),
+                logged_in=bool((account.headers or {}).get("authorization")),
+                total_requests=sum((account.stats or {}).values()),
+                error=account.error_msg,
+                last_used=account.last_used.isoformat() if account.last_used else None,
+                locked_queues=locked,
+            )
+            if not account.active:
+                self._ready.discard(account.username)
+
+        with self._lock:
+            self._health = health
+            self._health_at = time.monotonic()
+        return list(health.values())
+
+    def get_stats(self) -> dict:
+        """
+        Get pool metrics from the last health refresh.
+
+        Returns:
+            Dictionary with API requests, login counters and per-account health
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            health = list(self._health.values())
+        stats["accounts"] = len(health)
+        stats["active"] = sum(1 for h in health if h.available)
+        stats["locked"] = sum(1 for h in health if h.locked_queues)
+        stats["account_health"] = [asdict(h) for h in health]
+        return stats
+
+
+_pool: Optional[ScraperPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_scraper_pool() -> ScraperPool:
+    """Get the process-wide scraper pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ScraperPool()
+        return _pool
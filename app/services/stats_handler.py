@@ -1,7 +1,7 @@
-import sqlite3
 import time
 import os
 from app.core.logger import setup_logger
+from app.core.db_pool import get_connection
 
 logger = setup_logger(__name__)
 
@@ -26,7 +26,8 @@ class StatsTracker:
         """
         self.db_path = db_path or DB_PATH
 
-    def record_sync(self, source, target, success, media_count=0, is_thread=False, duration_ms=0):
+    def record_sync(self, source, target, success, media_count=0, is_thread=False, duration_ms=0,
+                    user_id=None):
         """
         Record a synchronization operation.
 
@@ -37,19 +38,27 @@ class StatsTracker:
             media_count: Number of media items synced (default: 0)
             is_thread: Boolean indicating if this was a thread sync (default: False)
             duration_ms: Duration of the sync operation in milliseconds (default: 0)
+            user_id: User the sync ran for (default: None)
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             timestamp = int(time.time())
             success_int = 1 if success else 0
             is_thread_int = 1 if is_thread else 0
 
-            cursor.execute("""
-            INSERT INTO sync_stats (timestamp, source, target, success, media_count, is_thread, duration_ms)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (timestamp, source, target, success_int, media_count, is_thread_int, duration_ms))
+            if user_id is None:
+                # Databases from before multi-user mode have no user_id column
+                cursor.execute("""
+                INSERT INTO sync_stats (timestamp, source, target, success, media_count, is_thread, duration_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (timestamp, source, target, success_int, media_count, is_thread_int, duration_ms))
+            else:
+                cursor.execute("""
+                INSERT INTO sync_stats (timestamp, source, target, success, media_count, is_thread, duration_ms, user_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (timestamp, source, target, success_int, media_count, is_thread_int, duration_ms, user_id))
 
             conn.commit()
             conn.close()
@@ -70,7 +79,7 @@ class StatsTracker:
             error_message: Detailed error message
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             timestamp = int(time.time())
@@ -110,7 +119,7 @@ class StatsTracker:
             period_seconds = self._parse_period(period)
             cutoff_timestamp = int(time.time()) - period_seconds
 
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             # Get aggregated stats
@@ -170,7 +179,7 @@ class StatsTracker:
                 - error_message: Detailed error message
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -8,6 +8,7 @@ from typing import Optional, Tuple, Dict
 from flask import current_app
 
 from app.core.db_handler import add_stats_tables
+from app.core.db_pool import get_connection
 
 
 @dataclass
@@ -45,6 +46,7 @@ class StatsService:
         total_synced = self._count_total_syncs(user_id)
         platforms_connected = self._count_platforms_connected(user_id)
         last_sync_at = self._get_last_sync_at(user_id)
+        next_sync_at = self._get_next_sync_at(user_id)
         storage_used_mb = self._get_storage_used_mb()
         tweets_archived = self._count_archived_tweets(user_id)
 
@@ -54,7 +56,7 @@ class StatsService:
             total_synced=total_synced,
             platforms_connected=platforms_connected,
             last_sync_at=last_sync_at,
-            next_sync_at=None,
+            next_sync_at=next_sync_at,
             storage_used_mb=storage_used_mb,
             tweets_archived=tweets_archived,
         )
@@ -63,7 +65,7 @@ class StatsService:
         return stats
 
     def _get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -138,6 +140,24 @@ class StatsService:
         finally:
             conn.close()
 
+    def _get_next_sync_at(self, user_id: int) -> Optional[str]:
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT next_sync_at FROM sync_schedule WHERE user_id = ?",
+                (user_id,),
+            )
+            row = cursor.fetchone()
+            if not row or not row[0]:
+                return None
+            return datetime.utcfromtimestamp(row[0]).isoformat()
+        except sqlite3.OperationalError:
+            # Scheduler has not run yet
+            return None
+        finally:
+            conn.close()
+
     def _count_archived_tweets(self, user_id: int) -> int:
         conn = self._get_connection()
         try:
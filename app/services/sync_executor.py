@@ -0,0 +1,128 @@
+"""
+SyncExecutor - Concurrent multi-user sync execution
+
+Runs one sync job per user on a bounded thread pool. Each job is isolated:
+an exception in one user's sync is captured in that user's result and never
+affects the others. Every result carries the job's wall-clock duration so a
+cycle can be profiled per user.
+
+Jobs must not mutate shared module state (config globals, module-level
+clients); everything a job needs is passed to it explicitly.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+
+from app.core.config import SYNC_MAX_CONCURRENT_USERS
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class UserSyncResult:
+    """Outcome of one user's sync job"""
+
+    user_id: int
+    username: str
+    success: bool
+    duration_ms: int
+    result: Any = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+
+class SyncExecutor:
+    """
+    Runs per-user sync jobs concurrently under a fixed concurrency limit.
+
+    The worker pool is created on first use and reused across cycles so
+    per-thread resources (e.g. pooled database connections) survive
+    between cycles.
+    """
+
+    def __init__(self, max_workers: int = SYNC_MAX_CONCURRENT_USERS):
+        """
+        Initialize SyncExecutor.
+
+        Args:
+            max_workers: Maximum number of users synced at the same time
+        """
+        self.max_workers = max(1, int(max_workers))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="user-sync"
+                )
+            return self._pool
+
+    def _run_one(self, user, job: Callable[[Any], Any]) -> UserSyncResult:
+        start = time.perf_counter()
+        try:
+            value = job(user)
+            success, error, error_type = True, None, None
+        except Exception as e:
+            value = None
+            success, error, error_type = False, str(e), type(e).__name__
+            logger.error(f"Error syncing user {user.username}: {e}")
+
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        logger.info(f"[User {user.username}] Sync job finished in {duration_ms} ms")
+        return UserSyncResult(
+            user_id=user.id,
+            username=user.username,
+            success=success,
+            duration_ms=duration_ms,
+            result=value,
+            error=error,
+            error_type=error_type,
+        )
+
+    def run(self, users: Iterable, job: Callable[[Any], Any]) -> List[UserSyncResult]:
+        """
+        Run job(user) for every user and wait for all of them.
+
+        Args:
+            users: Users to sync (objects with .id and .username)
+            job: Callable performing one user's sync
+
+        Returns:
+            List of UserSyncResult in the same order as users
+        """
+        users = list(users)
+        if not users:
+            return []
+
+        if self.max_workers == 1:
+            return [self._run_one(user, job) for user in users]
+
+        pool = self._get_pool()
+        futures = [pool.submit(self._run_one, user, job) for user in users]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool (it is recreated on next use)."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+_executor: Optional[SyncExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_sync_executor() -> SyncExecutor:
+    """Get the process-wide sync executor."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = SyncExecutor()
+        return _executor
@@ -0,0 +1,307 @@
+"""
+SyncLeases - Sharding users across sync worker processes
+
+In worker mode several sync processes (possibly on several hosts sharing
+the database) split the active users between them through a lease table:
+
+- Every worker registers in sync_workers and heartbeats it. Workers whose
+  heartbeat is older than the lease TTL count as dead.
+- A worker syncs a user only while it holds that user's row in
+  sync_leases (owner, expiry, heartbeat). Leases are claimed with a
+  conditional upsert inside BEGIN IMMEDIATE, so only one live owner exists
+  per user.
+- On every rebalance a worker aims for ceil(users / live workers) leases:
+  it releases its surplus when workers join and claims free or expired
+  leases when a worker dies (its leases expire after the TTL).
+- A background heartbeat renews held leases, and holds() re-checks the
+  lease right before each user is synced.
+
+The database must live on storage with working SQLite locking (a local
+disk or a network filesystem with reliable byte-range locks).
+"""
+
+import math
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from app.core.config import WORKER_HEARTBEAT_SECONDS, WORKER_LEASE_SECONDS
+from app.core.db_pool import get_connection
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Worker rows silent for this many TTLs are removed
+STALE_WORKER_TTLS = 10
+
+
+def default_worker_id() -> str:
+    """Identity of this process: host, PID and a random suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SyncLeases:
+    """
+    Lease table assigning each active user to exactly one sync worker.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "chirpsyncer.db",
+        worker_id: Optional[str] = None,
+        lease_seconds: float = WORKER_LEASE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize SyncLeases.
+
+        Args:
+            db_path: Path to SQLite database
+            worker_id: Unique identity of this worker (generated if omitted)
+            lease_seconds: How long a lease or heartbeat stays valid
+            clock: Returns the current Unix time (for tests)
+        """
+        self.db_path = db_path
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self._clock = clock
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get database connection"""
+        return get_connection(self.db_path)
+
+    def init_db(self):
+        """Initialize the sync_workers and sync_leases tables"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_workers (
+                    worker_id TEXT PRIMARY KEY,
+                    host TEXT NOT NULL,
+                    pid INTEGER NOT NULL,
+                    started_at INTEGER NOT NULL,
+                    heartbeat_at INTEGER NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_leases (
+                    user_id INTEGER PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    acquired_at INTEGER NOT NULL,
+                    heartbeat_at INTEGER NOT NULL,
+                    expires_at INTEGER NOT NULL
+                )
+            ''')
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sync_leases_owner ON sync_leases(owner)"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _beat(self, conn: sqlite3.Connection, now: int):
+        """Refresh this worker's heartbeat and every lease it holds."""
+        conn.execute(
+            '''
+            INSERT INTO sync_workers (worker_id, host, pid, started_at, heartbeat_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(worker_id) DO UPDATE SET heartbeat_at = excluded.heartbeat_at
+            ''',
+            (self.worker_id, socket.gethostname(), os.getpid(), now, now),
+        )
+        conn.execute(
+            '''
+            UPDATE sync_leases SET heartbeat_at = ?, expires_at = ?
+            WHERE owner = ? AND expires_at > ?
+            ''',
+            (now, now + int(self.lease_seconds), self.worker_id, now),
+        )
+
+    def heartbeat(self):
+        """Mark this worker alive and extend its leases."""
+        now = int(self._clock())
+        conn = self._get_connection()
+        try:
+            with conn:
+                self._beat(conn, now)
+        finally:
+            conn.close()
+
+    def rebalance(self, user_ids: Iterable[int]) -> Set[int]:
+        """
+        Adjust this worker's leases to its fair share of the active users.
+
+        Args:
+            user_ids: IDs of every active user
+
+        Returns:
+            IDs of the users this worker now holds
+        """
+        user_ids = sorted(set(user_ids))
+        now = int(self._clock())
+        conn = self._get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._beat(conn, now)
+                conn.execute(
+                    "DELETE FROM sync_workers WHERE heartbeat_at <= ?",
+                    (now - STALE_WORKER_TTLS * int(self.lease_seconds),),
+                )
+                live_workers = conn.execute(
+                    "SELECT COUNT(*) FROM sync_workers WHERE heartbeat_at > ?",
+                    (now - int(self.lease_seconds),),
+                ).fetchone()[0]
+                share = math.ceil(len(user_ids) / max(live_workers, 1))
+
+                leases = dict(
+                    conn.execute(
+                        "SELECT user_id, owner FROM sync_leases WHERE expires_at > ?", (now,)
+                    ).fetchall()
+                )
+                active = set(user_ids)
+                owned = sorted(
+                    uid for uid, owner in leases.items()
+                    if owner == self.worker_id and uid in active
+                )
+
+                # Deactivated users, then the surplus beyond the fair share
+                release = [
+                    uid for uid, owner in leases.items()
+                    if owner == self.worker_id and uid not in active
+                ]
+                if len(owned) > share:
+                    release += owned[share:]
+                    owned = owned[:share]
+                conn.executemany(
+                    "DELETE FROM sync_leases WHERE user_id = ? AND owner = ?",
+                    [(uid, self.worker_id) for uid in release],
+                )
+
+                free = [uid for uid in user_ids if uid not in leases]
+                claimed = []
+                for uid in free[: max(share - len(owned), 0)]:
+                    cursor = conn.execute(
+                        '''
+                        INSERT INTO sync_leases
+                            (user_id, owner, acquired_at, heartbeat_at, expires_at)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(user_id) DO UPDATE SET
+                            owner = excluded.owner,
+                            acquired_at = excluded.acquired_at,
+                            heartbeat_at = excluded.heartbeat_at,
+                            expires_at = excluded.expires_at
+                        WHERE sync_leases.expires_at <= ?
+                        ''',
+                        (uid, self.worker_id, now, now, now + int(self.lease_seconds), now),
+                    )
+                    if cursor.rowcount:
+                        claimed.append(uid)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        finally:
+            conn.close()
+
+        if release or claimed:
+            logger.info(
+                f"Worker {self.worker_id}: {len(owned) + len(claimed)} users held "
+                f"({len(claimed)} claimed, {len(release)} released, "
+                f"{live_workers} live workers)"
+            )
+        return set(owned) | set(claimed)
+
+    def holds(self, user_id: int) -> bool:
+        """
+        Renew and confirm this worker's lease on a user.
+
+        Call right before syncing the user; False means another worker may
+        own the user now and it must be skipped.
+        """
+        now = int(self._clock())
+        conn = self._get_connection()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    '''
+                    UPDATE sync_leases SET heartbeat_at = ?, expires_at = ?
+                    WHERE user_id = ? AND owner = ? AND expires_at > ?
+                    ''',
+                    (now, now + int(self.lease_seconds), user_id, self.worker_id, now),
+                )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def release_all(self):
+        """Give up every lease and unregister this worker (on shutdown)."""
+        conn = self._get_connection()
+        try:
+            with conn:
+                conn.execute("DELETE FROM sync_leases WHERE owner = ?", (self.worker_id,))
+                conn.execute("DELETE FROM sync_workers WHERE worker_id = ?", (self.worker_id,))
+        finally:
+            conn.close()
+
+    def start_heartbeat(self, interval: float = WORKER_HEARTBEAT_SECONDS):
+        """Heartbeat from a daemon thread until stop_heartbeat()."""
+        if self._heartbeat_thread is not None and self._heartbeat_thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.heartbeat()
+                except Exception as e:
+                    logger.error(f"Worker {self.worker_id} heartbeat failed: {e}")
+
+        self._heartbeat_thread = threading.Thread(
+            target=run, name="sync-lease-heartbeat", daemon=True
+        )
+        self._heartbeat_thread.start()
+
+    def stop_heartbeat(self):
+        """Stop the heartbeat thread."""
+        self._stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join()
+            self._heartbeat_thread = None
+
+    def get_stats(self) -> Dict:
+        """
+        Get lease metrics.
+
+        Returns:
+            Dictionary with this worker's ID, live workers and leases per owner
+        """
+        now = int(self._clock())
+        conn = self._get_connection()
+        try:
+            live = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT worker_id FROM sync_workers WHERE heartbeat_at > ? ORDER BY worker_id",
+                    (now - int(self.lease_seconds),),
+                )
+            ]
+            leases = dict(
+                conn.execute(
+                    "SELECT owner, COUNT(*) FROM sync_leases WHERE expires_at > ? GROUP BY owner",
+                    (now,),
+                ).fetchall()
+            )
+        except sqlite3.OperationalError:
+            # Lease tables not initialized yet
+            live, leases = [], {}
+        finally:
+            conn.close()
+        return {"worker_id": self.worker_id, "live_workers": live, "leases": leases}
@@ -0,0 +1,520 @@
+"""
+SyncOutbox - Durable queue between fetching and posting
+
+Fetched posts are not posted inline anymore. Each post (or whole thread) to
+mirror is enqueued in the sync_outbox table under an idempotency key built
+from its owner, target platform and compute_content_hash(), so enqueuing
+the same content twice is a no-op. Posting then drains the outbox:
+
+- A drain claims due jobs under a lease. A job whose worker died becomes
+  claimable again once its lease expires, so nothing is lost on a crash.
+- A failed job is retried on a later drain with exponential backoff, and
+  moved to the 'dead' state after OUTBOX_MAX_ATTEMPTS attempts.
+- A successful job is marked done and its synced_posts rows are written in
+  the same transaction, so a job is never done without being recorded.
+- A job refused before reaching the platform (open circuit, exhausted rate
+  limit) is deferred until the refusal expires without using up an attempt.
+- A job posted only in part (a thread that stopped midway) records the
+  posted items and keeps the rest as its payload, so its retry carries on
+  where it stopped instead of posting the thread again.
+
+Jobs belong to a user, and are drained during that user's sync with that
+user's platform clients.
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import (
+    OUTBOX_BACKOFF_SECONDS,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_MAX_BACKOFF_SECONDS,
+)
+from app.core.db_handler import save_synced_posts_many
+from app.core.db_pool import get_connection
+from app.core.logger import setup_logger
+from app.core.utils import compute_content_hash
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.rate_limiter import RateLimitExceeded
+
+logger = setup_logger(__name__)
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+DEAD = "dead"
+
+
+@dataclass
+class OutboxJob:
+    """One queued post or thread"""
+
+    id: int
+    idempotency_key: str
+    user_id: Optional[int]
+    source: str
+    target: str
+    items: List[dict]  # {"id": source post ID, "text": content, "media": [...]?}, thread order
+    attempts: int = 0
+    lease_owner: Optional[str] = None
+    last_error: Optional[str] = None
+
+    @property
+    def is_thread(self) -> bool:
+        return len(self.items) > 1
+
+
+@dataclass
+class DrainResult:
+    """Outcome of one drain"""
+
+    posted: int = 0
+    failed: int = 0
+    dead: int = 0
+    deferred: int = 0
+    records: List[dict] = field(default_factory=list)
+
+
+class PartialPostError(Exception):
+    """A job was posted only in part.
+
+    Attributes:
+        records: synced_posts records of the posted items
+        remaining: Job items still to post, replacing the job's payload
+        error: Error that stopped the job
+    """
+
+    def __init__(self, records: List[dict], remaining: List[dict], error: Exception):
+        super().__init__(str(error))
+        self.records = records
+        self.remaining = remaining
+        self.error = error
+
+
+def make_idempotency_key(user_id: Optional[int], target: str, items: List[dict]) -> str:
+    """Key of a job: owner and target plus the content hash of its text."""
+    content = "\n".join(item["text"] for item in items)
+    return f"{user_id}:{target}:{compute_content_hash(content)}"
+
+
+class SyncOutbox:
+    """
+    SQLite-backed outbox of posts waiting to be mirrored.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "chirpsyncer.db",
+        lease_seconds: int = OUTBOX_LEASE_SECONDS,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        backoff_seconds: int = OUTBOX_BACKOFF_SECONDS,
+        max_backoff_seconds: int = OUTBOX_MAX_BACKOFF_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize SyncOutbox.
+
+        Args:
+            db_path: Path to SQLite database
+            lease_seconds: How long a claimed job stays reserved for its worker
+            max_attempts: Attempts before a job is dead-lettered
+            backoff_seconds: Delay before the first retry (doubles per attempt)
+            max_backoff_seconds: Upper bound of the retry delay
+            clock: Returns the current Unix time (for tests)
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._clock = clock
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get database connection"""
+        return get_connection(self.db_path)
+
+    def init_db(self):
+        """Initialize the sync_outbox table"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    idempotency_key TEXT NOT NULL UNIQUE,
+                    user_id INTEGER,
+                    source TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at INTEGER NOT NULL,
+                    lease_owner TEXT,
+                    lease_expires_at INTEGER,
+                    last_error TEXT,
+                    result TEXT,
+                    created_at INTEGER NOT NULL,
+                    updated_at INTEGER NOT NULL,
+                    CHECK (status IN ('pending', 'in_progress', 'done', 'dead'))
+                )
+            ''')
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_outbox_due "
+                "ON sync_outbox(status, user_id, target, next_attempt_at)"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def enqueue_many(self, user_id: Optional[int], source: str, target: str,
+                     jobs: List[List[dict]]) -> int:
+        """
+        Enqueue posts to mirror in one transaction.
+
+        Args:
+            user_id: Owning user (None in single-user mode)
+            source: Platform the posts come from
+            target: Platform to post to
+            jobs: One list of {"id", "text"} items per job (several for a thread)
+
+        Returns:
+            Number of new jobs. Content the user already queued, posted or
+            dead-lettered for the target is not enqueued again.
+        """
+        now = int(self._clock())
+        rows = [
+            (
+                make_idempotency_key(user_id, target, items),
+                user_id,
+                source,
+                target,
+                json.dumps({"items": items}),
+                now,
+                now,
+                now,
+            )
+            for items in jobs
+            if items
+        ]
+        if not rows:
+            return 0
+
+        conn = self._get_connection()
+        try:
+            before = conn.total_changes
+            with conn:
+                conn.executemany('''
+                    INSERT OR IGNORE INTO sync_outbox
+                    (idempotency_key, user_id, source, target, payload,
+                     next_attempt_at, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+            return conn.total_changes - before
+        finally:
+            conn.close()
+
+    def claim(self, user_id: Optional[int], target: str,
+              limit: int = OUTBOX_BATCH_SIZE, owner: Optional[str] = None) -> List[OutboxJob]:
+        """
+        Lease due jobs of a user for one target.
+
+        Pending jobs whose backoff has elapsed and in-progress jobs whose
+        lease has expired are both claimable.
+
+        Args:
+            user_id: Owning user (None in single-user mode)
+            target: Platform to post to
+            limit: Most jobs to claim
+            owner: Lease owner (a fresh one if omitted)
+
+        Returns:
+            Claimed jobs, oldest first
+        """
+        owner = owner or uuid.uuid4().hex
+        now = int(self._clock())
+        conn = self._get_connection()
+        try:
+            # BEGIN IMMEDIATE takes the write lock before reading, so two
+            # workers can never claim the same job
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute('''
+                    SELECT id, idempotency_key, user_id, source, target, payload,
+                           attempts, last_error
+                    FROM sync_outbox
+                    WHERE user_id IS ? AND target = ?
+                      AND ((status = 'pending' AND next_attempt_at <= ?)
+                           OR (status = 'in_progress' AND lease_expires_at <= ?))
+                    ORDER BY id
+                    LIMIT ?
+                ''', (user_id, target, now, now, limit)).fetchall()
+
+                conn.executemany('''
+                    UPDATE sync_outbox
+                    SET status = 'in_progress', lease_owner = ?, lease_expires_at = ?,
+                        attempts = attempts + 1, updated_at = ?
+                    WHERE id = ?
+                ''', [(owner, now + self.lease_seconds, now, row[0]) for row in rows])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        finally:
+            conn.close()
+
+        return [
+            OutboxJob(
+                id=row[0],
+                idempotency_key=row[1],
+                user_id=row[2],
+                source=row[3],
+                target=row[4],
+                items=json.loads(row[5])["items"],
+                attempts=row[6] + 1,
+                lease_owner=owner,
+                last_error=row[7],
+            )
+            for row in rows
+        ]
+
+    def complete(self, job: OutboxJob, records: List[dict]) -> bool:
+        """
+        Mark a job done and record its posts in synced_posts atomically.
+
+        Args:
+            job: Claimed job
+            records: synced_posts rows (save_synced_posts_many() format)
+
+        Returns:
+            False if the lease was lost to another worker (nothing written)
+        """
+        now = int(self._clock())
+        conn = self._get_connection()
+        try:
+            with conn:
+                cursor = conn.execute('''
+                    UPDATE sync_outbox
+                    SET status = 'done', result = ?, last_error = NULL,
+                        lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                    WHERE id = ? AND lease_owner = ? AND status = 'in_progress'
+                ''', (json.dumps(records), now, job.id, job.lease_owner))
+                if cursor.rowcount == 0:
+                    return False
+                save_synced_posts_many(records, conn=conn)
+            return True
+        finally:
+            conn.close()
+
+    def advance(self, job: OutboxJob, records: List[dict], remaining: List[dict]) -> bool:
+        """
+        Record the posted part of a job and keep the rest as its payload.
+
+        The job stays claimed; fail() or defer() releases it afterwards.
+
+        Args:
+            job: Claimed job
+            records: synced_posts rows of the posted items
+            remaining: Items still to post
+
+        Returns:
+            False if the lease was lost to another worker (nothing written)
+        """
+        now = int(self._clock())
+        conn = self._get_connection()
+        try:
+            with conn:
+                cursor = conn.execute('''
+                    UPDATE sync_outbox SET payload = ?, updated_at = ?
+                    WHERE id = ? AND lease_owner = ? AND status = 'in_progress'
+                ''', (json.dumps({"items": remaining}), now, job.id, job.lease_owner))
+                if cursor.rowcount == 0:
+                    return False
+                save_synced_posts_many(records, conn=conn)
+            job.items = remaining
+            return True
+        finally:
+            conn.close()
+
+    def fail(self, job: OutboxJob, error: str) -> str:
+        """
+        Release a failed job for a later retry, or dead-letter it.
+
+        Args:
+            job: Claimed job
+            error: Error message to keep on the job
+
+        Returns:
+            New status ('pending' or 'dead')
+        """
+        now = int(self._clock())
+        if job.attempts >= self.max_attempts:
+            status, next_attempt_at = DEAD, now
+        else:
+            delay = min(self.backoff_seconds * 2 ** (job.attempts - 1), self.max_backoff_seconds)
+            status, next_attempt_at = PENDING, now + delay
+
+        conn = self._get_connection()
+        try:
+            with conn:
+                conn.execute('''
+                    UPDATE sync_outbox
+                    SET status = ?, next_attempt_at = ?, last_error = ?,
+                        lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                    WHERE id = ? AND lease_owner = ?
+                ''', (status, next_attempt_at, error, now, job.id, job.lease_owner))
+        finally:
+            conn.close()
+        return status
+
+    def defer(self, job: OutboxJob, delay: float, error: str):
+        """
+        Release a job that was never attempted, giving back its attempt.
+
+        Args:
+            job: Claimed job
+            delay: Seconds until the job is due again
+            error: Reason to keep on the job
+        """
+        now = int(self._clock())
+        conn = self._get_connection()
+        try:
+            with conn:
+                conn.execute('''
+                    UPDATE sync_outbox
+                    SET status = 'pending', attempts = MAX(attempts - 1, 0),
+                        next_attempt_at = ?, last_error = ?,
+                        lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                    WHERE id = ? AND lease_owner = ?
+                ''', (now + max(1, int(delay)), error, now, job.id, job.lease_owner))
+        finally:
+            conn.close()
+
+    def drain(self, user_id: Optional[int], target: str,
+              post: Callable[[OutboxJob], List[dict]],
+              limit: int = OUTBOX_BATCH_SIZE) -> DrainResult:
+        """
+        Post every due job of a user for one target.
+
+        Args:
+            user_id: Owning user (None in single-user mode)
+            target: Platform to post to
+            post: Posts a job and returns its synced_posts records; raises on failure
+            limit: Most jobs to post in this drain
+
+        Returns:
+            DrainResult with counts and the records written
+        """
+        result = DrainResult()
+        for job in self.claim(user_id, target, limit=limit):
+            try:
+                records, error = post(job), None
+            except Exception as e:
+                records, error = None, e
+            self.settle(job, result, records=records, error=error)
+        return result
+
+    def settle(self, job: OutboxJob, result: DrainResult,
+               records: Optional[List[dict]] = None, error: Optional[Exception] = None):
+        """
+        Complete or fail a claimed job after a posting attempt.
+
+        Args:
+            job: Claimed job
+            result: DrainResult to update
+            records: synced_posts records if the job was posted
+            error: Error raised by the posting attempt
+        """
+        if isinstance(error, PartialPostError):
+            if self.advance(job, error.records, error.remaining):
+                result.posted += len(error.records)
+                result.records.extend(error.records)
+            error = error.error
+        if isinstance(error, (CircuitOpenError, RateLimitExceeded)):
+            self.defer(job, error.retry_after, str(error))
+            result.deferred += 1
+            logger.info(f"Outbox job {job.id} deferred: {error}")
+        elif error is not None:
+            status = self.fail(job, str(error))
+            if status == DEAD:
+                result.dead += 1
+                logger.error(
+                    f"Outbox job {job.id} ({job.idempotency_key}) dead after "
+                    f"{job.attempts} attempts: {error}"
+                )
+            else:
+                result.failed += 1
+                logger.warning(f"Outbox job {job.id} failed (attempt {job.attempts}): {error}")
+        elif self.complete(job, records):
+            result.posted += len(records)
+            result.records.extend(records)
+        else:
+            logger.warning(f"Outbox job {job.id} lease lost before completion")
+
+    def list_jobs(self, status: str = DEAD, user_id: Optional[int] = None) -> List[dict]:
+        """
+        List jobs in a state (dead-lettered by default).
+
+        Args:
+            status: Job status
+            user_id: Only this user's jobs (all users if omitted)
+
+        Returns:
+            List of job dicts
+        """
+        query = '''
+            SELECT id, idempotency_key, user_id, source, target, payload,
+                   attempts, last_error, updated_at
+            FROM sync_outbox WHERE status = ?
+        '''
+        params = [status]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+
+        conn = self._get_connection()
+        try:
+            rows = conn.execute(query + " ORDER BY id", params).fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {
+                "id": row[0],
+                "idempotency_key": row[1],
+                "user_id": row[2],
+                "source": row[3],
+                "target": row[4],
+                "items": json.loads(row[5])["items"],
+                "attempts": row[6],
+                "last_error": row[7],
+                "updated_at": row[8],
+            }
+            for row in rows
+        ]
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Count jobs per status.
+
+        Returns:
+            Dictionary with pending, in_progress, done and dead counts
+        """
+        stats = {PENDING: 0, IN_PROGRESS: 0, DONE: 0, DEAD: 0}
+        conn = self._get_connection()
+        try:
+            for status, count in conn.execute(
+                "SELECT status, COUNT(*) FROM sync_outbox GROUP BY status"
+            ):
+                stats[status] = count
+        except sqlite3.OperationalError:
+            # Outbox not initialized yet
+            pass
+        finally:
+            conn.close()
+        return stats
@@ -0,0 +1,254 @@
+"""
+SyncPipeline - Staged streaming sync
+
+A sync is a chain of stages (e.g. fetch -> dedup -> enrich -> enqueue ->
+post -> record) connected by bounded asyncio queues:
+
+- Every stage runs its own number of workers, so I/O-heavy stages overlap:
+  a tweet is being posted while the next one's thread is still fetched.
+- Queues are bounded (PIPELINE_QUEUE_SIZE), so a slow stage applies
+  backpressure to the stages before it instead of buffering without limit.
+- Blocking handlers run in worker threads; coroutine handlers are awaited
+  on the loop directly.
+- Per-stage counters (items, failures, latency, queue depth) are kept
+  process-wide, so the dashboard shows which stage is the bottleneck.
+  Latency percentiles come from the stage's most recent items.
+
+Pipelines run on the shared async runtime:
+
+    run_sync(SyncPipeline("twitter_to_bluesky", stages).run([request]))
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List
+
+from app.core.config import PIPELINE_QUEUE_SIZE
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Latencies kept per stage for the percentiles
+LATENCY_SAMPLES = 1024
+
+
+@dataclass
+class Stage:
+    """One step of a pipeline"""
+
+    name: str
+    handler: Callable[[Any], Any]  # item -> next item, or None to drop it
+    concurrency: int = 1
+    fan_out: bool = False  # handler returns a list of next items
+    fail_fast: bool = False  # an error aborts the run instead of dropping the item
+
+
+class StageStats:
+    """Counters of one stage, accumulated over every run of its pipeline"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.failed = 0
+        self.emitted = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.recent_ms = deque(maxlen=LATENCY_SAMPLES)
+        self.queued = 0
+        self.max_queued = 0
+        self.in_flight = 0
+
+    def enqueued(self):
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+    def started(self):
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+
+    def discarded(self, count: int):
+        with self._lock:
+            self.queued -= count
+
+    def finished(self, elapsed_ms: float, emitted: int, failed: bool):
+        with self._lock:
+            self.in_flight -= 1
+            self.processed += 1
+            self.failed += int(failed)
+            self.emitted += emitted
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            self.recent_ms.append(elapsed_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = sorted(self.recent_ms)
+            return {
+                "processed": self.processed,
+                "failed": self.failed,
+                "emitted": self.emitted,
+                "avg_ms": round(self.total_ms / self.processed, 2) if self.processed else 0.0,
+                "max_ms": round(self.max_ms, 2),
+                "p50_ms": _percentile(recent, 50),
+                "p99_ms": _percentile(recent, 99),
+                "queue_depth": self.queued,
+                "max_queue_depth": self.max_queued,
+                "in_flight": self.in_flight,
+            }
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values (0.0 if there are none)."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return round(ordered[int(rank) - 1], 2)
+
+
+_stats: Dict[str, Dict[str, StageStats]] = {}
+_stats_lock = threading.Lock()
+
+
+def _stage_stats(pipeline: str, stage: str) -> StageStats:
+    with _stats_lock:
+        return _stats.setdefault(pipeline, {}).setdefault(stage, StageStats())
+
+
+def get_pipeline_stats() -> Dict[str, Dict[str, dict]]:
+    """
+    Get per-stage metrics of every pipeline that has run.
+
+    Returns:
+        {pipeline: {stage: counters}}, stages in pipeline order
+    """
+    with _stats_lock:
+        pipelines = {name: dict(stages) for name, stages in _stats.items()}
+    return {
+        name: {stage: stats.snapshot() for stage, stats in stages.items()}
+        for name, stages in pipelines.items()
+    }
+
+
+def reset_pipeline_stats():
+    """Forget all pipeline metrics (for tests)."""
+    with _stats_lock:
+        _stats.clear()
+
+
+class SyncPipeline:
+    """
+    Runs items through a chain of stages connected by bounded queues.
+    """
+
+    def __init__(self, name: str, stages: List[Stage], queue_size: int = PIPELINE_QUEUE_SIZE):
+        """
+        Initialize SyncPipeline.
+
+        Args:
+            name: Pipeline name, the key of its metrics
+            stages: Stages in processing order
+            queue_size: Items buffered in front of each stage
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.name = name
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self._stats = [_stage_stats(name, stage.name) for stage in stages]
+
+    async def run(self, sources: Iterable) -> List:
+        """
+        Feed items through every stage and wait until all are processed.
+
+        Args:
+            sources: Items handed to the first stage
+
+        Returns:
+            Items emitted by the last stage
+
+        Raises:
+            Exception: The first error raised by a fail_fast stage
+        """
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results: List = []
+        failure = asyncio.get_running_loop().create_future()
+
+        workers = [
+            asyncio.ensure_future(self._work(index, queues, results, failure))
+            for index, stage in enumerate(self.stages)
+            for _ in range(max(1, stage.concurrency))
+        ]
+
+        async def feed():
+            for item in sources:
+                await queues[0].put(item)
+                self._stats[0].enqueued()
+            # A stage puts its output before marking its input done, so the
+            # queues drain in order
+            for queue in queues:
+                await queue.join()
+
+        feeder = asyncio.ensure_future(feed())
+        try:
+            await asyncio.wait([feeder, failure], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in workers + [feeder]:
+                task.cancel()
+            await asyncio.gather(*workers, feeder, return_exceptions=True)
+            # Items left in the queues of an aborted run
+            for stats, queue in zip(self._stats, queues):
+                stats.discarded(queue.qsize())
+
+        if failure.done():
+            raise failure.result()
+        feeder.result()
+        return results
+
+    async def _work(self, index: int, queues: List[asyncio.Queue], results: List,
+                    failure: asyncio.Future):
+        inbox = queues[index]
+        is_last = index == len(self.stages) - 1
+
+        while True:
+            item = await inbox.get()
+            try:
+                for output in await self._process(index, item, failure):
+                    if is_last:
+                        results.append(output)
+                    else:
+                        await queues[index + 1].put(output)
+                        self._stats[index + 1].enqueued()
+            finally:
+                inbox.task_done()
+
+    async def _process(self, index: int, item: Any, failure: asyncio.Future) -> List:
+        """Run one item through a stage and return what it emits."""
+        stage, stats = self.stages[index], self._stats[index]
+        stats.started()
+        start = time.perf_counter()
+        outputs, failed = [], True
+        try:
+            value = await self._call(stage.handler, item)
+            outputs = (value or []) if stage.fan_out else [value]
+            outputs = [output for output in outputs if output is not None]
+            failed = False
+        except Exception as e:
+            if stage.fail_fast:
+                if not failure.done():
+                    failure.set_result(e)
+            else:
+                logger.error(f"Pipeline {self.name}: stage {stage.name} failed: {e}")
+        finally:
+            stats.finished((time.perf_counter() - start) * 1000, len(outputs), failed)
+        return outputs
+
+    @staticmethod
+    async def _call(handler: Callable[[Any], Any], item: Any) -> Any:
+        if asyncio.iscoroutinefunction(handler):
+            return await handler(item)
+        return await asyncio.to_thread(handler, item)
@@ -0,0 +1,283 @@
+"""
+SyncScheduler - Adaptive per-user polling
+
+Instead of sweeping every user every POLL_INTERVAL, each user has their own
+next due time, kept in a priority queue. After a user is synced, their next
+interval is derived from how often they have been posting:
+
+- Posting rate is an exponentially decayed count of the user's recent
+  synced_posts rows (half-life SCHEDULER_HALF_LIFE_SECONDS), so a burst
+  speeds polling up and then fades out.
+- The interval is the time expected to produce SCHEDULER_POSTS_PER_SYNC new
+  posts, clamped to [SCHEDULER_MIN_INTERVAL, SCHEDULER_MAX_INTERVAL].
+- The lower bound is raised further so that polling every active user at
+  that interval stays within each platform's hourly request budget.
+
+Next due times are persisted in the sync_schedule table, so the schedule
+survives restarts and the dashboard can report a real next_sync_at.
+"""
+
+import heapq
+import math
+import sqlite3
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.core.config import (
+    SCHEDULER_BLUESKY_REQUESTS_PER_HOUR,
+    SCHEDULER_HALF_LIFE_SECONDS,
+    SCHEDULER_MAX_INTERVAL,
+    SCHEDULER_MIN_INTERVAL,
+    SCHEDULER_POSTS_PER_SYNC,
+    SCHEDULER_TWITTER_REQUESTS_PER_HOUR,
+)
+from app.core.db_pool import get_connection
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Posts older than this many half-lives weigh < 1% and are not read
+LOOKBACK_HALF_LIVES = 7
+
+
+class SyncScheduler:
+    """
+    Priority queue of users keyed by their next sync time.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "chirpsyncer.db",
+        min_interval: float = SCHEDULER_MIN_INTERVAL,
+        max_interval: float = SCHEDULER_MAX_INTERVAL,
+        half_life: float = SCHEDULER_HALF_LIFE_SECONDS,
+        posts_per_sync: float = SCHEDULER_POSTS_PER_SYNC,
+        platform_budgets: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize SyncScheduler.
+
+        Args:
+            db_path: Path to SQLite database
+            min_interval: Shortest interval between two syncs of a user (seconds)
+            max_interval: Longest interval, used for dormant users (seconds)
+            half_life: Half-life of a post's weight in the posting rate (seconds)
+            posts_per_sync: New posts a sync should pick up on average
+            platform_budgets: Fetch requests per hour allowed per platform
+            clock: Returns the current Unix time (for tests)
+        """
+        self.db_path = db_path
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.half_life = half_life
+        self.posts_per_sync = posts_per_sync
+        self.platform_budgets = (
+            platform_budgets
+            if platform_budgets is not None
+            else {
+                "twitter": SCHEDULER_TWITTER_REQUESTS_PER_HOUR,
+                "bluesky": SCHEDULER_BLUESKY_REQUESTS_PER_HOUR,
+            }
+        )
+        self._clock = clock
+        self._heap = []  # (due_at, user_id); stale entries are skipped
+        self._due: Dict[int, float] = {}
+        self._user_count = 0
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get database connection"""
+        return get_connection(self.db_path)
+
+    def init_db(self):
+        """Initialize the sync_schedule table and load persisted due times"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_schedule (
+                    user_id INTEGER PRIMARY KEY,
+                    next_sync_at INTEGER NOT NULL,
+                    interval_seconds INTEGER NOT NULL,
+                    posting_rate REAL NOT NULL DEFAULT 0,
+                    updated_at INTEGER NOT NULL
+                )
+            ''')
+            conn.commit()
+
+            cursor.execute("SELECT user_id, next_sync_at FROM sync_schedule")
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        for user_id, next_sync_at in rows:
+            self._push(user_id, float(next_sync_at))
+
+    def _push(self, user_id: int, due_at: float):
+        self._due[user_id] = due_at
+        heapq.heappush(self._heap, (due_at, user_id))
+
+    def set_users(self, user_ids: Iterable[int]):
+        """
+        Track exactly the given users.
+
+        New users are due immediately unless a persisted due time exists;
+        users no longer in the list are dropped from the queue.
+
+        Args:
+            user_ids: IDs of the active users
+        """
+        user_ids = set(user_ids)
+        self._user_count = len(user_ids)
+        now = self._clock()
+        for user_id in user_ids - set(self._due):
+            self._push(user_id, now)
+        for user_id in set(self._due) - user_ids:
+            del self._due[user_id]
+
+    def pop_due(self, now: Optional[float] = None) -> List[int]:
+        """
+        Remove and return every user whose sync is due.
+
+        Args:
+            now: Current Unix time (defaults to the clock)
+
+        Returns:
+            User IDs in due order; call reschedule() for each after syncing
+        """
+        now = self._clock() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, user_id = heapq.heappop(self._heap)
+            if self._due.get(user_id) != due_at:
+                continue  # rescheduled or dropped since this entry was pushed
+            del self._due[user_id]
+            due.append(user_id)
+        return due
+
+    def seconds_until_next(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Time until the next user is due.
+
+        Returns:
+            Seconds (0 if a user is already due), or None if no user is queued
+        """
+        now = self._clock() if now is None else now
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - now)
+
+    def next_sync_at(self, user_id: int) -> Optional[float]:
+        """Unix time the user is next due, or None if not queued"""
+        return self._due.get(user_id)
+
+    def posting_rate(self, user_id: int, now: Optional[float] = None) -> float:
+        """
+        Exponentially decayed posting rate of a user.
+
+        Each synced post weighs exp(-age / tau) with tau = half_life / ln 2;
+        the sum over tau is the rate.
+
+        Args:
+            user_id: User ID
+            now: Current Unix time (defaults to the clock)
+
+        Returns:
+            Posts per second
+        """
+        now = self._clock() if now is None else now
+        tau = self.half_life / math.log(2)
+        since = now - LOOKBACK_HALF_LIVES * self.half_life
+
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT CAST(strftime('%s', synced_at) AS INTEGER) FROM synced_posts
+                WHERE user_id = ? AND synced_at >= datetime(?, 'unixepoch')
+                """,
+                (user_id, int(since)),
+            )
+            timestamps = [row[0] for row in cursor.fetchall() if row[0] is not None]
+        except sqlite3.OperationalError:
+            # synced_posts not migrated yet
+            timestamps = []
+        finally:
+            conn.close()
+
+        weight = sum(math.exp(-max(0.0, now - ts) / tau) for ts in timestamps)
+        return weight / tau
+
+    def budget_floor(self, user_count: int) -> float:
+        """
+        Shortest interval that keeps every platform within its budget.
+
+        Each sync costs about one fetch per platform, so polling user_count
+        users every N seconds costs 3600 * user_count / N requests an hour.
+        """
+        floors = [
+            3600.0 * user_count / budget
+            for budget in self.platform_budgets.values()
+            if budget and budget > 0
+        ]
+        return max(floors, default=0.0)
+
+    def compute_interval(self, rate: float) -> float:
+        """
+        Interval until the next sync of a user posting at the given rate.
+
+        Args:
+            rate: Posting rate from posting_rate() (posts per second)
+
+        Returns:
+            Seconds, within the clamps
+        """
+        interval = self.posts_per_sync / rate if rate > 0 else self.max_interval
+
+        user_count = max(self._user_count, len(self._due), 1)
+        lower = min(max(self.min_interval, self.budget_floor(user_count)), self.max_interval)
+        return min(max(interval, lower), self.max_interval)
+
+    def reschedule(self, user_id: int, now: Optional[float] = None) -> float:
+        """
+        Queue a user's next sync after one has run.
+
+        Args:
+            user_id: User ID
+            now: Current Unix time (defaults to the clock)
+
+        Returns:
+            Unix time of the next sync
+        """
+        now = self._clock() if now is None else now
+        rate = self.posting_rate(user_id, now)
+        interval = self.compute_interval(rate)
+        due_at = now + interval
+        self._push(user_id, due_at)
+
+        conn = self._get_connection()
+        try:
+            conn.execute(
+                """
+                INSERT INTO sync_schedule (user_id, next_sync_at, interval_seconds, posting_rate, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    next_sync_at = excluded.next_sync_at,
+                    interval_seconds = excluded.interval_seconds,
+                    posting_rate = excluded.posting_rate,
+                    updated_at = excluded.updated_at
+                """,
+                (user_id, int(due_at), int(interval), rate, int(now)),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        logger.debug(
+            f"User {user_id} next sync in {interval / 60:.1f} min "
+            f"({rate * 86400:.2f} posts/day)"
+        )
+        return due_at
@@ -13,6 +13,7 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.date import DateTrigger
+from app.core.db_pool import get_connection
 
 
 class TaskScheduler:
@@ -37,7 +38,7 @@ class TaskScheduler:
 
     def init_db(self):
         """Initialize database tables for task scheduling"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         # Create scheduled_tasks table
@@ -244,7 +245,7 @@ class TaskScheduler:
             self.scheduler.remove_job(name)
 
             # Remove from database
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
             cursor.execute('DELETE FROM scheduled_tasks WHERE task_name = ?', (name,))
             affected = cursor.rowcount
@@ -276,7 +277,7 @@ class TaskScheduler:
             self.scheduler.pause_job(name)
 
             # Update database
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
             cursor.execute(
                 'UPDATE scheduled_tasks SET enabled = 0, updated_at = ? WHERE task_name = ?',
@@ -307,7 +308,7 @@ class TaskScheduler:
             self.scheduler.resume_job(name)
 
             # Update database
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
             cursor.execute(
                 'UPDATE scheduled_tasks SET enabled = 1, updated_at = ? WHERE task_name = ?',
@@ -363,7 +364,7 @@ class TaskScheduler:
         Returns:
             Task status dict or None if not found
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -395,7 +396,7 @@ class TaskScheduler:
         Returns:
             List of task dicts
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -428,7 +429,7 @@ class TaskScheduler:
         Returns:
             List of execution dicts
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -446,7 +447,7 @@ class TaskScheduler:
 
     def _task_exists(self, name: str) -> bool:
         """Check if task already exists in database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
         cursor.execute('SELECT 1 FROM scheduled_tasks WHERE task_name = ?', (name,))
         exists = cursor.fetchone() is not None
@@ -455,7 +456,7 @@ class TaskScheduler:
 
     def _save_task(self, name: str, task_type: str, schedule: str):
         """Save task to database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         now = int(time.time())
@@ -503,7 +504,7 @@ class TaskScheduler:
 
     def _update_task_stats(self, name: str, success: bool):
         """Update task run counts"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         if success:
@@ -531,7 +532,7 @@ class TaskScheduler:
     def _record_execution(self, name: str, started_at: int, completed_at: int,
                          status: str, output: str, error: str, duration_ms: int):
         """Record task execution to database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute('''
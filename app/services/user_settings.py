@@ -8,6 +8,7 @@ import sqlite3
 import json
 import time
 from typing import Any, Dict
+from app.core.db_pool import get_connection
 
 
 class UserSettings:
@@ -41,7 +42,7 @@ class UserSettings:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -8,12 +8,13 @@ from app.auth.api_auth import require_auth
 from app.models.feed_rule import init_feed_rules_db
 from app.services.user_settings import UserSettings
 from app.web.api.v1.responses import api_response
+from app.core.db_pool import get_connection
 
 algorithm_bp = Blueprint("algorithm", __name__, url_prefix="/algorithm")
 
 
 def _get_conn():
-    conn = sqlite3.connect(current_app.config["DB_PATH"])
+    conn = get_connection(current_app.config["DB_PATH"])
     conn.row_factory = sqlite3.Row
     return conn
 
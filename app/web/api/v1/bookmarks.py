@@ -1,10 +1,9 @@
-import sqlite3
-
 from flask import Blueprint, current_app, g, request
 
 from app.auth.api_auth import require_auth
 from app.features.saved_content import SavedContentManager
 from app.web.api.v1.responses import api_error, api_response
+from app.core.db_pool import get_connection
 
 bookmarks_bp = Blueprint("bookmarks", __name__, url_prefix="")
 
@@ -45,7 +44,7 @@ def create_bookmark():
 @bookmarks_bp.route("/bookmarks/<int:bookmark_id>", methods=["DELETE"])
 @require_auth
 def delete_bookmark(bookmark_id: int):
-    conn = sqlite3.connect(current_app.config["DB_PATH"])
+    conn = get_connection(current_app.config["DB_PATH"])
     try:
         cursor = conn.cursor()
         cursor.execute(
@@ -89,7 +88,7 @@ def create_collection():
 def move_bookmark(bookmark_id: int):
     data = request.get_json(silent=True) or {}
     collection_id = data.get("collection_id")
-    conn = sqlite3.connect(current_app.config["DB_PATH"])
+    conn = get_connection(current_app.config["DB_PATH"])
     try:
         cursor = conn.cursor()
         cursor.execute(
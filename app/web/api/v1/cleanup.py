@@ -8,6 +8,7 @@ from app.auth.api_auth import require_auth
 from app.auth.credential_manager import CredentialManager
 from app.features.cleanup_engine import CleanupEngine
 from app.web.api.v1.responses import api_error, api_response
+from app.core.db_pool import get_connection
 
 cleanup_bp = Blueprint("cleanup", __name__, url_prefix="/cleanup")
 
@@ -22,7 +23,7 @@ def _get_engine():
 
 
 def _get_rule(rule_id: int, user_id: int):
-    conn = sqlite3.connect(current_app.config["DB_PATH"])
+    conn = get_connection(current_app.config["DB_PATH"])
     conn.row_factory = sqlite3.Row
     try:
         cursor = conn.cursor()
@@ -83,7 +84,7 @@ def create_rule():
 @require_auth
 def update_rule(rule_id: int):
     data = request.get_json(silent=True) or {}
-    conn = sqlite3.connect(current_app.config["DB_PATH"])
+    conn = get_connection(current_app.config["DB_PATH"])
     try:
         cursor = conn.cursor()
         updates = []
@@ -6,6 +6,7 @@ from flask import Blueprint, current_app, g, request
 from app.auth.api_auth import require_auth
 from app.auth.credential_manager import CredentialManager
 from app.web.api.v1.responses import api_error, api_response
+from app.core.db_pool import get_connection
 
 credentials_bp = Blueprint("credentials", __name__, url_prefix="/credentials")
 
@@ -15,7 +16,7 @@ def _get_credential_manager():
 
 
 def _get_credential_by_id(user_id: int, credential_id: int):
-    conn = sqlite3.connect(current_app.config["DB_PATH"])
+    conn = get_connection(current_app.config["DB_PATH"])
     conn.row_factory = sqlite3.Row
     try:
         cursor = conn.cursor()
@@ -120,7 +121,11 @@ def test_credential(cred_id: int):
     from app.integrations.credential_validator import validate_credentials
 
     valid, message = validate_credentials(
-        credential["platform"], credential["credential_type"], creds
+        credential["platform"],
+        credential["credential_type"],
+        creds,
+        user_id=g.user.id,
+        credential_manager=credential_manager,
     )
     return api_response({"valid": bool(valid), "message": message})
 
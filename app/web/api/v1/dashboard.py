@@ -1,10 +1,20 @@
 import time
 from typing import Any, Dict, Optional, Tuple
 
-from flask import Blueprint, g
+from flask import Blueprint, current_app, g
 
-from app.auth.api_auth import require_auth
+from app.auth.api_auth import require_admin, require_auth
+from app.core.db_pool import get_pool_stats
+from app.core.dedup_cache import get_dedup_stats
+from app.core.http_client import get_http_stats
+from app.integrations.bluesky_session import get_session_store
+from app.services.circuit_breaker import get_breaker_stats
+from app.services.media_transform import get_media_transformer
+from app.services.rate_limiter import get_rate_limiter
+from app.services.scraper_pool import get_scraper_pool
 from app.services.stats_service import StatsService
+from app.services.sync_outbox import SyncOutbox
+from app.services.sync_pipeline import get_pipeline_stats
 from app.web.api.v1.responses import api_response
 
 dashboard_bp = Blueprint("dashboard", __name__, url_prefix="/dashboard")
@@ -51,3 +61,26 @@ def stats():
 
     _set_cached_stats(g.user.id, result)
     return api_response(result)
+
+
+@dashboard_bp.route("/metrics", methods=["GET"])
+@require_admin
+def metrics():
+    """Runtime performance metrics for the sync infrastructure.
+
+    Admins only: the stats name scraper accounts, their errors and file paths.
+    """
+    return api_response(
+        {
+            "db_pool": get_pool_stats(),
+            "dedup_cache": get_dedup_stats(),
+            "bluesky_sessions": get_session_store().get_stats(),
+            "scraper_pool": get_scraper_pool().get_stats(),
+            "sync_outbox": SyncOutbox(db_path=current_app.config["DB_PATH"]).get_stats(),
+            "sync_pipeline": get_pipeline_stats(),
+            "rate_limits": get_rate_limiter().get_stats(),
+            "circuit_breakers": get_breaker_stats(),
+            "http_client": get_http_stats(),
+            "media_transform": get_media_transformer().get_stats(),
+        }
+    )
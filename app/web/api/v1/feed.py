@@ -8,6 +8,7 @@ from app.auth.api_auth import require_auth
 from app.features.feed.explainer import explain_post, preview_feed
 from app.models.feed_rule import init_feed_rules_db
 from app.web.api.v1.responses import api_error, api_response
+from app.core.db_pool import get_connection
 
 feed_bp = Blueprint("feed", __name__)
 
@@ -15,7 +16,7 @@ VALID_RULE_TYPES = {"boost", "demote", "filter"}
 
 
 def _get_conn():
-    conn = sqlite3.connect(current_app.config["DB_PATH"])
+    conn = get_connection(current_app.config["DB_PATH"])
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -7,6 +7,7 @@ from flask import Blueprint, current_app, request, g
 
 from app.auth.api_auth import require_auth
 from app.web.api.v1.responses import api_response, api_error
+from app.core.db_pool import get_connection
 
 sync_bp = Blueprint("sync", __name__, url_prefix="/sync")
 
@@ -14,7 +15,7 @@ _jobs = {}
 
 
 def _get_connection():
-    conn = sqlite3.connect(current_app.config["DB_PATH"])
+    conn = get_connection(current_app.config["DB_PATH"])
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -8,12 +8,13 @@ from app.auth.api_auth import require_auth
 from app.auth.user_manager import UserManager
 from app.models.workspace import ensure_personal_workspace, init_workspace_db
 from app.web.api.v1.responses import api_error, api_response
+from app.core.db_pool import get_connection
 
 workspaces_bp = Blueprint("workspaces", __name__, url_prefix="/workspaces")
 
 
 def _get_conn():
-    conn = sqlite3.connect(current_app.config["DB_PATH"])
+    conn = get_connection(current_app.config["DB_PATH"])
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -35,6 +35,7 @@ from app.models.workspace import init_workspace_db
 from app.web.api.v1 import api_v1
 from app.web.api.v1.responses import api_error
 import uuid
+from app.core.db_pool import get_connection
 
 logger = logging.getLogger(__name__)
 
@@ -488,7 +489,11 @@ def create_app(db_path="chirpsyncer.db", master_key=None):
 
         try:
             success, message = validate_credentials(
-                cred["platform"], cred["credential_type"], data
+                cred["platform"],
+                cred["credential_type"],
+                data,
+                user_id=session["user_id"],
+                credential_manager=credential_manager,
             )
 
             return jsonify(
@@ -911,7 +916,6 @@ def create_app(db_path="chirpsyncer.db", master_key=None):
         try:
             import csv
             import io
-            import sqlite3
             from datetime import datetime
             from flask import Response
 
@@ -930,7 +934,7 @@ def create_app(db_path="chirpsyncer.db", master_key=None):
             end_date = request.args.get("end_date")
 
             # Connect to database
-            conn = sqlite3.connect(app.config["DB_PATH"])
+            conn = get_connection(app.config["DB_PATH"])
             cursor = conn.cursor()
 
             # Build query with optional date filtering
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Import a Bluesky repository export (.car) into ChirpSyncer
+
+Usage:
+    python scripts/import_bluesky_repo.py repo.car --user-id 1 --username alice.bsky.social
+
+Running it again with a newer export only adds the new posts.
+"""
+import argparse
+import os
+import sys
+
+# Add app directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.features.car_import import CarImporter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a Bluesky repository CAR file")
+    parser.add_argument("car", help="Path to the .car file")
+    parser.add_argument("--db", default=os.getenv("DB_PATH", "chirpsyncer.db"), help="Database path")
+    parser.add_argument("--user-id", type=int, help="Owning ChirpSyncer user")
+    parser.add_argument("--username", default="", help="Bluesky handle of the repository")
+    parser.add_argument("--did", help="Repository DID (read from the export by default)")
+    args = parser.parse_args()
+
+    importer = CarImporter(args.db)
+    importer.init_db()
+
+    def report(progress):
+        print(
+            f"\r{progress.percent:5.1f}%  {progress.imported} imported, "
+            f"{progress.skipped} skipped",
+            end="",
+            flush=True,
+        )
+
+    result = importer.import_car(
+        args.car, user_id=args.user_id, username=args.username, did=args.did, progress=report
+    )
+    print(f"\n✓ Done: {result.imported} posts imported, {result.skipped} skipped")
+
+
+if __name__ == "__main__":
+    main()
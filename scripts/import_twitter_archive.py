@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Import a Twitter archive zip into ChirpSyncer
+
+Usage:
+    python scripts/import_twitter_archive.py twitter-archive.zip --user-id 1 --username alice
+
+Interrupted imports resume where they stopped when run again.
+"""
+import argparse
+import os
+import sys
+
+# Add app directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.features.archive_import import ArchiveImporter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a Twitter archive zip")
+    parser.add_argument("archive", help="Path to the archive zip")
+    parser.add_argument("--db", default=os.getenv("DB_PATH", "chirpsyncer.db"), help="Database path")
+    parser.add_argument("--user-id", type=int, help="Owning ChirpSyncer user")
+    parser.add_argument("--username", default="", help="Twitter username of the archive")
+    parser.add_argument("--restart", action="store_true", help="Ignore the progress of earlier runs")
+    args = parser.parse_args()
+
+    importer = ArchiveImporter(args.db)
+    importer.init_db()
+
+    def report(progress):
+        print(
+            f"\r{progress.percent:5.1f}%  {progress.imported} imported, "
+            f"{progress.skipped} skipped",
+            end="",
+            flush=True,
+        )
+
+    result = importer.import_archive(
+        args.archive,
+        user_id=args.user_id,
+        username=args.username,
+        progress=report,
+        restart=args.restart,
+    )
+    print(f"\n✓ Done: {result.imported} tweets imported, {result.skipped} skipped")
+
+
+if __name__ == "__main__":
+    main()
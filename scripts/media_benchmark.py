@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark fitting images into a platform's size limit
+
+Re-encodes images through the media transformer's process pool, as the
+sync does for images over a platform limit, and reports throughput,
+compression ratio and per-image times:
+
+    python scripts/media_benchmark.py --images 40 --workers 4
+    python scripts/media_benchmark.py --platform bluesky photos/*.jpg --json
+
+Without files, synthetic 12 MP photos are generated.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+
+# Add app directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _synthetic_photo(width: int, height: int, seed: int) -> bytes:
+    """JPEG at camera quality with smooth areas and grain, like a photo."""
+    from PIL import Image
+
+    grain = Image.effect_noise((width // 4, height // 4), 30 + seed % 30).resize(
+        (width, height), Image.BICUBIC
+    )
+    gradient = Image.linear_gradient("L").resize((width, height))
+    image = Image.merge("RGB", (gradient, grain, gradient.transpose(Image.Transpose.ROTATE_180)))
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=95)
+    return out.getvalue()
+
+
+def _percentile(ordered, percent):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))]
+
+
+async def _run(images, limit: int, workers: int) -> dict:
+    from app.services.media_transform import MediaTransformer
+
+    transformer = MediaTransformer(max_workers=workers)
+    try:
+        # Start the worker processes outside of the measurement
+        await asyncio.gather(*(transformer.fit(images[0], limit) for _ in range(workers)))
+
+        times = []
+
+        async def fit_one(data):
+            start = time.perf_counter()
+            result = await transformer.fit(data, limit)
+            times.append((time.perf_counter() - start) * 1000)
+            return result
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(fit_one(data) for data in images), return_exceptions=True)
+        elapsed = time.perf_counter() - start
+    finally:
+        transformer.shutdown()
+
+    fitted = [(data, result) for data, result in zip(images, results) if result is not None
+              and not isinstance(result, Exception)]
+    bytes_in = sum(len(data) for data, _ in fitted)
+    bytes_out = sum(len(result.data) for _, result in fitted)
+    times.sort()
+    return {
+        "images": len(images),
+        "workers": workers,
+        "limit_bytes": limit,
+        "seconds": round(elapsed, 3),
+        "images_per_second": round(len(images) / elapsed, 2) if elapsed else 0.0,
+        "mb_in_per_second": round(sum(len(d) for d in images) / elapsed / 1e6, 2) if elapsed else 0.0,
+        "transformed": len(fitted),
+        "unchanged": sum(1 for result in results if result is None),
+        "failed": sum(1 for result in results if isinstance(result, Exception)),
+        "ratio": round(bytes_out / bytes_in, 3) if bytes_in else 0.0,
+        "p50_ms": round(_percentile(times, 50), 1),
+        "p99_ms": round(_percentile(times, 99), 1),
+        "max_ms": round(times[-1], 1) if times else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark image recompression into platform limits")
+    parser.add_argument("paths", nargs="*", help="Images to fit (default: synthetic photos)")
+    parser.add_argument("--images", type=int, default=20, help="Synthetic photos")
+    parser.add_argument("--width", type=int, default=4032, help="Synthetic photo width")
+    parser.add_argument("--height", type=int, default=3024, help="Synthetic photo height")
+    parser.add_argument("--platform", choices=["bluesky", "twitter"], default="bluesky",
+                        help="Platform whose image limit to fit")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Encoder processes")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    from app.integrations.media_handler import media_size_limit
+
+    if args.paths:
+        images = []
+        for path in args.paths:
+            with open(path, "rb") as f:
+                images.append(f.read())
+    else:
+        images = [_synthetic_photo(args.width, args.height, seed) for seed in range(args.images)]
+
+    report = asyncio.run(_run(images, media_size_limit(args.platform, "image"), args.workers))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\n{report['images']} images into {report['limit_bytes']} bytes "
+          f"with {report['workers']} worker(s) in {report['seconds']:.2f}s")
+    print(f"  {report['images_per_second']:.1f} images/s ({report['mb_in_per_second']:.1f} MB/s in)")
+    print(f"  {report['transformed']} re-encoded, {report['unchanged']} unchanged, {report['failed']} failed")
+    print(f"  compression ratio {report['ratio']:.3f} (bytes after / before)")
+    print(f"  per image: p50 {report['p50_ms']:.0f} ms, p99 {report['p99_ms']:.0f} ms, "
+          f"max {report['max_ms']:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Offline sync benchmark with recorded platform responses
+
+Record the read responses of real accounts once:
+
+    python scripts/sync_benchmark.py record --out fixtures.jsonl \\
+        --twitter-username alice --bluesky-handle alice.bsky.social
+
+Then sync a synthetic population against a local replay server:
+
+    python scripts/sync_benchmark.py run --users 50 --fixtures fixtures.jsonl \\
+        --latency-ms 80 --jitter-ms 20 --error-rate 0.01
+
+Without --fixtures, synthetic timelines are generated. The run reports
+posts/second, p50/p99 latency per pipeline stage and database writes; with
+--json the report is printed as JSON, e.g. to gate changes in CI.
+
+Recording uses the credentials of the .env file (BSKY_*, TWITTER_* and the
+twscrape accounts database). Only reads are recorded, never tokens; posts,
+logins and uploads are synthesized by the replay server.
+"""
+import argparse
+import json
+import os
+import secrets
+import sys
+import tempfile
+import time
+import types
+
+# Add app directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+
+def _alias_legacy_modules():
+    """
+    Make the top-level module names app/main.py imports resolve to the app
+    package, as the deployed layout does.
+    """
+    from app.core import config, db_handler
+
+    sys.modules.setdefault("config", config)
+    sys.modules.setdefault("db_handler", db_handler)
+
+    from app.integrations import bluesky_handler, twitter_scraper
+
+    sys.modules.setdefault("bluesky_handler", bluesky_handler)
+    sys.modules.setdefault("twitter_scraper", twitter_scraper)
+    if "twitter_handler" not in sys.modules:
+        # Single-user posting is not part of the multi-user benchmark
+        legacy = types.ModuleType("twitter_handler")
+
+        def post_to_twitter(*args, **kwargs):
+            raise RuntimeError("single-user posting is not benchmarked")
+
+        legacy.post_to_twitter = post_to_twitter
+        sys.modules["twitter_handler"] = legacy
+
+
+def _use_database(db_path: str):
+    """Point every component of the sync path at the benchmark database."""
+    from app.core import db_handler
+    from app.services import rate_limiter
+
+    import main
+
+    db_handler.DB_PATH = db_path
+    main.DB_PATH = db_path
+    rate_limiter._limiter = rate_limiter.RateLimiter(db_path=db_path)
+    return main
+
+
+def record(args):
+    """Record the read responses of real accounts into a fixture file."""
+    from atproto import Client
+    from atproto_client.request import Request
+    from twscrape import API
+
+    from app.core.async_runtime import run_sync
+    from app.core.config import (
+        BSKY_PASSWORD,
+        TWITTER_EMAIL,
+        TWITTER_EMAIL_PASSWORD,
+        TWITTER_PASSWORD,
+        TWSCRAPE_ACCOUNTS_DB,
+    )
+    from app.services import scraper_pool
+    from app.services.platform_replay import FixtureRecorder, RecordingTwscrapeAPI
+
+    _alias_legacy_modules()
+    from app.integrations import twitter_scraper
+    from app.integrations.bluesky_handler import iter_bluesky_posts
+
+    recorder = FixtureRecorder(args.out)
+    workdir = tempfile.mkdtemp(prefix="chirpsyncer-record-")
+    _use_database(os.path.join(workdir, "record.db"))
+    from app.core.db_handler import migrate_database
+
+    migrate_database(os.path.join(workdir, "record.db"))
+
+    # Twitter timeline and threads, through the app's own fetch path
+    scraper_pool._pool = scraper_pool.ScraperPool(
+        api_factory=lambda db_file: RecordingTwscrapeAPI(API(db_file), recorder)
+    )
+    credentials = {
+        "username": os.getenv("TWITTER_SCRAPER_USERNAME", args.twitter_username),
+        "password": TWITTER_PASSWORD,
+        "email": TWITTER_EMAIL,
+        "email_password": TWITTER_EMAIL_PASSWORD,
+    }
+    tweets = twitter_scraper.fetch_tweets(
+        count=args.count, username=args.twitter_username, credentials=credentials
+    )
+    for tweet in tweets:
+        if run_sync(twitter_scraper.is_thread(tweet._tweet)):
+            run_sync(twitter_scraper.fetch_thread(str(tweet.id), args.twitter_username, tweet._tweet))
+    print(f"✓ {len(tweets)} tweets of @{args.twitter_username} (accounts: {TWSCRAPE_ACCOUNTS_DB})")
+
+    # Bluesky author feed
+    client = Client(request=Request(event_hooks={"response": [recorder.httpx_hook()]}))
+    client.login(os.getenv("BSKY_USERNAME", args.bluesky_handle), BSKY_PASSWORD)
+    posts = list(iter_bluesky_posts(args.bluesky_handle, client=client, max_posts=args.count))
+    print(f"✓ {len(posts)} posts of {args.bluesky_handle}")
+
+    # Twitter API v2 reads (posting is never recorded)
+    if os.getenv("TWITTER_API_KEY"):
+        import tweepy
+
+        api = tweepy.Client(
+            consumer_key=os.getenv("TWITTER_API_KEY"),
+            consumer_secret=os.getenv("TWITTER_API_SECRET"),
+            access_token=os.getenv("TWITTER_ACCESS_TOKEN"),
+            access_token_secret=os.getenv("TWITTER_ACCESS_SECRET"),
+        )
+        api.session.hooks["response"].append(recorder.requests_hook())
+        api.get_me()
+        print("✓ Twitter API account")
+
+    print(f"✓ Recorded {recorder.recorded} responses to {args.out}")
+
+
+def _create_users(main, count: int):
+    """Active users with credentials for both directions."""
+    from app.auth.credential_manager import CredentialManager
+    from app.auth.user_manager import UserManager
+
+    user_manager = UserManager(db_path=main.DB_PATH)
+    cred_manager = CredentialManager(main.get_master_key(), db_path=main.DB_PATH)
+    accounts = []
+    for i in range(count):
+        username, handle = f"bench{i}", f"bench{i}.bsky.social"
+        user_id = user_manager.create_user(
+            username=username, email=f"{username}@bench.local", password=f"Bench-{secrets.token_hex(8)}-9!"
+        )
+        cred_manager.save_credentials(user_id, "twitter", "scraping", {
+            "username": username, "password": "replay", "email": f"{username}@bench.local",
+            "email_password": "replay",
+        })
+        cred_manager.save_credentials(user_id, "twitter", "api", {
+            "api_key": "replay", "api_secret": "replay",
+            "access_token": f"{i}-replay", "access_secret": "replay",
+        })
+        cred_manager.save_credentials(user_id, "bluesky", "api", {"username": handle, "password": "replay"})
+        accounts.append((username, handle))
+    return accounts
+
+
+def _synced_posts(db_path: str) -> int:
+    from app.core.db_pool import get_connection
+
+    conn = get_connection(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM synced_posts").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def run(args) -> dict:
+    """Sync a synthetic user population against the replay server."""
+    from app.core.async_runtime import run_sync
+    from app.core.db_pool import get_pool_stats, reset_pool_stats
+    from app.services.platform_replay import (
+        FixtureSet,
+        ReplayServer,
+        population,
+        replay_clients,
+        synthetic_fixtures,
+    )
+    from app.services.sync_pipeline import get_pipeline_stats, reset_pipeline_stats
+
+    os.environ.setdefault("SECRET_KEY", secrets.token_hex(32))
+    _alias_legacy_modules()
+    db_path = os.path.join(tempfile.mkdtemp(prefix="chirpsyncer-bench-"), "bench.db")
+    main = _use_database(db_path)
+
+    # seen_tweets backs the scraper's duplicate check
+    from app.core.db_handler import initialize_db
+
+    initialize_db(db_path)
+    main.migrate_database(db_path=db_path)
+    main.init_multi_user_system()
+    accounts = _create_users(main, args.users)
+    users = main.UserManager(db_path=db_path).list_users(active_only=True)
+
+    if args.fixtures:
+        template = FixtureSet.load(args.fixtures)
+    else:
+        template = synthetic_fixtures(
+            "template", "template.bsky.social", posts=args.posts_per_user, thread_every=args.thread_every
+        )
+    server = ReplayServer(
+        population(template, accounts),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    url = server.start_in_thread()
+
+    reset_pool_stats()
+    reset_pipeline_stats()
+    results = []
+    try:
+        with replay_clients(url) as api:
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                results.extend(main.sync_all_users(users))
+            elapsed = time.perf_counter() - start
+            run_sync(api.aclose())
+    finally:
+        server.stop_thread()
+
+    pool = get_pool_stats()
+    synced = _synced_posts(db_path)
+    return {
+        "users": args.users,
+        "rounds": args.rounds,
+        "seconds": round(elapsed, 3),
+        "posts_synced": synced,
+        "posts_per_second": round(synced / elapsed, 2) if elapsed else 0.0,
+        "user_failures": sum(1 for result in results if not result.success),
+        "stages": {
+            pipeline: {
+                stage: {key: counters[key] for key in ("processed", "failed", "p50_ms", "p99_ms", "max_ms")}
+                for stage, counters in stages.items()
+            }
+            for pipeline, stages in get_pipeline_stats().items()
+        },
+        "db": {key: pool[key] for key in ("writes", "rows_written", "checkouts")},
+        "server": server.get_stats(),
+    }
+
+
+def _print_report(report: dict):
+    print(f"\n{report['users']} users, {report['rounds']} round(s) in {report['seconds']:.2f}s")
+    print(f"  {report['posts_synced']} posts synced, {report['posts_per_second']:.1f} posts/s, "
+          f"{report['user_failures']} user sync failures")
+    print(f"  DB: {report['db']['writes']} write transactions, {report['db']['rows_written']} rows, "
+          f"{report['db']['checkouts']} checkouts")
+    server = report["server"]
+    print(f"  Replay server: {server['requests']} requests, {server['misses']} not recorded, "
+          f"{server['errors_injected']} errors injected")
+    for pipeline, stages in report["stages"].items():
+        print(f"\n  {pipeline}")
+        print(f"    {'stage':<10} {'items':>7} {'failed':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for stage, c in stages.items():
+            print(f"    {stage:<10} {c['processed']:>7} {c['failed']:>7} "
+                  f"{c['p50_ms']:>9.2f} {c['p99_ms']:>9.2f} {c['max_ms']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record platform fixtures and benchmark the sync")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record", help="Record real responses into a fixture file")
+    rec.add_argument("--out", required=True, help="Fixture file (JSONL, appended to)")
+    rec.add_argument("--twitter-username", required=True, help="Twitter account to record")
+    rec.add_argument("--bluesky-handle", required=True, help="Bluesky account to record")
+    rec.add_argument("--count", type=int, default=20, help="Posts per platform")
+
+    bench = commands.add_parser("run", help="Sync a synthetic population against the replay server")
+    bench.add_argument("--users", type=int, default=10, help="Synthetic users")
+    bench.add_argument("--fixtures", help="Recorded fixture file (default: synthetic timelines)")
+    bench.add_argument("--posts-per-user", type=int, default=10, help="Synthetic posts per platform")
+    bench.add_argument("--thread-every", type=int, default=0, help="Every n-th synthetic tweet starts a thread")
+    bench.add_argument("--latency-ms", type=float, default=0.0, help="Latency of every response")
+    bench.add_argument("--jitter-ms", type=float, default=0.0, help="Random +/- latency variation")
+    bench.add_argument("--error-rate", type=float, default=0.0, help="Share of requests that fail")
+    bench.add_argument("--rounds", type=int, default=1, help="Sync cycles (later ones find nothing new)")
+    bench.add_argument("--seed", type=int, default=0, help="Seed of latency and error randomness")
+    bench.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args)
+        return
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
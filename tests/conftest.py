@@ -2,6 +2,8 @@ import sys
 import os
 from unittest.mock import MagicMock
 
+import pytest
+
 # Add the app directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "app"))
 
@@ -26,3 +28,43 @@ sys.modules["atproto"] = mock_atproto
 # Mock db_handler before any imports
 mock_db_handler = MagicMock()
 sys.modules["db_handler"] = mock_db_handler
+
+
+@pytest.fixture(autouse=True)
+def isolated_rate_limiter(tmp_path, monkeypatch):
+    """Give every test fresh rate-limit buckets outside the working directory."""
+    from app.services import rate_limiter
+
+    limiter = rate_limiter.RateLimiter(db_path=str(tmp_path / "rate_limits.db"))
+    monkeypatch.setattr(rate_limiter, "_limiter", limiter)
+    return limiter
+
+
+@pytest.fixture(autouse=True)
+def closed_circuit_breakers():
+    """Start every test with all circuits closed."""
+    from app.services.circuit_breaker import reset_breakers
+
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+@pytest.fixture(autouse=True)
+def empty_thread_cache():
+    """Start every test without cached thread graphs."""
+    from app.core.thread_cache import get_thread_cache
+
+    get_thread_cache().clear()
+    yield
+    get_thread_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_media_cache(tmp_path, monkeypatch):
+    """Give every test an empty media cache outside the working directory."""
+    from app.core import media_cache
+
+    cache = media_cache.MediaCache(cache_dir=str(tmp_path / "media_cache"))
+    monkeypatch.setattr(media_cache, "_cache", cache)
+    return cache
@@ -197,7 +197,7 @@ def mock_media_response():
 
 
 @patch("app.integrations.bluesky_handler.Client")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_full_twitter_to_bluesky_sync(
     mock_twitter_api_class, mock_bluesky_client, temp_db
 ):
@@ -290,7 +290,7 @@ def test_full_twitter_to_bluesky_sync(
 
 @patch("app.integrations.media_handler.download_media")
 @patch("app.integrations.bluesky_handler.Client")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_sync_with_media(
     mock_twitter_api_class,
     mock_bluesky_client,
@@ -399,7 +399,7 @@ def test_sync_with_media(
 @patch("app.integrations.bluesky_handler.post_thread_to_bluesky")
 @patch("app.integrations.twitter_scraper.is_thread")
 @patch("app.integrations.bluesky_handler.Client")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_sync_with_threads(
     mock_twitter_api_class,
     mock_bluesky_client,
@@ -500,7 +500,7 @@ def test_sync_with_threads(
 
 
 @patch("app.integrations.bluesky_handler.Client")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_sync_error_recovery(mock_twitter_api_class, mock_bluesky_client, temp_db):
     """
     Test API failures with retry logic and error recovery.
@@ -583,7 +583,7 @@ def test_sync_error_recovery(mock_twitter_api_class, mock_bluesky_client, temp_d
 
 @patch("app.auth.user_manager.UserManager")
 @patch("app.integrations.bluesky_handler.Client")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_multi_user_sync_isolation(
     mock_twitter_api_class, mock_bluesky_client, mock_user_manager, temp_db
 ):
@@ -37,6 +37,18 @@ from app.integrations.media_handler import (
 )
 
 
+def stream_body(response, data):
+    """Serve data from a mocked aiohttp response like iter_chunked() does."""
+    async def iter_chunked(size):
+        for start in range(0, len(data), size):
+            yield data[start:start + size]
+
+    response.content_length = len(data)
+    response.content = MagicMock()
+    response.content.iter_chunked = iter_chunked
+
+
+
 # =============================================================================
 # TEST FIXTURES - Media Data
 # =============================================================================
@@ -180,20 +192,18 @@ async def test_download_media_from_url_image(sample_image_data):
     - Correct number of bytes is returned
     - No errors occur during download
     """
-    with patch('aiohttp.ClientSession') as mock_session_class:
+    with patch('app.integrations.media_handler.get_http_session') as mock_get_session:
         # Setup mock
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.read = AsyncMock(return_value=sample_image_data)
+        stream_body(mock_response, sample_image_data)
 
         mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get = MagicMock()
         mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
         mock_session.get.return_value.__aexit__ = AsyncMock(return_value=None)
 
-        mock_session_class.return_value = mock_session
+        mock_get_session.return_value = mock_session
 
         # Execute
         url = "https://example.com/photo.jpg"
@@ -215,20 +225,18 @@ async def test_download_media_from_url_video(sample_video_data):
     - Function handles different media types
     - Response is properly read
     """
-    with patch('aiohttp.ClientSession') as mock_session_class:
+    with patch('app.integrations.media_handler.get_http_session') as mock_get_session:
         # Setup mock
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.read = AsyncMock(return_value=sample_video_data)
+        stream_body(mock_response, sample_video_data)
 
         mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get = MagicMock()
         mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
         mock_session.get.return_value.__aexit__ = AsyncMock(return_value=None)
 
-        mock_session_class.return_value = mock_session
+        mock_get_session.return_value = mock_session
 
         # Execute
         url = "https://example.com/video.mp4"
@@ -249,19 +257,17 @@ async def test_download_media_http_error():
     - Exception is raised with appropriate message
     - Function logs error properly
     """
-    with patch('aiohttp.ClientSession') as mock_session_class:
+    with patch('app.integrations.media_handler.get_http_session') as mock_get_session:
         # Setup mock for 404 error
         mock_response = AsyncMock()
         mock_response.status = 404
 
         mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get = MagicMock()
         mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
         mock_session.get.return_value.__aexit__ = AsyncMock(return_value=None)
 
-        mock_session_class.return_value = mock_session
+        mock_get_session.return_value = mock_session
 
         # Execute and verify exception
         url = "https://example.com/missing.jpg"
@@ -281,15 +287,13 @@ async def test_download_media_timeout_error():
     - Appropriate exception is raised
     - Error message indicates timeout
     """
-    with patch('aiohttp.ClientSession') as mock_session_class:
+    with patch('app.integrations.media_handler.get_http_session') as mock_get_session:
         # Setup mock to raise timeout
         mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get = MagicMock()
         mock_session.get.return_value.__aenter__.side_effect = asyncio.TimeoutError()
 
-        mock_session_class.return_value = mock_session
+        mock_get_session.return_value = mock_session
 
         # Execute and verify exception
         url = "https://example.com/slow-image.jpg"
@@ -309,15 +313,13 @@ async def test_download_media_connection_error():
     - Exception is raised
     - Error is logged
     """
-    with patch('aiohttp.ClientSession') as mock_session_class:
+    with patch('app.integrations.media_handler.get_http_session') as mock_get_session:
         # Setup mock to raise connection error
         mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get = MagicMock()
         mock_session.get.return_value.__aenter__.side_effect = Exception("Connection refused")
 
-        mock_session_class.return_value = mock_session
+        mock_get_session.return_value = mock_session
 
         # Execute and verify exception
         url = "https://example.com/unreachable.jpg"
@@ -769,28 +771,28 @@ async def test_multiple_media_handling_download(sample_image_data, sample_video_
         "https://example.com/video1.mp4",
     ]
 
-    with patch('aiohttp.ClientSession') as mock_session_class:
+    with patch('app.integrations.media_handler.get_http_session') as mock_get_session:
         mock_response_image = AsyncMock()
         mock_response_image.status = 200
-        mock_response_image.read = AsyncMock(return_value=sample_image_data)
+        stream_body(mock_response_image, sample_image_data)
 
         mock_response_video = AsyncMock()
         mock_response_video.status = 200
-        mock_response_video.read = AsyncMock(return_value=sample_video_data)
+        stream_body(mock_response_video, sample_video_data)
 
-        mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=None)
-        mock_session.get = MagicMock()
+        # Return each URL's response: the downloads may request in either order
+        responses = {urls[0]: mock_response_image, urls[1]: mock_response_video}
 
-        # Return different responses for different calls
-        mock_session.get.return_value.__aenter__.side_effect = [
-            mock_response_image,
-            mock_response_video,
-        ]
-        mock_session.get.return_value.__aexit__ = AsyncMock(return_value=None)
+        def get(url, *args, **kwargs):
+            context = MagicMock()
+            context.__aenter__ = AsyncMock(return_value=responses[url])
+            context.__aexit__ = AsyncMock(return_value=None)
+            return context
+
+        mock_session = AsyncMock()
+        mock_session.get = MagicMock(side_effect=get)
 
-        mock_session_class.return_value = mock_session
+        mock_get_session.return_value = mock_session
 
         # Execute
         results = await asyncio.gather(
@@ -912,10 +914,8 @@ async def test_media_error_handling_download_with_retry():
     - Error information is logged
     - Exception propagates correctly
     """
-    with patch('aiohttp.ClientSession') as mock_session_class:
+    with patch('app.integrations.media_handler.get_http_session') as mock_get_session:
         mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get = MagicMock()
 
         # First call fails, simulating retry scenario
@@ -925,7 +925,7 @@ async def test_media_error_handling_download_with_retry():
         mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response_error)
         mock_session.get.return_value.__aexit__ = AsyncMock(return_value=None)
 
-        mock_session_class.return_value = mock_session
+        mock_get_session.return_value = mock_session
 
         url = "https://example.com/error.jpg"
         with pytest.raises(Exception) as exc_info:
@@ -1114,22 +1114,20 @@ async def test_full_media_pipeline_download_and_upload(
     url = "https://example.com/photo.jpg"
     alt_text = "Test photo"
 
-    with patch('aiohttp.ClientSession') as mock_session_class, \
+    with patch('app.integrations.media_handler.get_http_session') as mock_get_session, \
          patch('app.integrations.media_handler.bsky_client') as mock_bsky:
 
         # Setup download mock
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.read = AsyncMock(return_value=sample_image_data)
+        stream_body(mock_response, sample_image_data)
 
         mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get = MagicMock()
         mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
         mock_session.get.return_value.__aexit__ = AsyncMock(return_value=None)
 
-        mock_session_class.return_value = mock_session
+        mock_get_session.return_value = mock_session
 
         # Setup upload mock
         mock_bsky.com.atproto.repo.upload_blob.return_value = mock_bluesky_blob_response
@@ -27,7 +27,7 @@ import time
 import json
 import tempfile
 import asyncio
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from typing import Dict, Optional, Tuple
 from datetime import datetime
 
@@ -337,16 +337,17 @@ def test_bluesky_handler_login_to_bluesky():
 @pytest.mark.integration
 @pytest.mark.api
 def test_bluesky_handler_post_error_handling():
-    """Test Bluesky posting error handling with retry decorator."""
+    """Test Bluesky posting error handling (retries belong to the outbox)."""
     from app.integrations.bluesky_handler import post_to_bluesky
 
     with patch("app.integrations.bluesky_handler.bsky_client") as mock_client:
         # Mock posting error
         mock_client.post.side_effect = Exception("Network error: Connection timeout")
 
-        # The function has a retry decorator, so it will raise Exception
+        # Raised after one attempt: a timed-out post may already be live
         with pytest.raises(Exception):
             post_to_bluesky("Test content")
+        assert mock_client.post.call_count == 1
 
 
 @pytest.mark.integration
@@ -780,7 +781,7 @@ def test_twitter_scraper_fetch_tweets():
     """Test fetch_tweets synchronous wrapper function."""
     from app.integrations.twitter_scraper import fetch_tweets, _fetch_tweets_async
 
-    with patch("app.integrations.twitter_scraper.API") as mock_api_class, patch(
+    with patch("app.integrations.twitter_scraper._get_api") as mock_api_class, patch(
         "app.integrations.twitter_scraper.is_tweet_seen"
     ) as mock_is_seen, patch(
         "app.integrations.twitter_scraper.mark_tweet_as_seen"
@@ -825,7 +826,7 @@ def test_twitter_scraper_fetch_tweets_with_filtering():
     """Test tweet filtering for already-seen tweets."""
     from app.integrations.twitter_scraper import fetch_tweets
 
-    with patch("app.integrations.twitter_scraper.API") as mock_api_class, patch(
+    with patch("app.integrations.twitter_scraper._get_api") as mock_api_class, patch(
         "app.integrations.twitter_scraper.is_tweet_seen"
     ) as mock_is_seen, patch(
         "app.integrations.twitter_scraper.mark_tweet_as_seen"
@@ -867,7 +868,7 @@ def test_twitter_scraper_fetch_error_handling():
     """Test error handling during tweet fetching."""
     from app.integrations.twitter_scraper import fetch_tweets
 
-    with patch("app.integrations.twitter_scraper.API") as mock_api_class:
+    with patch("app.integrations.twitter_scraper._get_api") as mock_api_class:
         mock_api_instance = MagicMock()
         mock_api_class.return_value = mock_api_instance
 
@@ -914,7 +915,7 @@ def test_twitter_scraper_fetch_tweets_async_with_empty_tweets():
     from app.integrations.twitter_scraper import _fetch_tweets_async
 
     async def test_async():
-        with patch("app.integrations.twitter_scraper.API") as mock_api_class, patch(
+        with patch("app.integrations.twitter_scraper._get_api") as mock_api_class, patch(
             "app.integrations.twitter_scraper.is_tweet_seen"
         ):
 
@@ -937,32 +938,23 @@ def test_twitter_scraper_fetch_tweets_async_with_empty_tweets():
 
 @pytest.mark.integration
 @pytest.mark.api
-def test_twitter_scraper_fetch_error_with_async_loop():
-    """Test fetch_tweets error handling when asyncio.run() raises RuntimeError."""
+def test_twitter_scraper_fetch_inside_running_loop():
+    """Test fetch_tweets works when the caller is already running an event loop."""
     from app.integrations.twitter_scraper import fetch_tweets
 
-    with patch("app.integrations.twitter_scraper.asyncio.run") as mock_run, patch(
-        "app.integrations.twitter_scraper.asyncio.get_event_loop"
-    ) as mock_get_loop:
-
-        # First call to asyncio.run() raises RuntimeError
-        mock_run.side_effect = RuntimeError(
-            "asyncio.run() cannot be called from a running event loop"
-        )
-
-        # Mock the event loop's run_until_complete
-        mock_loop = MagicMock()
-        mock_get_loop.return_value = mock_loop
+    with patch(
+        "app.integrations.twitter_scraper._fetch_tweets_async", new_callable=AsyncMock
+    ) as mock_fetch:
+        mock_fetch.return_value = []
 
-        # Mock the async function result
-        mock_loop.run_until_complete.return_value = []
+        async def caller():
+            return fetch_tweets(count=5)
 
-        # Call fetch_tweets
-        result = fetch_tweets(count=5)
+        # Previously required a get_event_loop() fallback
+        result = asyncio.run(caller())
 
-        # Should have used the event loop fallback
         assert result == []
-        mock_loop.run_until_complete.assert_called_once()
+        mock_fetch.assert_awaited_once_with(5, None, None, None)
 
 
 @pytest.mark.integration
@@ -971,7 +963,7 @@ def test_twitter_scraper_fetch_tweets_no_results_on_exception():
     """Test that fetch_tweets returns empty list on exception."""
     from app.integrations.twitter_scraper import fetch_tweets
 
-    with patch("app.integrations.twitter_scraper.API") as mock_api_class, patch(
+    with patch("app.integrations.twitter_scraper._get_api") as mock_api_class, patch(
         "app.integrations.twitter_scraper.is_tweet_seen"
     ):
 
@@ -997,7 +989,7 @@ def test_twitter_scraper_fetch_thread():
     from app.integrations.twitter_scraper import fetch_thread
 
     async def test_fetch_thread_async():
-        with patch("app.integrations.twitter_scraper.API") as mock_api_class:
+        with patch("app.integrations.twitter_scraper._get_api") as mock_api_class:
             mock_api_instance = MagicMock()
             mock_api_class.return_value = mock_api_instance
 
@@ -1017,14 +1009,13 @@ def test_twitter_scraper_fetch_thread():
             mock_tweet3.inReplyToTweetId = 1002
             mock_tweet3.user.username = "testuser"
 
-            # Mock tweet_details to return tweets in sequence
-            async def mock_tweet_details_generator(*args, **kwargs):
-                for tweet in [mock_tweet1, mock_tweet2, mock_tweet3]:
-                    yield tweet
+            # Mock tweet_details to look the tweets up by ID
+            tweets = {t.id: t for t in [mock_tweet1, mock_tweet2, mock_tweet3]}
 
-            mock_api_instance.tweet_details.return_value = (
-                mock_tweet_details_generator()
-            )
+            async def mock_tweet_details(tweet_id):
+                return tweets.get(tweet_id)
+
+            mock_api_instance.tweet_details = mock_tweet_details
 
             # Mock search for replies
             async def mock_search_generator(*args, **kwargs):
@@ -1049,7 +1040,7 @@ def test_twitter_scraper_fetch_thread_with_parent_lookup():
     from app.integrations.twitter_scraper import fetch_thread
 
     async def test_parent_lookup():
-        with patch("app.integrations.twitter_scraper.API") as mock_api_class:
+        with patch("app.integrations.twitter_scraper._get_api") as mock_api_class:
             mock_api_instance = MagicMock()
             mock_api_class.return_value = mock_api_instance
 
@@ -1065,13 +1056,11 @@ def test_twitter_scraper_fetch_thread_with_parent_lookup():
             current_tweet.inReplyToTweetId = 1000
             current_tweet.user.username = "testuser"
 
-            # Mock tweet_details to return parent on first call
-            async def mock_tweet_details_parent(*args, **kwargs):
-                yield current_tweet
-                # Second call will get parent
-                yield parent_tweet
+            # Mock tweet_details to return the current tweet, then its parent
+            async def mock_tweet_details_parent(tweet_id):
+                return {1001: current_tweet, 1000: parent_tweet}.get(tweet_id)
 
-            mock_api_instance.tweet_details.return_value = mock_tweet_details_parent()
+            mock_api_instance.tweet_details = mock_tweet_details_parent
 
             # Mock search for replies
             async def mock_search_generator_empty(*args, **kwargs):
@@ -1096,19 +1085,15 @@ def test_twitter_scraper_fetch_thread_error_handling():
     from app.integrations.twitter_scraper import fetch_thread
 
     async def test_error_handling():
-        with patch("app.integrations.twitter_scraper.API") as mock_api_class:
+        with patch("app.integrations.twitter_scraper._get_api") as mock_api_class:
             mock_api_instance = MagicMock()
             mock_api_class.return_value = mock_api_instance
 
             # Mock empty response (tweet not found)
-            async def mock_tweet_details_generator_empty(*args, **kwargs):
-                # No tweets yielded
-                return
-                yield  # Never reached
+            async def mock_tweet_details_empty(tweet_id):
+                return None
 
-            mock_api_instance.tweet_details.return_value = (
-                mock_tweet_details_generator_empty()
-            )
+            mock_api_instance.tweet_details = mock_tweet_details_empty
 
             # Should return empty list on error
             result = await fetch_thread("nonexistent", "testuser")
@@ -1124,16 +1109,15 @@ def test_twitter_scraper_fetch_thread_exception():
     from app.integrations.twitter_scraper import fetch_thread
 
     async def test_exception_handling():
-        with patch("app.integrations.twitter_scraper.API") as mock_api_class:
+        with patch("app.integrations.twitter_scraper._get_api") as mock_api_class:
             mock_api_instance = MagicMock()
             mock_api_class.return_value = mock_api_instance
 
             # Mock exception during tweet_details
-            async def mock_tweet_details_error(*args, **kwargs):
+            async def mock_tweet_details_error(tweet_id):
                 raise Exception("Connection error")
-                yield  # Never reached
 
-            mock_api_instance.tweet_details.return_value = mock_tweet_details_error()
+            mock_api_instance.tweet_details = mock_tweet_details_error
 
             # Should catch exception and return empty list
             result = await fetch_thread("1001", "testuser")
@@ -1149,7 +1133,7 @@ def test_twitter_scraper_fetch_thread_with_multiple_replies():
     from app.integrations.twitter_scraper import fetch_thread
 
     async def test_multiple_replies():
-        with patch("app.integrations.twitter_scraper.API") as mock_api_class:
+        with patch("app.integrations.twitter_scraper._get_api") as mock_api_class:
             mock_api_instance = MagicMock()
             mock_api_class.return_value = mock_api_instance
 
@@ -1160,10 +1144,10 @@ def test_twitter_scraper_fetch_thread_with_multiple_replies():
             root_tweet.user.username = "testuser"
 
             # Mock tweet_details - returns root tweet
-            async def mock_tweet_details_gen(*args, **kwargs):
-                yield root_tweet
+            async def mock_tweet_details(tweet_id):
+                return root_tweet if tweet_id == 1000 else None
 
-            mock_api_instance.tweet_details.return_value = mock_tweet_details_gen()
+            mock_api_instance.tweet_details = mock_tweet_details
 
             # Mock search - returns multiple replies
             reply1 = MagicMock()
@@ -1493,7 +1477,7 @@ def test_validate_twitter_scraping_credentials_exception():
     """Test Twitter scraping validation with exception during async operation."""
     from app.integrations.credential_validator import validate_twitter_scraping
 
-    with patch("app.integrations.credential_validator.asyncio.run") as mock_run:
+    with patch("app.integrations.credential_validator.run_sync") as mock_run:
         # Simulate exception during validation (return False with error message)
         mock_run.side_effect = RuntimeError("Some other error")
 
@@ -1510,31 +1494,26 @@ def test_validate_twitter_scraping_credentials_exception():
 
 @pytest.mark.integration
 def test_validate_twitter_scraping_with_event_loop():
-    """Test Twitter scraping validation when asyncio.run() fails with RuntimeError."""
+    """Test Twitter scraping validation when called from a running event loop."""
     from app.integrations.credential_validator import validate_twitter_scraping
 
-    with patch("app.integrations.credential_validator.asyncio.run") as mock_run, patch(
-        "app.integrations.credential_validator.asyncio.get_event_loop"
-    ) as mock_get_loop:
-
-        # First call raises RuntimeError (event loop already running)
-        mock_run.side_effect = RuntimeError(
-            "asyncio.run() cannot be called from a running event loop"
-        )
+    with patch(
+        "app.integrations.credential_validator._validate_twitter_scraping_async",
+        new_callable=AsyncMock,
+    ) as mock_validate:
+        mock_validate.return_value = (True, "validated")
 
-        # Mock the event loop
-        mock_loop = MagicMock()
-        mock_get_loop.return_value = mock_loop
-        mock_loop.run_until_complete.return_value = (True, "validated")
+        async def caller():
+            return validate_twitter_scraping(
+                {
+                    "username": "user@example.com",
+                    "password": "pass123",
+                    "email": "user@example.com",
+                    "email_password": "email_pass123",
+                }
+            )
 
-        success, message = validate_twitter_scraping(
-            {
-                "username": "user@example.com",
-                "password": "pass123",
-                "email": "user@example.com",
-                "email_password": "email_pass123",
-            }
-        )
+        success, message = asyncio.run(caller())
 
         assert success is True
         assert "validated" in message.lower()
@@ -1768,9 +1747,9 @@ def test_bluesky_handler_fetch_posts_count_limit():
 @pytest.mark.integration
 @pytest.mark.api
 def test_bluesky_handler_post_thread_with_error_in_middle():
-    """Test post_thread with error in middle of thread (should continue)."""
+    """Test post_thread with error in middle of thread (stops with the posted prefix)."""
     with patch("app.integrations.bluesky_handler.bsky_client") as mock_client:
-        from app.integrations.bluesky_handler import post_thread_to_bluesky
+        from app.integrations.bluesky_handler import ThreadPostError, post_thread_to_bluesky
 
         class MockTweet:
             def __init__(self, text):
@@ -1802,12 +1781,13 @@ def test_bluesky_handler_post_thread_with_error_in_middle():
             mock_ref = MagicMock()
             mock_models.create_strong_ref.return_value = mock_ref
 
-            uris = post_thread_to_bluesky(tweets)
+            with pytest.raises(ThreadPostError) as exc:
+                post_thread_to_bluesky(tweets)
 
-            # Should have 2 successful posts (first and third)
-            assert len(uris) == 2
-            assert uris[0] == "at://did:plc:test/post/001"
-            assert uris[1] == "at://did:plc:test/post/003"
+            # The third tweet is not posted without its parent
+            assert exc.value.posted == ["at://did:plc:test/post/001"]
+            assert exc.value.parent == {"uri": mock_ref.uri, "cid": mock_ref.cid}
+            assert mock_client.send_post.call_count == 2
 
 
 @pytest.mark.integration
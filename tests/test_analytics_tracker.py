@@ -7,6 +7,8 @@ Covers metric recording, retrieval, aggregations, and user isolation.
 import pytest
 import sqlite3
 
+from app.core.db_pool import close_all
+
 
 @pytest.fixture
 def db_path(tmp_path):
@@ -463,6 +465,8 @@ class TestDatabaseErrorHandling:
                 sqlite3.OperationalError("database is locked")
             )
         )
+        # Pooled connections are reused, so force a fresh connect
+        close_all()
         
         metrics = {'impressions': 1000, 'likes': 50, 'retweets': 10, 'replies': 5, 'engagements': 65}
         result = analytics_tracker.record_metrics('error_tweet', user_id, metrics)
@@ -478,6 +482,8 @@ class TestDatabaseErrorHandling:
                 sqlite3.OperationalError("database connection failed")
             )
         )
+        # Pooled connections are reused, so force a fresh connect
+        close_all()
         
         result = analytics_tracker.get_user_analytics(user_id=999, period='daily')
         
@@ -495,6 +501,8 @@ class TestDatabaseErrorHandling:
                 sqlite3.OperationalError("database locked")
             )
         )
+        # Pooled connections are reused, so force a fresh connect
+        close_all()
         
         result = analytics_tracker.create_snapshot(user_id, period='daily')
         
@@ -510,6 +518,8 @@ class TestDatabaseErrorHandling:
                 sqlite3.OperationalError("cannot open database")
             )
         )
+        # Pooled connections are reused, so force a fresh connect
+        close_all()
         
         result = analytics_tracker.get_top_tweets(user_id, metric='likes', limit=10)
         
@@ -0,0 +1,155 @@
+"""
+Tests for the streaming Twitter archive importer.
+"""
+
+import io
+import json
+import sqlite3
+import zipfile
+
+import pytest
+
+from app.features.archive_import import ArchiveImporter, iter_js_array, normalize_tweet
+from app.features.search_engine import SearchEngine
+
+
+def archive_record(i, text=None, **extra):
+    tweet = {
+        "id_str": str(1000 + i),
+        "full_text": text if text is not None else f"Archived tweet number {i} #history",
+        "created_at": "Wed Oct 10 20:19:24 +0000 2018",
+        "favorite_count": "3",
+        "retweet_count": "1",
+        "entities": {"hashtags": [{"text": "history"}], "urls": []},
+    }
+    tweet.update(extra)
+    return {"tweet": tweet}
+
+
+def write_archive(path, records, member="data/tweets.js"):
+    body = "window.YTD.tweets.part0 = " + json.dumps(records, indent=2)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("data/account.js", "window.YTD.account.part0 = []")
+        archive.writestr(member, body)
+    return str(path)
+
+
+@pytest.fixture
+def importer(tmp_path):
+    importer = ArchiveImporter(str(tmp_path / "import.db"), batch_size=10)
+    importer.init_db()
+    return importer
+
+
+def count(importer, table, where="1"):
+    conn = sqlite3.connect(importer.db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_iter_js_array_decodes_across_chunks():
+    elements = [{"tweet": {"id_str": str(i), "full_text": "ünïcode " * 20}} for i in range(50)]
+    data = ("window.YTD.tweets.part0 = " + json.dumps(elements)).encode("utf-8")
+
+    decoded = list(iter_js_array(io.BytesIO(data), chunk_size=7))
+
+    assert [element for element, _ in decoded] == elements
+    assert decoded[-1][1] == len(data)
+
+
+def test_iter_js_array_rejects_truncated_file():
+    data = b'window.YTD.tweets.part0 = [{"tweet": {"id_str": "1"}}, {"tw'
+
+    with pytest.raises(ValueError):
+        list(iter_js_array(io.BytesIO(data), chunk_size=16))
+
+
+def test_normalize_tweet():
+    tweet = normalize_tweet(
+        archive_record(
+            1,
+            text="Fish &amp; chips https://t.co/abc",
+            entities={"hashtags": [], "urls": [
+                {"url": "https://t.co/abc", "expanded_url": "https://example.com/fish"},
+            ]},
+        )
+    )
+
+    assert tweet.text == "Fish & chips https://example.com/fish"
+    assert tweet.created_at == 1539202764
+    assert tweet.likes == 3
+    assert normalize_tweet(archive_record(2, text="RT @someone: hello")) is None
+
+
+def test_import_fills_posts_search_and_metrics(tmp_path, importer):
+    engine = SearchEngine(importer.db_path)
+    conn = sqlite3.connect(importer.db_path)
+    conn.execute("""
+        CREATE VIRTUAL TABLE tweet_search_index USING fts5(
+            tweet_id UNINDEXED, user_id UNINDEXED, content, hashtags, author,
+            posted_at UNINDEXED, tokenize='porter unicode61'
+        )
+    """)
+    conn.close()
+    records = [archive_record(i) for i in range(25)]
+    records.append(archive_record(25, text="RT @other: not mine"))
+    records.append(archive_record(26, text="Archived tweet number 3 #history"))  # same text
+    path = write_archive(tmp_path / "archive.zip", records)
+
+    reports = []
+    result = importer.import_archive(
+        path, user_id=7, username="alice", progress=lambda p: reports.append(p.processed)
+    )
+
+    assert result.completed
+    assert (result.processed, result.imported, result.skipped) == (27, 25, 2)
+    assert reports == [10, 20, 27]
+    assert count(importer, "synced_posts", "user_id = 7 AND source = 'twitter'") == 25
+    assert count(importer, "tweet_metrics", "user_id = 7 AND likes = 3") == 25
+    assert len(engine.search("history", user_id=7, limit=100)) == 25
+
+
+def test_import_resumes_after_interruption(tmp_path, importer):
+    path = write_archive(tmp_path / "archive.zip", [archive_record(i) for i in range(25)])
+
+    def interrupt(progress):
+        if progress.processed == 20:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        importer.import_archive(path, user_id=7, progress=interrupt)
+    assert importer.get_progress(path, user_id=7).processed == 20
+
+    result = importer.import_archive(path, user_id=7)
+
+    assert result.resumed_from == 20
+    assert result.imported == 25
+    assert count(importer, "synced_posts") == 25
+
+    # Finished imports are not read again
+    again = importer.import_archive(path, user_id=7)
+    assert again.completed and again.imported == 25
+
+
+def test_reimport_skips_known_tweets(tmp_path, importer):
+    path = write_archive(
+        tmp_path / "archive.zip", [archive_record(i) for i in range(5)], member="data/tweet.js"
+    )
+
+    importer.import_archive(path)
+    result = importer.import_archive(path, restart=True)
+
+    assert result.imported == 0
+    assert result.skipped == 5
+    assert count(importer, "synced_posts", "user_id IS NULL") == 5
+
+
+def test_archive_without_tweets(tmp_path, importer):
+    path = tmp_path / "empty.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("data/account.js", "window.YTD.account.part0 = []")
+
+    with pytest.raises(ValueError):
+        importer.import_archive(str(path))
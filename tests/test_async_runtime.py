@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.async_runtime import AsyncRuntime, get_runtime, run_sync
+
+
+@pytest.fixture
+def runtime():
+    rt = AsyncRuntime(name="test-async")
+    yield rt
+    rt.shutdown()
+
+
+def test_run_returns_coroutine_result(runtime):
+    async def add(a, b):
+        await asyncio.sleep(0)
+        return a + b
+
+    assert runtime.run(add(2, 3)) == 5
+
+
+def test_all_calls_share_one_loop(runtime):
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    first = runtime.run(current_loop())
+    second = runtime.run(current_loop())
+
+    assert first is second
+    assert runtime.get_stats()["started"] == 1
+
+
+def test_exceptions_propagate(runtime):
+    async def boom():
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError):
+        runtime.run(boom())
+
+    stats = runtime.get_stats()
+    assert stats["failed"] == 1
+    assert stats["pending"] == 0
+
+
+def test_timeout_cancels_coroutine(runtime):
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        runtime.run(slow(), timeout=0.05)
+
+    assert cancelled.wait(1)
+
+
+def test_callable_from_a_running_loop(runtime):
+    async def inner():
+        return "inner"
+
+    async def outer():
+        return runtime.run(inner())
+
+    assert asyncio.run(outer()) == "inner"
+
+
+def test_run_from_loop_thread_raises(runtime):
+    async def inner():
+        return 1
+
+    async def reentrant():
+        return runtime.run(inner())
+
+    with pytest.raises(RuntimeError):
+        runtime.run(reentrant())
+
+
+def test_connections_survive_between_calls(runtime):
+    """Objects bound to the loop (e.g. client sessions) stay usable."""
+
+    async def make_event():
+        return asyncio.Event()
+
+    event = runtime.run(make_event())
+
+    async def use_event():
+        event.set()
+        await event.wait()
+        return True
+
+    assert runtime.run(use_event()) is True
+
+
+def test_shutdown_restarts_lazily(runtime):
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    first = runtime.run(current_loop())
+    runtime.shutdown()
+    assert first.is_closed()
+
+    second = runtime.run(current_loop())
+    assert second is not first
+    assert runtime.get_stats()["started"] == 2
+
+
+def test_module_facade_uses_shared_runtime():
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    assert run_sync(current_loop()) is get_runtime().loop
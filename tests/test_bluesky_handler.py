@@ -194,8 +194,7 @@ def test_fetch_posts_from_bluesky_success(mock_client):
 
     # Verify API was called correctly
     mock_client.app.bsky.feed.get_author_feed.assert_called_once_with(
-        actor='user.bsky.social',
-        limit=10
+        {'actor': 'user.bsky.social', 'limit': 10}
     )
 
 
@@ -347,6 +346,215 @@ def test_fetch_posts_from_bluesky_respects_count_limit(mock_client):
 
     # Verify the API was called with limit=5
     mock_client.app.bsky.feed.get_author_feed.assert_called_once_with(
-        actor='user.bsky.social',
-        limit=5
+        {'actor': 'user.bsky.social', 'limit': 5}
     )
+
+
+@patch("app.integrations.bluesky_handler.bsky_client")
+def test_fetch_posts_from_bluesky_pages_until_high_water_mark(mock_client):
+    """Test that a high-water mark makes the fetch follow cursors until it is reached."""
+    def item(i, reason=None):
+        return {
+            'post': {
+                'uri': f'at://did:plc:user1/app.bsky.feed.post/post{i}',
+                'indexedAt': f'2026-01-09T10:{i:02d}:00.000Z',
+                'record': {'text': f'Post {i}'},
+            },
+            'reason': reason,
+        }
+
+    pages = [
+        # A pinned old post on top must not end the scan
+        type('obj', (object,), {
+            'feed': [item(1, reason={'$type': 'app.bsky.feed.defs#reasonPin'})]
+            + [item(i) for i in range(30, 20, -1)],
+            'cursor': 'page2',
+        })(),
+        type('obj', (object,), {
+            'feed': [item(i) for i in range(20, 10, -1)],
+            'cursor': 'page3',
+        })(),
+    ]
+    mock_client.app.bsky.feed.get_author_feed.side_effect = pages
+
+    since = {
+        'last_id': 'at://did:plc:user1/app.bsky.feed.post/post15',
+        'last_timestamp': '2026-01-09T10:15:00.000Z',
+    }
+    posts = fetch_posts_from_bluesky('user.bsky.social', count=10, since=since)
+
+    assert [p.text for p in posts] == [f'Post {i}' for i in range(30, 15, -1)]
+    assert posts[0].indexed_at == '2026-01-09T10:30:00.000Z'
+    calls = mock_client.app.bsky.feed.get_author_feed.call_args_list
+    assert len(calls) == 2
+    assert calls[1].args[0]['cursor'] == 'page2'
+
+
+@patch("app.integrations.bluesky_handler.bsky_client")
+def test_fetch_posts_from_bluesky_compares_mark_as_time(mock_client):
+    """Test that timestamps in another precision or offset are compared as times."""
+    feed = [
+        {'post': {'uri': f'at://did:plc:user1/app.bsky.feed.post/{rkey}',
+                  'indexedAt': indexed_at, 'record': {'text': rkey}}}
+        for rkey, indexed_at in [
+            ('newer', '2026-01-09T10:00:01Z'),
+            # Same instant as the mark, written with an offset
+            ('mark', '2026-01-09T12:00:00.000+02:00'),
+            ('older', '2026-01-09T09:59:59.999999Z'),
+        ]
+    ]
+    mock_client.app.bsky.feed.get_author_feed.return_value = type(
+        'obj', (object,), {'feed': feed, 'cursor': None}
+    )()
+
+    since = {'last_id': None, 'last_timestamp': '2026-01-09T10:00:00.000Z'}
+    posts = fetch_posts_from_bluesky('user.bsky.social', count=10, since=since)
+
+    assert [p.text for p in posts] == ['newer']
+
+
+@patch('app.integrations.bluesky_handler.Client')
+def test_create_bluesky_client_logs_in_a_new_client(mock_client_class):
+    """Test that a client not in the session store is logged in separately."""
+    from app.integrations.bluesky_handler import bsky_client, create_bluesky_client
+    from app.integrations.bluesky_session import get_session_store
+
+    get_session_store().clear()
+    try:
+        client = create_bluesky_client("user.bsky.social", "app-pass")
+    finally:
+        get_session_store().clear()
+
+    assert client is mock_client_class.return_value
+    assert client is not bsky_client
+    client.login.assert_called_once_with("user.bsky.social", "app-pass")
+
+
+@patch('app.integrations.bluesky_handler.bsky_client')
+def test_post_to_bluesky_uses_given_client(mock_global_client):
+    """Test that an explicit client is used instead of the module-level one."""
+    from unittest.mock import MagicMock
+
+    client = MagicMock()
+    post_to_bluesky("Hello", client=client)
+
+    client.post.assert_called_once_with("Hello")
+    mock_global_client.post.assert_not_called()
+
+
+def _feed_page(numbers, cursor=None):
+    """getAuthorFeed response with posts indexed at 2026-01-<n> (newest first)."""
+    return type('obj', (object,), {
+        'feed': [
+            {
+                'post': {
+                    'uri': f'at://did:plc:user1/app.bsky.feed.post/post{n}',
+                    'indexedAt': f'2026-01-{n:02d}T12:00:00.000Z',
+                    'record': {'text': f'Post {n}'},
+                },
+                'reason': None,
+            }
+            for n in numbers
+        ],
+        'cursor': cursor,
+    })()
+
+
+def test_iter_bluesky_posts_streams_pages_lazily():
+    """Test that pages are only requested as posts are consumed."""
+    from unittest.mock import MagicMock
+    from app.integrations.bluesky_handler import Post, iter_bluesky_posts
+
+    client = MagicMock()
+    client.app.bsky.feed.get_author_feed.side_effect = [
+        _feed_page([30, 29], cursor='page2'),
+        _feed_page([28, 27], cursor='page3'),
+        _feed_page([26, 25]),
+    ]
+
+    posts = iter_bluesky_posts('user.bsky.social', client=client, page_size=2, prefetch=False)
+    first = next(posts)
+    assert first.text == 'Post 30'
+    assert client.app.bsky.feed.get_author_feed.call_count == 1
+    assert not hasattr(first, '__dict__')
+
+    assert [p.text for p in posts] == [f'Post {n}' for n in range(29, 24, -1)]
+    assert isinstance(first, Post)
+    calls = client.app.bsky.feed.get_author_feed.call_args_list
+    assert [c.args[0].get('cursor') for c in calls] == [None, 'page2', 'page3']
+    assert calls[1].args[0]['limit'] == 100
+
+
+def test_iter_bluesky_posts_stops_at_date_and_count():
+    """Test that backfills stop at the given date or after max_posts."""
+    from datetime import datetime, timezone
+    from unittest.mock import MagicMock
+    from app.integrations.bluesky_handler import iter_bluesky_posts
+
+    client = MagicMock()
+    client.app.bsky.feed.get_author_feed.side_effect = [
+        _feed_page([30, 29, 28], cursor='page2'),
+        _feed_page([27, 26, 25], cursor='page3'),
+    ]
+    until = datetime(2026, 1, 26, tzinfo=timezone.utc)
+    posts = list(iter_bluesky_posts('user.bsky.social', client=client, until=until))
+
+    assert [p.text for p in posts] == [f'Post {n}' for n in range(30, 25, -1)]
+    # The page holding the date ends the stream; no further page is prefetched
+    assert client.app.bsky.feed.get_author_feed.call_count == 2
+
+    client = MagicMock()
+    client.app.bsky.feed.get_author_feed.side_effect = [
+        _feed_page([30, 29, 28], cursor='page2'),
+    ]
+    posts = list(iter_bluesky_posts('user.bsky.social', client=client, max_posts=2))
+
+    assert [p.text for p in posts] == ['Post 30', 'Post 29']
+    assert client.app.bsky.feed.get_author_feed.call_count == 1
+
+
+def test_iter_bluesky_posts_prefetches_next_page():
+    """Test that the next page is requested before the current one is consumed."""
+    from unittest.mock import MagicMock
+    from app.integrations.bluesky_handler import iter_bluesky_posts
+
+    client = MagicMock()
+    client.app.bsky.feed.get_author_feed.side_effect = [
+        _feed_page([30, 29], cursor='page2'),
+        _feed_page([28, 27]),
+    ]
+
+    posts = iter_bluesky_posts('user.bsky.social', client=client)
+    next(posts)
+    # The prefetch of page 2 is running or done while post 30 is processed
+    assert [p.text for p in posts] == ['Post 29', 'Post 28', 'Post 27']
+    assert client.app.bsky.feed.get_author_feed.call_count == 2
+
+
+def test_resolve_did_caches_handle_lookups():
+    """Test that handles are resolved once and DIDs are passed through."""
+    from unittest.mock import MagicMock
+    from app.integrations.bluesky_handler import resolve_did
+
+    client = MagicMock()
+    client.com.atproto.identity.resolve_handle.return_value.did = "did:plc:resolved"
+
+    assert resolve_did("Resolve-Test.bsky.social", client=client) == "did:plc:resolved"
+    assert resolve_did("resolve-test.bsky.social", client=client) == "did:plc:resolved"
+    assert resolve_did("did:plc:other", client=client) == "did:plc:other"
+    client.com.atproto.identity.resolve_handle.assert_called_once_with(
+        {"handle": "Resolve-Test.bsky.social"}
+    )
+
+
+def test_classify_xrpc_keeps_session_calls_out_of_write_budget():
+    """Test that only record writes share the write bucket."""
+    from app.integrations.bluesky_handler import _classify_xrpc
+
+    base = "https://bsky.social/xrpc/"
+    assert _classify_xrpc("POST", base + "com.atproto.repo.createRecord") == "write"
+    assert _classify_xrpc("post", base + "com.atproto.repo.applyWrites") == "write"
+    assert _classify_xrpc("POST", base + "com.atproto.server.createSession") == "session"
+    assert _classify_xrpc("POST", base + "com.atproto.server.refreshSession") == "session"
+    assert _classify_xrpc("POST", base + "com.atproto.repo.uploadBlob") == "procedure"
+    assert _classify_xrpc("GET", base + "app.bsky.feed.getAuthorFeed?actor=a&limit=5") == "read"
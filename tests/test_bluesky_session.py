@@ -0,0 +1,190 @@
+"""
+Tests for the Bluesky session store.
+
+Clients are fakes that record logins and emit session changes the way
+atproto does, so no network access is needed.
+"""
+
+import base64
+import json
+import time
+
+import pytest
+
+from app.integrations import bluesky_session
+from app.integrations.bluesky_session import BlueskySessionStore
+
+
+def _jwt(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": int(exp)}).encode()).decode().rstrip("=")
+    return f"e30.{payload}.sig"
+
+
+class FakeClient:
+    """Minimal stand-in for atproto.Client"""
+
+    instances = []
+
+    def __init__(self):
+        self.logins = []
+        self.callbacks = []
+        self.session_string = None
+        FakeClient.instances.append(self)
+
+    def on_session_change(self, callback):
+        self.callbacks.append(callback)
+
+    def login(self, login=None, password=None, session_string=None):
+        if password == "wrong":
+            raise Exception("Invalid identifier or password")
+        self.logins.append(session_string or (login, password))
+        self.session_string = session_string or f"session-for-{login}"
+        event = "import" if session_string else "create"
+        for callback in self.callbacks:
+            callback(event, None)
+
+    def export_session_string(self):
+        return self.session_string
+
+
+class FakeCredentialManager:
+    def __init__(self):
+        self.sessions = {}
+
+    def save_session(self, user_id, platform, data):
+        self.sessions[(user_id, platform)] = data
+        return True
+
+    def get_session(self, user_id, platform):
+        return self.sessions.get((user_id, platform))
+
+    def delete_session(self, user_id, platform):
+        return self.sessions.pop((user_id, platform), None) is not None
+
+
+@pytest.fixture
+def store(monkeypatch):
+    FakeClient.instances = []
+    # Fake session strings are not real JWTs; expiry is driven per test
+    monkeypatch.setattr(bluesky_session, "_refresh_expired", lambda s: s == "expired")
+    return BlueskySessionStore(client_factory=FakeClient)
+
+
+def test_second_call_reuses_cached_client(store):
+    first = store.get_client("alice.bsky.social", "pw")
+    second = store.get_client("Alice.bsky.social", "pw")
+
+    assert first is second
+    assert len(FakeClient.instances) == 1
+    stats = store.get_stats()
+    assert stats["logins"] == 1
+    assert stats["cache_hits"] == 1
+    assert stats["accounts"] == 1
+
+
+def test_changed_password_logs_in_again(store):
+    first = store.get_client("alice.bsky.social", "pw")
+    second = store.get_client("alice.bsky.social", "new-pw")
+
+    assert first is not second
+    assert store.get_stats()["logins"] == 2
+
+
+def test_failed_login_keeps_cached_client(store):
+    client = store.get_client("alice.bsky.social", "pw")
+
+    with pytest.raises(Exception):
+        store.get_client("alice.bsky.social", "wrong")
+
+    assert store.get_client("alice.bsky.social", "pw") is client
+
+
+def test_expired_refresh_token_logs_in_again(store):
+    client = store.get_client("alice.bsky.social", "pw")
+    client.session_string = "expired"
+
+    assert store.get_client("alice.bsky.social", "pw") is not client
+    assert store.get_stats()["logins"] == 2
+
+
+def test_session_persisted_and_resumed_without_password_login(store):
+    cred_manager = FakeCredentialManager()
+    store.get_client("alice.bsky.social", "pw", user_id=1, cred_manager=cred_manager)
+
+    stored = cred_manager.get_session(1, "bluesky")
+    assert stored["session_string"] == "session-for-alice.bsky.social"
+
+    # A new process only has the persisted session
+    fresh = BlueskySessionStore(client_factory=FakeClient)
+    client = fresh.get_client("alice.bsky.social", "pw", user_id=1, cred_manager=cred_manager)
+
+    assert client.logins == ["session-for-alice.bsky.social"]
+    assert fresh.get_stats()["resumed"] == 1
+    assert fresh.get_stats()["logins"] == 0
+
+
+def test_stored_session_for_other_password_is_ignored(store):
+    cred_manager = FakeCredentialManager()
+    store.get_client("alice.bsky.social", "pw", user_id=1, cred_manager=cred_manager)
+
+    fresh = BlueskySessionStore(client_factory=FakeClient)
+    client = fresh.get_client("alice.bsky.social", "new-pw", user_id=1, cred_manager=cred_manager)
+
+    assert client.logins == [("alice.bsky.social", "new-pw")]
+
+
+def test_unusable_stored_session_falls_back_to_password(store):
+    cred_manager = FakeCredentialManager()
+    store.get_client("alice.bsky.social", "pw", user_id=1, cred_manager=cred_manager)
+
+    class RevokedClient(FakeClient):
+        def login(self, login=None, password=None, session_string=None):
+            if session_string:
+                raise Exception("Token has been revoked")
+            super().login(login, password)
+
+    fresh = BlueskySessionStore(client_factory=RevokedClient)
+    client = fresh.get_client("alice.bsky.social", "pw", user_id=1, cred_manager=cred_manager)
+
+    assert client.logins == [("alice.bsky.social", "pw")]
+    assert fresh.get_stats()["logins"] == 1
+
+
+def test_refresh_is_persisted_and_counted(store):
+    cred_manager = FakeCredentialManager()
+    client = store.get_client("alice.bsky.social", "pw", user_id=1, cred_manager=cred_manager)
+
+    client.session_string = "refreshed"
+    for callback in client.callbacks:
+        callback("refresh", None)
+
+    assert cred_manager.get_session(1, "bluesky")["session_string"] == "refreshed"
+    assert store.get_stats()["refreshes"] == 1
+
+
+def test_cache_hit_persists_for_new_owner(store):
+    first_manager = FakeCredentialManager()
+    second_manager = FakeCredentialManager()
+    store.get_client("alice.bsky.social", "pw", user_id=1, cred_manager=first_manager)
+    store.get_client("alice.bsky.social", "pw", user_id=2, cred_manager=second_manager)
+
+    assert second_manager.get_session(2, "bluesky") is not None
+
+
+def test_invalidate_drops_memory_and_stored_session(store):
+    cred_manager = FakeCredentialManager()
+    client = store.get_client("alice.bsky.social", "pw", user_id=1, cred_manager=cred_manager)
+
+    store.invalidate("alice.bsky.social", user_id=1, cred_manager=cred_manager)
+
+    assert cred_manager.get_session(1, "bluesky") is None
+    assert store.get_client("alice.bsky.social", "pw") is not client
+
+
+def test_refresh_expired_reads_jwt_expiry():
+    def session_string(exp):
+        return f"alice.bsky.social:::did:plc:abc:::{_jwt(exp)}:::{_jwt(exp)}:::https://bsky.social"
+
+    assert bluesky_session._refresh_expired(session_string(time.time() + 3600)) is False
+    assert bluesky_session._refresh_expired(session_string(time.time() - 60)) is True
+    assert bluesky_session._refresh_expired("garbage") is True
@@ -0,0 +1,147 @@
+"""
+Tests for the streaming Bluesky repository (CAR) importer.
+"""
+
+import hashlib
+import io
+import sqlite3
+
+import libipld
+import pytest
+
+from app.features.car_import import CarImporter, iter_car_blocks, iter_repo_posts
+
+DID = "did:plc:alice"
+
+
+def cid_of(block, codec=0x71):
+    return bytes([1, codec, 0x12, 0x20]) + hashlib.sha256(block).digest()
+
+
+def varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        out.append(byte | (0x80 if value else 0))
+        if not value:
+            return bytes(out)
+
+
+def build_car(posts, records_first=False):
+    """
+    CARv1 repository with one commit, one MST node and the given posts.
+
+    Links are plain byte strings; decoded DAG-CBOR links have the same form.
+    """
+    records = {}
+    for rkey, text in posts:
+        block = libipld.encode_dag_cbor({
+            "$type": "app.bsky.feed.post",
+            "text": text,
+            "createdAt": "2024-05-01T12:00:00.000Z",
+            "facets": [{"features": [{"$type": "app.bsky.richtext.facet#tag", "tag": "car"}]}],
+        })
+        records[f"app.bsky.feed.post/{rkey}"] = (cid_of(block), block)
+    like = libipld.encode_dag_cbor({"$type": "app.bsky.feed.like", "subject": {}})
+    records["app.bsky.feed.like/3aaa"] = (cid_of(like), like)
+
+    entries, previous = [], b""
+    for key in sorted(records):
+        encoded = key.encode()
+        prefix = next((i for i, (a, b) in enumerate(zip(previous, encoded)) if a != b),
+                      min(len(previous), len(encoded)))
+        entries.append({"p": prefix, "k": encoded[prefix:], "v": records[key][0], "t": None})
+        previous = encoded
+    node = libipld.encode_dag_cbor({"l": None, "e": entries})
+    commit = libipld.encode_dag_cbor(
+        {"did": DID, "version": 3, "data": cid_of(node), "rev": "3abc", "sig": b"sig"}
+    )
+    blob = b"\x89PNG not cbor"
+
+    record_blocks = list(records.values())
+    tree_blocks = [(cid_of(node), node)]
+    if records_first:
+        tree_blocks = record_blocks + tree_blocks
+    else:
+        tree_blocks += record_blocks
+    blocks = [(cid_of(commit), commit)] + tree_blocks + [(cid_of(blob, codec=0x55), blob)]
+
+    header = libipld.encode_dag_cbor({"version": 1, "roots": [cid_of(commit)]})
+    data = varint(len(header)) + header
+    for cid, block in blocks:
+        data += varint(len(cid) + len(block)) + cid + block
+    return data
+
+
+@pytest.fixture
+def importer(tmp_path):
+    importer = CarImporter(str(tmp_path / "import.db"), batch_size=2)
+    importer.init_db()
+    return importer
+
+
+def test_iter_car_blocks_streams_sections():
+    data = build_car([("3k1", "hello")])
+
+    blocks = list(iter_car_blocks(io.BytesIO(data)))
+
+    assert len(blocks) == 5
+    assert all(len(cid) == 36 for cid, _ in blocks)
+
+
+def test_iter_car_blocks_rejects_truncated_file():
+    data = build_car([("3k1", "hello")])
+
+    with pytest.raises(ValueError):
+        list(iter_car_blocks(io.BytesIO(data[:-3])))
+
+
+@pytest.mark.parametrize("records_first", [False, True])
+def test_iter_repo_posts_resolves_uris(records_first):
+    data = build_car([("3k1", "first post"), ("3k2", "second post")], records_first=records_first)
+
+    posts = sorted(iter_repo_posts(io.BytesIO(data)), key=lambda post: post.uri)
+
+    assert [post.uri for post in posts] == [
+        f"at://{DID}/app.bsky.feed.post/3k1",
+        f"at://{DID}/app.bsky.feed.post/3k2",
+    ]
+    assert posts[0].text == "first post"
+    assert posts[0].hashtags == "car"
+    assert posts[0].created_at == 1714564800
+
+
+def test_import_car_loads_posts_and_search_index(tmp_path, importer):
+    conn = sqlite3.connect(importer.db_path)
+    conn.execute("""
+        CREATE VIRTUAL TABLE tweet_search_index USING fts5(
+            tweet_id UNINDEXED, user_id UNINDEXED, content, hashtags, author,
+            posted_at UNINDEXED, tokenize='porter unicode61'
+        )
+    """)
+    conn.close()
+    path = tmp_path / "repo.car"
+    path.write_bytes(build_car([(f"3k{i}", f"Bluesky post {i}") for i in range(5)]))
+
+    reports = []
+    result = importer.import_car(str(path), user_id=3, username="alice.bsky.social",
+                                 progress=lambda p: reports.append(p.processed))
+
+    assert (result.processed, result.imported, result.skipped) == (5, 5, 0)
+    assert reports == [2, 4, 5]
+    conn = sqlite3.connect(importer.db_path)
+    try:
+        assert conn.execute(
+            "SELECT COUNT(*) FROM synced_posts WHERE source = 'bluesky' AND user_id = 3"
+        ).fetchone()[0] == 5
+        assert conn.execute(
+            "SELECT COUNT(*) FROM tweet_search_index WHERE tweet_search_index MATCH 'bluesky'"
+        ).fetchone()[0] == 5
+    finally:
+        conn.close()
+
+    # A newer export only adds what is missing
+    path.write_bytes(build_car([(f"3k{i}", f"Bluesky post {i}") for i in range(6)]))
+    again = importer.import_car(str(path), user_id=3)
+    assert (again.imported, again.skipped) == (1, 5)
@@ -0,0 +1,174 @@
+"""
+Tests for the per-platform circuit breakers.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    get_breaker,
+    get_breaker_stats,
+    is_client_error,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        "bluesky:write",
+        error_threshold=0.5,
+        min_calls=4,
+        window_seconds=60,
+        open_seconds=30,
+        slow_call_seconds=5,
+        clock=clock,
+    )
+
+
+def fail(breaker):
+    with pytest.raises(ConnectionError):
+        with breaker.guard():
+            raise ConnectionError("platform down")
+
+
+def test_opens_on_error_rate_and_fails_fast(breaker):
+    breaker.call(lambda: "ok")
+    breaker.call(lambda: "ok")
+    fail(breaker)
+    assert breaker.state == CLOSED
+
+    fail(breaker)
+    assert breaker.state == OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.call(calls.append, 1)
+    assert calls == []
+    assert exc.value.retry_after == pytest.approx(30)
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_needs_minimum_calls(breaker):
+    fail(breaker)
+    fail(breaker)
+    fail(breaker)
+
+    assert breaker.state == CLOSED
+
+
+def test_old_outcomes_leave_the_window(breaker, clock):
+    fail(breaker)
+    fail(breaker)
+    clock.now += 61
+    breaker.call(lambda: "ok")
+    fail(breaker)
+    breaker.call(lambda: "ok")
+    breaker.call(lambda: "ok")
+
+    assert breaker.state == CLOSED
+
+
+def test_slow_calls_count_as_failures(breaker, clock):
+    def slow():
+        clock.now += 6
+
+    for _ in range(4):
+        breaker.call(slow)
+
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["slow"] == 4
+
+
+def test_half_open_probe_closes_or_reopens(breaker, clock):
+    for _ in range(4):
+        fail(breaker)
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+
+    # The failed probe opens the circuit again
+    fail(breaker)
+    assert breaker.state == OPEN
+
+    clock.now += 30
+    with breaker.guard():
+        # Only one probe at a time
+        assert breaker.is_open()
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: "second probe")
+    assert breaker.state == CLOSED
+    assert not breaker.is_open()
+
+
+async def test_cancelled_probe_frees_the_probe_slot(breaker, clock):
+    import asyncio
+
+    for _ in range(4):
+        fail(breaker)
+    clock.now += 30
+
+    async def probe():
+        with breaker.guard():
+            await asyncio.sleep(60)
+
+    task = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    assert breaker.is_open()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # Nothing recorded, and the next call is admitted as the probe
+    assert breaker.state == HALF_OPEN
+    assert not breaker.is_open()
+    assert breaker.call(lambda: "probe") == "probe"
+    assert breaker.state == CLOSED
+
+
+def test_client_errors_do_not_trip(breaker):
+    error = Exception("bad request")
+    error.response = SimpleNamespace(status_code=400)
+    for _ in range(4):
+        with pytest.raises(Exception):
+            with breaker.guard():
+                raise error
+
+    assert breaker.state == CLOSED
+
+
+def test_is_client_error():
+    throttled = Exception()
+    throttled.response = SimpleNamespace(status_code=429)
+    not_found = Exception()
+    not_found.status = 404
+
+    assert is_client_error(not_found)
+    assert not is_client_error(throttled)
+    assert not is_client_error(ConnectionError())
+
+
+def test_registry_reports_every_breaker():
+    assert get_breaker("twitter", "post") is get_breaker("twitter", "post")
+    get_breaker("bluesky", "read")
+
+    stats = get_breaker_stats()
+    assert list(stats) == ["bluesky:read", "twitter:post"]
+    assert stats["twitter:post"]["state"] == CLOSED
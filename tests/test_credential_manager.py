@@ -380,6 +380,58 @@ class TestDeleteCredentials:
         assert result is False
 
 
+class TestPlatformSessions:
+    """Tests for persisted platform sessions"""
+
+    def test_save_and_get_session(self, credential_manager, test_user):
+        """Test that a saved session is returned decrypted"""
+        data = {'session_string': 'handle:::did:::access:::refresh', 'fingerprint': 'abc'}
+
+        assert credential_manager.save_session(test_user, 'bluesky', data) is True
+        assert credential_manager.get_session(test_user, 'bluesky') == data
+
+    def test_save_session_replaces_previous(self, credential_manager, test_user):
+        """Test that saving again overwrites the stored session"""
+        credential_manager.save_session(test_user, 'bluesky', {'session_string': 'old'})
+        credential_manager.save_session(test_user, 'bluesky', {'session_string': 'new'})
+
+        assert credential_manager.get_session(test_user, 'bluesky') == {'session_string': 'new'}
+
+    def test_session_is_encrypted_at_rest(self, credential_manager, test_user, temp_db):
+        """Test that the session string is not stored in plaintext"""
+        import sqlite3
+
+        credential_manager.save_session(test_user, 'bluesky', {'session_string': 'secret-jwt'})
+
+        conn = sqlite3.connect(temp_db)
+        row = conn.execute('SELECT encrypted_data FROM platform_sessions').fetchone()
+        conn.close()
+        assert b'secret-jwt' not in row[0]
+
+    def test_get_missing_session_returns_none(self, credential_manager, test_user):
+        """Test that a user without a session gets None"""
+        assert credential_manager.get_session(test_user, 'bluesky') is None
+
+    def test_delete_credentials_drops_session(self, credential_manager, test_user):
+        """Test that deleting credentials also forgets the platform session"""
+        credential_manager.save_credentials(
+            user_id=test_user,
+            platform='bluesky',
+            credential_type='api',
+            data={'username': 'test.bsky.social', 'password': 'app-pass'}
+        )
+        credential_manager.save_session(test_user, 'bluesky', {'session_string': 's'})
+
+        credential_manager.delete_credentials(test_user, 'bluesky', 'api')
+
+        assert credential_manager.get_session(test_user, 'bluesky') is None
+
+    def test_save_session_invalid_platform(self, credential_manager, test_user):
+        """Test that unknown platforms are rejected"""
+        with pytest.raises(ValueError):
+            credential_manager.save_session(test_user, 'myspace', {'session_string': 's'})
+
+
 class TestListUserCredentials:
     """Tests for listing user credentials"""
 
@@ -208,7 +208,7 @@ class TestUnifiedValidation:
         success, message = validate_credentials('bluesky', 'api', credentials)
 
         assert success is True
-        mock_validate.assert_called_once_with(credentials)
+        mock_validate.assert_called_once_with(credentials, None, None)
 
     def test_validate_credentials_invalid_platform(self):
         """Test with invalid platform name"""
@@ -8,8 +8,13 @@ from app.core.db_handler import (
     migrate_database,
     should_sync_post,
     save_synced_post,
-    get_post_by_hash
+    get_post_by_hash,
+    should_sync_post_many,
+    save_synced_posts_many,
+    get_sync_cursor,
+    save_sync_cursor,
 )
+from app.core.utils import compute_content_hash
 
 def test_db_operations():
     # Use a temporary file for testing (in-memory doesn't work with separate connections)
@@ -302,3 +307,111 @@ def test_get_post_by_hash():
     finally:
         if os.path.exists(db_path):
             os.unlink(db_path)
+
+
+# Batched dedup and persistence
+
+def test_should_sync_post_many_matches_single_post_checks():
+    """Batch dedup resolves hash and ID duplicates like should_sync_post()"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        migrate_database(db_path=db_path)
+        save_synced_post(twitter_id="1", bluesky_uri="at://x/1", source="twitter",
+                         synced_to="bluesky", content="Already synced", db_path=db_path)
+
+        results = should_sync_post_many(
+            [
+                ("Already synced", "99"),      # duplicate hash
+                ("Fresh content", "1"),        # duplicate twitter_id
+                ("Brand new post", "2"),       # new
+                ("brand new   POST", "3"),     # same hash as previous entry in batch
+            ],
+            "twitter",
+            db_path=db_path,
+        )
+
+        assert results == [False, False, True, False]
+        assert should_sync_post_many([], "twitter", db_path=db_path) == []
+    finally:
+        if os.path.exists(db_path):
+            os.unlink(db_path)
+
+
+def test_should_sync_post_many_handles_large_batches():
+    """Batches larger than one IN-list chunk are fully checked"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        migrate_database(db_path=db_path)
+        save_synced_posts_many(
+            [{"bluesky_uri": f"at://x/{i}", "source": "bluesky", "synced_to": "twitter",
+              "content": f"post {i}"} for i in range(0, 1000, 2)],
+            db_path=db_path,
+        )
+
+        posts = [(f"post {i}", f"at://x/{i}") for i in range(1000)]
+        results = should_sync_post_many(posts, "bluesky", db_path=db_path)
+
+        assert results == [i % 2 == 1 for i in range(1000)]
+    finally:
+        if os.path.exists(db_path):
+            os.unlink(db_path)
+
+
+def test_save_synced_posts_many_inserts_in_one_batch():
+    """Batch save stores every post and skips already-recorded hashes"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        migrate_database(db_path=db_path)
+        posts = [
+            {"twitter_id": "1", "bluesky_uri": "at://x/1", "source": "twitter",
+             "synced_to": "bluesky", "content": "first"},
+            {"twitter_id": "2", "bluesky_uri": "at://x/2", "source": "twitter",
+             "synced_to": "bluesky", "content": "second"},
+        ]
+
+        assert save_synced_posts_many(posts, db_path=db_path) == 2
+        assert save_synced_posts_many(posts, db_path=db_path) == 0
+        assert save_synced_posts_many([], db_path=db_path) == 0
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute(
+            "SELECT twitter_id, bluesky_uri, original_text FROM synced_posts ORDER BY id"
+        ).fetchall()
+        conn.close()
+        assert rows == [("1", "at://x/1", "first"), ("2", "at://x/2", "second")]
+        assert get_post_by_hash(compute_content_hash("first"), db_path=db_path) is not None
+    finally:
+        if os.path.exists(db_path):
+            os.unlink(db_path)
+
+
+def test_sync_cursor_round_trip():
+    """High-water marks are stored per account and platform and overwritten"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        migrate_database(db_path=db_path)
+        assert get_sync_cursor("alice", "twitter", db_path=db_path) is None
+
+        save_sync_cursor("alice", "twitter", last_id=100, db_path=db_path)
+        save_sync_cursor("alice", "bluesky", last_id="at://x/1",
+                         last_timestamp="2026-01-09T10:00:00.000Z", db_path=db_path)
+        save_sync_cursor("alice", "twitter", last_id=250, db_path=db_path)
+
+        assert get_sync_cursor("alice", "twitter", db_path=db_path) == {
+            "last_id": "250", "last_timestamp": None
+        }
+        assert get_sync_cursor("alice", "bluesky", db_path=db_path) == {
+            "last_id": "at://x/1", "last_timestamp": "2026-01-09T10:00:00.000Z"
+        }
+        assert get_sync_cursor("bob", "twitter", db_path=db_path) is None
+    finally:
+        if os.path.exists(db_path):
+            os.unlink(db_path)
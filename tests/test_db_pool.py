@@ -0,0 +1,224 @@
+import os
+import sqlite3
+import tempfile
+import threading
+
+import pytest
+
+from app.core import db_pool
+from app.core.db_pool import (
+    checkpoint,
+    close_all,
+    get_connection,
+    get_pool_stats,
+    reset_pool_stats,
+)
+
+
+@pytest.fixture
+def db_path():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    close_all()
+    reset_pool_stats()
+    yield path
+    close_all()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+def test_connection_uses_wal_and_tuned_pragmas(db_path):
+    conn = get_connection(db_path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] < 0  # KiB form
+    finally:
+        conn.close()
+
+
+def test_close_returns_connection_to_pool(db_path):
+    first = get_connection(db_path)
+    first.close()
+    second = get_connection(db_path)
+    second.close()
+
+    assert first is second
+    stats = get_pool_stats()
+    assert stats["checkouts"] == 2
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["avg_wait_ms"] >= 0
+
+
+def test_committed_writes_are_counted(db_path):
+    conn = get_connection(db_path)
+    conn.execute("CREATE TABLE t (id INTEGER)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(1,), (2,), (3,)])
+    conn.commit()
+    conn.close()
+
+    conn = get_connection(db_path)
+    conn.execute("INSERT INTO t VALUES (4)")
+    conn.close()  # rolled back
+
+    conn = get_connection(db_path)
+    conn.execute("SELECT * FROM t").fetchall()
+    conn.close()
+
+    stats = get_pool_stats()
+    assert stats["writes"] == 1
+    assert stats["rows_written"] == 3
+
+
+def test_nested_checkouts_get_distinct_connections(db_path):
+    outer = get_connection(db_path)
+    inner = get_connection(db_path)
+    try:
+        assert outer is not inner
+    finally:
+        inner.close()
+        outer.close()
+
+
+def test_double_close_does_not_duplicate_idle_entry(db_path):
+    conn = get_connection(db_path)
+    conn.close()
+    conn.close()
+
+    a = get_connection(db_path)
+    b = get_connection(db_path)
+    try:
+        assert a is not b
+    finally:
+        a.close()
+        b.close()
+
+
+def test_release_rolls_back_uncommitted_work(db_path):
+    conn = get_connection(db_path)
+    conn.execute("CREATE TABLE items (id INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO items VALUES (1)")
+    conn.close()  # no commit
+
+    conn = get_connection(db_path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_row_factory_is_per_checkout(db_path):
+    conn = get_connection(db_path, row_factory=sqlite3.Row)
+    assert conn.row_factory is sqlite3.Row
+    conn.close()
+
+    conn = get_connection(db_path)
+    try:
+        assert conn.row_factory is None
+    finally:
+        conn.close()
+
+
+def test_foreign_keys_do_not_leak_between_checkouts(db_path):
+    conn = get_connection(db_path, foreign_keys=True)
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    conn.close()
+
+    conn = get_connection(db_path)
+    try:
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_replaced_database_file_is_not_reused(db_path):
+    conn = get_connection(db_path)
+    conn.execute("CREATE TABLE old_table (id INTEGER)")
+    conn.commit()
+    conn.close()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.unlink(db_path + suffix)
+
+    conn = get_connection(db_path)
+    try:
+        tables = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'"
+        ).fetchall()
+        assert tables == []
+    finally:
+        conn.close()
+    assert get_pool_stats()["stale_discarded"] == 1
+
+
+def test_pools_are_per_thread(db_path):
+    main_conn = get_connection(db_path)
+    main_conn.close()
+
+    seen = []
+
+    def worker():
+        conn = get_connection(db_path)
+        seen.append(conn)
+        conn.close()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert seen[0] is not main_conn
+
+
+def test_close_all_invalidates_idle_connections(db_path):
+    conn = get_connection(db_path)
+    conn.close()
+    close_all()
+
+    fresh = get_connection(db_path)
+    try:
+        assert fresh is not conn
+    finally:
+        fresh.close()
+
+
+def test_idle_list_is_bounded(db_path, monkeypatch):
+    monkeypatch.setattr(db_pool, "DB_POOL_MAX_IDLE", 1)
+    a = get_connection(db_path)
+    b = get_connection(db_path)
+    a.close()
+    b.close()
+
+    stats = get_pool_stats()
+    assert stats["opened"] == 2
+    assert stats["closed"] == 1
+    assert stats["open_connections"] == 1
+
+
+def test_memory_databases_are_never_shared():
+    first = get_connection(":memory:")
+    first.execute("CREATE TABLE t (id INTEGER)")
+    second = get_connection(":memory:")
+    try:
+        tables = second.execute("SELECT name FROM sqlite_master").fetchall()
+        assert tables == []
+    finally:
+        first.close()
+        second.close()
+
+
+def test_checkpoint_makes_file_copy_complete(db_path):
+    conn = get_connection(db_path)
+    conn.execute("CREATE TABLE items (id INTEGER)")
+    conn.execute("INSERT INTO items VALUES (1)")
+    conn.commit()
+    conn.close()
+
+    checkpoint(db_path)
+
+    assert os.path.getsize(db_path + "-wal") == 0
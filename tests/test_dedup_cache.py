@@ -0,0 +1,171 @@
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from app.core import db_handler
+from app.core.db_handler import (
+    initialize_db,
+    is_tweet_seen,
+    mark_tweet_as_seen,
+    migrate_database,
+    save_synced_post,
+    should_sync_post,
+    should_sync_post_many,
+    warm_dedup_cache,
+)
+from app.core.db_pool import close_all
+from app.core.dedup_cache import (
+    CONTENT_HASH,
+    TWITTER_ID,
+    BloomFilter,
+    DedupCache,
+    get_dedup_cache,
+    get_dedup_stats,
+    reset_dedup_caches,
+)
+from app.core.utils import compute_content_hash
+
+
+@pytest.fixture
+def db_path():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    close_all()
+    reset_dedup_caches()
+    migrate_database(db_path=path)
+    yield path
+    close_all()
+    reset_dedup_caches()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+def _external_insert(path, twitter_id, content):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        INSERT INTO synced_posts (twitter_id, source, content_hash, synced_to, original_text)
+        VALUES (?, 'twitter', ?, 'bluesky', ?)
+        """,
+        (twitter_id, compute_content_hash(content), content),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    for i in range(5000):
+        bloom.add(f"key-{i}")
+
+    assert all(f"key-{i}" in bloom for i in range(5000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.03
+    assert bloom.estimated_error_rate() < 0.02
+
+
+def test_bloom_filter_rejects_invalid_sizing():
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0, error_rate=0.01)
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=10, error_rate=1.5)
+
+
+def test_lookup_outcomes(db_path):
+    save_synced_post(twitter_id="t1", source="twitter", synced_to="bluesky", content="hello", db_path=db_path)
+    cache = DedupCache(db_path)
+
+    assert cache.lookup([(TWITTER_ID, "t2"), (CONTENT_HASH, compute_content_hash("new"))]) is False
+    assert cache.lookup([(TWITTER_ID, "t1")]) is None
+    cache.confirm(TWITTER_ID, "t1", True)
+    assert cache.lookup([(TWITTER_ID, "t1")]) is True
+
+    stats = cache.get_stats()
+    assert stats["definite_misses"] == 1
+    assert stats["db_checks"] == 1
+    assert stats["lru_hits"] == 1
+    assert stats["keys"] >= 2
+
+
+def test_should_sync_post_skips_database_for_new_posts(db_path):
+    assert should_sync_post("brand new", "twitter", "t100", db_path=db_path) is True
+    save_synced_post(twitter_id="t100", source="twitter", synced_to="bluesky", content="brand new", db_path=db_path)
+
+    assert should_sync_post("brand new", "twitter", "t100", db_path=db_path) is False
+    assert should_sync_post("another", "twitter", "t101", db_path=db_path) is True
+
+    stats = get_dedup_cache(db_path).get_stats()
+    assert stats["lookups"] == 3
+    assert stats["definite_misses"] == 2
+    assert stats["lru_hits"] == 1
+
+
+def test_external_writes_are_picked_up(db_path):
+    assert should_sync_post("from elsewhere", "twitter", "t200", db_path=db_path) is True
+
+    _external_insert(db_path, "t200", "from elsewhere")
+
+    assert should_sync_post("from elsewhere", "twitter", "t200", db_path=db_path) is False
+    assert get_dedup_cache(db_path).get_stats()["refreshes"] >= 1
+
+
+def test_external_deletes_flush_lru(db_path):
+    save_synced_post(twitter_id="t300", source="twitter", synced_to="bluesky", content="gone soon", db_path=db_path)
+    assert should_sync_post("gone soon", "twitter", "t300", db_path=db_path) is False
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM synced_posts WHERE twitter_id = 't300'")
+    conn.commit()
+    conn.close()
+
+    assert should_sync_post("gone soon", "twitter", "t300", db_path=db_path) is True
+
+
+def test_batch_dedup_uses_cache(db_path):
+    save_synced_post(twitter_id="t400", source="twitter", synced_to="bluesky", content="known", db_path=db_path)
+    posts = [("known", "t400"), ("fresh", "t401"), ("fresh", "t402")]
+
+    assert should_sync_post_many(posts, "twitter", db_path=db_path) == [False, True, False]
+
+
+def test_seen_tweets_are_cached(db_path, monkeypatch):
+    monkeypatch.setattr(db_handler, "DB_PATH", db_path)
+    initialize_db(db_path)
+
+    assert is_tweet_seen("s1") is False
+    mark_tweet_as_seen("s1")
+    assert is_tweet_seen("s1") is True
+    assert get_dedup_cache(db_path).get_stats()["lru_hits"] == 1
+
+
+def test_filter_grows_past_capacity(db_path):
+    cache = DedupCache(db_path, capacity=4, error_rate=0.01)
+    for i in range(10):
+        _external_insert(db_path, f"g{i}", f"grow {i}")
+
+    cache.warm()
+
+    stats = cache.get_stats()
+    assert stats["capacity"] >= 16
+    assert all(cache.lookup([(TWITTER_ID, f"g{i}")]) is None for i in range(10))
+
+
+def test_warm_reports_metrics(db_path):
+    _external_insert(db_path, "w1", "warm")
+
+    stats = warm_dedup_cache(db_path)
+
+    assert stats["warmup_ms"] >= 0
+    assert stats["keys"] >= 2
+    assert os.path.abspath(db_path) in get_dedup_stats()
+
+
+def test_cache_disabled(db_path, monkeypatch):
+    monkeypatch.setattr("app.core.dedup_cache.DEDUP_CACHE_ENABLED", False)
+
+    assert get_dedup_cache(db_path) is None
+    assert warm_dedup_cache(db_path) is None
+    assert should_sync_post("anything", "twitter", "t500", db_path=db_path) is True
@@ -0,0 +1,87 @@
+"""
+Tests for the shared outbound HTTP client.
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from app.core import http_client
+from app.core.async_runtime import AsyncRuntime
+from app.core.http_client import close_http_session, get_http_session, get_http_stats, reset_http_stats
+
+
+@pytest.fixture
+async def server():
+    state = {"active": 0, "peak": 0}
+
+    async def slow(request):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.05)
+        state["active"] -= 1
+        return web.Response(body=b"ok")
+
+    app = web.Application()
+    app.router.add_get("/slow", slow)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    reset_http_stats()
+    yield f"http://127.0.0.1:{port}", state
+    await close_http_session()
+    await runner.cleanup()
+
+
+async def fetch(url):
+    async with get_http_session().get(url) as response:
+        return await response.read()
+
+
+async def test_connections_are_kept_alive_and_reused(server):
+    url, _ = server
+
+    for _ in range(3):
+        assert await fetch(f"{url}/slow") == b"ok"
+
+    stats = get_http_stats()
+    assert stats["requests"] == 3
+    assert (stats["connections_created"], stats["connections_reused"]) == (1, 2)
+    assert stats["reuse_rate"] == round(2 / 3, 3)
+    assert stats["sessions_created"] == 1 and stats["open_sessions"] == 1
+
+
+async def test_requests_to_one_host_are_capped(server, monkeypatch):
+    url, state = server
+    monkeypatch.setattr(http_client, "HTTP_MAX_CONNECTIONS_PER_HOST", 2)
+
+    await asyncio.gather(*(fetch(f"{url}/slow") for _ in range(6)))
+
+    assert state["peak"] == 2
+    stats = get_http_stats()
+    assert stats["connections_created"] == 2
+    assert stats["connection_waits"] >= 4
+
+
+async def test_session_is_shared_per_loop_and_replaced_once_closed(server):
+    session = get_http_session()
+    assert get_http_session() is session
+
+    await close_http_session()
+    assert session.closed
+    assert get_http_session() is not session
+
+
+def test_runtime_shutdown_closes_its_session():
+    runtime = AsyncRuntime(name="http-client-test")
+
+    async def open_session():
+        return get_http_session()
+
+    session = runtime.run(open_session())
+    runtime.shutdown()
+
+    assert session.closed
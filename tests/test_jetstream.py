@@ -0,0 +1,247 @@
+"""
+Tests for the Jetstream push ingestion of Bluesky posts.
+
+A local websocket server stands in for Jetstream and replays recorded
+events from the requested cursor on.
+"""
+
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+from app.core.db_handler import get_sync_cursor, migrate_database
+from app.services.jetstream import JetstreamConsumer
+
+ALICE = "did:plc:alice"
+BOB = "did:plc:bob"
+
+
+def event(did, time_us, text="Hello from the stream", operation="create",
+          collection="app.bsky.feed.post"):
+    commit = {"rev": "3l3qo2vuowo2b", "operation": operation, "collection": collection,
+              "rkey": f"r{time_us}", "cid": "bafyreia"}
+    if operation != "delete":
+        commit["record"] = {"$type": collection, "text": text,
+                            "createdAt": "2024-09-09T19:46:02.102Z"}
+    return json.dumps({"did": did, "time_us": time_us, "kind": "commit", "commit": commit})
+
+
+RECORDED = [
+    event(BOB, 1_725_911_162_000_001),
+    event(ALICE, 1_725_911_162_000_002, text="First post"),
+    event(ALICE, 1_725_911_162_000_003, collection="app.bsky.feed.like"),
+    event(ALICE, 1_725_911_162_000_004, operation="delete"),
+    event(ALICE, 1_725_911_162_000_005, text="Second post"),
+]
+
+
+class StandInJetstream:
+    """Replays RECORDED to each connection, after the requested cursor."""
+
+    def __init__(self, events, close_after=None):
+        self.events = events
+        self.close_after = close_after
+        self.requests = []
+
+    async def subscribe(self, request):
+        self.requests.append(dict(request.query))
+        cursor = int(request.query.get("cursor", 0))
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        sent = 0
+        for raw in self.events:
+            if json.loads(raw)["time_us"] <= cursor:
+                continue
+            await ws.send_str(raw)
+            sent += 1
+            if self.close_after is not None and sent >= self.close_after:
+                break
+        if self.close_after is None:
+            # Stay connected like the live stream does
+            async for _ in ws:
+                pass
+        await ws.close()
+        return ws
+
+
+@pytest.fixture
+async def jetstream():
+    async def start(events=RECORDED, close_after=None):
+        server = StandInJetstream(events, close_after)
+        app = web.Application()
+        app.router.add_get("/subscribe", server.subscribe)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        server.url = f"ws://127.0.0.1:{port}/subscribe"
+        runners.append(runner)
+        return server
+
+    runners = []
+    yield start
+    for runner in runners:
+        await runner.cleanup()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "jetstream.db")
+    migrate_database(db_path=path)
+    return path
+
+
+async def wait_until(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+def test_match_filters_untracked_and_non_post_events(db_path):
+    consumer = JetstreamConsumer(lambda user_id, posts: None, db_path=db_path)
+    consumer.set_dids({ALICE: 7})
+
+    assert consumer.match(RECORDED[0]) == (1_725_911_162_000_001, None, None)
+    assert consumer.match(RECORDED[2])[1:] == (7, None)
+    assert consumer.match(RECORDED[3])[1:] == (7, None)
+
+    time_us, user_id, post = consumer.match(RECORDED[1])
+    assert (time_us, user_id) == (1_725_911_162_000_002, 7)
+    assert post.uri == f"at://{ALICE}/app.bsky.feed.post/r{time_us}"
+    assert post.text == "First post"
+    assert post.indexed_at.endswith("Z")
+
+    assert post.media == []
+
+
+def test_match_reads_attached_images(db_path):
+    consumer = JetstreamConsumer(lambda user_id, posts: None, db_path=db_path)
+    consumer.set_dids({ALICE: 7})
+    raw = json.loads(event(ALICE, 1_725_911_162_000_006, text="With a photo"))
+    raw["commit"]["record"]["embed"] = {
+        "$type": "app.bsky.embed.images",
+        "images": [{"alt": "Sunset", "image": {"$type": "blob", "ref": {"$link": "bafkimg"},
+                                               "mimeType": "image/png", "size": 1234}}],
+    }
+
+    _, _, post = consumer.match(json.dumps(raw))
+
+    assert post.media == [{
+        "url": f"https://cdn.bsky.app/img/feed_fullsize/plain/{ALICE}/bafkimg@jpeg",
+        "type": "image", "mime_type": "image/jpeg", "alt": "Sunset",
+    }]
+
+
+async def test_consumer_hands_tracked_posts_and_saves_cursor(jetstream, db_path):
+    server = await jetstream()
+    received = []
+    consumer = JetstreamConsumer(
+        lambda user_id, posts: received.extend((user_id, post.text) for post in posts),
+        url=server.url,
+        db_path=db_path,
+        cursor_save_seconds=3600,
+    )
+    consumer.set_dids({ALICE: 7})
+
+    task = asyncio.create_task(consumer.run())
+    await wait_until(lambda: consumer.cursor == 1_725_911_162_000_005)
+    # Polling for a user only stops after a catch-up poll on this connection
+    assert not consumer.tracks(7)
+    consumer.finish_catch_up(7, consumer.start_catch_up(7))
+    assert consumer.tracks(7)
+    assert consumer.start_catch_up(8) is None and not consumer.tracks(8)
+
+    consumer._request_stop()
+    await asyncio.wait_for(task, 5)
+
+    assert received == [(7, "First post"), (7, "Second post")]
+    assert server.requests[0] == {"wantedCollections": "app.bsky.feed.post"}
+    assert not consumer.live
+    mark = get_sync_cursor("jetstream:" + server.url.split("/")[2], "bluesky", db_path=db_path)
+    assert int(mark["last_id"]) == 1_725_911_162_000_005
+
+
+async def test_reconnect_resumes_from_cursor(jetstream, db_path):
+    server = await jetstream(close_after=2)
+    received = []
+    consumer = JetstreamConsumer(
+        lambda user_id, posts: received.extend(post.text for post in posts),
+        url=server.url,
+        db_path=db_path,
+        reconnect_max_seconds=0.05,
+    )
+    consumer.set_dids({ALICE: 7})
+
+    task = asyncio.create_task(consumer.run())
+    await wait_until(lambda: len(server.requests) >= 3)
+    consumer._request_stop()
+    await asyncio.wait_for(task, 5)
+
+    # Each connection picks up after the last handled event; nothing twice
+    assert received == ["First post", "Second post"]
+    assert server.requests[1]["cursor"] == "1725911162000002"
+    assert server.requests[2]["cursor"] == "1725911162000004"
+
+
+async def test_failed_handoff_does_not_advance_cursor(jetstream, db_path):
+    server = await jetstream()
+
+    def fail(user_id, posts):
+        raise RuntimeError("database is locked")
+
+    consumer = JetstreamConsumer(fail, url=server.url, db_path=db_path, reconnect_max_seconds=10)
+    consumer.set_dids({ALICE: 7})
+
+    task = asyncio.create_task(consumer.run())
+    await wait_until(lambda: consumer.get_stats()["errors"] >= 1)
+    consumer._request_stop()
+    await asyncio.wait_for(task, 5)
+
+    # Only the untracked event before the failed post counts as handled
+    assert consumer.cursor == 1_725_911_162_000_001
+
+
+def test_saved_cursor_is_loaded_on_start(db_path):
+    consumer = JetstreamConsumer(lambda user_id, posts: None, url="wss://js.example/subscribe",
+                                 db_path=db_path)
+    consumer._cursor = 1_725_911_162_000_002
+    consumer.save_cursor()
+
+    resumed = JetstreamConsumer(lambda user_id, posts: None, url="wss://js.example/subscribe",
+                                db_path=db_path)
+    assert resumed.load_cursor() == 1_725_911_162_000_002
+    assert resumed.subscribe_url() == (
+        "wss://js.example/subscribe?wantedCollections=app.bsky.feed.post"
+    )
+    resumed._cursor = resumed.load_cursor()
+    assert resumed.subscribe_url().endswith("&cursor=1725911162000002")
+
+
+def test_catch_up_is_redone_for_new_users_and_live_edge_restarts(db_path):
+    consumer = JetstreamConsumer(lambda user_id, posts: None, db_path=db_path)
+    consumer.set_dids({ALICE: 7})
+    assert consumer.start_catch_up(7) is None  # not connected: keep polling
+
+    consumer._live = True
+    consumer.finish_catch_up(7, consumer.start_catch_up(7))
+    assert consumer.tracks(7)
+
+    # A user added mid-stream is polled until its own catch-up
+    consumer.set_dids({ALICE: 7, "did:plc:bob": 8})
+    assert consumer.tracks(7) and not consumer.tracks(8)
+
+    # A poll begun before a reconnect at the live edge does not count
+    epoch = consumer.start_catch_up(8)
+    consumer._epoch += 1
+    consumer.finish_catch_up(8, epoch)
+    assert not consumer.tracks(8) and not consumer.tracks(7)
+
+    # Dropped and added again: caught up from scratch
+    consumer.finish_catch_up(7, consumer.start_catch_up(7))
+    consumer.set_dids({"did:plc:bob": 8})
+    consumer.set_dids({ALICE: 7, "did:plc:bob": 8})
+    assert not consumer.tracks(7)
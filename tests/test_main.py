@@ -1,6 +1,7 @@
 import pytest
 import sys
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock, MagicMock
 
 # Create mock modules with necessary attributes
 twitter_scraper_mock = MagicMock()
@@ -25,6 +26,42 @@ sys.modules['validation'] = validation_mock
 from app.main import main, sync_twitter_to_bluesky, sync_bluesky_to_twitter
 
 
+@pytest.fixture
+def outbox_db(tmp_path):
+    """Real database with a sync outbox for the per-user sync functions"""
+    import sqlite3
+    from app.core.db_handler import add_stats_tables, migrate_database
+    from app.services.sync_outbox import SyncOutbox
+
+    path = str(tmp_path / "outbox.db")
+    migrate_database(db_path=path)
+    add_stats_tables(db_path=path)
+    SyncOutbox(db_path=path).init_db()
+
+    def synced_posts():
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            "SELECT twitter_id, bluesky_uri, source, synced_to, original_text AS content, user_id "
+            "FROM synced_posts ORDER BY id"
+        ).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
+    def sync_stats():
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            "SELECT source, target, success, media_count, is_thread, duration_ms, user_id "
+            "FROM sync_stats ORDER BY id"
+        ).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
+    with patch("app.main.DB_PATH", path):
+        yield SimpleNamespace(path=path, synced_posts=synced_posts, sync_stats=sync_stats)
+
+
 # ===== Original Tests =====
 
 def test_login_to_bluesky_called_on_startup():
@@ -147,9 +184,9 @@ def test_sync_twitter_to_bluesky_with_new_db():
     # Mock Bluesky post
     bluesky_handler_mock.post_to_bluesky.return_value = "at://did:plc:test/app.bsky.feed.post/abc123"
 
-    # Mock asyncio.run for is_thread
-    with patch("app.main.asyncio.run") as mock_asyncio:
-        mock_asyncio.return_value = False
+    # Mock run_sync for is_thread
+    with patch("app.main.run_sync") as mock_run_sync:
+        mock_run_sync.return_value = False
 
         # Act: Run sync
         sync_twitter_to_bluesky()
@@ -206,7 +243,9 @@ def test_sync_bluesky_to_twitter_success():
             sync_bluesky_to_twitter()
 
     # Assert: Verify fetch_posts_from_bluesky was called
-    bluesky_handler_mock.fetch_posts_from_bluesky.assert_called_once_with("test.bsky.social", count=10)
+    bluesky_handler_mock.fetch_posts_from_bluesky.assert_called_once_with(
+        "test.bsky.social", count=10, since=db_handler_mock.get_sync_cursor.return_value
+    )
 
     # Assert: Verify should_sync_post was called for both posts
     assert db_handler_mock.should_sync_post.call_count == 2
@@ -263,7 +302,7 @@ def test_bidirectional_sync_no_loop():
 
     bluesky_handler_mock.post_to_bluesky.return_value = "at://did:plc:test/app.bsky.feed.post/bbb222"
 
-    with patch("app.main.asyncio.run", return_value=False):
+    with patch("app.main.run_sync", return_value=False):
         with patch("app.main.TWITTER_API_KEY", "test_key"):
             with patch("app.main.BSKY_USERNAME", "test.bsky.social"):
                 # Act: Run both sync directions
@@ -314,7 +353,7 @@ def test_sync_same_content_different_platforms():
     twitter_scraper_mock.fetch_tweets.side_effect = None  # Clear any previous side_effect
     bluesky_handler_mock.fetch_posts_from_bluesky.return_value = [mock_post]
 
-    with patch("app.main.asyncio.run", return_value=False):
+    with patch("app.main.run_sync", return_value=False):
         with patch("app.main.TWITTER_API_KEY", "test_key"):
             with patch("app.main.BSKY_USERNAME", "test.bsky.social"):
                 # Act: Try to sync in both directions
@@ -357,7 +396,7 @@ def test_main_loop_handles_missing_twitter_api_creds():
     bluesky_handler_mock.post_to_bluesky.return_value = "at://test/uri"
 
     # Mock config WITHOUT Twitter API credentials
-    with patch("app.main.asyncio.run", return_value=False):
+    with patch("app.main.run_sync", return_value=False):
         with patch("app.main.TWITTER_API_KEY", None):  # No API key!
             with patch("app.main.BSKY_USERNAME", "test.bsky.social"):
                 # Act: Run both sync functions
@@ -466,10 +505,10 @@ def test_sync_twitter_to_bluesky_handles_threads():
         "at://test/uri2"
     ]
 
-    with patch("app.main.asyncio.run") as mock_asyncio:
+    with patch("app.main.run_sync") as mock_run_sync:
         # First call: is_thread returns True
         # Second call: fetch_thread returns thread
-        mock_asyncio.side_effect = [
+        mock_run_sync.side_effect = [
             True,  # is_thread
             [mock_tweet1, mock_tweet2]  # fetch_thread
         ]
@@ -485,6 +524,72 @@ def test_sync_twitter_to_bluesky_handles_threads():
     assert db_handler_mock.save_synced_post.call_count == 2
 
 
+def _fail_on(failing_text, result):
+    """Post side effect that raises for one text and succeeds for the rest"""
+    def post(text):
+        if text == failing_text:
+            raise RuntimeError("503")
+        return result
+    return post
+
+
+def test_sync_twitter_to_bluesky_keeps_mark_below_failed_tweet():
+    """A tweet that failed to post stays above the high-water mark"""
+    twitter_scraper_mock.reset_mock()
+    bluesky_handler_mock.reset_mock()
+    db_handler_mock.reset_mock()
+    twitter_scraper_mock.fetch_tweets.side_effect = None
+    db_handler_mock.should_sync_post.side_effect = None
+    db_handler_mock.should_sync_post.return_value = True
+
+    tweets = [SimpleNamespace(id=str(n), text=f"Tweet {n}", _tweet=None) for n in (30, 20, 10)]
+    twitter_scraper_mock.fetch_tweets.return_value = tweets
+    bluesky_handler_mock.post_to_bluesky.side_effect = _fail_on("Tweet 20", "at://ok")
+
+    with patch("app.main.run_sync", return_value=False):
+        sync_twitter_to_bluesky()
+    bluesky_handler_mock.post_to_bluesky.side_effect = None
+
+    db_handler_mock.save_sync_cursor.assert_called_once_with(
+        "testuser", "twitter", last_id="10", db_path=None
+    )
+
+
+def test_sync_bluesky_to_twitter_keeps_mark_below_failed_post():
+    """Nothing at or above a failed Bluesky post is marked as handled"""
+    bluesky_handler_mock.reset_mock()
+    twitter_handler_mock.reset_mock()
+    db_handler_mock.reset_mock()
+    db_handler_mock.should_sync_post.side_effect = None
+    db_handler_mock.should_sync_post.return_value = True
+
+    failed = SimpleNamespace(uri="at://post/2", text="Fails", indexed_at="t2", media=None)
+    bluesky_handler_mock.fetch_posts_from_bluesky.return_value = [failed]
+    twitter_handler_mock.post_to_twitter.side_effect = RuntimeError("503")
+
+    with patch("app.main.TWITTER_API_KEY", "test_key"):
+        sync_bluesky_to_twitter()
+
+    db_handler_mock.save_sync_cursor.assert_not_called()
+
+    # Newest first: only the post below the failed one moves the mark
+    posts = [
+        SimpleNamespace(uri="at://post/3", text="Newer", indexed_at="t3", media=None),
+        failed,
+        SimpleNamespace(uri="at://post/1", text="Older", indexed_at="t1", media=None),
+    ]
+    bluesky_handler_mock.fetch_posts_from_bluesky.return_value = posts
+    twitter_handler_mock.post_to_twitter.side_effect = _fail_on("Fails", "42")
+
+    with patch("app.main.TWITTER_API_KEY", "test_key"):
+        sync_bluesky_to_twitter()
+    twitter_handler_mock.post_to_twitter.side_effect = None
+
+    db_handler_mock.save_sync_cursor.assert_called_once_with(
+        "test.bsky.social", "bluesky", last_id="at://post/1", last_timestamp="t1", db_path=None
+    )
+
+
 # ===== SPRINT 6: Multi-User Support Tests =====
 
 class TestGetMasterKey:
@@ -566,7 +671,7 @@ class TestEnsureAdminUser:
 class TestSyncUserTwitterToBluesky:
     """Tests for sync_user_twitter_to_bluesky function"""
 
-    def test_sync_user_twitter_to_bluesky_syncs_tweets(self):
+    def test_sync_user_twitter_to_bluesky_syncs_tweets(self, outbox_db):
         """Test that sync_user_twitter_to_bluesky syncs tweets for a user"""
         from app.main import sync_user_twitter_to_bluesky
 
@@ -586,17 +691,477 @@ class TestSyncUserTwitterToBluesky:
         mock_tweet._tweet = MagicMock()
 
         twitter_scraper_mock.fetch_tweets.return_value = [mock_tweet]
-        db_handler_mock.should_sync_post.return_value = True
+        db_handler_mock.should_sync_post_many.return_value = [True]
         bluesky_handler_mock.post_to_bluesky.return_value = "at://test/uri"
 
         twitter_creds = {"username": "twitter_user", "password": "twitter_pass"}
         bluesky_creds = {"username": "bsky_user", "password": "bsky_pass"}
 
-        with patch("app.main.asyncio.run", return_value=False):
+        with patch("app.main.is_thread", AsyncMock(return_value=False)):
             sync_user_twitter_to_bluesky(mock_user, twitter_creds, bluesky_creds)
 
-        bluesky_handler_mock.login_to_bluesky.assert_called_once()
-        bluesky_handler_mock.post_to_bluesky.assert_called_once_with("Test tweet")
+        bluesky_handler_mock.create_bluesky_client.assert_called_once_with(
+            "bsky_user", "bsky_pass"
+        )
+        bluesky_handler_mock.login_to_bluesky.assert_not_called()
+        db_handler_mock.get_sync_cursor.assert_called_once_with(
+            "twitter_user", "twitter", db_path=outbox_db.path
+        )
+        twitter_scraper_mock.fetch_tweets.assert_called_once_with(
+            username="twitter_user",
+            credentials=twitter_creds,
+            since_id=db_handler_mock.get_sync_cursor.return_value.__getitem__.return_value,
+        )
+        db_handler_mock.save_sync_cursor.assert_called_once_with(
+            "twitter_user", "twitter", last_id="123456", db_path=outbox_db.path
+        )
+        bluesky_handler_mock.post_to_bluesky.assert_called_once_with(
+            "Test tweet", client=bluesky_handler_mock.create_bluesky_client.return_value
+        )
+        db_handler_mock.should_sync_post_many.assert_called_once_with(
+            [("Test tweet", "123456")], "twitter", db_path=outbox_db.path
+        )
+        assert outbox_db.synced_posts() == [
+            {
+                "twitter_id": "123456",
+                "bluesky_uri": "at://test/uri",
+                "source": "twitter",
+                "synced_to": "bluesky",
+                "content": "Test tweet",
+                "user_id": 1,
+            }
+        ]
+        db_handler_mock.save_synced_post.assert_not_called()
+
+    def test_sync_user_twitter_to_bluesky_skips_tweets_already_posted_in_thread(self, outbox_db):
+        """Timeline tweets already posted as part of a thread are not reposted"""
+        from app.main import sync_user_twitter_to_bluesky
+
+        twitter_scraper_mock.reset_mock()
+        bluesky_handler_mock.reset_mock()
+        db_handler_mock.reset_mock()
+        twitter_scraper_mock.fetch_tweets.side_effect = None
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+
+        root = SimpleNamespace(id="1", text="Thread start", rawContent="Thread start", _tweet=None)
+        reply = SimpleNamespace(id="2", text="Thread reply", rawContent="Thread reply", _tweet=None)
+        twitter_scraper_mock.fetch_tweets.return_value = [reply, root]
+        db_handler_mock.should_sync_post_many.return_value = [True, True]
+        bluesky_handler_mock.post_thread_to_bluesky.return_value = ["at://1", "at://2"]
+
+        with patch("app.main.is_thread", AsyncMock(return_value=True)), \
+                patch("app.main.fetch_thread", AsyncMock(return_value=[root, reply])):
+            sync_user_twitter_to_bluesky(
+                mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+            )
+
+        bluesky_handler_mock.post_thread_to_bluesky.assert_called_once()
+        posted = bluesky_handler_mock.post_thread_to_bluesky.call_args[0][0]
+        assert [t.text for t in posted] == ["Thread start", "Thread reply"]
+        bluesky_handler_mock.post_to_bluesky.assert_not_called()
+        records = outbox_db.synced_posts()
+        assert [r["twitter_id"] for r in records] == ["1", "2"]
+        assert [r["bluesky_uri"] for r in records] == ["at://1", "at://2"]
+
+    def test_sync_user_twitter_to_bluesky_posts_root_once_when_its_thread_is_slow(self, outbox_db):
+        """A root enriched before its reply's thread lookup returns is not posted twice"""
+        import asyncio
+        from app.main import sync_user_twitter_to_bluesky
+
+        twitter_scraper_mock.reset_mock()
+        bluesky_handler_mock.reset_mock()
+        db_handler_mock.reset_mock()
+        twitter_scraper_mock.fetch_tweets.side_effect = None
+        bluesky_handler_mock.post_to_bluesky.side_effect = None
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+
+        root = SimpleNamespace(id="1", text="Thread start", rawContent="Thread start",
+                               _tweet=SimpleNamespace(inReplyToTweetId=None))
+        reply = SimpleNamespace(id="2", text="Thread reply", rawContent="Thread reply",
+                                _tweet=SimpleNamespace(inReplyToTweetId=1))
+        twitter_scraper_mock.fetch_tweets.return_value = [reply, root]
+        db_handler_mock.should_sync_post_many.side_effect = lambda pairs, *a, **k: [True] * len(pairs)
+        bluesky_handler_mock.post_thread_to_bluesky.return_value = ["at://1", "at://2"]
+
+        async def is_thread(raw):
+            return raw.inReplyToTweetId is not None
+
+        async def fetch_thread(tweet_id, username, tweet=None):
+            await asyncio.sleep(0.2)
+            return [root, reply]
+
+        with patch("app.main.is_thread", is_thread), \
+                patch("app.main.fetch_thread", fetch_thread), \
+                patch("app.main.PIPELINE_ENRICH_CONCURRENCY", 4):
+            sync_user_twitter_to_bluesky(
+                mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+            )
+        db_handler_mock.should_sync_post_many.side_effect = None
+
+        bluesky_handler_mock.post_to_bluesky.assert_not_called()
+        bluesky_handler_mock.post_thread_to_bluesky.assert_called_once()
+        posted = bluesky_handler_mock.post_thread_to_bluesky.call_args[0][0]
+        assert [t.text for t in posted] == ["Thread start", "Thread reply"]
+        assert [r["twitter_id"] for r in outbox_db.synced_posts()] == ["1", "2"]
+
+    def test_sync_user_twitter_to_bluesky_trims_already_synced_thread_tweets(self, outbox_db):
+        """Thread tweets synced in an earlier cycle are not posted again"""
+        from app.main import sync_user_twitter_to_bluesky
+
+        twitter_scraper_mock.reset_mock()
+        bluesky_handler_mock.reset_mock()
+        db_handler_mock.reset_mock()
+        twitter_scraper_mock.fetch_tweets.side_effect = None
+        bluesky_handler_mock.post_to_bluesky.side_effect = None
+        bluesky_handler_mock.post_to_bluesky.return_value = "at://2"
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+
+        root = SimpleNamespace(id="1", text="Thread start", rawContent="Thread start", _tweet=None)
+        reply = SimpleNamespace(id="2", text="Thread reply", rawContent="Thread reply", _tweet=None)
+        twitter_scraper_mock.fetch_tweets.return_value = [reply]
+        # The root was synced last cycle
+        db_handler_mock.should_sync_post_many.side_effect = lambda pairs, *a, **k: [
+            tweet_id != "1" for _, tweet_id in pairs
+        ]
+
+        with patch("app.main.is_thread", AsyncMock(return_value=True)), \
+                patch("app.main.fetch_thread", AsyncMock(return_value=[root, reply])):
+            sync_user_twitter_to_bluesky(
+                mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+            )
+        db_handler_mock.should_sync_post_many.side_effect = None
+
+        bluesky_handler_mock.post_thread_to_bluesky.assert_not_called()
+        bluesky_handler_mock.post_to_bluesky.assert_called_once()
+        assert bluesky_handler_mock.post_to_bluesky.call_args[0][0] == "Thread reply"
+        assert [r["twitter_id"] for r in outbox_db.synced_posts()] == ["2"]
+
+    def test_sync_user_twitter_to_bluesky_continues_stopped_thread(self, outbox_db):
+        """A thread that stops midway records its posted part and retries only the rest"""
+        from app.integrations.bluesky_handler import ThreadPostError
+        from app.main import get_outbox, sync_user_twitter_to_bluesky
+        from app.services.sync_outbox import DONE, PENDING
+
+        twitter_scraper_mock.reset_mock()
+        bluesky_handler_mock.reset_mock()
+        db_handler_mock.reset_mock()
+        twitter_scraper_mock.fetch_tweets.side_effect = None
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+
+        thread = [
+            SimpleNamespace(id=str(i), text=f"Part {i}", rawContent=f"Part {i}", _tweet=None)
+            for i in (1, 2, 3)
+        ]
+        twitter_scraper_mock.fetch_tweets.return_value = [thread[-1]]
+        db_handler_mock.should_sync_post_many.side_effect = lambda pairs, *a, **k: [True] * len(pairs)
+        parent = {"uri": "at://1", "cid": "c1"}
+        bluesky_handler_mock.post_thread_to_bluesky.side_effect = ThreadPostError(
+            ["at://1"], parent, parent, RuntimeError("503")
+        )
+
+        with patch("app.main.is_thread", AsyncMock(return_value=True)), \
+                patch("app.main.fetch_thread", AsyncMock(return_value=thread)):
+            sync_user_twitter_to_bluesky(
+                mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+            )
+
+        assert [(r["twitter_id"], r["bluesky_uri"]) for r in outbox_db.synced_posts()] == [
+            ("1", "at://1")
+        ]
+        assert get_outbox().get_stats()[PENDING] == 1
+
+        # Next cycle: the rest is posted under the last posted part
+        twitter_scraper_mock.fetch_tweets.return_value = []
+        bluesky_handler_mock.post_thread_to_bluesky.side_effect = None
+        bluesky_handler_mock.post_thread_to_bluesky.return_value = ["at://2", "at://3"]
+
+        import sqlite3
+        conn = sqlite3.connect(outbox_db.path)
+        conn.execute("UPDATE sync_outbox SET next_attempt_at = 0")  # backoff elapsed
+        conn.commit()
+        conn.close()
+
+        sync_user_twitter_to_bluesky(
+            mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+        )
+        db_handler_mock.should_sync_post_many.side_effect = None
+
+        args, kwargs = bluesky_handler_mock.post_thread_to_bluesky.call_args
+        assert [t.text for t in args[0]] == ["Part 2", "Part 3"]
+        assert kwargs["reply_to"] == {"root": parent, "parent": parent}
+        assert [r["twitter_id"] for r in outbox_db.synced_posts()] == ["1", "2", "3"]
+        assert get_outbox().get_stats()[DONE] == 1
+
+    def test_sync_user_twitter_to_bluesky_fails_thread_with_missing_uris(self, outbox_db):
+        """A thread reported with fewer URIs than tweets is not recorded misaligned"""
+        from app.main import get_outbox, sync_user_twitter_to_bluesky
+        from app.services.sync_outbox import PENDING
+
+        twitter_scraper_mock.reset_mock()
+        bluesky_handler_mock.reset_mock()
+        db_handler_mock.reset_mock()
+        twitter_scraper_mock.fetch_tweets.side_effect = None
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+
+        thread = [
+            SimpleNamespace(id=str(i), text=f"Part {i}", rawContent=f"Part {i}", _tweet=None)
+            for i in (1, 2)
+        ]
+        twitter_scraper_mock.fetch_tweets.return_value = [thread[-1]]
+        db_handler_mock.should_sync_post_many.side_effect = lambda pairs, *a, **k: [True] * len(pairs)
+        bluesky_handler_mock.post_thread_to_bluesky.side_effect = None
+        bluesky_handler_mock.post_thread_to_bluesky.return_value = ["at://2"]
+
+        with patch("app.main.is_thread", AsyncMock(return_value=True)), \
+                patch("app.main.fetch_thread", AsyncMock(return_value=thread)):
+            sync_user_twitter_to_bluesky(
+                mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+            )
+        db_handler_mock.should_sync_post_many.side_effect = None
+
+        assert outbox_db.synced_posts() == []
+        assert get_outbox().get_stats()[PENDING] == 1
+
+    def test_sync_user_twitter_to_bluesky_retries_failed_post_next_cycle(self, outbox_db):
+        """A post that fails stays in the outbox and is posted by a later sync"""
+        from app.main import get_outbox, sync_user_twitter_to_bluesky
+        from app.services.sync_outbox import PENDING, DONE
+
+        twitter_scraper_mock.reset_mock()
+        bluesky_handler_mock.reset_mock()
+        db_handler_mock.reset_mock()
+        twitter_scraper_mock.fetch_tweets.side_effect = None
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+
+        tweet = SimpleNamespace(id="42", text="Flaky tweet", _tweet=None)
+        twitter_scraper_mock.fetch_tweets.return_value = [tweet]
+        db_handler_mock.should_sync_post_many.return_value = [True]
+        bluesky_handler_mock.post_to_bluesky.side_effect = RuntimeError("503")
+
+        with patch("app.main.is_thread", AsyncMock(return_value=False)):
+            sync_user_twitter_to_bluesky(
+                mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+            )
+
+        assert outbox_db.synced_posts() == []
+        assert get_outbox().get_stats()[PENDING] == 1
+
+        # Next cycle: nothing new fetched, the queued tweet is retried once due
+        twitter_scraper_mock.fetch_tweets.return_value = []
+        db_handler_mock.should_sync_post_many.return_value = []
+        bluesky_handler_mock.post_to_bluesky.side_effect = None
+        bluesky_handler_mock.post_to_bluesky.return_value = "at://42"
+
+        import sqlite3
+        conn = sqlite3.connect(outbox_db.path)
+        conn.execute("UPDATE sync_outbox SET next_attempt_at = 0")  # backoff elapsed
+        conn.commit()
+        conn.close()
+
+        with patch("app.main.is_thread", AsyncMock(return_value=False)):
+            sync_user_twitter_to_bluesky(
+                mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+            )
+
+        assert [r["bluesky_uri"] for r in outbox_db.synced_posts()] == ["at://42"]
+        assert get_outbox().get_stats()[DONE] == 1
+
+    def test_sync_user_twitter_to_bluesky_keeps_mark_when_enqueue_fails(self, outbox_db):
+        """Tweets that never reached the outbox are fetched again"""
+        from app.main import sync_user_twitter_to_bluesky
+
+        twitter_scraper_mock.reset_mock()
+        bluesky_handler_mock.reset_mock()
+        db_handler_mock.reset_mock()
+        twitter_scraper_mock.fetch_tweets.side_effect = None
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+
+        twitter_scraper_mock.fetch_tweets.return_value = [
+            SimpleNamespace(id="42", text="Lost tweet", _tweet=None)
+        ]
+        db_handler_mock.should_sync_post_many.return_value = [True]
+
+        with patch("app.main.is_thread", AsyncMock(return_value=False)), \
+                patch("app.main.SyncOutbox.enqueue_many", side_effect=RuntimeError("disk full")):
+            with pytest.raises(RuntimeError):
+                sync_user_twitter_to_bluesky(
+                    mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+                )
+
+        db_handler_mock.save_sync_cursor.assert_not_called()
+
+    def test_sync_user_twitter_to_bluesky_keeps_mark_below_dropped_tweet(self, outbox_db):
+        """The mark only moves past tweets that were deduped or queued"""
+        from app.main import sync_user_twitter_to_bluesky
+
+        twitter_scraper_mock.reset_mock()
+        bluesky_handler_mock.reset_mock()
+        db_handler_mock.reset_mock()
+        twitter_scraper_mock.fetch_tweets.side_effect = None
+        bluesky_handler_mock.post_to_bluesky.side_effect = None
+        bluesky_handler_mock.post_to_bluesky.return_value = "at://ok"
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+
+        tweets = [
+            SimpleNamespace(id=str(n), text=f"Tweet {n}", _tweet=SimpleNamespace())
+            for n in (30, 20, 10)
+        ]
+        twitter_scraper_mock.fetch_tweets.return_value = tweets
+        db_handler_mock.should_sync_post_many.return_value = [True, True, True]
+
+        def attachments(raw):
+            if raw is tweets[1]._tweet:
+                raise RuntimeError("bad media entity")
+            return []
+
+        # Enrich of tweet 20 fails, so only tweet 10 is behind the mark
+        with patch("app.main.is_thread", AsyncMock(return_value=False)), \
+                patch("app.main.twitter_attachments", side_effect=attachments):
+            sync_user_twitter_to_bluesky(
+                mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+            )
+
+        assert len(outbox_db.synced_posts()) == 2
+        db_handler_mock.save_sync_cursor.assert_called_once_with(
+            "twitter_user", "twitter", last_id="10", db_path=outbox_db.path
+        )
+
+
+    def test_sync_user_twitter_to_bluesky_posts_media(self, outbox_db):
+        """Attachments are mirrored concurrently and embedded in the Bluesky post"""
+        from app.integrations.media_handler import UploadedMedia
+        from app.main import sync_user_twitter_to_bluesky
+
+        twitter_scraper_mock.reset_mock()
+        bluesky_handler_mock.reset_mock()
+        db_handler_mock.reset_mock()
+        twitter_scraper_mock.fetch_tweets.side_effect = None
+        bluesky_handler_mock.post_to_bluesky.side_effect = None
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+
+        photos = [SimpleNamespace(url=f"https://pbs.twimg.com/media/{n}.jpg") for n in "ab"]
+        raw = SimpleNamespace(media=SimpleNamespace(photos=photos, videos=[], animated=[]))
+        tweet = SimpleNamespace(id="7", text="Two photos", _tweet=raw)
+        twitter_scraper_mock.fetch_tweets.return_value = [tweet]
+        db_handler_mock.should_sync_post_many.return_value = [True]
+        bluesky_handler_mock.post_to_bluesky.return_value = "at://7"
+
+        uploaded = [UploadedMedia("image", "image/jpeg", f"blob-{n}") for n in "ab"]
+        with patch("app.main.is_thread", AsyncMock(return_value=False)), \
+                patch("app.main.sync_post_media", AsyncMock(return_value=uploaded)) as mirror, \
+                patch("app.main.bluesky_embed") as embed:
+            sync_user_twitter_to_bluesky(
+                mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+            )
+
+        client = bluesky_handler_mock.create_bluesky_client.return_value
+        attachments = mirror.call_args[0][0]
+        assert [a["url"] for a in attachments] == [p.url for p in photos]
+        assert mirror.call_args[0][1] == "bluesky" and mirror.call_args.kwargs == {"client": client}
+        embed.assert_called_once_with(uploaded)
+        bluesky_handler_mock.post_to_bluesky.assert_called_once_with(
+            "Two photos", client=client, embed=embed.return_value
+        )
+        assert outbox_db.synced_posts()[0]["bluesky_uri"] == "at://7"
+        [stats] = outbox_db.sync_stats()
+        assert (stats["source"], stats["target"], stats["success"]) == ("twitter", "bluesky", 1)
+        assert (stats["media_count"], stats["is_thread"], stats["user_id"]) == (2, 0, 1)
+        assert stats["duration_ms"] >= 0
+
+    def test_sync_user_twitter_to_bluesky_mirrors_media_without_nested_run_sync(self, outbox_db):
+        """Stage threads never block on the runtime loop the uploads need"""
+        import asyncio
+        import threading
+        from app.main import run_sync, sync_user_twitter_to_bluesky
+
+        twitter_scraper_mock.reset_mock()
+        bluesky_handler_mock.reset_mock()
+        db_handler_mock.reset_mock()
+        twitter_scraper_mock.fetch_tweets.side_effect = None
+        bluesky_handler_mock.post_to_bluesky.side_effect = None
+        bluesky_handler_mock.post_to_bluesky.return_value = "at://7"
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+
+        photo = SimpleNamespace(url="https://pbs.twimg.com/media/a.jpg")
+        raw = SimpleNamespace(media=SimpleNamespace(photos=[photo], videos=[], animated=[]))
+        twitter_scraper_mock.fetch_tweets.return_value = [
+            SimpleNamespace(id="7", text="A photo", _tweet=raw)
+        ]
+        db_handler_mock.should_sync_post_many.return_value = [True]
+
+        callers = []
+
+        def tracking_run_sync(coro, *args, **kwargs):
+            callers.append(threading.current_thread())
+            return run_sync(coro, *args, **kwargs)
+
+        async def mirror(attachments, platform, **upload):
+            # Uploads use the default executor, like the real ones
+            return await asyncio.to_thread(lambda: [])
+
+        with patch("app.main.is_thread", AsyncMock(return_value=False)), \
+                patch("app.main.run_sync", tracking_run_sync), \
+                patch("app.main.sync_post_media", mirror):
+            sync_user_twitter_to_bluesky(
+                mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+            )
+
+        assert callers and set(callers) == {threading.current_thread()}
+        assert outbox_db.synced_posts()[0]["bluesky_uri"] == "at://7"
+
+    def test_sync_user_twitter_to_bluesky_fails_fast_while_bluesky_circuit_open(self, outbox_db):
+        """An open Bluesky circuit skips the sync without fetching or posting"""
+        from app.main import sync_user_twitter_to_bluesky
+        from app.services.circuit_breaker import get_breaker
+
+        twitter_scraper_mock.reset_mock()
+        bluesky_handler_mock.reset_mock()
+
+        breaker = get_breaker("bluesky", "write")
+        for _ in range(breaker.min_calls):
+            breaker.record(False)
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+
+        sync_user_twitter_to_bluesky(
+            mock_user, {"username": "twitter_user"}, {"username": "bsky_user"}
+        )
+
+        twitter_scraper_mock.fetch_tweets.assert_not_called()
+        bluesky_handler_mock.create_bluesky_client.assert_not_called()
+        bluesky_handler_mock.post_to_bluesky.assert_not_called()
 
 
 class TestSyncUserBlueskyToTwitter:
@@ -620,7 +1185,7 @@ class TestSyncUserBlueskyToTwitter:
 
         bluesky_handler_mock.fetch_posts_from_bluesky.assert_not_called()
 
-    def test_sync_user_bluesky_to_twitter_syncs_posts(self):
+    def test_sync_user_bluesky_to_twitter_syncs_posts(self, outbox_db):
         """Test that sync_user_bluesky_to_twitter syncs posts for a user"""
         from app.main import sync_user_bluesky_to_twitter
 
@@ -638,15 +1203,126 @@ class TestSyncUserBlueskyToTwitter:
         mock_post.text = "Test bluesky post"
 
         bluesky_handler_mock.fetch_posts_from_bluesky.return_value = [mock_post]
-        db_handler_mock.should_sync_post.return_value = True
-        twitter_handler_mock.post_to_twitter.return_value = "987654"
+        db_handler_mock.should_sync_post_many.return_value = [True]
 
         twitter_api_creds = {"api_key": "key", "api_secret": "secret"}
         bluesky_creds = {"username": "bsky_user", "password": "bsky_pass"}
 
-        sync_user_bluesky_to_twitter(mock_user, twitter_api_creds, bluesky_creds)
+        with patch("app.main.TwitterAPIHandler") as mock_handler:
+            mock_handler.return_value.post_tweet.return_value = "987654"
+            sync_user_bluesky_to_twitter(mock_user, twitter_api_creds, bluesky_creds)
+
+        mock_handler.assert_called_once_with(
+            api_key="key", api_secret="secret", access_token=None, access_secret=None
+        )
+        mock_handler.return_value.post_tweet.assert_called_once_with("Test bluesky post")
+        twitter_handler_mock.post_to_twitter.assert_not_called()
+        bluesky_handler_mock.fetch_posts_from_bluesky.assert_called_once_with(
+            "bsky_user",
+            count=10,
+            client=bluesky_handler_mock.create_bluesky_client.return_value,
+            since=db_handler_mock.get_sync_cursor.return_value,
+        )
+        db_handler_mock.save_sync_cursor.assert_called_once_with(
+            "bsky_user",
+            "bluesky",
+            last_id="at://test/post/123",
+            last_timestamp=mock_post.indexed_at,
+            db_path=outbox_db.path,
+        )
+        records = outbox_db.synced_posts()
+        assert records[0]["bluesky_uri"] == "at://test/post/123"
+        assert records[0]["twitter_id"] == "987654"
+        assert records[0]["user_id"] == 1
+
+    def test_sync_user_bluesky_to_twitter_posts_media(self, outbox_db):
+        """Bluesky images are uploaded with the user's API and attached to the tweet"""
+        from app.integrations.media_handler import UploadedMedia
+        from app.main import sync_user_bluesky_to_twitter
+
+        bluesky_handler_mock.reset_mock()
+        db_handler_mock.reset_mock()
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+        media = [{"url": "https://cdn.bsky.app/img/a@jpeg", "type": "image", "alt": "A cat"}]
+        post = SimpleNamespace(uri="at://post/1", text="Cat picture", indexed_at=None, media=media)
+        bluesky_handler_mock.fetch_posts_from_bluesky.return_value = [post]
+        db_handler_mock.should_sync_post_many.return_value = [True]
+
+        uploaded = [UploadedMedia("image", "image/jpeg", "555", alt="A cat")]
+        with patch("app.main.TwitterAPIHandler") as mock_handler, \
+                patch("app.main.sync_post_media", AsyncMock(return_value=uploaded)) as mirror:
+            mock_handler.return_value.post_tweet.return_value = "987654"
+            sync_user_bluesky_to_twitter(mock_user, {"api_key": "key"}, {"username": "bsky_user"})
+
+        handler = mock_handler.return_value
+        mirror.assert_called_once_with(
+            media, "twitter", api=handler.api_v1, account=handler.account
+        )
+        handler.post_tweet.assert_called_once_with("Cat picture", media_ids=["555"])
+        assert outbox_db.sync_stats()[0]["media_count"] == 1
+
+    def test_streamed_posts_are_queued_and_posted_without_polling(self, outbox_db):
+        """Test that Jetstream posts go through the outbox, not the feed fetch"""
+        from app.main import _enqueue_stream_posts, get_outbox, sync_user_bluesky_to_twitter
+
+        bluesky_handler_mock.reset_mock()
+        db_handler_mock.reset_mock()
+        db_handler_mock.should_sync_post_many.return_value = [True]
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+        post = SimpleNamespace(uri="at://did:plc:alice/app.bsky.feed.post/r1", text="Streamed post")
+
+        with patch("app.main._stream_pool") as pool:
+            _enqueue_stream_posts(1, [post])
+        pool.submit.assert_called_once()
+        assert get_outbox().get_stats()["pending"] == 1
+
+        with patch("app.main.TwitterAPIHandler") as mock_handler:
+            mock_handler.return_value.post_tweet.return_value = "987654"
+            sync_user_bluesky_to_twitter(
+                mock_user, {"api_key": "key"}, {"username": "bsky_user"}, posts=[]
+            )
+
+        mock_handler.return_value.post_tweet.assert_called_once_with("Streamed post")
+        bluesky_handler_mock.fetch_posts_from_bluesky.assert_not_called()
+        bluesky_handler_mock.create_bluesky_client.assert_not_called()
+        db_handler_mock.save_sync_cursor.assert_not_called()
+        assert outbox_db.synced_posts()[0]["twitter_id"] == "987654"
+
+    def test_newly_streamed_user_is_polled_once_before_relying_on_stream(self):
+        """Posts from before the stream tracked a user come from one catch-up poll"""
+        from app.main import sync_user
+        from app.services.jetstream import JetstreamConsumer
+
+        mock_user = MagicMock()
+        mock_user.id = 1
+        mock_user.username = "testuser"
+        cred_manager = MagicMock()
+        cred_manager.get_credentials.side_effect = lambda user_id, platform, kind: (
+            {"api_key": "key"} if kind == "api" and platform == "twitter"
+            else {"username": "bsky_user"} if platform == "bluesky" else None
+        )
+        settings_manager = MagicMock()
+        settings_manager.get_all.return_value = {}
+
+        consumer = JetstreamConsumer(lambda user_id, posts: None)
+        consumer.set_dids({"did:plc:user": 1})
+        consumer._live = True
 
-        twitter_handler_mock.post_to_twitter.assert_called_once_with("Test bluesky post")
+        with patch("app.main._jetstream", consumer), \
+                patch("app.main.create_bluesky_client"), \
+                patch("app.main.sync_user_bluesky_to_twitter", return_value=True) as sync:
+            sync_user(mock_user, cred_manager, settings_manager)
+            assert "posts" not in sync.call_args.kwargs  # catch-up poll
+            assert consumer.tracks(1)
+
+            sync_user(mock_user, cred_manager, settings_manager)
+            assert sync.call_args.kwargs["posts"] == []
 
 
 class TestSyncAllUsers:
@@ -686,6 +1362,130 @@ class TestSyncAllUsers:
 
                         mock_cm.return_value.get_credentials.assert_any_call(1, "bluesky", "api")
 
+    def test_sync_all_users_runs_users_concurrently_without_global_state(self):
+        """Users are synced in parallel, each with their own clients"""
+        import threading
+        import app.core.config as config_module
+        from app.main import sync_all_users
+        from app.services.sync_executor import SyncExecutor
+
+        users = [MagicMock(id=i, username=f"user{i}") for i in range(3)]
+        creds = {
+            "twitter": {"username": "tw", "password": "pw"},
+            "bluesky": {"username": "bsky", "password": "pw"},
+        }
+        barrier = threading.Barrier(3, timeout=5)
+        seen = []
+
+        def fake_sync(user, twitter_creds, bluesky_creds, bluesky_client=None):
+            # Every user must be in flight at the same time to pass the barrier
+            barrier.wait()
+            seen.append((user.id, bluesky_client))
+
+        original_username = config_module.BSKY_USERNAME
+        with patch("app.main.UserManager") as mock_um, \
+             patch("app.main.CredentialManager") as mock_cm, \
+             patch("app.main.UserSettings") as mock_us, \
+             patch("app.main.get_master_key", return_value=b"x" * 32), \
+             patch("app.main.get_sync_executor", return_value=SyncExecutor(max_workers=3)), \
+             patch("app.main.sync_user_twitter_to_bluesky", side_effect=fake_sync), \
+             patch("app.main.log_audit"):
+            mock_um.return_value.list_users.return_value = users
+            mock_us.return_value.get_all.return_value = {"bluesky_to_twitter_enabled": False}
+            mock_cm.return_value.get_credentials.side_effect = (
+                lambda user_id, platform, kind: creds[platform] if kind != "api" or platform == "bluesky" else None
+            )
+            bluesky_handler_mock.create_bluesky_client.side_effect = lambda *a, **kw: MagicMock()
+
+            results = sync_all_users()
+
+        bluesky_handler_mock.create_bluesky_client.side_effect = None
+        assert [r.user_id for r in results] == [0, 1, 2]
+        assert all(r.success and r.duration_ms >= 0 for r in results)
+        assert len({id(client) for _, client in seen}) == 3
+        assert config_module.BSKY_USERNAME == original_username
+
+
+class TestRunDueSyncs:
+    """Tests for run_due_syncs (adaptive per-user polling)"""
+
+    def test_run_due_syncs_syncs_only_due_users_and_reschedules(self):
+        """Only due users are synced, and each is rescheduled afterwards"""
+        from app.main import run_due_syncs
+
+        users = [MagicMock(id=i, username=f"user{i}") for i in range(3)]
+        scheduler = MagicMock()
+        scheduler.pop_due.return_value = [0, 2]
+
+        with patch("app.main.UserManager") as mock_um, \
+             patch("app.main.sync_all_users") as mock_sync:
+            mock_um.return_value.list_users.return_value = users
+            mock_sync.side_effect = Exception("boom")
+
+            with pytest.raises(Exception):
+                run_due_syncs(scheduler)
+
+        assert list(scheduler.set_users.call_args[0][0]) == [0, 1, 2]
+        mock_sync.assert_called_once_with([users[0], users[2]], leases=None)
+        assert [c.args[0] for c in scheduler.reschedule.call_args_list] == [0, 2]
+
+    def test_run_due_syncs_skips_when_nobody_due(self):
+        """No sync runs while every user is waiting for their interval"""
+        from app.main import run_due_syncs
+
+        scheduler = MagicMock()
+        scheduler.pop_due.return_value = []
+
+        with patch("app.main.UserManager") as mock_um, \
+             patch("app.main.sync_all_users") as mock_sync:
+            mock_um.return_value.list_users.return_value = [MagicMock(id=1)]
+            assert run_due_syncs(scheduler) == []
+
+        mock_sync.assert_not_called()
+        scheduler.reschedule.assert_not_called()
+
+
+    def test_run_due_syncs_only_schedules_leased_users(self):
+        """In worker mode only users this worker holds a lease on are synced"""
+        from app.main import run_due_syncs
+
+        users = [MagicMock(id=i, username=f"user{i}") for i in range(4)]
+        scheduler = MagicMock()
+        scheduler.pop_due.return_value = [1, 3]
+        leases = MagicMock()
+        leases.rebalance.return_value = {1, 3}
+
+        with patch("app.main.UserManager") as mock_um, \
+             patch("app.main.sync_all_users") as mock_sync:
+            mock_um.return_value.list_users.return_value = users
+            run_due_syncs(scheduler, leases=leases)
+
+        assert list(leases.rebalance.call_args[0][0]) == [0, 1, 2, 3]
+        assert list(scheduler.set_users.call_args[0][0]) == [1, 3]
+        mock_sync.assert_called_once_with([users[1], users[3]], leases=leases)
+
+
+class TestSyncAllUsersLeases:
+    """Tests for sync_all_users in worker mode"""
+
+    def test_sync_all_users_skips_users_whose_lease_was_lost(self):
+        """A user taken over by another worker is not synced"""
+        from app.main import sync_all_users
+
+        users = [MagicMock(id=1, username="kept"), MagicMock(id=2, username="lost")]
+        leases = MagicMock()
+        leases.holds.side_effect = lambda user_id: user_id == 1
+
+        with patch("app.main.UserManager"), \
+             patch("app.main.CredentialManager"), \
+             patch("app.main.UserSettings"), \
+             patch("app.main.get_master_key", return_value=b"x" * 32), \
+             patch("app.main.sync_user", return_value=True) as mock_sync_user:
+            results = sync_all_users(users, leases=leases)
+
+        assert [call.args[0] for call in mock_sync_user.call_args_list] == [users[0]]
+        assert [r.result for r in results] == [True, False]
+
 
 class TestMainMultiUserMode:
     """Tests for main() in multi-user mode"""
@@ -889,7 +1689,7 @@ def test_sync_twitter_to_bluesky_thread_fallback():
     twitter_scraper_mock.fetch_thread.return_value = []  # Empty thread = fallback
     bluesky_handler_mock.post_to_bluesky.return_value = "bsky://uri"
     
-    with patch("app.main.asyncio.run") as mock_run:
+    with patch("app.main.run_sync") as mock_run:
         mock_run.side_effect = [True, []]  # is_thread=True, fetch_thread=[]
         
         sync_twitter_to_bluesky()
@@ -912,7 +1712,7 @@ def test_sync_twitter_to_bluesky_exception_fallback():
     db_handler_mock.should_sync_post.return_value = True
     bluesky_handler_mock.post_to_bluesky.return_value = "bsky://uri"
     
-    with patch("app.main.asyncio.run") as mock_run:
+    with patch("app.main.run_sync") as mock_run:
         mock_run.side_effect = Exception("Thread check failed")
         
         sync_twitter_to_bluesky()
@@ -936,7 +1736,7 @@ def test_sync_twitter_to_bluesky_complete_failure():
     db_handler_mock.should_sync_post.return_value = True
     bluesky_handler_mock.post_to_bluesky.side_effect = Exception("Post failed")
     
-    with patch("app.main.asyncio.run") as mock_run:
+    with patch("app.main.run_sync") as mock_run:
         mock_run.side_effect = Exception("Thread check failed")
         
         # Should not raise, just log error
@@ -0,0 +1,91 @@
+"""
+Tests for the content-addressed media cache.
+"""
+
+import os
+
+import pytest
+
+from app.core.media_cache import MediaCache, media_digest
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return MediaCache(cache_dir=str(tmp_path / "media"), max_bytes=100, clock=clock)
+
+
+def test_urls_with_the_same_bytes_share_one_file(cache):
+    first = cache.put(b"a" * 10, url="https://pbs.twimg.com/media/a.jpg")
+    second = cache.put(b"a" * 10, url="https://pbs.twimg.com/media/a.jpg?name=orig")
+
+    assert first == second == media_digest(b"a" * 10)
+    assert cache.get_url("https://pbs.twimg.com/media/a.jpg?name=orig") == b"a" * 10
+    assert cache.get_url("https://pbs.twimg.com/media/b.jpg") is None
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["files"], stats["bytes"]) == (1, 1, 1, 10)
+    assert os.path.exists(os.path.join(cache.cache_dir, first[:2], first))
+
+
+def test_least_recently_used_files_are_evicted(cache, clock):
+    for name in "abc":
+        clock.now += 1
+        cache.put(name.encode() * 40, url=f"https://example.com/{name}")
+    # 120 bytes > 100: the oldest file goes
+    assert cache.get_url("https://example.com/a") is None
+
+    clock.now += 1
+    assert cache.get_url("https://example.com/b") == b"b" * 40
+    clock.now += 1
+    cache.put(b"d" * 40, url="https://example.com/d")
+
+    # b was used more recently than c
+    assert cache.get_url("https://example.com/c") is None
+    assert cache.get_url("https://example.com/b") == b"b" * 40
+    stats = cache.get_stats()
+    assert (stats["evictions"], stats["files"], stats["bytes"]) == (2, 2, 80)
+
+
+def test_media_larger_than_the_cache_is_not_stored(cache):
+    digest = cache.put(b"x" * 101, url="https://example.com/big")
+
+    assert digest == media_digest(b"x" * 101)
+    assert cache.get_url("https://example.com/big") is None
+    assert cache.get_stats()["files"] == 0
+
+
+def test_deleted_file_is_a_miss(cache):
+    digest = cache.put(b"gone", url="https://example.com/gone")
+    os.remove(os.path.join(cache.cache_dir, digest[:2], digest))
+
+    assert cache.get_url("https://example.com/gone") is None
+    assert cache.get_stats()["files"] == 0
+
+
+def test_upload_refs_are_per_account_and_expire(cache, clock):
+    digest = media_digest(b"photo")
+    blob = {"$type": "blob", "ref": {"$link": "bafkrei"}, "mimeType": "image/jpeg", "size": 5}
+    cache.save_upload(digest, "bluesky", "did:plc:alice", blob, ttl_seconds=3600)
+    cache.save_upload(digest, "twitter", "alice", "1234567890", ttl_seconds=3600)
+
+    assert cache.get_upload(digest, "bluesky", "did:plc:alice") == blob
+    assert cache.get_upload(digest, "bluesky", "did:plc:bob") is None
+    assert cache.get_upload(digest, "twitter", "alice") == "1234567890"
+
+    # Not handed out anymore shortly before it expires
+    clock.now += 3600 - 60
+    assert cache.get_upload(digest, "twitter", "alice") is None
+    stats = cache.get_stats()
+    assert (stats["upload_hits"], stats["upload_misses"], stats["uploads"]) == (2, 2, 2)
@@ -4,10 +4,22 @@ This test suite comprehensively tests media download, upload, and processing
 functionality for bidirectional Twitter↔Bluesky media synchronization.
 """
 
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 
 
+def stream_body(response, data):
+    """Serve data from a mocked aiohttp response like iter_chunked() does."""
+    async def iter_chunked(size):
+        for start in range(0, len(data), size):
+            yield data[start:start + size]
+
+    response.content_length = len(data)
+    response.content = MagicMock()
+    response.content.iter_chunked = iter_chunked
+
+
 @pytest.fixture
 def sample_image_bytes():
     """Fixture providing sample image data (1x1 PNG)"""
@@ -27,14 +39,14 @@ def mock_aiohttp_response(sample_image_bytes):
     """Fixture for mocked aiohttp response"""
     mock_response = AsyncMock()
     mock_response.status = 200
-    mock_response.read = AsyncMock(return_value=sample_image_bytes)
+    stream_body(mock_response, sample_image_bytes)
     return mock_response
 
 
 # Test 1: download_media success
 @pytest.mark.asyncio
-@patch('app.integrations.media_handler.aiohttp.ClientSession')
-async def test_download_media_success(mock_session_class, sample_image_bytes):
+@patch('app.integrations.media_handler.get_http_session')
+async def test_download_media_success(mock_get_session, sample_image_bytes):
     """Test successful media download from URL"""
     from app.integrations.media_handler import download_media
 
@@ -42,7 +54,7 @@ async def test_download_media_success(mock_session_class, sample_image_bytes):
     mock_session = AsyncMock()
     mock_response = AsyncMock()
     mock_response.status = 200
-    mock_response.read = AsyncMock(return_value=sample_image_bytes)
+    stream_body(mock_response, sample_image_bytes)
 
     # Create proper async context manager mock
     mock_get_context = AsyncMock()
@@ -50,10 +62,7 @@ async def test_download_media_success(mock_session_class, sample_image_bytes):
     mock_get_context.__aexit__ = AsyncMock(return_value=None)
     mock_session.get = MagicMock(return_value=mock_get_context)
 
-    mock_session_context = AsyncMock()
-    mock_session_context.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_context.__aexit__ = AsyncMock(return_value=None)
-    mock_session_class.return_value = mock_session_context
+    mock_get_session.return_value = mock_session
 
     # Test
     url = "https://example.com/image.jpg"
@@ -62,13 +71,13 @@ async def test_download_media_success(mock_session_class, sample_image_bytes):
     # Assertions
     assert result == sample_image_bytes
     assert len(result) > 0
-    mock_session.get.assert_called_once_with(url, timeout=30)
+    mock_session.get.assert_called_once_with(url)
 
 
 # Test 2: download_media failure (404)
 @pytest.mark.asyncio
-@patch('app.integrations.media_handler.aiohttp.ClientSession')
-async def test_download_media_not_found(mock_session_class):
+@patch('app.integrations.media_handler.get_http_session')
+async def test_download_media_not_found(mock_get_session):
     """Test media download with 404 error"""
     from app.integrations.media_handler import download_media
 
@@ -83,11 +92,7 @@ async def test_download_media_not_found(mock_session_class):
     mock_get_context.__aexit__ = AsyncMock(return_value=None)
     mock_session.get = MagicMock(return_value=mock_get_context)
 
-    # Create proper async context manager mock for ClientSession()
-    mock_session_context = AsyncMock()
-    mock_session_context.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_context.__aexit__ = AsyncMock(return_value=None)
-    mock_session_class.return_value = mock_session_context
+    mock_get_session.return_value = mock_session
 
     # Test - should raise exception
     url = "https://example.com/missing.jpg"
@@ -97,8 +102,8 @@ async def test_download_media_not_found(mock_session_class):
 
 # Test 3: download_media timeout
 @pytest.mark.asyncio
-@patch('app.integrations.media_handler.aiohttp.ClientSession')
-async def test_download_media_timeout(mock_session_class):
+@patch('app.integrations.media_handler.get_http_session')
+async def test_download_media_timeout(mock_get_session):
     """Test media download with timeout error"""
     from app.integrations.media_handler import download_media
     import asyncio
@@ -114,11 +119,7 @@ async def test_download_media_timeout(mock_session_class):
     mock_get_context.__aexit__ = AsyncMock(return_value=None)
     mock_session.get = MagicMock(return_value=mock_get_context)
 
-    # Create proper async context manager mock for ClientSession()
-    mock_session_context = AsyncMock()
-    mock_session_context.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_context.__aexit__ = AsyncMock(return_value=None)
-    mock_session_class.return_value = mock_session_context
+    mock_get_session.return_value = mock_session
 
     # Test
     url = "https://example.com/slow.jpg"
@@ -302,8 +303,8 @@ def test_upload_media_to_twitter_failure(mock_api, sample_image_bytes):
 
 # Test 17: download_media with large file
 @pytest.mark.asyncio
-@patch('app.integrations.media_handler.aiohttp.ClientSession')
-async def test_download_media_large_file(mock_session_class):
+@patch('app.integrations.media_handler.get_http_session')
+async def test_download_media_large_file(mock_get_session):
     """Test downloading large media file"""
     from app.integrations.media_handler import download_media
 
@@ -313,7 +314,7 @@ async def test_download_media_large_file(mock_session_class):
     mock_session = AsyncMock()
     mock_response = AsyncMock()
     mock_response.status = 200
-    mock_response.read = AsyncMock(return_value=large_data)
+    stream_body(mock_response, large_data)
 
     # Create proper async context manager mock for get()
     mock_get_context = AsyncMock()
@@ -321,11 +322,7 @@ async def test_download_media_large_file(mock_session_class):
     mock_get_context.__aexit__ = AsyncMock(return_value=None)
     mock_session.get = MagicMock(return_value=mock_get_context)
 
-    # Create proper async context manager mock for ClientSession()
-    mock_session_context = AsyncMock()
-    mock_session_context.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_context.__aexit__ = AsyncMock(return_value=None)
-    mock_session_class.return_value = mock_session_context
+    mock_get_session.return_value = mock_session
 
     # Test
     result = await download_media("https://example.com/large.mp4", "video")
@@ -367,3 +364,345 @@ def test_validate_media_size_at_limit():
     # Exactly 5MB for Twitter (should be valid)
     five_mb = b'x' * (5 * 1024 * 1024)
     assert validate_media_size(five_mb, 'twitter') is True
+
+
+# Test 21: a downloaded URL is served from the media cache
+@pytest.mark.asyncio
+@patch('app.integrations.media_handler.get_http_session')
+async def test_download_media_uses_cache(mock_get_session, sample_image_bytes, isolated_media_cache):
+    """Test that retries and repeated images cost one download"""
+    from app.integrations.media_handler import download_media
+
+    mock_session = AsyncMock()
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    stream_body(mock_response, sample_image_bytes)
+    mock_get_context = AsyncMock()
+    mock_get_context.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_get_context.__aexit__ = AsyncMock(return_value=None)
+    mock_session.get = MagicMock(return_value=mock_get_context)
+    mock_get_session.return_value = mock_session
+
+    url = "https://pbs.twimg.com/media/photo.png"
+    assert await download_media(url, "image") == sample_image_bytes
+    assert await download_media(url, "image") == sample_image_bytes
+
+    mock_session.get.assert_called_once()
+    stats = isolated_media_cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["files"]) == (1, 1, 1)
+
+
+# Test 22: identical bytes are uploaded once per Bluesky account
+@pytest.mark.asyncio
+@patch('app.integrations.media_handler.models')
+async def test_upload_media_to_bluesky_reuses_blob_per_account(mock_models, sample_image_bytes):
+    """Test that a blob ref is reused by its account only"""
+    from app.integrations.media_handler import upload_media_to_bluesky
+
+    blob = {'$type': 'blob', 'ref': {'$link': 'bafkreiabc'}, 'mimeType': 'image/png', 'size': 67}
+    alice, bob = MagicMock(), MagicMock()
+    alice.me.did, bob.me.did = 'did:plc:alice', 'did:plc:bob'
+    for client in (alice, bob):
+        client.com.atproto.repo.upload_blob.return_value.blob.model_dump.return_value = blob
+
+    await upload_media_to_bluesky(sample_image_bytes, 'image/png', client=alice)
+    await upload_media_to_bluesky(sample_image_bytes, 'image/png', client=alice)
+    await upload_media_to_bluesky(sample_image_bytes, 'image/png', client=bob)
+
+    assert alice.com.atproto.repo.upload_blob.call_count == 1
+    assert bob.com.atproto.repo.upload_blob.call_count == 1
+    mock_models.ComAtprotoRepoUploadBlob.Response.assert_called_once_with(blob=blob)
+
+
+# Test 23: Twitter media IDs are reused until the reported expiry
+def test_upload_media_to_twitter_reuses_media_id(sample_image_bytes, isolated_media_cache):
+    """Test that a media ID is reused by the account that uploaded it"""
+    from app.integrations.media_handler import upload_media_to_twitter
+
+    api = MagicMock()
+    api.media_upload.return_value.media_id_string = "123456789"
+    api.media_upload.return_value.expires_after_secs = 86400
+
+    assert upload_media_to_twitter(sample_image_bytes, 'image/png', api=api, account='alice') == "123456789"
+    assert upload_media_to_twitter(sample_image_bytes, 'image/png', api=api, account='alice') == "123456789"
+    # Without a known account nothing is reused
+    upload_media_to_twitter(sample_image_bytes, 'image/png', api=api)
+
+    assert api.media_upload.call_count == 2
+    assert isolated_media_cache.get_stats()["upload_hits"] == 1
+
+
+@pytest.fixture
+async def media_server():
+    """Local server streaming media without a Content-Length."""
+    from aiohttp import web
+    from app.core.http_client import close_http_session
+
+    sent = []
+
+    async def serve(request):
+        size = int(request.match_info['size'])
+        response = web.StreamResponse()
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        for start in range(0, size, 64 * 1024):
+            chunk = b'm' * min(64 * 1024, size - start)
+            await response.write(chunk)
+            sent.append(len(chunk))
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get('/media/{size}', serve)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f'http://127.0.0.1:{port}/media', sent
+    await close_http_session()
+    await runner.cleanup()
+
+
+# Test 24: Content-Length over the limit is rejected before the body is read
+@pytest.mark.asyncio
+@patch('app.integrations.media_handler.get_http_session')
+async def test_fetch_media_rejects_by_content_length(mock_get_session):
+    """Test that oversized media is rejected from its headers"""
+    from app.integrations.media_handler import MediaTooLargeError, fetch_media
+    from app.services.circuit_breaker import get_breaker
+
+    mock_session = AsyncMock()
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    stream_body(mock_response, b'x' * (2 * 1024 * 1024))
+    mock_response.content.iter_chunked = MagicMock()
+    mock_get_context = AsyncMock()
+    mock_get_context.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_get_context.__aexit__ = AsyncMock(return_value=None)
+    mock_session.get = MagicMock(return_value=mock_get_context)
+    mock_get_session.return_value = mock_session
+
+    with pytest.raises(MediaTooLargeError) as excinfo:
+        await fetch_media("https://video.twimg.com/big.mp4", "image", max_bytes=1024 * 1024)
+
+    assert excinfo.value.size == 2 * 1024 * 1024
+    mock_response.content.iter_chunked.assert_not_called()
+    # Too large is the media's fault, not the host's
+    assert get_breaker("media", "video.twimg.com").snapshot()["window_error_rate"] == 0.0
+
+
+# Test 25: a stream without Content-Length is aborted once past the limit
+@pytest.mark.asyncio
+async def test_fetch_media_aborts_stream_past_limit(media_server, isolated_media_cache):
+    """Test that a download stops as soon as it exceeds the limit"""
+    from app.integrations.media_handler import MediaTooLargeError, fetch_media
+
+    url, sent = media_server
+    with pytest.raises(MediaTooLargeError):
+        await fetch_media(f"{url}/{8 * 1024 * 1024}", "image", max_bytes=1024 * 1024)
+
+    assert sum(sent) < 8 * 1024 * 1024
+    assert isolated_media_cache.get_stats()["files"] == 0
+
+
+# Test 26: large media spills to a temporary file and is uploaded from it
+@pytest.mark.asyncio
+async def test_fetch_media_spills_large_media_to_disk(media_server):
+    """Test that large downloads are buffered on disk and streamed to uploads"""
+    from app.integrations.media_handler import fetch_media, upload_media_to_twitter
+
+    url, _ = media_server
+    with await fetch_media(f"{url}/{3 * 1024 * 1024}", "video") as media:
+        assert media.on_disk
+        assert len(media) == 3 * 1024 * 1024
+        view = media.view()
+        assert view[:4] == b'mmmm' and len(view) == len(media)
+
+        api = MagicMock()
+        api.media_upload.return_value.media_id_string = "987"
+        assert upload_media_to_twitter(media, 'video/mp4', api=api, account='alice') == "987"
+        uploaded = api.media_upload.call_args.kwargs['file']
+        assert uploaded.read(4) == b'mmmm'
+
+    # Served from the media cache the second time, still without copying
+    with await fetch_media(f"{url}/{3 * 1024 * 1024}", "video") as cached:
+        assert cached.on_disk and len(cached) == 3 * 1024 * 1024
+
+
+# Test 27: MediaBuffer keeps small media in memory
+def test_media_buffer_keeps_small_media_in_memory():
+    """Test the in-memory side of MediaBuffer"""
+    from app.integrations.media_handler import MediaBuffer
+
+    with MediaBuffer(spool_bytes=16) as media:
+        media.write(b'0123456789')
+        assert not media.on_disk
+        assert bytes(media.view()) == b'0123456789'
+        assert media.file().read() == b'0123456789'
+        with pytest.raises(ValueError):
+            media.write(b'more')
+
+    with MediaBuffer(spool_bytes=16) as media:
+        media.write(b'0123456789')
+        media.write(b'0123456789')
+        assert media.on_disk
+        assert bytes(media.view()) == b'01234567890123456789'
+
+
+# Test 28: attachments are read from twscrape tweets and Bluesky embeds
+def test_attachments_from_tweets_and_bluesky_embeds():
+    """Test extracting the media entries of posts on both platforms"""
+    from types import SimpleNamespace
+    from app.integrations.media_handler import bluesky_attachments, twitter_attachments
+
+    tweet = SimpleNamespace(media=SimpleNamespace(
+        photos=[SimpleNamespace(url="https://pbs.twimg.com/media/a.png")],
+        videos=[SimpleNamespace(variants=[
+            SimpleNamespace(contentType="video/mp4", bitrate=832000, url="https://video.twimg.com/low.mp4"),
+            SimpleNamespace(contentType="video/mp4", bitrate=2176000, url="https://video.twimg.com/high.mp4"),
+        ])],
+        animated=[SimpleNamespace(videoUrl="https://video.twimg.com/gif.mp4")],
+    ))
+    assert twitter_attachments(tweet) == [
+        {"url": "https://pbs.twimg.com/media/a.png", "type": "image", "mime_type": "image/png", "alt": ""},
+        {"url": "https://video.twimg.com/high.mp4", "type": "video", "mime_type": "video/mp4", "alt": ""},
+        {"url": "https://video.twimg.com/gif.mp4", "type": "video", "mime_type": "video/mp4", "alt": ""},
+    ]
+    assert twitter_attachments(None) == [] and twitter_attachments(MagicMock()) == []
+
+    # Feed view of a quote post with images
+    view = {"media": {"images": [{"fullsize": "https://cdn.bsky.app/img/full/a@jpeg", "alt": "A cat"}]}}
+    assert bluesky_attachments(view) == [
+        {"url": "https://cdn.bsky.app/img/full/a@jpeg", "type": "image", "mime_type": "image/jpeg",
+         "alt": "A cat"},
+    ]
+    # Post record (e.g. from Jetstream): blob refs only
+    record = {"images": [{"image": {"ref": {"$link": "bafkcid"}}, "alt": ""}]}
+    assert bluesky_attachments(record, did="did:plc:alice")[0]["url"] == (
+        "https://cdn.bsky.app/img/feed_fullsize/plain/did:plc:alice/bafkcid@jpeg"
+    )
+    assert bluesky_attachments(None) == []
+
+
+@pytest.fixture
+async def slow_media_server():
+    """Local server answering every media request after 0.3 s."""
+    from aiohttp import web
+    from app.core.http_client import close_http_session
+
+    in_flight = {"now": 0, "max": 0}
+
+    async def serve(request):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        try:
+            await asyncio.sleep(0.3)
+            return web.Response(body=request.match_info['name'].encode() * 100)
+        finally:
+            in_flight["now"] -= 1
+
+    app = web.Application()
+    app.router.add_get('/{name}.jpg', serve)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f'http://127.0.0.1:{port}', in_flight
+    await close_http_session()
+    await runner.cleanup()
+
+
+# Test 29: a post's attachments are mirrored concurrently
+@pytest.mark.asyncio
+async def test_sync_post_media_handles_attachments_concurrently(slow_media_server, monkeypatch):
+    """Test that a media post takes about as long as its slowest attachment"""
+    import time
+    from app.integrations import media_handler
+    from app.integrations.media_handler import sync_post_media
+
+    url, in_flight = slow_media_server
+    attachments = [
+        {"url": f"{url}/{name}.jpg", "type": "image", "alt": f"Photo {name}"} for name in "abcde"
+    ]
+    api = MagicMock()
+    api.media_upload.side_effect = lambda filename, file, **options: MagicMock(
+        media_id_string=file.read(1).decode(), expires_after_secs=86400
+    )
+
+    start = time.perf_counter()
+    uploaded = await sync_post_media(attachments, "twitter", api=api, account="alice")
+    elapsed = time.perf_counter() - start
+
+    # At most 4 attachments, in post order, all downloaded at once
+    assert [media.ref for media in uploaded] == ["a", "b", "c", "d"]
+    assert in_flight["max"] == 4 and elapsed < 0.9
+    api.create_media_metadata.assert_any_call("a", "Photo a")
+
+    # Fewer at a time when limited; a missing attachment is left out
+    monkeypatch.setattr(media_handler, "MEDIA_POST_CONCURRENCY", 2)
+    in_flight["max"] = 0
+    attachments = [{"url": f"{url}/{name}.jpg"} for name in "fgh"] + [{"url": "http://127.0.0.1:1/x.jpg"}]
+    uploaded = await sync_post_media(attachments, "twitter", api=api, account="alice")
+    assert [media.ref for media in uploaded] == ["f", "g", "h"]
+    assert in_flight["max"] == 2
+
+
+# Test 30: an outage fails the post instead of dropping its media
+@pytest.mark.asyncio
+@patch('app.integrations.media_handler.fetch_media', new_callable=AsyncMock)
+async def test_sync_post_media_raises_while_circuit_open(mock_fetch):
+    """Test that an open circuit makes the post retry later"""
+    from app.integrations.media_handler import sync_post_media
+    from app.services.circuit_breaker import CircuitOpenError
+
+    mock_fetch.side_effect = CircuitOpenError("media:pbs.twimg.com", 30.0)
+
+    with pytest.raises(CircuitOpenError):
+        await sync_post_media([{"url": "https://pbs.twimg.com/media/a.jpg"}], "bluesky", client=MagicMock())
+    assert await sync_post_media([], "bluesky", client=MagicMock()) == []
+
+
+# Test 31: cache lookups, writes and hashing stay off the event loop thread
+@pytest.mark.asyncio
+@patch('app.integrations.media_handler.models')
+@patch('app.integrations.media_handler.get_http_session')
+async def test_media_cache_work_runs_off_the_loop(mock_get_session, mock_models,
+                                                  sample_image_bytes, isolated_media_cache):
+    """Test that SQLite, file copies and SHA-256 never block the runtime loop"""
+    import threading
+    from app.integrations import media_handler
+
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    stream_body(mock_response, sample_image_bytes)
+    mock_get_context = AsyncMock()
+    mock_get_context.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_get_context.__aexit__ = AsyncMock(return_value=None)
+    mock_get_session.return_value.get = MagicMock(return_value=mock_get_context)
+
+    loop_thread = threading.get_ident()
+    threads = {}
+
+    def spy(name, func):
+        def call(*args, **kwargs):
+            threads.setdefault(name, set()).add(threading.get_ident())
+            return func(*args, **kwargs)
+        return call
+
+    cache = isolated_media_cache
+    client = MagicMock()
+    client.me.did = 'did:plc:alice'
+    client.com.atproto.repo.upload_blob.return_value.blob.model_dump.return_value = {'ref': 'x'}
+    with patch.object(cache, 'lookup_url', spy('lookup_url', cache.lookup_url)), \
+            patch.object(cache, 'put', spy('put', cache.put)), \
+            patch.object(cache, 'get_upload', spy('get_upload', cache.get_upload)), \
+            patch.object(cache, 'save_upload', spy('save_upload', cache.save_upload)), \
+            patch.object(media_handler, 'media_digest',
+                         spy('media_digest', media_handler.media_digest)):
+        data = await media_handler.download_media("https://pbs.twimg.com/media/a.png", "image")
+        await media_handler.upload_media_to_bluesky(data, 'image/png', client=client)
+
+    assert set(threads) == {'lookup_url', 'put', 'get_upload', 'save_upload', 'media_digest'}
+    assert all(loop_thread not in used for used in threads.values())
@@ -0,0 +1,121 @@
+"""
+Tests for fitting images into platform size limits.
+"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from app.services import media_transform
+from app.services.media_transform import ImageTooLargeError, MediaTransformer, fit_image
+
+
+def encode(image, fmt="PNG", **options):
+    out = io.BytesIO()
+    image.save(out, format=fmt, **options)
+    return out.getvalue()
+
+
+def photo(width=1600, height=1200):
+    """Noisy RGB image that compresses badly, like a photo."""
+    return Image.effect_noise((width, height), 50).convert("RGB")
+
+
+@pytest.fixture(scope="module")
+def transformer():
+    transformer = MediaTransformer(max_workers=2)
+    yield transformer
+    transformer.shutdown()
+
+
+def test_fit_image_finds_highest_quality_that_fits():
+    image = photo()
+    data = encode(image)
+    jpeg = {"optimize": True, "progressive": True}
+    limit = len(encode(image, "JPEG", quality=70, **jpeg)) + 1
+
+    result = fit_image(data, limit, min_quality=50, max_quality=90)
+
+    assert len(result.data) <= limit
+    assert result.mime_type == "image/jpeg"
+    assert (result.width, result.height) == (1600, 1200)
+    # The next quality step would not have fit
+    assert result.quality >= 70
+    assert len(encode(image, "JPEG", quality=result.quality + 5, **jpeg)) > limit
+    assert result.ratio < 0.5
+
+
+def test_fit_image_scales_down_when_quality_is_not_enough():
+    result = fit_image(encode(photo()), 60 * 1024, min_quality=50, max_quality=90)
+
+    assert len(result.data) <= 60 * 1024
+    assert result.width < 1600 and result.width / result.height == pytest.approx(4 / 3, rel=0.01)
+
+
+def test_fit_image_applies_orientation_and_strips_metadata():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotated 90 degrees clockwise
+    exif[0x010F] = "Phone maker"
+    data = encode(photo(400, 300), "JPEG", quality=100, exif=exif.tobytes())
+
+    result = fit_image(data, len(data) // 2)
+
+    with Image.open(io.BytesIO(result.data)) as fitted:
+        assert fitted.size == (300, 400)
+        assert not fitted.getexif()
+
+
+def test_fit_image_keeps_transparency_as_webp():
+    image = photo(800, 600).convert("RGBA")
+    image.putalpha(128)
+
+    result = fit_image(encode(image), 100 * 1024)
+
+    assert result.mime_type == "image/webp"
+    with Image.open(io.BytesIO(result.data)) as fitted:
+        assert fitted.mode == "RGBA"
+
+
+def test_fit_image_leaves_animations_and_rejects_impossible_limits():
+    frames = [photo(64, 64) for _ in range(3)]
+    gif = encode(frames[0], "GIF", save_all=True, append_images=frames[1:])
+    assert fit_image(gif, 10) is None
+
+    with pytest.raises(ImageTooLargeError):
+        fit_image(encode(photo(64, 64)), 10)
+
+    # Longest side is capped first
+    assert fit_image(encode(photo()), 10 * 1024 * 1024, max_dimension=800).width == 800
+
+
+async def test_transformer_runs_in_process_pool_and_reports_metrics(transformer):
+    data = encode(photo())
+
+    assert await transformer.fit(data, len(data)) is None
+    result = await transformer.fit(memoryview(data), 300 * 1024)
+
+    assert len(result.data) <= 300 * 1024
+    stats = transformer.get_stats()
+    assert (stats["images"], stats["transformed"], stats["unchanged"]) == (2, 1, 1)
+    assert stats["ratio"] == round(len(result.data) / len(data), 3)
+    assert stats["avg_ms"] > 0
+
+
+async def test_fit_image_to_platform(transformer, monkeypatch):
+    from app.integrations.media_handler import (
+        BLUESKY_IMAGE_LIMIT, TWITTER_IMAGE_LIMIT, fit_image_to_platform,
+    )
+
+    monkeypatch.setattr(media_transform, "_transformer", transformer)
+    big = encode(photo(1200, 900))
+    assert BLUESKY_IMAGE_LIMIT < len(big) < TWITTER_IMAGE_LIMIT
+
+    data, mime_type = await fit_image_to_platform(big, "image/png", "bluesky")
+    assert len(data) <= BLUESKY_IMAGE_LIMIT and mime_type == "image/jpeg"
+
+    # Fits Twitter's limit as it is; videos and broken images are passed on
+    assert await fit_image_to_platform(big, "image/png", "twitter") == (big, "image/png")
+    video = b"\x00" * (BLUESKY_IMAGE_LIMIT + 1)
+    assert await fit_image_to_platform(video, "video/mp4", "bluesky") == (video, "video/mp4")
+    assert await fit_image_to_platform(video, "image/jpeg", "bluesky") == (video, "image/jpeg")
@@ -0,0 +1,147 @@
+"""
+Tests for the shared token-bucket rate limiter.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.async_runtime import run_sync
+from app.services.rate_limiter import RateLimiter, RateLimitExceeded, bucket_key
+
+
+NOW = 1_800_000_000.0
+
+
+class FakeClock:
+    def __init__(self, now=NOW):
+        self.now = now
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_limiter(tmp_path, clock):
+    db_path = str(tmp_path / "limits.db")
+
+    def make(max_wait=60):
+        return RateLimiter(db_path=db_path, max_wait=max_wait, clock=clock, sleep=clock.sleep)
+
+    return make
+
+
+def test_bucket_key_hides_credential():
+    key = bucket_key("twitter", "post", "secret-access-token")
+
+    assert key.startswith("twitter:post:")
+    assert "secret" not in key
+    assert bucket_key("twitter", "post") == "twitter:post:default"
+
+
+def test_bucket_empties_and_refills(make_limiter, clock):
+    limiter = make_limiter()
+
+    # twitter/delete defaults to 50 requests per 15 minutes
+    for _ in range(50):
+        assert limiter.try_acquire("twitter", "delete", "token") == 0
+    assert limiter.try_acquire("twitter", "delete", "token") == pytest.approx(18)
+
+    clock.now += 18
+    assert limiter.try_acquire("twitter", "delete", "token") == 0
+    # Other credentials have their own bucket
+    assert limiter.try_acquire("twitter", "delete", "other") == 0
+
+
+def test_acquire_waits_then_gives_up(make_limiter, clock):
+    limiter = make_limiter(max_wait=30)
+    for _ in range(50):
+        limiter.acquire("twitter", "delete", "token")
+
+    limiter.acquire("twitter", "delete", "token")
+    assert clock.slept == [pytest.approx(18)]
+
+    limiter.observe("twitter", "delete", "token", {"retry-after": "600"}, 429)
+    with pytest.raises(RateLimitExceeded) as exc:
+        limiter.acquire("twitter", "delete", "token")
+    assert exc.value.retry_after == pytest.approx(600)
+
+    stats = limiter.get_stats()
+    assert stats["acquired"] == 51
+    assert stats["waited"] == 1
+    assert stats["rejected"] == 1
+
+
+def test_headers_replace_default_limits(make_limiter, clock):
+    limiter = make_limiter(max_wait=0)
+    limiter.observe(
+        "bluesky", "write", "alice.bsky.social",
+        {"RateLimit-Limit": "5", "RateLimit-Remaining": "1", "RateLimit-Policy": "5;w=100"},
+        200,
+    )
+
+    limiter.acquire("bluesky", "write", "alice.bsky.social")
+    with pytest.raises(RateLimitExceeded) as exc:
+        limiter.acquire("bluesky", "write", "alice.bsky.social")
+    assert exc.value.retry_after == pytest.approx(20)
+
+    bucket = limiter.get_stats()["buckets"][bucket_key("bluesky", "write", "alice.bsky.social")]
+    assert bucket["capacity"] == 5
+
+
+def test_exhausted_limit_blocks_until_reset(make_limiter, clock):
+    limiter = make_limiter(max_wait=0)
+    limiter.observe(
+        "twitter", "post", "token",
+        {"x-rate-limit-limit": "100", "x-rate-limit-remaining": "0",
+         "x-rate-limit-reset": str(int(NOW + 300))},
+    )
+
+    assert limiter.try_acquire("twitter", "post", "token") == pytest.approx(300)
+    clock.now += 300
+    assert limiter.try_acquire("twitter", "post", "token") == 0
+
+
+def test_processes_share_buckets(make_limiter):
+    first, second = make_limiter(max_wait=0), make_limiter(max_wait=0)
+    for _ in range(25):
+        first.acquire("twitter", "delete", "token")
+        second.acquire("twitter", "delete", "token")
+
+    with pytest.raises(RateLimitExceeded):
+        first.acquire("twitter", "delete", "token")
+
+
+def test_observer_hook_classifies_responses(make_limiter):
+    limiter = make_limiter(max_wait=0)
+    hook = limiter.observer("twitter", "token", lambda method, url: "post")
+    response = SimpleNamespace(
+        request=SimpleNamespace(method="POST", url="https://api.twitter.com/2/tweets"),
+        headers={"x-rate-limit-limit": "100", "x-rate-limit-remaining": "0"},
+        status_code=200,
+    )
+
+    assert hook(response) is response
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire("twitter", "post", "token")
+
+
+def test_acquire_async_waits_without_blocking(tmp_path):
+    limiter = RateLimiter(db_path=str(tmp_path / "limits.db"), max_wait=1)
+    limiter.observe("bluesky", "read", "alice", {"ratelimit-remaining": "0"}, 200)
+
+    # Blocked for one refill interval (300s / 3000 requests)
+    assert limiter.try_acquire("bluesky", "read", "alice") > 0
+    run_sync(limiter.acquire_async("bluesky", "read", "alice"))
+
+    assert limiter.get_stats()["waited"] == 1
@@ -0,0 +1,157 @@
+"""
+Tests for the shared twscrape scraper pool.
+
+The twscrape API is replaced by a fake holding accounts in memory, so no
+accounts database or network access is needed.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.scraper_pool import ScraperPool
+
+
+CREDS = {
+    "username": "scraper1",
+    "password": "pw",
+    "email": "scraper1@example.com",
+    "email_password": "mailpw",
+}
+
+
+class FakeAccountsPool:
+    def __init__(self, login_ok=True):
+        self.accounts = {}
+        self.login_ok = login_ok
+        self.login_calls = []
+
+    async def get_account(self, username):
+        return self.accounts.get(username)
+
+    async def add_account(self, username, password, email, email_password, **kwargs):
+        self.accounts[username] = SimpleNamespace(
+            username=username,
+            active=False,
+            headers={},
+            locks={},
+            stats={},
+            error_msg=None,
+            last_used=None,
+        )
+
+    async def login_all(self, usernames=None):
+        self.login_calls.append(usernames)
+        for username in usernames:
+            self.accounts[username].active = self.login_ok
+        ok = len(usernames) if self.login_ok else 0
+        return {"total": len(usernames), "success": ok, "failed": len(usernames) - ok}
+
+    async def get_all(self):
+        return list(self.accounts.values())
+
+
+class FakeAPI:
+    instances = 0
+
+    def __init__(self, db_file, login_ok=True):
+        FakeAPI.instances += 1
+        self.db_file = db_file
+        self.pool = FakeAccountsPool(login_ok)
+
+
+@pytest.fixture
+def pool():
+    FakeAPI.instances = 0
+    return ScraperPool(db_file="test-accounts.db", api_factory=FakeAPI)
+
+
+def test_api_is_created_once(pool):
+    async def run():
+        first = await pool.get_api(CREDS)
+        second = await pool.get_api()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert FakeAPI.instances == 1
+    assert first.db_file == "test-accounts.db"
+
+
+def test_account_added_and_logged_in_once(pool):
+    async def run():
+        for _ in range(3):
+            await pool.get_api(CREDS)
+
+    asyncio.run(run())
+
+    assert pool.api.pool.login_calls == [["scraper1"]]
+    stats = pool.get_stats()
+    assert stats["accounts_added"] == 1
+    assert stats["logins"] == 1
+    assert stats["api_requests"] == 3
+
+
+def test_already_active_account_is_not_logged_in(pool):
+    async def run():
+        await pool.api.pool.add_account(**CREDS)
+        pool.api.pool.accounts["scraper1"].active = True
+        return await pool.ensure_account(CREDS)
+
+    assert asyncio.run(run()) is True
+    assert pool.api.pool.login_calls == []
+
+
+def test_failed_login_waits_for_cooldown():
+    pool = ScraperPool(
+        api_factory=lambda db: FakeAPI(db, login_ok=False), login_retry_seconds=3600
+    )
+
+    async def run():
+        return [await pool.ensure_account(CREDS) for _ in range(3)]
+
+    assert asyncio.run(run()) == [False, False, False]
+    assert len(pool.api.pool.login_calls) == 1
+    assert pool.get_stats()["logins_skipped"] == 2
+
+
+def test_incomplete_credentials_are_ignored(pool):
+    assert asyncio.run(pool.ensure_account({"username": "scraper1"})) is False
+    assert asyncio.run(pool.ensure_account(None)) is False
+
+
+def test_refresh_health_reports_locks(pool):
+    async def run():
+        await pool.ensure_account(CREDS)
+        account = pool.api.pool.accounts["scraper1"]
+        account.locks = {
+            "SearchTimeline": datetime.now(timezone.utc) + timedelta(minutes=15),
+            "UserTweets": datetime.now(timezone.utc) - timedelta(minutes=1),
+        }
+        account.stats = {"SearchTimeline": 40, "UserTweets": 2}
+        return await pool.refresh_health()
+
+    health = asyncio.run(run())
+
+    assert len(health) == 1
+    assert list(health[0].locked_queues) == ["SearchTimeline"]
+    assert health[0].total_requests == 42
+    stats = pool.get_stats()
+    assert stats["accounts"] == 1
+    assert stats["active"] == 1
+    assert stats["locked"] == 1
+
+
+def test_deactivated_account_is_checked_again(pool):
+    async def run():
+        await pool.ensure_account(CREDS)
+        pool.api.pool.accounts["scraper1"].active = False
+        await pool.refresh_health()
+        await pool.ensure_account(CREDS)
+
+    asyncio.run(run())
+
+    assert pool.api.pool.login_calls == [["scraper1"], ["scraper1"]]
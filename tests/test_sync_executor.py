@@ -0,0 +1,87 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from app.services.sync_executor import SyncExecutor, get_sync_executor
+
+
+def _users(n):
+    return [SimpleNamespace(id=i, username=f"user{i}") for i in range(n)]
+
+
+def test_results_keep_user_order_and_values():
+    executor = SyncExecutor(max_workers=4)
+    try:
+        results = executor.run(_users(5), lambda user: user.id * 10)
+    finally:
+        executor.shutdown()
+
+    assert [r.user_id for r in results] == [0, 1, 2, 3, 4]
+    assert [r.result for r in results] == [0, 10, 20, 30, 40]
+    assert all(r.success for r in results)
+
+
+def test_failures_are_isolated():
+    def job(user):
+        if user.id == 1:
+            raise ValueError("bad credentials")
+        return "ok"
+
+    executor = SyncExecutor(max_workers=2)
+    try:
+        results = executor.run(_users(3), job)
+    finally:
+        executor.shutdown()
+
+    assert [r.success for r in results] == [True, False, True]
+    assert results[1].error == "bad credentials"
+    assert results[1].error_type == "ValueError"
+
+
+def test_concurrency_is_bounded():
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def job(user):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    executor = SyncExecutor(max_workers=3)
+    try:
+        executor.run(_users(9), job)
+    finally:
+        executor.shutdown()
+
+    assert 1 < peak <= 3
+
+
+def test_records_per_user_timing():
+    executor = SyncExecutor(max_workers=1)
+    results = executor.run(_users(1), lambda user: time.sleep(0.02))
+
+    assert results[0].duration_ms >= 20
+
+
+def test_worker_threads_are_reused_across_cycles():
+    executor = SyncExecutor(max_workers=2)
+    try:
+        first = set(r.result for r in executor.run(_users(4), lambda u: threading.get_ident()))
+        second = set(r.result for r in executor.run(_users(4), lambda u: threading.get_ident()))
+    finally:
+        executor.shutdown()
+
+    assert second <= first
+
+
+def test_empty_user_list():
+    assert SyncExecutor().run([], lambda user: None) == []
+
+
+def test_shared_executor_is_a_singleton():
+    assert get_sync_executor() is get_sync_executor()
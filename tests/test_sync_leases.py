@@ -0,0 +1,97 @@
+"""
+Tests for lease-based sharding of users across sync workers.
+"""
+
+import pytest
+
+from app.services.sync_leases import SyncLeases
+
+
+NOW = 1_800_000_000.0
+
+
+class FakeClock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_worker(tmp_path, clock):
+    db_path = str(tmp_path / "leases.db")
+
+    def make(worker_id):
+        leases = SyncLeases(db_path=db_path, worker_id=worker_id, lease_seconds=120, clock=clock)
+        leases.init_db()
+        leases.heartbeat()
+        return leases
+
+    return make
+
+
+USERS = list(range(1, 11))
+
+
+def test_single_worker_takes_every_user(make_worker):
+    worker = make_worker("a")
+
+    assert worker.rebalance(USERS) == set(USERS)
+    assert all(worker.holds(uid) for uid in USERS)
+
+
+def test_workers_split_users_without_overlap(make_worker):
+    a, b = make_worker("a"), make_worker("b")
+
+    held_a = a.rebalance(USERS)
+    held_b = b.rebalance(USERS)
+    # a gives up its surplus once b is known, b picks it up next round
+    held_a = a.rebalance(USERS)
+    held_b = b.rebalance(USERS)
+
+    assert held_a.isdisjoint(held_b)
+    assert held_a | held_b == set(USERS)
+    assert len(held_a) == len(held_b) == 5
+    assert not any(b.holds(uid) for uid in held_a)
+
+
+def test_dead_worker_users_are_taken_over_after_expiry(make_worker, clock):
+    a, b = make_worker("a"), make_worker("b")
+    a.rebalance(USERS)
+    b.rebalance(USERS)
+    a.rebalance(USERS)
+    held_b = b.rebalance(USERS)
+
+    # a stops heartbeating; its leases are still valid for a while
+    clock.now += 60
+    assert len(b.rebalance(USERS)) == 5
+
+    clock.now += 61
+    assert b.rebalance(USERS) == set(USERS)
+    assert held_b <= set(USERS)
+    # The dead worker may not sync anything once it is taken over
+    assert not any(a.holds(uid) for uid in USERS)
+
+
+def test_deactivated_users_are_released(make_worker):
+    worker = make_worker("a")
+    worker.rebalance(USERS)
+
+    assert worker.rebalance(USERS[:3]) == set(USERS[:3])
+    assert not worker.holds(USERS[5])
+
+
+def test_release_all_hands_users_over(make_worker):
+    a, b = make_worker("a"), make_worker("b")
+    a.rebalance(USERS)
+    a.release_all()
+
+    assert b.rebalance(USERS) == set(USERS)
+    assert b.get_stats()["live_workers"] == ["b"]
+    assert b.get_stats()["leases"] == {"b": 10}
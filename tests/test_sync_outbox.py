@@ -0,0 +1,198 @@
+"""
+Tests for the durable sync outbox.
+"""
+
+import sqlite3
+
+import pytest
+
+from app.core.db_handler import migrate_database
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.sync_outbox import DEAD, DONE, PENDING, PartialPostError, SyncOutbox
+
+
+NOW = 1_800_000_000.0
+
+
+class FakeClock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    migrate_database(db_path=path)
+    return path
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_outbox(db_path, clock, **kwargs):
+    kwargs.setdefault("lease_seconds", 300)
+    kwargs.setdefault("max_attempts", 3)
+    kwargs.setdefault("backoff_seconds", 60)
+    kwargs.setdefault("max_backoff_seconds", 3600)
+    outbox = SyncOutbox(db_path=db_path, clock=clock, **kwargs)
+    outbox.init_db()
+    return outbox
+
+
+def record_for(job):
+    return [
+        {"twitter_id": item["id"], "bluesky_uri": f"at://{item['id']}",
+         "source": job.source, "synced_to": job.target, "content": item["text"],
+         "user_id": job.user_id}
+        for item in job.items
+    ]
+
+
+def synced_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT twitter_id, bluesky_uri, user_id FROM synced_posts ORDER BY id"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def test_enqueue_is_idempotent(db_path, clock):
+    outbox = make_outbox(db_path, clock)
+    jobs = [[{"id": "1", "text": "hello"}], [{"id": "2", "text": "world"}]]
+
+    assert outbox.enqueue_many(1, "twitter", "bluesky", jobs) == 2
+    assert outbox.enqueue_many(1, "twitter", "bluesky", jobs) == 0
+    # Same content for another user or target is a separate job
+    assert outbox.enqueue_many(2, "twitter", "bluesky", jobs[:1]) == 1
+    assert outbox.enqueue_many(1, "bluesky", "twitter", jobs[:1]) == 1
+    assert outbox.get_stats()[PENDING] == 4
+
+
+def test_claimed_jobs_are_leased_exclusively(db_path, clock):
+    outbox = make_outbox(db_path, clock)
+    outbox.enqueue_many(1, "twitter", "bluesky", [[{"id": "1", "text": "a"}]])
+
+    first = outbox.claim(1, "bluesky", owner="worker-1")
+    second = outbox.claim(1, "bluesky", owner="worker-2")
+
+    assert [job.items[0]["id"] for job in first] == ["1"]
+    assert first[0].attempts == 1
+    assert second == []
+    assert outbox.claim(2, "bluesky") == []
+
+
+def test_expired_lease_is_reclaimed(db_path, clock):
+    outbox = make_outbox(db_path, clock)
+    outbox.enqueue_many(1, "twitter", "bluesky", [[{"id": "1", "text": "a"}]])
+    stale = outbox.claim(1, "bluesky", owner="crashed")[0]
+
+    clock.now += 301
+    reclaimed = outbox.claim(1, "bluesky", owner="worker-2")
+
+    assert [job.id for job in reclaimed] == [stale.id]
+    assert reclaimed[0].attempts == 2
+    # The crashed worker can no longer complete the job
+    assert outbox.complete(stale, record_for(stale)) is False
+    assert outbox.complete(reclaimed[0], record_for(reclaimed[0])) is True
+    assert synced_rows(db_path) == [("1", "at://1", 1)]
+
+
+def test_failed_job_backs_off_then_dead_letters(db_path, clock):
+    outbox = make_outbox(db_path, clock)
+    outbox.enqueue_many(1, "twitter", "bluesky", [[{"id": "1", "text": "a"}]])
+
+    def broken(job):
+        raise RuntimeError("rate limited")
+
+    assert outbox.drain(1, "bluesky", broken).failed == 1
+    # Backoff: not due again right away
+    assert outbox.claim(1, "bluesky") == []
+
+    clock.now += 60
+    assert outbox.drain(1, "bluesky", broken).failed == 1
+    clock.now += 119
+    assert outbox.claim(1, "bluesky") == []
+    clock.now += 1
+    assert outbox.drain(1, "bluesky", broken).dead == 1
+
+    dead = outbox.list_jobs(DEAD)
+    assert len(dead) == 1
+    assert dead[0]["attempts"] == 3
+    assert dead[0]["last_error"] == "rate limited"
+    clock.now += 10_000
+    assert outbox.claim(1, "bluesky") == []
+
+
+def test_refused_job_is_deferred_without_using_an_attempt(db_path, clock):
+    outbox = make_outbox(db_path, clock)
+    outbox.enqueue_many(1, "twitter", "bluesky", [[{"id": "1", "text": "a"}]])
+
+    def circuit_open(job):
+        raise CircuitOpenError("bluesky:write", 30)
+
+    for _ in range(5):
+        assert outbox.drain(1, "bluesky", circuit_open).deferred == 1
+        assert outbox.claim(1, "bluesky") == []
+        clock.now += 30
+
+    assert outbox.list_jobs(DEAD) == []
+    jobs = outbox.list_jobs(PENDING)
+    assert jobs[0]["attempts"] == 0
+    assert jobs[0]["last_error"] == "Circuit bluesky:write is open, retry in 30s"
+
+
+def test_drain_records_posts_with_job(db_path, clock):
+    outbox = make_outbox(db_path, clock)
+    thread = [{"id": "1", "text": "start"}, {"id": "2", "text": "reply"}]
+    outbox.enqueue_many(1, "twitter", "bluesky", [thread, [{"id": "3", "text": "single"}]])
+
+    posted_jobs = []
+
+    def post(job):
+        posted_jobs.append(job)
+        return record_for(job)
+
+    result = outbox.drain(1, "bluesky", post)
+
+    assert [job.is_thread for job in posted_jobs] == [True, False]
+    assert result.posted == 3
+    assert synced_rows(db_path) == [("1", "at://1", 1), ("2", "at://2", 1), ("3", "at://3", 1)]
+    assert outbox.get_stats()[DONE] == 2
+    # Done jobs are neither drained nor enqueued again
+    assert outbox.drain(1, "bluesky", post).posted == 0
+    assert outbox.enqueue_many(1, "twitter", "bluesky", [thread]) == 0
+
+
+def test_partly_posted_job_keeps_the_rest_for_its_retry(db_path, clock):
+    outbox = make_outbox(db_path, clock)
+    thread = [{"id": "1", "text": "start"}, {"id": "2", "text": "middle"},
+              {"id": "3", "text": "end"}]
+    outbox.enqueue_many(1, "twitter", "bluesky", [thread])
+
+    def stop_after_first(job):
+        rest = [dict(item) for item in job.items[1:]]
+        rest[0]["reply_to"] = {"root": {"uri": "at://1", "cid": "c1"},
+                               "parent": {"uri": "at://1", "cid": "c1"}}
+        raise PartialPostError(record_for(job)[:1], rest, ConnectionError("reset"))
+
+    result = outbox.drain(1, "bluesky", stop_after_first)
+
+    assert (result.posted, result.failed) == (1, 1)
+    assert synced_rows(db_path) == [("1", "at://1", 1)]
+    clock.now += 60
+    [job] = outbox.claim(1, "bluesky")
+    assert [item["id"] for item in job.items] == ["2", "3"]
+    assert job.items[0]["reply_to"]["parent"]["uri"] == "at://1"
+    assert job.last_error == "reset"
+
+    outbox.settle(job, result, records=record_for(job))
+    assert [row[0] for row in synced_rows(db_path)] == ["1", "2", "3"]
+    assert outbox.get_stats()[DONE] == 1
+    # The whole thread is still known to the outbox
+    assert outbox.enqueue_many(1, "twitter", "bluesky", [thread]) == 0
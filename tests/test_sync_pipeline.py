@@ -0,0 +1,138 @@
+"""
+Tests for the staged streaming sync pipeline.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.async_runtime import run_sync
+from app.services.sync_pipeline import (
+    Stage,
+    SyncPipeline,
+    get_pipeline_stats,
+    reset_pipeline_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    reset_pipeline_stats()
+    yield
+    reset_pipeline_stats()
+
+
+def test_items_flow_through_stages_in_order():
+    pipeline = SyncPipeline(
+        "test",
+        [
+            Stage("split", lambda text: text.split(), fan_out=True),
+            Stage("upper", lambda word: word.upper()),
+            Stage("drop_short", lambda word: word if len(word) > 1 else None),
+        ],
+    )
+
+    assert run_sync(pipeline.run(["a bc", "def"])) == ["BC", "DEF"]
+
+    stats = get_pipeline_stats()["test"]
+    assert list(stats) == ["split", "upper", "drop_short"]
+    assert stats["split"]["processed"] == 2
+    assert stats["split"]["emitted"] == 3
+    assert stats["drop_short"]["emitted"] == 2
+    assert all(stage["queue_depth"] == 0 for stage in stats.values())
+    assert all(stage["in_flight"] == 0 for stage in stats.values())
+
+
+def test_stage_workers_overlap():
+    async def slow(item):
+        await asyncio.sleep(0.2)
+        return item
+
+    pipeline = SyncPipeline("test", [Stage("slow", slow, concurrency=4)])
+
+    start = time.perf_counter()
+    assert sorted(run_sync(pipeline.run(range(4)))) == [0, 1, 2, 3]
+    assert time.perf_counter() - start < 0.6
+
+
+def test_blocking_handlers_run_off_the_loop():
+    threads = set()
+
+    def blocking(item):
+        threads.add(threading.current_thread().name)
+        return item
+
+    pipeline = SyncPipeline("test", [Stage("blocking", blocking)])
+    run_sync(pipeline.run([1, 2]))
+
+    assert "chirpsyncer-async" not in threads
+
+
+def test_bounded_queues_apply_backpressure():
+    release = None
+
+    async def gate(item):
+        await release.wait()
+        return item
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        pipeline = SyncPipeline("test", [Stage("gate", gate)], queue_size=2)
+        run = asyncio.ensure_future(pipeline.run(range(10)))
+        await asyncio.sleep(0.05)
+        depth = get_pipeline_stats()["test"]["gate"]["queue_depth"]
+        release.set()
+        return depth, await run
+
+    depth, results = run_sync(scenario())
+
+    assert depth == 2
+    assert results == list(range(10))
+    assert get_pipeline_stats()["test"]["gate"]["max_queue_depth"] == 2
+
+
+def test_failed_item_is_dropped_and_counted():
+    def flaky(item):
+        if item == 2:
+            raise ValueError("bad item")
+        return item
+
+    pipeline = SyncPipeline("test", [Stage("flaky", flaky)])
+
+    assert run_sync(pipeline.run([1, 2, 3])) == [1, 3]
+    assert get_pipeline_stats()["test"]["flaky"]["failed"] == 1
+
+
+def test_fail_fast_stage_aborts_run():
+    def broken(item):
+        raise RuntimeError("fetch failed")
+
+    downstream = []
+    pipeline = SyncPipeline(
+        "test",
+        [Stage("fetch", broken, fail_fast=True), Stage("post", downstream.append)],
+    )
+
+    with pytest.raises(RuntimeError, match="fetch failed"):
+        run_sync(pipeline.run([1, 2, 3]))
+    assert downstream == []
+    assert get_pipeline_stats()["test"]["fetch"]["queue_depth"] == 0
+
+
+def test_stage_latency_percentiles():
+    delays = {i: 0.05 if i == 99 else 0.0 for i in range(100)}
+    pipeline = SyncPipeline("test", [Stage("wait", lambda i: time.sleep(delays[i]))])
+
+    run_sync(pipeline.run(range(100)))
+
+    stats = get_pipeline_stats()["test"]["wait"]
+    assert stats["p50_ms"] < 40
+    assert stats["p99_ms"] < 40 <= stats["max_ms"]
+
+
+def test_pipeline_needs_stages():
+    with pytest.raises(ValueError):
+        SyncPipeline("test", [])
@@ -0,0 +1,130 @@
+"""
+Tests for the adaptive per-user sync scheduler.
+"""
+
+import sqlite3
+
+import pytest
+
+from app.core.db_handler import migrate_database, save_synced_posts_many
+from app.services.sync_scheduler import SyncScheduler
+
+
+NOW = 1_800_000_000.0
+HOUR = 3600
+
+
+class FakeClock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "scheduler.db")
+    migrate_database(db_path=path)
+    return path
+
+
+def make_scheduler(db_path, clock=None, **kwargs):
+    kwargs.setdefault("min_interval", 300)
+    kwargs.setdefault("max_interval", 24 * HOUR)
+    kwargs.setdefault("half_life", 24 * HOUR)
+    kwargs.setdefault("platform_budgets", {})
+    scheduler = SyncScheduler(db_path=db_path, clock=clock or FakeClock(), **kwargs)
+    scheduler.init_db()
+    return scheduler
+
+
+def add_posts(db_path, user_id, ages):
+    """Insert synced posts for a user, each `age` seconds old."""
+    save_synced_posts_many(
+        [
+            {"twitter_id": f"{user_id}-{i}", "source": "twitter", "synced_to": "bluesky",
+             "content": f"user {user_id} post {i}", "user_id": user_id}
+            for i in range(len(ages))
+        ],
+        db_path=db_path,
+    )
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT id FROM synced_posts WHERE user_id = ? ORDER BY id", (user_id,)
+    ).fetchall()
+    for (row_id,), age in zip(rows, ages):
+        conn.execute(
+            "UPDATE synced_posts SET synced_at = datetime(?, 'unixepoch') WHERE id = ?",
+            (int(NOW - age), row_id),
+        )
+    conn.commit()
+    conn.close()
+
+
+def test_new_users_are_due_immediately(db_path):
+    scheduler = make_scheduler(db_path)
+    scheduler.set_users([1, 2])
+
+    assert scheduler.seconds_until_next() == 0
+    assert sorted(scheduler.pop_due()) == [1, 2]
+    assert scheduler.pop_due() == []
+    assert scheduler.seconds_until_next() is None
+
+
+def test_active_user_polled_more_often_than_dormant(db_path):
+    # User 1 posted every 30 minutes over the last day; user 2 never
+    add_posts(db_path, 1, [i * 1800 for i in range(48)])
+    scheduler = make_scheduler(db_path)
+    scheduler.set_users([1, 2])
+    scheduler.pop_due()
+
+    active_due = scheduler.reschedule(1, now=NOW)
+    dormant_due = scheduler.reschedule(2, now=NOW)
+
+    assert NOW + 300 <= active_due < NOW + 2 * HOUR
+    assert dormant_due == NOW + 24 * HOUR
+    assert scheduler.pop_due(now=active_due) == [1]
+
+
+def test_posting_rate_decays_with_age(db_path):
+    add_posts(db_path, 1, [60] * 5)
+    add_posts(db_path, 2, [3 * 24 * HOUR] * 5)
+    scheduler = make_scheduler(db_path)
+
+    recent = scheduler.posting_rate(1, now=NOW)
+    old = scheduler.posting_rate(2, now=NOW)
+
+    assert old == pytest.approx(recent / 8, rel=0.01)
+
+
+def test_interval_respects_platform_budget(db_path):
+    add_posts(db_path, 1, [i * 60 for i in range(100)])
+    scheduler = make_scheduler(db_path, platform_budgets={"twitter": 60, "bluesky": 600})
+    scheduler.set_users(range(1, 31))
+
+    # 30 users within 60 requests/hour -> each at most every 30 minutes
+    assert scheduler.budget_floor(30) == 1800
+    assert scheduler.reschedule(1, now=NOW) == NOW + 1800
+
+
+def test_schedule_is_persisted(db_path):
+    scheduler = make_scheduler(db_path)
+    scheduler.set_users([7])
+    scheduler.pop_due()
+    due_at = scheduler.reschedule(7, now=NOW)
+
+    restarted = make_scheduler(db_path)
+    restarted.set_users([7])
+
+    assert restarted.next_sync_at(7) == int(due_at)
+    assert restarted.pop_due(now=NOW) == []
+
+
+def test_inactive_users_are_dropped(db_path):
+    scheduler = make_scheduler(db_path)
+    scheduler.set_users([1, 2])
+    scheduler.set_users([2])
+
+    assert scheduler.pop_due() == [2]
+    assert scheduler.next_sync_at(1) is None
@@ -100,7 +100,7 @@ def test_detect_self_reply_is_thread(mock_self_reply_tweet):
 
 
 # TEST 3: Thread fetching returns tweets in order
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_fetch_thread_returns_ordered_tweets(mock_api_class, mock_thread_tweets):
     """Test that fetch_thread returns all tweets in chronological order"""
     # Setup mock API
@@ -123,11 +123,10 @@ def test_fetch_thread_returns_ordered_tweets(mock_api_class, mock_thread_tweets)
             self.index += 1
             return item
 
-    # Mock tweet_details to return tweets in sequence
-    def mock_tweet_details(tweet_ids):
+    # Mock tweet_details to look tweets up by ID
+    async def mock_tweet_details(tweet_id):
         tweet_map = {t.id: t for t in mock_thread_tweets}
-        items = [tweet_map[tid] for tid in tweet_ids if tid in tweet_map]
-        return AsyncIterator(items)
+        return tweet_map.get(tweet_id)
 
     # Mock search to return tweet 300 as a forward reply
     def mock_search(query, limit=10):
@@ -149,7 +148,7 @@ def test_fetch_thread_returns_ordered_tweets(mock_api_class, mock_thread_tweets)
 
 
 # TEST 4: Handle missing/deleted tweets in thread
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_fetch_thread_handles_missing_tweets(mock_api_class, mock_thread_tweets):
     """Test that fetch_thread handles deleted tweets gracefully"""
     from app.integrations.twitter_scraper import fetch_thread
@@ -175,14 +174,13 @@ def test_fetch_thread_handles_missing_tweets(mock_api_class, mock_thread_tweets)
             return item
 
     # Mock tweet_details to skip middle tweet (deleted)
-    def mock_tweet_details(tweet_ids):
+    async def mock_tweet_details(tweet_id):
         # Only return tweet 1 and 3, skip tweet 2 (deleted)
         tweet_map = {
             100: mock_thread_tweets[0],
             300: mock_thread_tweets[2]
         }
-        items = [tweet_map[tid] for tid in tweet_ids if tid in tweet_map]
-        return AsyncIterator(items)
+        return tweet_map.get(tweet_id)
 
     def mock_search(query, limit=10):
         return AsyncIterator([])
@@ -266,8 +264,8 @@ def test_post_thread_maintains_order(mock_send_post, mock_thread_tweets):
 @patch("app.integrations.bluesky_handler.bsky_client.send_post")
 @patch("app.integrations.bluesky_handler.logger")
 def test_post_thread_handles_partial_failure(mock_logger, mock_send_post, mock_thread_tweets):
-    """Test that partial failures in thread posting are handled gracefully"""
-    from app.integrations.bluesky_handler import post_thread_to_bluesky
+    """Test that a failed post stops the thread and reports the posted prefix"""
+    from app.integrations.bluesky_handler import ThreadPostError, post_thread_to_bluesky
     from app.integrations.twitter_scraper import TweetAdapter
 
     # Setup mock client: first succeeds, second fails, third succeeds
@@ -288,11 +286,13 @@ def test_post_thread_handles_partial_failure(mock_logger, mock_send_post, mock_t
     # Wrap tweets in TweetAdapter
     adapted_tweets = [TweetAdapter(t) for t in mock_thread_tweets]
 
-    # Call post_thread_to_bluesky - should not crash
-    result = post_thread_to_bluesky(adapted_tweets)
+    # Later posts could not chain to the missing one, so the thread stops
+    with pytest.raises(ThreadPostError) as exc:
+        post_thread_to_bluesky(adapted_tweets)
 
-    # Should return partial results or empty
-    assert isinstance(result, list), "Should return a list even on partial failure"
+    assert exc.value.posted == ["at://test/uri1"]
+    assert str(exc.value.error) == "Network error"
+    assert mock_send_post.call_count == 2
 
 
 # TEST 8: Thread deduplication
@@ -316,8 +316,8 @@ def test_thread_deduplication(mock_is_tweet_seen, mock_thread_tweets):
 
 # TEST 9: Long thread rate limiting
 @patch("app.integrations.bluesky_handler.bsky_client.send_post")
-@patch("app.integrations.bluesky_handler.time.sleep")
-def test_long_thread_rate_limiting(mock_sleep, mock_send_post):
+@patch("app.integrations.bluesky_handler.get_rate_limiter")
+def test_long_thread_rate_limiting(mock_get_limiter, mock_send_post):
     """Test that rate limiting is applied for long threads"""
     from app.integrations.bluesky_handler import post_thread_to_bluesky
     from app.integrations.twitter_scraper import TweetAdapter
@@ -345,14 +345,63 @@ def test_long_thread_rate_limiting(mock_sleep, mock_send_post):
     # Call post_thread_to_bluesky
     post_thread_to_bluesky(adapted_tweets)
 
-    # Verify sleep was called for rate limiting (between posts)
-    # Should sleep N-1 times for N posts (4 times for 5 tweets)
-    assert mock_sleep.call_count == 4, "Should sleep 4 times between 5 posts for rate limiting"
+    # Every post takes a token from the account's write bucket
+    acquire = mock_get_limiter.return_value.acquire
+    assert acquire.call_count == 5, "Should take one write token per post"
+    assert acquire.call_args.args == ("bluesky", "write")
+
+
+# TEST 9b: Exhausted rate limit stops the thread
+@patch("app.integrations.bluesky_handler.bsky_client.send_post")
+@patch("app.integrations.bluesky_handler.get_rate_limiter")
+def test_thread_stops_when_rate_limited(mock_get_limiter, mock_send_post, mock_thread_tweets):
+    """Test that a thread stops at the first post without a rate-limit token"""
+    from app.integrations.bluesky_handler import ThreadPostError
+    from app.services.rate_limiter import RateLimitExceeded
+
+    mock_response = MagicMock()
+    mock_response.uri = "at://test/uri"
+    mock_response.cid = "test_cid"
+    mock_send_post.return_value = mock_response
+    mock_get_limiter.return_value.acquire.side_effect = [
+        None,
+        RateLimitExceeded("bluesky:write:default", 600),
+        None,
+    ]
+
+    adapted_tweets = [TweetAdapter(t) for t in mock_thread_tweets]
+    with pytest.raises(ThreadPostError) as exc:
+        post_thread_to_bluesky(adapted_tweets)
+
+    assert exc.value.posted == ["at://test/uri"]
+    assert isinstance(exc.value.error, RateLimitExceeded)
+    assert mock_send_post.call_count == 1
+
+
+# TEST 9c: A stopped thread continues under its last posted post
+@patch("app.integrations.bluesky_handler.bsky_client.send_post")
+@patch("app.integrations.bluesky_handler.models")
+def test_thread_continues_under_reply_to(mock_models, mock_send_post, mock_thread_tweets):
+    """Test that reply_to chains the first post under an existing thread"""
+    mock_response = MagicMock()
+    mock_response.uri = "at://test/uri"
+    mock_response.cid = "test_cid"
+    mock_send_post.return_value = mock_response
+    reply_to = {"root": {"uri": "at://root", "cid": "c0"}, "parent": {"uri": "at://p", "cid": "c1"}}
+
+    adapted_tweets = [TweetAdapter(t) for t in mock_thread_tweets[1:]]
+    uris = post_thread_to_bluesky(adapted_tweets, reply_to=reply_to)
+
+    assert uris == ["at://test/uri", "at://test/uri"]
+    mock_models.ComAtprotoRepoStrongRef.Main.assert_any_call(uri="at://p", cid="c1")
+    mock_models.ComAtprotoRepoStrongRef.Main.assert_any_call(uri="at://root", cid="c0")
+    # Every post, the first included, is a reply
+    assert all("reply_to" in call[1] for call in mock_send_post.call_args_list)
 
 
 # TEST 10: Integration test - sync thread end-to-end
 @patch("app.integrations.bluesky_handler.bsky_client.send_post")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 @patch("app.core.db_handler.is_tweet_seen")
 @patch("app.core.db_handler.mark_tweet_as_seen")
 def test_integration_sync_thread_end_to_end(
@@ -385,10 +434,9 @@ def test_integration_sync_thread_end_to_end(
             self.index += 1
             return item
 
-    def mock_tweet_details(tweet_ids):
+    async def mock_tweet_details(tweet_id):
         tweet_map = {t.id: t for t in mock_thread_tweets}
-        items = [tweet_map[tid] for tid in tweet_ids if tid in tweet_map]
-        return AsyncIterator(items)
+        return tweet_map.get(tweet_id)
 
     def mock_search(query, limit=10):
         return AsyncIterator([])
@@ -418,3 +466,120 @@ def test_integration_sync_thread_end_to_end(
     # Assertions
     assert len(uris) > 0, "Should post thread to Bluesky"
     assert mock_send_post.called, "Should call Bluesky API"
+
+
+class FakeThreadAPI:
+    """twscrape stand-in serving one author's conversation and counting calls"""
+
+    def __init__(self, tweets):
+        self.tweets = {t.id: t for t in tweets}
+        self.detail_calls = []
+        self.queries = []
+
+    def add(self, tweet):
+        self.tweets[tweet.id] = tweet
+
+    async def tweet_details(self, twid):
+        # twscrape: one tweet ID in, the tweet or None out
+        self.detail_calls.append(twid)
+        return self.tweets.get(twid)
+
+    async def search(self, query, limit=10):
+        self.queries.append(query)
+        since = int(query.split("since_id:")[1]) if "since_id:" in query else 0
+        for tweet_id in sorted(self.tweets, reverse=True)[:limit]:
+            tweet = self.tweets[tweet_id]
+            # Search returns the replies, not the conversation root
+            if tweet.inReplyToTweetId is not None and tweet_id > since:
+                yield tweet
+
+
+def make_thread_tweet(tweet_id, parent_id=None, conversation_id=1000):
+    tweet = MagicMock()
+    tweet.id = tweet_id
+    tweet.rawContent = f"Tweet {tweet_id}"
+    tweet.conversationId = conversation_id
+    tweet.inReplyToTweetId = parent_id
+    tweet.user = MagicMock()
+    tweet.user.username = "testuser"
+    return tweet
+
+
+# TEST 12: Long threads come from one search plus one batched lookup
+@patch("app.integrations.twitter_scraper._get_api")
+def test_fetch_long_thread_by_conversation_id(mock_api_class):
+    """Test that a 25-tweet thread is fetched whole in a few calls"""
+    tweets = [make_thread_tweet(1000)] + [
+        make_thread_tweet(1000 + i, parent_id=1000 + i - 1) for i in range(1, 25)
+    ]
+    api = FakeThreadAPI(tweets)
+    mock_api_class.return_value = api
+
+    thread = asyncio.run(fetch_thread("1012", "testuser", tweet=tweets[12]))
+
+    assert [t.id for t in thread] == [t.id for t in tweets]
+    assert api.queries == ["conversation_id:1000 from:testuser"]
+    # Only the root is missing from the search results
+    assert api.detail_calls == [1000]
+
+
+# TEST 13: A growing thread only fetches its new replies
+@patch("app.integrations.twitter_scraper._get_api")
+def test_fetch_thread_reuses_cached_graph(mock_api_class):
+    """Test that expanding a thread again searches only for newer replies"""
+    tweets = [make_thread_tweet(1000), make_thread_tweet(1001, 1000), make_thread_tweet(1002, 1001)]
+    api = FakeThreadAPI(tweets)
+    mock_api_class.return_value = api
+
+    asyncio.run(fetch_thread("1002", "testuser", tweet=tweets[2]))
+    api.add(make_thread_tweet(1003, 1002))
+    api.detail_calls.clear()
+
+    thread = asyncio.run(fetch_thread("1003", "testuser", tweet=api.tweets[1003]))
+
+    assert [t.id for t in thread] == [1000, 1001, 1002, 1003]
+    assert api.queries[-1] == "conversation_id:1000 from:testuser since_id:1002"
+    assert api.detail_calls == []
+
+
+# TEST 14: Replies to other people's tweets are not part of the thread
+@patch("app.integrations.twitter_scraper._get_api")
+def test_fetch_thread_ignores_branches_from_other_authors(mock_api_class):
+    """Test that the thread only follows the author's own reply chain"""
+    root = make_thread_tweet(1000)
+    reply = make_thread_tweet(1001, 1000)
+    stranger = make_thread_tweet(1002, 1000)
+    stranger.user.username = "someone_else"
+    answer = make_thread_tweet(1003, 1002)
+    api = FakeThreadAPI([root, reply, stranger, answer])
+    mock_api_class.return_value = api
+
+    thread = asyncio.run(fetch_thread("1001", "testuser", tweet=reply))
+
+    assert [t.id for t in thread] == [1000, 1001]
+
+
+# TEST 15: Lookups run one tweet_details call per ID, a batch at a time
+def test_lookup_tweets_runs_batches_of_single_id_calls():
+    """Test that IDs are looked up concurrently per batch and missing tweets dropped"""
+    from app.integrations.twitter_scraper import _lookup_tweets
+
+    api = FakeThreadAPI([make_thread_tweet(tweet_id) for tweet_id in (1, 2, 4, 5)])
+    in_flight, peak = 0, 0
+    lookup = api.tweet_details
+
+    async def tweet_details(twid):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return await lookup(twid)
+
+    api.tweet_details = tweet_details
+    with patch("app.integrations.twitter_scraper.THREAD_LOOKUP_BATCH_SIZE", 2):
+        found = asyncio.run(_lookup_tweets(api, ["5", 4, 3, 2, 1]))
+
+    assert sorted(found) == [1, 2, 4, 5]
+    assert sorted(api.detail_calls) == [1, 2, 3, 4, 5]
+    assert peak == 2
@@ -25,7 +25,7 @@ def mock_tweet_data():
 
 @patch("app.integrations.twitter_scraper.mark_tweet_as_seen")
 @patch("app.integrations.twitter_scraper.is_tweet_seen")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_fetch_tweets_returns_list(mock_api_class, mock_is_tweet_seen,
                                    mock_mark_tweet_as_seen, mock_tweet_data):
     """Test that fetch_tweets returns a list of tweet objects"""
@@ -60,7 +60,7 @@ def test_fetch_tweets_returns_list(mock_api_class, mock_is_tweet_seen,
 
 @patch("app.integrations.twitter_scraper.mark_tweet_as_seen")
 @patch("app.integrations.twitter_scraper.is_tweet_seen")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_fetch_tweets_with_count(mock_api_class, mock_is_tweet_seen,
                                  mock_mark_tweet_as_seen, mock_tweet_data):
     """Test that fetch_tweets respects the count parameter"""
@@ -84,7 +84,7 @@ def test_fetch_tweets_with_count(mock_api_class, mock_is_tweet_seen,
 
 @patch("app.integrations.twitter_scraper.mark_tweet_as_seen")
 @patch("app.integrations.twitter_scraper.is_tweet_seen")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_async_wrapper_works(mock_api_class, mock_is_tweet_seen,
                              mock_mark_tweet_as_seen, mock_tweet_data):
     """Test that the sync wrapper properly calls the async function"""
@@ -113,7 +113,7 @@ def test_async_wrapper_works(mock_api_class, mock_is_tweet_seen,
 
 @patch("app.integrations.twitter_scraper.mark_tweet_as_seen")
 @patch("app.integrations.twitter_scraper.is_tweet_seen")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_tweet_format_matches_expected(mock_api_class, mock_is_tweet_seen,
                                        mock_mark_tweet_as_seen, mock_tweet_data):
     """Test that tweet objects have the expected format (id and text attributes)"""
@@ -148,7 +148,7 @@ def test_tweet_format_matches_expected(mock_api_class, mock_is_tweet_seen,
 
 @patch("app.integrations.twitter_scraper.mark_tweet_as_seen")
 @patch("app.integrations.twitter_scraper.is_tweet_seen")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_fetch_tweets_filters_seen_tweets(mock_api_class, mock_is_tweet_seen,
                                           mock_mark_tweet_as_seen, mock_tweet_data):
     """Test that fetch_tweets filters out already seen tweets"""
@@ -186,7 +186,7 @@ def test_fetch_tweets_filters_seen_tweets(mock_api_class, mock_is_tweet_seen,
 
 @patch("app.integrations.twitter_scraper.mark_tweet_as_seen")
 @patch("app.integrations.twitter_scraper.is_tweet_seen")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_fetch_tweets_all_seen(mock_api_class, mock_is_tweet_seen,
                                mock_mark_tweet_as_seen, mock_tweet_data):
     """Test fetch_tweets when all tweets have already been seen"""
@@ -219,7 +219,7 @@ def test_fetch_tweets_all_seen(mock_api_class, mock_is_tweet_seen,
 
 @patch("app.integrations.twitter_scraper.mark_tweet_as_seen")
 @patch("app.integrations.twitter_scraper.is_tweet_seen")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_fetch_tweets_no_tweets_returned(mock_api_class, mock_is_tweet_seen,
                                          mock_mark_tweet_as_seen):
     """Test fetch_tweets when API returns no tweets"""
@@ -246,7 +246,107 @@ def test_fetch_tweets_no_tweets_returned(mock_api_class, mock_is_tweet_seen,
     mock_is_tweet_seen.assert_not_called()
     mock_mark_tweet_as_seen.assert_not_called()
 
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper.mark_tweet_as_seen")
+@patch("app.integrations.twitter_scraper.is_tweet_seen")
+@patch("app.integrations.twitter_scraper._get_api")
+def test_fetch_tweets_since_id_pages_to_high_water_mark(mock_api_class, mock_is_tweet_seen,
+                                                        mock_mark_tweet_as_seen):
+    """Test that fetch_tweets with since_id returns every newer tweet and stops at the mark"""
+    tweets = []
+    for tweet_id in range(120, 90, -1):
+        tweet = MagicMock()
+        tweet.id = tweet_id
+        tweet.rawContent = f"Tweet {tweet_id}"
+        tweets.append(tweet)
+
+    mock_api = AsyncMock()
+    mock_api_class.return_value = mock_api
+    search_calls = []
+
+    async def mock_search(query, limit):
+        search_calls.append((query, limit))
+        for tweet in tweets:
+            yield tweet
+
+    mock_api.search = mock_search
+    mock_is_tweet_seen.return_value = False
+
+    # The burst (20 tweets) is larger than the default window of 5
+    result = fetch_tweets(username="testuser", since_id="100")
+
+    assert [t.id for t in result] == list(range(120, 100, -1))
+    query, limit = search_calls[0]
+    assert "since_id:100" in query
+    assert limit == -1  # no cap: the search ends at the mark
+    # The mark bounds the window; the seen table is not consulted
+    mock_is_tweet_seen.assert_not_called()
+    mock_mark_tweet_as_seen.assert_not_called()
+
+
+@patch("app.integrations.twitter_scraper.mark_tweet_as_seen")
+@patch("app.integrations.twitter_scraper.is_tweet_seen")
+@patch("app.integrations.twitter_scraper._get_api")
+def test_fetch_tweets_checks_seen_tweets_off_the_loop(mock_api_class, mock_is_tweet_seen,
+                                                      mock_mark_tweet_as_seen, mock_tweet_data):
+    """Test that the seen-table lookups and writes run in one worker thread"""
+    import threading
+
+    mock_api = AsyncMock()
+    mock_api_class.return_value = mock_api
+    loop_threads = []
+    db_threads = set()
+
+    async def mock_search(*args, **kwargs):
+        loop_threads.append(threading.current_thread())
+        for tweet in mock_tweet_data:
+            yield tweet
+
+    mock_api.search = mock_search
+    mock_is_tweet_seen.side_effect = lambda tweet_id: db_threads.add(threading.current_thread())
+    mock_mark_tweet_as_seen.side_effect = lambda tweet_id: db_threads.add(threading.current_thread())
+
+    assert len(fetch_tweets()) == 3
+    assert len(db_threads) == 1
+    assert loop_threads[0] not in db_threads
+
+
+@patch("app.integrations.twitter_scraper._get_api")
+def test_fetch_tweets_since_id_refetches_tweet_that_failed_to_post(mock_api_class, tmp_path):
+    """Test that a tweet fetched but not posted comes back while the mark stays below it"""
+    import sqlite3
+    from app.core.db_handler import initialize_db, is_tweet_seen, mark_tweet_as_seen
+
+    db_path = str(tmp_path / "seen.db")
+    initialize_db(db_path)
+    # The scraper runs on the shared runtime loop's thread
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+
+    tweet = MagicMock()
+    tweet.id = 150
+    tweet.rawContent = "Failed to post"
+
+    mock_api = AsyncMock()
+    mock_api_class.return_value = mock_api
+
+    async def mock_search(query, limit):
+        yield tweet
+
+    mock_api.search = mock_search
+
+    with patch("app.integrations.twitter_scraper.is_tweet_seen",
+               side_effect=lambda tweet_id: is_tweet_seen(tweet_id, conn=conn)), \
+            patch("app.integrations.twitter_scraper.mark_tweet_as_seen",
+                  side_effect=lambda tweet_id: mark_tweet_as_seen(tweet_id, conn=conn)):
+        first = fetch_tweets(username="testuser", since_id="100")
+        # Posting failed, so the mark stays at 100 and the next cycle refetches
+        second = fetch_tweets(username="testuser", since_id="100")
+    conn.close()
+
+    assert [t.id for t in first] == [150]
+    assert [t.id for t in second] == [150]
+
+
+@patch("app.integrations.twitter_scraper._get_api")
 def test_fetch_tweets_uses_correct_username(mock_api_class, mock_tweet_data):
     """Test that fetch_tweets uses the correct Twitter username from config"""
 
@@ -279,7 +379,7 @@ def test_fetch_tweets_uses_correct_username(mock_api_class, mock_tweet_data):
 
 @patch("app.integrations.twitter_scraper.mark_tweet_as_seen")
 @patch("app.integrations.twitter_scraper.is_tweet_seen")
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_fetch_tweets_async_exception(mock_api_class, mock_is_tweet_seen, mock_mark_tweet_as_seen):
     """Test _fetch_tweets_async handles exceptions gracefully"""
     from app.integrations.twitter_scraper import fetch_tweets
@@ -298,7 +398,7 @@ def test_fetch_tweets_async_exception(mock_api_class, mock_is_tweet_seen, mock_m
     assert result == []
 
 
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 def test_fetch_tweets_runtime_error_handling(mock_api_class):
     """Test fetch_tweets handles RuntimeError for running event loop"""
     from app.integrations.twitter_scraper import fetch_tweets
@@ -357,7 +457,7 @@ async def test_is_thread_false():
 
 
 @pytest.mark.asyncio
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 async def test_fetch_thread_exception(mock_api_class):
     """Test fetch_thread handles exceptions gracefully"""
     from app.integrations.twitter_scraper import fetch_thread
@@ -366,9 +466,8 @@ async def test_fetch_thread_exception(mock_api_class):
     mock_api_class.return_value = mock_api
     
     # Make tweet_details raise exception
-    async def mock_tweet_details_error(*args):
+    async def mock_tweet_details_error(tweet_id):
         raise Exception("API error")
-        yield
     
     mock_api.tweet_details = mock_tweet_details_error
     
@@ -377,7 +476,7 @@ async def test_fetch_thread_exception(mock_api_class):
 
 
 @pytest.mark.asyncio
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 async def test_fetch_thread_not_found(mock_api_class):
     """Test fetch_thread handles missing initial tweet"""
     from app.integrations.twitter_scraper import fetch_thread
@@ -385,10 +484,9 @@ async def test_fetch_thread_not_found(mock_api_class):
     mock_api = AsyncMock()
     mock_api_class.return_value = mock_api
     
-    # Return empty generator
-    async def mock_tweet_details_empty(*args):
-        return
-        yield
+    # Deleted or protected tweets come back as None
+    async def mock_tweet_details_empty(tweet_id):
+        return None
     
     mock_api.tweet_details = mock_tweet_details_empty
     
@@ -397,7 +495,7 @@ async def test_fetch_thread_not_found(mock_api_class):
 
 
 @pytest.mark.asyncio
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 async def test_fetch_thread_single_tweet(mock_api_class):
     """Test fetch_thread with single tweet (no thread)"""
     from app.integrations.twitter_scraper import fetch_thread
@@ -413,8 +511,8 @@ async def test_fetch_thread_single_tweet(mock_api_class):
     mock_tweet.user = MagicMock()
     mock_tweet.user.username = "testuser"
     
-    async def mock_tweet_details(*args):
-        yield mock_tweet
+    async def mock_tweet_details(tweet_id):
+        return mock_tweet if tweet_id == 12345 else None
     
     async def mock_search(*args, **kwargs):
         return
@@ -429,7 +527,7 @@ async def test_fetch_thread_single_tweet(mock_api_class):
 
 
 @pytest.mark.asyncio
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 async def test_fetch_thread_with_parent(mock_api_class):
     """Test fetch_thread follows parent chain"""
     from app.integrations.twitter_scraper import fetch_thread
@@ -452,14 +550,8 @@ async def test_fetch_thread_with_parent(mock_api_class):
     child_tweet.user = MagicMock()
     child_tweet.user.username = "testuser"
     
-    call_count = [0]
-    
-    async def mock_tweet_details(ids):
-        if call_count[0] == 0:
-            call_count[0] += 1
-            yield child_tweet
-        else:
-            yield parent_tweet
+    async def mock_tweet_details(tweet_id):
+        return {22222: child_tweet, 11111: parent_tweet}.get(tweet_id)
     
     async def mock_search(*args, **kwargs):
         return
@@ -473,7 +565,7 @@ async def test_fetch_thread_with_parent(mock_api_class):
 
 
 @pytest.mark.asyncio
-@patch("app.integrations.twitter_scraper.API")
+@patch("app.integrations.twitter_scraper._get_api")
 async def test_fetch_thread_parent_not_found(mock_api_class):
     """Test fetch_thread handles missing parent tweet"""
     from app.integrations.twitter_scraper import fetch_thread
@@ -489,13 +581,9 @@ async def test_fetch_thread_parent_not_found(mock_api_class):
     mock_tweet.user = MagicMock()
     mock_tweet.user.username = "testuser"
     
-    call_count = [0]
-    
-    async def mock_tweet_details(ids):
-        if call_count[0] == 0:
-            call_count[0] += 1
-            yield mock_tweet
-        # Don't yield anything for parent request
+    async def mock_tweet_details(tweet_id):
+        # The parent (99999) is not found
+        return mock_tweet if tweet_id == 12345 else None
     
     async def mock_search(*args, **kwargs):
         return
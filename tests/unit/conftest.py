@@ -53,3 +53,17 @@ def test_user(test_db_path):
 def auth_headers(app, test_user):
     token = create_token(test_user["id"], test_user["username"], test_user["is_admin"])
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def admin_headers(app, test_db_path):
+    manager = UserManager(test_db_path)
+    manager.init_db()
+    admin_id = manager.create_user(
+        "adminuser",
+        "adminuser@example.com",
+        "AdminPassword123!",
+        is_admin=True,
+    )
+    token = create_token(admin_id, "adminuser", True)
+    return {"Authorization": f"Bearer {token}"}
@@ -11,3 +11,72 @@ def test_stats_returns_expected_fields(client, auth_headers):
     assert "synced_week" in data
     assert "total_synced" in data
     assert "platforms_connected" in data
+
+
+def test_metrics_requires_auth(client):
+    response = client.get("/api/v1/dashboard/metrics")
+    assert response.status_code == 401
+
+
+def test_metrics_requires_admin(client, auth_headers):
+    response = client.get("/api/v1/dashboard/metrics", headers=auth_headers)
+    assert response.status_code == 403
+    assert response.get_json()["error"]["code"] == "FORBIDDEN"
+
+
+def test_metrics_reports_db_pool(client, admin_headers):
+    response = client.get("/api/v1/dashboard/metrics", headers=admin_headers)
+    assert response.status_code == 200
+    pool = response.get_json()["data"]["db_pool"]
+    assert pool["checkouts"] > 0
+    assert 0.0 <= pool["hit_rate"] <= 1.0
+    assert "avg_wait_ms" in pool
+
+
+def test_metrics_reports_sync_outbox(client, admin_headers):
+    response = client.get("/api/v1/dashboard/metrics", headers=admin_headers)
+    outbox = response.get_json()["data"]["sync_outbox"]
+    assert set(outbox) == {"pending", "in_progress", "done", "dead"}
+
+
+def test_metrics_reports_sync_outbox_of_app_database(client, admin_headers, test_db_path):
+    from app.services.sync_outbox import SyncOutbox
+
+    outbox = SyncOutbox(db_path=test_db_path)
+    outbox.init_db()
+    outbox.enqueue_many(1, "twitter", "bluesky", [[{"id": "1", "text": "queued"}]])
+
+    response = client.get("/api/v1/dashboard/metrics", headers=admin_headers)
+    assert response.get_json()["data"]["sync_outbox"]["pending"] == 1
+
+
+def test_metrics_reports_sync_pipeline(client, admin_headers):
+    response = client.get("/api/v1/dashboard/metrics", headers=admin_headers)
+    assert isinstance(response.get_json()["data"]["sync_pipeline"], dict)
+
+
+def test_metrics_reports_rate_limits(client, admin_headers):
+    response = client.get("/api/v1/dashboard/metrics", headers=admin_headers)
+    assert "buckets" in response.get_json()["data"]["rate_limits"]
+
+
+def test_metrics_reports_circuit_breakers(client, admin_headers):
+    from app.services.circuit_breaker import get_breaker
+
+    get_breaker("bluesky", "write").record(False)
+    response = client.get("/api/v1/dashboard/metrics", headers=admin_headers)
+    breakers = response.get_json()["data"]["circuit_breakers"]
+    assert breakers["bluesky:write"]["state"] == "closed"
+    assert breakers["bluesky:write"]["failures"] == 1
+
+
+def test_metrics_reports_http_client(client, admin_headers):
+    response = client.get("/api/v1/dashboard/metrics", headers=admin_headers)
+    http = response.get_json()["data"]["http_client"]
+    assert {"requests", "connections_created", "connections_reused", "reuse_rate"} <= set(http)
+
+
+def test_metrics_reports_media_transform(client, admin_headers):
+    response = client.get("/api/v1/dashboard/metrics", headers=admin_headers)
+    transform = response.get_json()["data"]["media_transform"]
+    assert {"images", "transformed", "ratio", "avg_ms", "max_ms"} <= set(transform)